@@ -0,0 +1,89 @@
+"""
+Benchmark do modo adiado (grafo fundido) contra a avaliação imediata.
+
+Mede a cadeia de ``pense_num_numero2`` e uma expressão com subexpressões
+repetidas, em lote (lista de floats) e em escalares:
+
+- imediato: cada etapa chama a Calculadora (``*_lote`` em lote), alocando
+  um resultado intermediário por etapa;
+- adiado: o grafo montado com ``CalculadoraAdiada`` e avaliado por
+  ``avaliar``, em um único laço fundido.
+
+O pico de memória de cada avaliação em lote é medido com tracemalloc (o
+resultado final, igual nos dois modos, está incluído no pico).
+
+Uso:
+    python -m benchmarks.bench_adiado [tamanho]
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+
+from libs.adiado import CalculadoraAdiada, entrada, interpretar
+from libs.calculadora import Calculadora
+from libs.jogo import pense_num_numero2
+
+
+def _mede(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return time.perf_counter() - inicio, resultado
+
+
+def _pico(funcao):
+    tracemalloc.start()
+    try:
+        funcao()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _compara_lote(titulo, grafo, valores):
+    entradas = {nome: valores for nome in grafo.variaveis}
+    imediato = lambda: interpretar(grafo, entradas)
+    adiado = lambda: grafo.avaliar(**entradas)
+    grafo.compilar()
+    print(titulo)
+    linhas = []
+    for nome, funcao in (('imediato', imediato), ('adiado', adiado)):
+        segundos, _ = _mede(funcao)
+        linhas.append((nome, segundos, _pico(funcao)))
+    base_tempo, base_memoria = linhas[0][1], linhas[0][2]
+    for nome, segundos, pico in linhas:
+        print(f'  {nome:<10} {segundos:8.3f}s  {len(valores) / segundos:14,.0f} elem/s  '
+              f'pico {pico / 2**20:8.1f} MiB  (x{base_tempo / segundos:4.1f} tempo, '
+              f'x{base_memoria / pico:4.1f} memória)')
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    tamanho = int(float(argv[0])) if argv else 10**6
+    aleatorio = random.Random(3)
+    valores = [aleatorio.uniform(0, 1000) for _ in range(tamanho)]
+
+    num = entrada('num')
+    jogo = pense_num_numero2(num, calculadora=CalculadoraAdiada)
+    _compara_lote(f'pense_num_numero2 em lote ({tamanho} floats)', jogo, valores)
+
+    x = entrada('x')
+    soma = x + 1
+    repetida = (soma * soma - soma / 2) * (soma * soma - soma / 2)
+    _compara_lote(f'(s*s - s/2)**2 com s = x+1 ({tamanho} floats)', repetida, valores)
+
+    escalares = valores[:min(tamanho, 10**5)]
+    funcao = jogo.avaliar
+    casos = (
+        ('imediato', lambda: [pense_num_numero2(v, calculadora=Calculadora) for v in escalares]),
+        ('adiado', lambda: [funcao(v) for v in escalares]),
+    )
+    print(f'pense_num_numero2 escalar ({len(escalares)} chamadas)')
+    for nome, caso in casos:
+        segundos, _ = _mede(caso)
+        print(f'  {nome:<10} {segundos:8.3f}s  {len(escalares) / segundos:14,.0f} chamadas/s')
+
+
+if __name__ == '__main__':
+    main()
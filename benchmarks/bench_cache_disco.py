@@ -0,0 +1,87 @@
+"""
+Benchmark do cache persistente: a mesma tarefa com o cache frio e quente.
+
+A tarefa multiplica pares de inteiros grandes e percorre uma cadeia longa de
+operações com Fraction (cada passo usa o resultado do anterior), tudo por
+uma ``CalculadoraCache`` sobre ``CacheDisco``. Cada execução roda em um
+processo novo, como um job reiniciado: a primeira encontra o diretório vazio
+(fria), as seguintes leem os resultados gravados pelas anteriores (quentes).
+Também mede a tarefa sem cache e com dois processos irmãos ao mesmo tempo.
+
+Uso:
+    python -m benchmarks.bench_cache_disco [bits] [pares] [passos]
+"""
+
+import multiprocessing
+import random
+import shutil
+import sys
+import tempfile
+import time
+from fractions import Fraction
+
+from libs.cache import CalculadoraCache
+from libs.cache_disco import CacheDisco
+from libs.calculadora import Calculadora
+
+
+def _entradas(bits, pares):
+    aleatorio = random.Random(5)
+    return [(aleatorio.getrandbits(bits) | 1, aleatorio.getrandbits(bits) | 1)
+            for _ in range(pares)]
+
+
+def _tarefa(diretorio, bits, pares, passos):
+    """Roda a tarefa num processo novo; retorna (segundos, estatísticas)."""
+    inicio = time.perf_counter()
+    if diretorio is None:
+        calculadora, cache = Calculadora, None
+    else:
+        cache = CacheDisco(diretorio)
+        calculadora = CalculadoraCache(cache=cache)
+    total = 0
+    for a, b in _entradas(bits, pares):
+        total ^= calculadora.multiplicacao(a, b)
+    x = Fraction(3, 7)
+    for passo in range(passos):
+        x = calculadora.soma(calculadora.multiplicacao(x, Fraction(passo + 2, passo + 3)),
+                             Fraction(1, passo + 5))
+    segundos = time.perf_counter() - inicio
+    estatisticas = cache.estatisticas() if cache is not None else {}
+    if cache is not None:
+        cache.fechar()
+    return segundos, estatisticas
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    bits = int(float(argv[0])) if argv else 400_000
+    pares = int(argv[1]) if len(argv) > 1 else 200
+    passos = int(argv[2]) if len(argv) > 2 else 600
+    diretorio = tempfile.mkdtemp(prefix='bench_cache_disco_')
+    contexto = multiprocessing.get_context('spawn')
+    argumentos = (bits, pares, passos)
+    try:
+        print(f'{pares} produtos de {bits} bits + cadeia de {passos} passos com Fraction'
+              f' (cada linha em um processo novo)')
+        with contexto.Pool(1) as pool:
+            sem_cache, _ = pool.apply(_tarefa, (None,) + argumentos)
+        print(f'  {"sem cache":<22} {sem_cache:8.3f}s')
+        for rotulo in ('fria', 'quente', 'quente (de novo)'):
+            with contexto.Pool(1) as pool:
+                segundos, estatisticas = pool.apply(_tarefa, (diretorio,) + argumentos)
+            print(f'  {rotulo:<22} {segundos:8.3f}s  (x{sem_cache / segundos:6.1f})'
+                  f'  acertos {estatisticas["acertos"]}, falhas {estatisticas["falhas"]},'
+                  f' {estatisticas["bytes_log"] / 2**20:.1f} MiB no log')
+        with contexto.Pool(2) as pool:
+            inicio = time.perf_counter()
+            resultados = pool.starmap(_tarefa, [(diretorio,) + argumentos] * 2)
+            parede = time.perf_counter() - inicio
+        print(f'  {"2 irmãos, quente":<22} {parede:8.3f}s de parede;'
+              f' cada um {", ".join(f"{s:.3f}s" for s, _ in resultados)}')
+    finally:
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark do PoolCompartilhado contra ``multiprocessing.Pool.map``.
+
+A referência é o jeito direto de paralelizar: ``Pool.map`` sobre fatias das
+listas de operandos (as fatias e as listas de resultado passam por pickle)
+para as operações, e ``Pool.map(pense_num_numero, lista, chunksize)`` para o
+jogo. O ``PoolCompartilhado`` é medido com entradas em lista (inclui a
+conversão para array) e em ``array.array`` (só a cópia para o segmento).
+O tempo de criar os processos fica fora das medidas nos dois casos.
+
+Uso:
+    python -m benchmarks.bench_compartilhado [tamanho] [trabalhadores]
+"""
+
+import multiprocessing
+import os
+import random
+import sys
+import time
+from array import array
+
+from libs.calculadora import Calculadora
+from libs.compartilhado import PoolCompartilhado
+from libs.jogo import pense_num_numero
+
+
+def _soma_fatia(fatias):
+    a, b = fatias
+    return Calculadora.soma_lote(a, b)
+
+
+def _pool_map_soma(pool, a, b, fatia):
+    resultado = []
+    partes = [(a[i:i + fatia], b[i:i + fatia]) for i in range(0, len(a), fatia)]
+    for parcial in pool.map(_soma_fatia, partes):
+        resultado.extend(parcial)
+    return resultado
+
+
+def _cronometra(funcao, *args):
+    inicio = time.perf_counter()
+    funcao(*args)
+    return time.perf_counter() - inicio
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    tamanho = int(float(argv[0])) if argv else 10**7
+    trabalhadores = int(argv[1]) if len(argv) > 1 else (os.cpu_count() or 1)
+    fatia = -(-tamanho // (trabalhadores * 4))
+    aleatorio = random.Random(3)
+    lista_a = [aleatorio.uniform(1, 1000) for _ in range(tamanho)]
+    lista_b = [aleatorio.uniform(1, 1000) for _ in range(tamanho)]
+    array_a, array_b = array('d', lista_a), array('d', lista_b)
+
+    print(f'{tamanho} floats, {trabalhadores} processo(s) ({os.cpu_count()} núcleo(s))')
+    with multiprocessing.Pool(trabalhadores) as pool:
+        pool.map(abs, range(trabalhadores))        # sobe os processos antes de medir
+        soma_map = _cronometra(_pool_map_soma, pool, lista_a, lista_b, fatia)
+        jogo_map = _cronometra(pool.map, pense_num_numero, lista_a, fatia)
+    with PoolCompartilhado(trabalhadores) as compartilhado:
+        compartilhado.soma([1.0], 1.0)
+        soma_lista = _cronometra(compartilhado.soma, lista_a, lista_b)
+        soma_array = _cronometra(compartilhado.soma, array_a, array_b)
+        jogo_lista = _cronometra(compartilhado.pense_num_numero, lista_a)
+        jogo_array = _cronometra(compartilhado.pense_num_numero, array_a)
+
+    for nome, referencia, de_lista, de_array in (
+            ('soma', soma_map, soma_lista, soma_array),
+            ('pense_num_numero', jogo_map, jogo_lista, jogo_array)):
+        print(f'  {nome:<17} Pool.map {referencia:7.3f}s   compartilhado: lista'
+              f' {de_lista:7.3f}s (x{referencia / de_lista:4.1f})  array'
+              f' {de_array:7.3f}s (x{referencia / de_array:4.1f})')
+
+
+if __name__ == '__main__':
+    main()
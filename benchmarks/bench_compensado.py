@@ -0,0 +1,110 @@
+"""
+Benchmark de precisão e velocidade do modo compensado (double-double).
+
+Compara, em uma soma longa com cancelamento e em uma cadeia mista das quatro
+operações, a Calculadora com float, ``math.fsum`` (só na soma), a
+CalculadoraCompensada e a Calculadora com Decimal. O erro relativo é medido
+contra o resultado exato em Fraction.
+
+Uso:
+    python -m benchmarks.bench_compensado [tamanho]
+"""
+
+import math
+import random
+import sys
+import time
+from decimal import Decimal
+from fractions import Fraction
+
+from libs.calculadora import Calculadora
+from libs.compensado import CalculadoraCompensada
+
+
+def _valores(tamanho, semente=42):
+    # Magnitudes variadas com sinais trocados: a soma cancela bastante
+    aleatorio = random.Random(semente)
+    return [aleatorio.uniform(-1, 1) * 10.0 ** aleatorio.randint(-8, 8) for _ in range(tamanho)]
+
+
+def _soma(calc, valores, converte):
+    total = converte(0)
+    for valor in valores:
+        total = calc.soma(total, converte(valor))
+    return total
+
+
+def _cadeia(calc, valores, converte):
+    # soma, multiplica, subtrai e divide em rodízio, com fatores perto de 1
+    x = converte(1)
+    for i, valor in enumerate(valores):
+        v = converte(valor)
+        fator = converte(1 + valor * 1e-9)
+        resto = i % 4
+        if resto == 0:
+            x = calc.soma(x, v)
+        elif resto == 1:
+            x = calc.multiplicacao(x, fator)
+        elif resto == 2:
+            x = calc.subtracao(x, v)
+        else:
+            x = calc.divisao(x, fator)
+    return x
+
+
+def _exato(funcao, valores):
+    # Calculadora sobre Fraction: referência sem nenhum arredondamento
+    return funcao(Calculadora, valores, Fraction)
+
+
+def _erro_relativo(resultado, exato):
+    if isinstance(resultado, Decimal):
+        resultado = Fraction(resultado)
+    elif hasattr(resultado, 'para_fracao'):
+        resultado = resultado.para_fracao()
+    else:
+        resultado = Fraction(resultado)
+    return float(abs((resultado - exato) / exato)) if exato else float(abs(resultado))
+
+
+def _mede(funcao, *args):
+    inicio = time.perf_counter()
+    resultado = funcao(*args)
+    return time.perf_counter() - inicio, resultado
+
+
+def _imprime(titulo, linhas):
+    print(titulo)
+    base = linhas[0][1]
+    for nome, segundos, erro in linhas:
+        print(f'  {nome:<24} {segundos:8.3f}s  x{segundos / base:6.1f}  erro relativo {erro:.2e}')
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    tamanho = int(argv[0]) if argv else 100_000
+    valores = _valores(tamanho)
+
+    exato = _exato(_soma, valores)
+    linhas = []
+    for nome, calc, converte in (('float', Calculadora, float),
+                                 ('compensado', CalculadoraCompensada, float),
+                                 ('Decimal (28 dígitos)', Calculadora, Decimal)):
+        segundos, resultado = _mede(_soma, calc, valores, converte)
+        linhas.append((nome, segundos, _erro_relativo(resultado, exato)))
+    segundos, resultado = _mede(math.fsum, valores)
+    linhas.insert(1, ('math.fsum', segundos, _erro_relativo(resultado, exato)))
+    _imprime(f'soma de {tamanho} floats', linhas)
+
+    exato = _exato(_cadeia, valores)
+    linhas = []
+    for nome, calc, converte in (('float', Calculadora, float),
+                                 ('compensado', CalculadoraCompensada, float),
+                                 ('Decimal (28 dígitos)', Calculadora, Decimal)):
+        segundos, resultado = _mede(_cadeia, calc, valores, converte)
+        linhas.append((nome, segundos, _erro_relativo(resultado, exato)))
+    _imprime(f'cadeia mista de {tamanho} operações', linhas)
+
+
+if __name__ == '__main__':
+    main()
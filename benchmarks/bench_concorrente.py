@@ -0,0 +1,64 @@
+"""
+Benchmark de escalabilidade do ExecutorConcorrente no modo threads.
+
+Mede 1, 2, 4 e N threads sobre o jogo (forma fechada, N floats), sobre a
+soma em lote e sobre o jogo passo a passo com ``CalculadoraRacional`` (uma
+instância por thread; trabalho Python puro por elemento). Em um
+interpretador com threads livres (``python3.13t``) o speedup deve crescer
+com o número de threads até o número de núcleos; com o GIL fica perto de 1,
+e a última linha mostra o modo processos, que é o padrão nesses builds.
+
+Uso:
+    python -m benchmarks.bench_concorrente [tamanho]
+"""
+
+import os
+import random
+import sys
+import time
+from array import array
+
+from libs.concorrente import PROCESSOS, THREADS, ExecutorConcorrente, gil_ativo
+from libs.racional import CalculadoraRacional
+
+
+def _cronometra(executor, operacao, *args):
+    inicio = time.perf_counter()
+    executor.executar(operacao, *args)
+    return time.perf_counter() - inicio
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    tamanho = int(float(argv[0])) if argv else 10**6
+    nucleos = os.cpu_count() or 1
+    contagens = sorted({1, 2, 4, nucleos})
+    aleatorio = random.Random(17)
+    valores = array('d', (aleatorio.uniform(0, 1000) for _ in range(tamanho)))
+    racionais = array('d', valores[:tamanho // 20])
+
+    print(f'Python {sys.version.split()[0]}, GIL {"ativo" if gil_ativo() else "desativado"},'
+          f' {nucleos} núcleo(s)')
+    casos = [
+        ('pense_num_numero', None, ('pense_num_numero', valores)),
+        ('soma_lote', None, ('soma', valores, valores)),
+        ('jogo racional', CalculadoraRacional, ('pense_num_numero', racionais)),
+    ]
+    for nome, fabrica, args in casos:
+        base = None
+        for threads in contagens:
+            with ExecutorConcorrente(threads, modo=THREADS, calculadora=fabrica) as executor:
+                executor.executar(args[0], *(arg[:10] for arg in args[1:]))   # aquece
+                segundos = _cronometra(executor, *args)
+            base = base or segundos
+            print(f'  {nome:<17} {len(args[1]):>9} elementos {threads:>3} threads'
+                  f' {segundos:8.3f}s  speedup x{base / segundos:5.2f}')
+    with ExecutorConcorrente(nucleos, modo=PROCESSOS) as executor:
+        executor.executar('soma', valores[:10], 1.0)
+        segundos = _cronometra(executor, 'pense_num_numero', valores)
+    print(f'  {"pense_num_numero":<17} {tamanho:>9} elementos {nucleos:>3} processos'
+          f' {segundos:8.3f}s')
+
+
+if __name__ == '__main__':
+    main()
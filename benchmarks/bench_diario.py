@@ -0,0 +1,95 @@
+"""
+Benchmark do custo do diário de auditoria.
+
+Roda a mesma carga (``pense_num_numero`` e ``Calculadora.soma`` sobre N
+floats) sem registro, com um registro JSON por linha (uma escrita por
+chamada, como um wrapper de logging simples) e com o ``Diario`` binário, e
+depois mede a releitura (``reproduzir``) e a reverificação do diário.
+
+Uso:
+    python -m benchmarks.bench_diario [tamanho]
+"""
+
+import json
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from libs.calculadora import Calculadora
+from libs.diario import Diario, reproduzir, reverificar
+from libs.jogo import pense_num_numero
+
+
+def _carga(valores):
+    inicio = time.perf_counter()
+    for valor in valores:
+        pense_num_numero(valor)
+    meio = time.perf_counter()
+    soma = Calculadora.soma
+    for valor in valores:
+        soma(valor, 1.5)
+    return meio - inicio, time.perf_counter() - meio
+
+
+def _com_json(valores, caminho):
+    # O wrapper de referência: json.dumps e write a cada chamada
+    original = Calculadora.__dict__['soma']
+    with open(caminho, 'w') as arquivo:
+        escreve = arquivo.write
+
+        def soma(a, b):
+            resultado = original.__func__(a, b)
+            escreve(json.dumps({'operacao': 'soma', 'a': a, 'b': b,
+                                'resultado': resultado, 't': time.time_ns()}) + '\n')
+            return resultado
+        Calculadora.soma = staticmethod(soma)
+        try:
+            inicio = time.perf_counter()
+            for valor in valores:
+                Calculadora.soma(valor, 1.5)
+            return time.perf_counter() - inicio
+        finally:
+            Calculadora.soma = original
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    tamanho = int(float(argv[0])) if argv else 10**6
+    aleatorio = random.Random(11)
+    valores = [aleatorio.uniform(0, 1000) for _ in range(tamanho)]
+    diretorio = tempfile.mkdtemp(prefix='bench_diario_')
+    try:
+        jogo_sem, soma_sem = _carga(valores)
+        soma_json = _com_json(valores, f'{diretorio}/log.jsonl')
+        with Diario(f'{diretorio}/diario') as diario:
+            diario.ativar()
+            jogo_com, soma_com = _carga(valores)
+            inicio = time.perf_counter()
+        fechamento = time.perf_counter() - inicio
+
+        print(f'{tamanho} chamadas de cada')
+        print(f'  {"pense_num_numero":<22} sem diário {jogo_sem:7.3f}s  diário {jogo_com:7.3f}s'
+              f'  (x{jogo_com / jogo_sem:4.2f})')
+        print(f'  {"Calculadora.soma":<22} sem diário {soma_sem:7.3f}s  diário {soma_com:7.3f}s'
+              f'  (x{soma_com / soma_sem:4.2f})  JSON por linha {soma_json:7.3f}s'
+              f'  (x{soma_json / soma_sem:4.1f})')
+        print(f'  fechamento (último bloco + fsync) {fechamento:.3f}s;'
+              f' {diario.sincronizacoes} fsyncs')
+
+        inicio = time.perf_counter()
+        lidos = sum(1 for _ in reproduzir(f'{diretorio}/diario'))
+        segundos = time.perf_counter() - inicio
+        print(f'  reproduzir: {lidos} registros em {segundos:.3f}s ({lidos / segundos:,.0f}/s)')
+        inicio = time.perf_counter()
+        relatorio = reverificar(f'{diretorio}/diario')
+        segundos = time.perf_counter() - inicio
+        print(f'  reverificar: {relatorio["registros"]} registros em {segundos:.3f}s,'
+              f' {relatorio["divergencias"]} divergências')
+    finally:
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark das janelas deslizantes: atualizações por segundo.
+
+Compara a janela incremental (simples, compensada e com produto) com o
+recálculo da soma da janela inteira a cada evento.
+
+Uso:
+    python -m benchmarks.bench_janela [eventos] [tamanho_janela]
+"""
+
+import random
+import sys
+import time
+from collections import deque
+from functools import reduce
+
+from libs.calculadora import Calculadora
+from libs.janela import JanelaContagem, JanelaTempo
+
+
+def _recalculando(valores, tamanho):
+    janela = deque(maxlen=tamanho)
+    soma = 0
+    for valor in valores:
+        janela.append(valor)
+        soma = reduce(Calculadora.soma, janela)
+    return soma
+
+
+def _por_evento(janela, valores):
+    adicionar = janela.adicionar
+    for valor in valores:
+        adicionar(valor)
+
+
+def _tempo(valores):
+    janela = JanelaTempo(1.0)
+    adicionar = janela.adicionar
+    for i, valor in enumerate(valores):
+        adicionar(valor, i * 1e-4)
+
+
+def _taxa(funcao, *args, eventos):
+    inicio = time.perf_counter()
+    funcao(*args)
+    return eventos / (time.perf_counter() - inicio)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    eventos = int(float(argv[0])) if argv else 10**6
+    tamanho = int(argv[1]) if len(argv) > 1 else 1000
+    aleatorio = random.Random(3)
+    valores = [aleatorio.uniform(-1, 1) * 10.0 ** aleatorio.randint(-3, 6) for _ in range(eventos)]
+
+    casos = [
+        ('estender (simples)', lambda: JanelaContagem(tamanho).estender(valores)),
+        ('estender (compensada)',
+         lambda: JanelaContagem(tamanho, compensada=True).estender(valores)),
+        ('adicionar (simples)', lambda: _por_evento(JanelaContagem(tamanho), valores)),
+        ('adicionar (compensada)',
+         lambda: _por_evento(JanelaContagem(tamanho, compensada=True), valores)),
+        ('adicionar (com produto)',
+         lambda: _por_evento(JanelaContagem(tamanho, com_produto=True), valores)),
+        ('JanelaTempo.adicionar', lambda: _tempo(valores)),
+    ]
+    print(f'{eventos} eventos, janela de {tamanho}')
+    for nome, funcao in casos:
+        print(f'  {nome:<26} {_taxa(funcao, eventos=eventos):>14,.0f} atualizações/s')
+    amostra = valores[:max(1, eventos // 100)]
+    taxa = _taxa(_recalculando, amostra, tamanho, eventos=len(amostra))
+    print(f'  {"recalculando a soma":<26} {taxa:>14,.0f} atualizações/s')
+
+
+if __name__ == '__main__':
+    main()
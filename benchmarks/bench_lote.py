@@ -0,0 +1,60 @@
+"""
+Benchmark das operações em lote da Calculadora contra o laço escalar.
+
+Uso:
+    python -m benchmarks.bench_lote [tamanho ...]
+"""
+
+import sys
+import time
+from array import array
+
+from libs.calculadora import Calculadora
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+TAMANHOS_PADRAO = (10**3, 10**6, 10**7)
+
+
+def _cronometra(funcao, *args):
+    inicio = time.perf_counter()
+    funcao(*args)
+    return time.perf_counter() - inicio
+
+
+def _laco_escalar(a, b):
+    c = Calculadora()
+    return [c.soma(x, y) for x, y in zip(a, b)]
+
+
+def executa(tamanho):
+    a = [float(i) for i in range(tamanho)]
+    b = [float(i % 97 + 1) for i in range(tamanho)]
+    casos = [
+        ('laço escalar', _laco_escalar, a, b),
+        ('soma_lote (list)', Calculadora.soma_lote, a, b),
+        ('soma_lote (array)', Calculadora.soma_lote, array('d', a), array('d', b)),
+    ]
+    if np is not None:
+        casos.append(('soma_lote (numpy)', Calculadora.soma_lote, np.array(a), np.array(b)))
+
+    base = None
+    for nome, funcao, x, y in casos:
+        segundos = _cronometra(funcao, x, y)
+        base = base or segundos
+        print(f'{tamanho:>10} {nome:<20} {segundos:10.4f}s '
+              f'{tamanho / segundos / 1e6:8.2f} Mop/s  x{base / segundos:6.1f}')
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    tamanhos = [int(float(t)) for t in argv] or TAMANHOS_PADRAO
+    for tamanho in tamanhos:
+        executa(tamanho)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark de aplicar_arquivo contra a abordagem de carregar listas.
+
+Compara tempo e pico de memória Python (tracemalloc) para somar duas colunas
+float64 em disco.
+
+Uso:
+    python -m benchmarks.bench_mapeado [elementos]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from array import array
+
+from libs.calculadora import Calculadora
+from libs.mapeado import aplicar_arquivo
+
+
+def _com_listas(a, b, saida):
+    c = Calculadora()
+    with open(a, 'rb') as arquivo:
+        valores_a = _le_lista(arquivo)
+    with open(b, 'rb') as arquivo:
+        valores_b = _le_lista(arquivo)
+    resultado = [c.soma(x, y) for x, y in zip(valores_a, valores_b)]
+    with open(saida, 'wb') as arquivo:
+        array('d', resultado).tofile(arquivo)
+
+
+def _le_lista(arquivo):
+    valores = array('d')
+    valores.frombytes(arquivo.read())
+    return valores.tolist()
+
+
+def _mede(funcao, *args):
+    # Tempo e memória em execuções separadas: tracemalloc distorce o tempo
+    inicio = time.perf_counter()
+    funcao(*args)
+    segundos = time.perf_counter() - inicio
+    tracemalloc.start()
+    funcao(*args)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return segundos, pico
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    elementos = int(float(argv[0])) if argv else 10**7
+    with tempfile.TemporaryDirectory() as diretorio:
+        a = os.path.join(diretorio, 'a.f64')
+        b = os.path.join(diretorio, 'b.f64')
+        saida = os.path.join(diretorio, 'saida.f64')
+        bloco = array('d', range(1 << 16))
+        for caminho in (a, b):
+            with open(caminho, 'wb') as arquivo:
+                for _ in range(elementos // len(bloco)):
+                    bloco.tofile(arquivo)
+        casos = [
+            ('listas', _com_listas, a, b, saida),
+            ('mmap em janelas', lambda: aplicar_arquivo('soma', a, saida, operando=b)),
+        ]
+        dados = os.path.getsize(a) * 2
+        print(f'dados de entrada: {dados / 2**20:.1f} MiB')
+        for nome, funcao, *args in casos:
+            segundos, pico = _mede(funcao, *args)
+            print(f'{nome:<18} {segundos:8.3f}s  pico Python {pico / 2**20:9.1f} MiB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark de escalabilidade de pense_num_numero_paralelo.
+
+Mede 1, 2, 4 e N processos sobre uma lista (custo de pickling proporcional
+ao tamanho) e sobre um range (custo de envio constante).
+
+Uso:
+    python -m benchmarks.bench_paralelo [tamanho]
+"""
+
+import os
+import sys
+import time
+from decimal import Decimal
+
+from libs.jogo import pense_num_numero
+from libs.paralelo import pense_num_numero_paralelo
+
+
+def _cronometra(entradas, trabalhadores):
+    inicio = time.perf_counter()
+    pense_num_numero_paralelo(entradas, trabalhadores=trabalhadores)
+    return time.perf_counter() - inicio
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    tamanho = int(float(argv[0])) if argv else 10**6
+    nucleos = os.cpu_count() or 1
+    contagens = sorted({1, 2, 4, nucleos})
+
+    casos = [
+        ('range', range(tamanho)),
+        ('lista', list(range(tamanho))),
+        # Decimal não tem forma fechada: mostra o ganho com trabalho real por elemento
+        ('lista Decimal', [Decimal(i) for i in range(tamanho // 10)]),
+    ]
+    for nome, entradas in casos:
+        base = None
+        for trabalhadores in contagens:
+            segundos = _cronometra(entradas, trabalhadores)
+            base = base or segundos
+            print(f'{nome:<14} {len(entradas):>10} elementos {trabalhadores:>3} proc '
+                  f'{segundos:8.3f}s  speedup x{base / segundos:5.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark de Racional (redução preguiçosa) contra fractions.Fraction.
+
+Executa cadeias longas de operações mistas com os dois tipos e com a cadeia
+do jogo sobre CalculadoraRacional.
+
+Uso:
+    python -m benchmarks.bench_racional [passos]
+"""
+
+import sys
+import time
+from fractions import Fraction
+
+from libs.jogo import pense_num_numero
+from libs.racional import Racional, CalculadoraRacional
+
+
+def _cadeia(tipo, passos):
+    x = tipo(1, 3)
+    for i in range(1, passos + 1):
+        x = x * tipo(i + 1, i) + tipo(1, i + 2)
+        x = x / tipo(i + 3, i + 1) - tipo(1, 7)
+    return x
+
+
+def _cadeia_inteira(tipo, passos):
+    # Operandos inteiros, como no jogo: Fraction paga um mdc por operação
+    x = tipo(1, 3)
+    for i in range(1, passos + 1):
+        x = (x + 5) * 2
+        x = (x - 4) / 2 - i
+    return x
+
+
+def _cronometra(funcao, *args):
+    inicio = time.perf_counter()
+    resultado = funcao(*args)
+    return time.perf_counter() - inicio, resultado
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    passos = int(argv[0]) if argv else 2000
+
+    t_fraction, r_fraction = _cronometra(_cadeia, Fraction, passos)
+    t_racional, r_racional = _cronometra(_cadeia, Racional, passos)
+    assert r_racional.para_fracao() == r_fraction
+    print(f'cadeia de {4 * passos} operações com frações variadas')
+    print(f'  Fraction {t_fraction:8.3f}s')
+    print(f'  Racional {t_racional:8.3f}s  x{t_fraction / t_racional:5.2f}')
+
+    t_fraction, r_fraction = _cronometra(_cadeia_inteira, Fraction, passos)
+    t_racional, r_racional = _cronometra(_cadeia_inteira, Racional, passos)
+    assert r_racional.para_fracao() == r_fraction
+    print(f'cadeia de {6 * passos} operações com operandos inteiros')
+    print(f'  Fraction {t_fraction:8.3f}s')
+    print(f'  Racional {t_racional:8.3f}s  x{t_fraction / t_racional:5.2f}')
+
+    calc = CalculadoraRacional()
+    entradas = [i / 7 for i in range(20000)]
+    t_jogo, _ = _cronometra(lambda: [pense_num_numero(x, calculadora=calc) for x in entradas])
+    t_frac, _ = _cronometra(lambda: [pense_num_numero(Fraction(x)) for x in entradas])
+    print(f'jogo com {len(entradas)} floats')
+    print(f'  CalculadoraRacional {t_jogo:8.3f}s')
+    print(f'  Fraction (forma fechada) {t_frac:8.3f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark das reduções: somatório de floats e produtório de inteiros grandes.
+
+Compara ``functools.reduce`` sobre a Calculadora (da esquerda para a
+direita) com ``Calculadora.somatorio`` e ``Calculadora.produtorio``, em um
+processo e em vários. O erro do somatório é medido contra ``math.fsum``
+(corretamente arredondado).
+
+Uso:
+    python -m benchmarks.bench_reducao [floats] [inteiros]
+"""
+
+import functools
+import math
+import os
+import random
+import sys
+import time
+
+from libs.calculadora import Calculadora
+
+
+def _mede(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return time.perf_counter() - inicio, resultado
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n_floats = int(float(argv[0])) if argv else 10**7
+    n_inteiros = int(float(argv[1])) if len(argv) > 1 else 10**5
+    processos = os.cpu_count() or 1
+    aleatorio = random.Random(7)
+
+    valores = [aleatorio.uniform(-1, 1) * 10.0 ** aleatorio.randint(-6, 6)
+               for _ in range(n_floats)]
+    referencia = math.fsum(valores)
+    print(f'somatório de {n_floats} floats')
+    casos = [
+        ('reduce(soma)', lambda: functools.reduce(Calculadora.soma, valores)),
+        ('pareada', lambda: Calculadora.somatorio(valores)),
+        ('kahan', lambda: Calculadora.somatorio(valores, 'kahan')),
+        (f'pareada {processos} proc',
+         lambda: Calculadora.somatorio(valores, processos=processos)),
+        (f'kahan {processos} proc',
+         lambda: Calculadora.somatorio(valores, 'kahan', processos=processos)),
+    ]
+    for nome, funcao in casos:
+        segundos, resultado = _mede(funcao)
+        erro = abs(resultado - referencia) / abs(referencia)
+        print(f'  {nome:<20} {segundos:8.3f}s  erro relativo {erro:.2e}')
+
+    inteiros = [aleatorio.getrandbits(64) | 1 for _ in range(n_inteiros)]
+    print(f'produtório de {n_inteiros} inteiros de 64 bits')
+    casos = [
+        ('reduce(multiplicacao)', lambda: functools.reduce(Calculadora.multiplicacao, inteiros)),
+        ('árvore', lambda: Calculadora.produtorio(inteiros)),
+        (f'árvore {processos} proc',
+         lambda: Calculadora.produtorio(inteiros, processos=processos,
+                                        tamanho_bloco=-(-n_inteiros // (4 * processos)))),
+    ]
+    esperado = None
+    for nome, funcao in casos:
+        segundos, resultado = _mede(funcao)
+        esperado = resultado if esperado is None else esperado
+        assert resultado == esperado
+        print(f'  {nome:<20} {segundos:8.3f}s  {resultado.bit_length()} bits')
+
+
+if __name__ == '__main__':
+    main()
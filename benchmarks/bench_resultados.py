@@ -0,0 +1,101 @@
+"""
+Benchmark de memória dos contêineres compactos de resultados.
+
+Guarda os resultados de ``pense_num_numero`` (e, no segundo caso, também
+``passo_0`` a ``passo_4``) de N entradas float de três formas e mede com
+tracemalloc o que fica alocado:
+
+- lista de tuplas ``(entrada, resultado)`` / lista de dicts (o usual);
+- ``Tabela`` de ``libs.resultados`` (colunas array.array), montada por
+  ``pense_num_numero_lote``.
+
+Uso:
+    python -m benchmarks.bench_resultados [tamanho]
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+
+from libs.calculadora import Calculadora
+from libs.jogo import _passos_pense_num_numero, pense_num_numero, pense_num_numero_lote
+
+
+class _Passos:
+    """Calculadora que guarda cada etapa, para o formato de dicts."""
+
+    def __init__(self):
+        self.passos = []
+
+    def _grava(self, valor):
+        self.passos.append(valor)
+        return valor
+
+    def soma(self, a, b):
+        return self._grava(Calculadora.soma(a, b))
+
+    def subtracao(self, a, b):
+        return self._grava(Calculadora.subtracao(a, b))
+
+    def multiplicacao(self, a, b):
+        return self._grava(Calculadora.multiplicacao(a, b))
+
+    def divisao(self, a, b):
+        return self._grava(Calculadora.divisao(a, b))
+
+
+def _dicts(valores):
+    registros = []
+    for valor in valores:
+        gravador = _Passos()
+        _passos_pense_num_numero(valor, gravador)
+        registro = {f'passo_{i}': passo for i, passo in enumerate(gravador.passos)}
+        registro['entrada'] = valor
+        registro['resultado'] = pense_num_numero(valor)
+        registros.append(registro)
+    return registros
+
+
+def _retido(funcao):
+    """(bytes ainda alocados pelo resultado, pico durante a construção, segundos)."""
+    tracemalloc.start()
+    try:
+        inicio = time.perf_counter()
+        resultado = funcao()
+        segundos = time.perf_counter() - inicio
+        atual, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del resultado
+    return atual, pico, segundos
+
+
+def _imprime(titulo, casos, tamanho):
+    print(titulo)
+    base = None
+    for nome, funcao in casos:
+        atual, pico, segundos = _retido(funcao)
+        base = base or atual
+        print(f'  {nome:<28} {atual / 2**20:8.1f} MiB retidos  ({atual / tamanho:6.1f} B/registro, '
+              f'x{base / atual:5.1f})  pico {pico / 2**20:8.1f} MiB  {segundos:6.2f}s')
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    tamanho = int(float(argv[0])) if argv else 10**6
+    aleatorio = random.Random(5)
+    valores = [aleatorio.uniform(0, 1000) for _ in range(tamanho)]
+
+    _imprime(f'resultados de {tamanho} entradas', (
+        ('lista de (entrada, resultado)', lambda: [(v, pense_num_numero(v)) for v in valores]),
+        ('Tabela (entrada, resultado)', lambda: pense_num_numero_lote(valores)),
+    ), tamanho)
+    _imprime(f'resultados com passo_0..passo_4 de {tamanho} entradas', (
+        ('lista de dicts', lambda: _dicts(valores)),
+        ('Tabela com_passos=True', lambda: pense_num_numero_lote(valores, com_passos=True)),
+    ), tamanho)
+
+
+if __name__ == '__main__':
+    main()
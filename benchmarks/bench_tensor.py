@@ -0,0 +1,86 @@
+"""
+Benchmark do Tensor (array.array, sem NumPy) contra listas aninhadas e NumPy.
+
+Para uma matriz N x N mede: soma de duas matrizes contíguas, soma com um
+vetor linha (broadcasting), soma com uma view transposta e a cadeia de
+pense_num_numero2 aplicada à matriz inteira. NumPy entra na comparação só
+se estiver instalado.
+
+Uso:
+    python -m benchmarks.bench_tensor [n]
+"""
+
+import random
+import sys
+import time
+
+from libs.calculadora import Calculadora
+from libs.jogo import pense_num_numero2
+from libs.tensor import Tensor
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _mede(funcao):
+    inicio = time.perf_counter()
+    funcao()
+    return time.perf_counter() - inicio
+
+
+def _listas_soma(a, b):
+    return [[Calculadora.soma(x, y) for x, y in zip(linha_a, linha_b)]
+            for linha_a, linha_b in zip(a, b)]
+
+
+def _listas_soma_linha(a, v):
+    return [[Calculadora.soma(x, y) for x, y in zip(linha, v)] for linha in a]
+
+
+def _listas_soma_transposta(a, b):
+    n = len(a)
+    return [[Calculadora.soma(a[i][j], b[j][i]) for j in range(n)] for i in range(n)]
+
+
+def _listas_jogo(a):
+    return [[pense_num_numero2(x) for x in linha] for linha in a]
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n = int(argv[0]) if argv else 1000
+    aleatorio = random.Random(11)
+    a = [[aleatorio.random() for _ in range(n)] for _ in range(n)]
+    b = [[aleatorio.random() for _ in range(n)] for _ in range(n)]
+    v = [aleatorio.random() for _ in range(n)]
+    ta, tb, tv = Tensor(a), Tensor(b), Tensor(v)
+
+    casos = {
+        'soma contígua': (lambda: _listas_soma(a, b), lambda: ta + tb),
+        'soma com linha': (lambda: _listas_soma_linha(a, v), lambda: ta + tv),
+        'soma com transposta': (lambda: _listas_soma_transposta(a, b), lambda: ta + tb.T),
+        'pense_num_numero2': (lambda: _listas_jogo(a), lambda: ta.mapear(pense_num_numero2)),
+    }
+    if np is not None:
+        na, nb, nv = np.array(a), np.array(b), np.array(v)
+        numpy = {
+            'soma contígua': lambda: na + nb,
+            'soma com linha': lambda: na + nv,
+            'soma com transposta': lambda: na + nb.T,
+            'pense_num_numero2': lambda: pense_num_numero2(na),
+        }
+    print(f'matriz {n} x {n}')
+    for nome, (listas, tensor) in casos.items():
+        t_listas = _mede(listas)
+        t_tensor = _mede(tensor)
+        linha = (f'  {nome:<22} listas {t_listas:7.3f}s  Tensor {t_tensor:7.3f}s '
+                 f'(x{t_listas / t_tensor:5.1f})')
+        if np is not None:
+            linha += f'  NumPy {_mede(numpy[nome]):7.4f}s'
+        print(linha)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Teste de carga local do servidor da Calculadora.
+
+Sobe um servidor no próprio processo (ou usa --porta de um servidor já em
+execução) e mede requisições por segundo e latências p50/p99 em diferentes
+níveis de concorrência.
+
+Uso:
+    python -m benchmarks.carga_servico [--requisicoes N] [--concorrencia 1 8 64]
+"""
+
+import argparse
+import asyncio
+import time
+
+from libs.servico import Servidor, Cliente
+
+
+def _percentil(ordenadas, fracao):
+    return ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * fracao))]
+
+
+async def _mede(cliente, requisicoes, concorrencia):
+    latencias = []
+    por_tarefa = requisicoes // concorrencia
+
+    async def tarefa():
+        for i in range(por_tarefa):
+            inicio = time.perf_counter()
+            await cliente.soma(i, 1)
+            latencias.append(time.perf_counter() - inicio)
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(tarefa() for _ in range(concorrencia)))
+    total = time.perf_counter() - inicio
+    latencias.sort()
+    return len(latencias) / total, _percentil(latencias, 0.50), _percentil(latencias, 0.99)
+
+
+async def _mede_pipeline(cliente, requisicoes, lote):
+    inicio = time.perf_counter()
+    for base in range(0, requisicoes, lote):
+        await cliente.executar_varios([('soma', i, 1) for i in range(base, base + lote)])
+    return requisicoes / (time.perf_counter() - inicio)
+
+
+async def _executa(args):
+    servidor = None
+    porta = args.porta
+    if porta is None:
+        servidor = await Servidor().iniciar()
+        porta = servidor.porta
+    try:
+        async with Cliente(porta=porta, conexoes=args.conexoes) as cliente:
+            print(f'{"concorrência":>12} {"req/s":>10} {"p50 (ms)":>10} {"p99 (ms)":>10}')
+            for concorrencia in args.concorrencia:
+                rps, p50, p99 = await _mede(cliente, args.requisicoes, concorrencia)
+                print(f'{concorrencia:>12} {rps:>10.0f} {p50 * 1e3:>10.3f} {p99 * 1e3:>10.3f}')
+            rps = await _mede_pipeline(cliente, args.requisicoes, 1000)
+            print(f'{"pipeline 1000":>12} {rps:>10.0f}')
+    finally:
+        if servidor is not None:
+            await servidor.fechar()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--porta', type=int, default=None)
+    parser.add_argument('--conexoes', type=int, default=4)
+    parser.add_argument('--requisicoes', type=int, default=20000)
+    parser.add_argument('--concorrencia', type=int, nargs='+', default=[1, 8, 64, 256])
+    asyncio.run(_executa(parser.parse_args(argv)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+"""
+Suíte de benchmarks com baselines persistidas e gate de regressão.
+
+Mede cada operação da Calculadora e as duas implementações do jogo para
+operandos int, float, inteiro grande e Decimal. O número de repetições é
+calibrado automaticamente (dobra até passar de ``tempo_minimo``) e o melhor
+de ``rodadas`` medições é guardado como operações por segundo.
+
+As baselines ficam em um JSON indexado pela máquina
+(``{maquina: {caso: ops_por_segundo}}``). Uma execução falha quando algum
+caso fica mais de ``limite`` abaixo da baseline da mesma máquina.
+
+Uso:
+    python -m benchmarks.suite [--baseline ARQ] [--salvar] [--limite 0.2] [--filtro TEXTO]
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from decimal import Decimal
+
+from libs.calculadora import Calculadora
+from libs.jogo import pense_num_numero, pense_num_numero2
+
+BASELINE_PADRAO = os.path.join(os.path.dirname(__file__), 'baselines.json')
+LIMITE_PADRAO = 0.2
+
+# Operandos por tipo: (a, b) para a Calculadora, num para o jogo
+OPERANDOS = {
+    'int': (123456, 789),
+    'float': (1234.5678, 0.789),
+    # Quociente cabe em um float: divisao não estoura
+    'int_grande': (7**2000, 7**1990 + 1),
+    'decimal': (Decimal('1234.5678'), Decimal('0.789')),
+}
+
+OPERACOES = ('soma', 'subtracao', 'multiplicacao', 'divisao')
+JOGOS = {'pense_num_numero': pense_num_numero, 'pense_num_numero2': pense_num_numero2}
+
+
+def chave_maquina():
+    """Identifica a máquina e o interpretador em que a medição foi feita."""
+    return '/'.join((platform.node() or 'desconhecida', platform.machine(),
+                     platform.python_implementation(), platform.python_version()))
+
+
+def casos():
+    """Retorna ``{nome: (funcao, args)}`` de todos os casos da suíte."""
+    resultado = {}
+    for tipo, (a, b) in OPERANDOS.items():
+        for nome in OPERACOES:
+            resultado[f'{nome}[{tipo}]'] = (getattr(Calculadora, nome), (a, b))
+        for nome, funcao in JOGOS.items():
+            resultado[f'{nome}[{tipo}]'] = (funcao, (a,))
+    return resultado
+
+
+def medir(funcao, args=(), tempo_minimo=0.05, rodadas=5, relogio=time.perf_counter):
+    """Retorna as operações por segundo de ``funcao(*args)``.
+
+    Calibra as repetições até uma rodada durar ao menos ``tempo_minimo`` e
+    usa a melhor de ``rodadas`` (a menos perturbada pelo sistema).
+    """
+    repeticoes = 1
+    while True:
+        duracao = _cronometra(funcao, args, repeticoes, relogio)
+        if duracao >= tempo_minimo:
+            break
+        if duracao <= 0:
+            repeticoes *= 10
+        else:
+            # Estima as repetições necessárias, com folga, crescendo ao menos 2x
+            repeticoes = max(repeticoes * 2, int(repeticoes * tempo_minimo * 1.2 / duracao))
+    melhor = duracao
+    for _ in range(rodadas - 1):
+        melhor = min(melhor, _cronometra(funcao, args, repeticoes, relogio))
+    return repeticoes / melhor
+
+
+def _cronometra(funcao, args, repeticoes, relogio):
+    laco = range(repeticoes)
+    inicio = relogio()
+    for _ in laco:
+        funcao(*args)
+    return relogio() - inicio
+
+
+def executar(filtro=None, tempo_minimo=0.05, rodadas=5):
+    """Executa a suíte e retorna ``{caso: ops_por_segundo}``."""
+    return {
+        nome: medir(funcao, args, tempo_minimo, rodadas)
+        for nome, (funcao, args) in casos().items()
+        if filtro is None or filtro in nome
+    }
+
+
+def comparar_jogo(resultados):
+    """Compara pense_num_numero e pense_num_numero2 tipo a tipo.
+
+    Retorna ``{tipo: (ops_1, ops_2, vencedor)}`` para os tipos presentes.
+    """
+    comparacao = {}
+    for tipo in OPERANDOS:
+        ops_1 = resultados.get(f'pense_num_numero[{tipo}]')
+        ops_2 = resultados.get(f'pense_num_numero2[{tipo}]')
+        if ops_1 is None or ops_2 is None:
+            continue
+        vencedor = 'pense_num_numero' if ops_1 >= ops_2 else 'pense_num_numero2'
+        comparacao[tipo] = (ops_1, ops_2, vencedor)
+    return comparacao
+
+
+def carregar_baselines(caminho=BASELINE_PADRAO):
+    if not os.path.exists(caminho):
+        return {}
+    with open(caminho, encoding='utf-8') as arquivo:
+        return json.load(arquivo)
+
+
+def salvar_baseline(resultados, caminho=BASELINE_PADRAO, maquina=None):
+    """Grava (ou atualiza) a baseline da máquina no arquivo JSON."""
+    baselines = carregar_baselines(caminho)
+    baselines.setdefault(maquina or chave_maquina(), {}).update(resultados)
+    temporario = caminho + '.tmp'
+    with open(temporario, 'w', encoding='utf-8') as arquivo:
+        json.dump(baselines, arquivo, indent=2, sort_keys=True)
+    os.replace(temporario, caminho)
+
+
+def regressoes(resultados, baseline, limite=LIMITE_PADRAO):
+    """Lista ``(caso, atual, referencia, queda)`` dos casos abaixo do limite."""
+    encontradas = []
+    for nome, atual in sorted(resultados.items()):
+        referencia = baseline.get(nome)
+        if not referencia:
+            continue
+        queda = 1 - atual / referencia
+        if queda > limite:
+            encontradas.append((nome, atual, referencia, queda))
+    return encontradas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks da Calculadora e do jogo.')
+    parser.add_argument('--baseline', default=BASELINE_PADRAO)
+    parser.add_argument('--salvar', action='store_true',
+                        help='grava os resultados como baseline desta máquina')
+    parser.add_argument('--limite', type=float, default=LIMITE_PADRAO,
+                        help='queda máxima tolerada de throughput (fração)')
+    parser.add_argument('--filtro', default=None)
+    parser.add_argument('--tempo-minimo', type=float, default=0.05)
+    args = parser.parse_args(argv)
+
+    maquina = chave_maquina()
+    resultados = executar(args.filtro, args.tempo_minimo)
+    baseline = carregar_baselines(args.baseline).get(maquina, {})
+
+    print(f'máquina: {maquina}')
+    for nome, ops in resultados.items():
+        referencia = baseline.get(nome)
+        delta = f'{(ops / referencia - 1) * 100:+7.1f}%' if referencia else '       -'
+        print(f'{nome:<32} {ops:>14,.0f} ops/s {delta}')
+
+    print('\npense_num_numero x pense_num_numero2')
+    for tipo, (ops_1, ops_2, vencedor) in comparar_jogo(resultados).items():
+        print(f'{tipo:<12} {ops_1:>14,.0f} {ops_2:>14,.0f}  -> {vencedor}')
+
+    if args.salvar:
+        salvar_baseline(resultados, args.baseline, maquina)
+        print(f'\nbaseline salva em {args.baseline}')
+        return 0
+
+    encontradas = regressoes(resultados, baseline, args.limite)
+    for nome, atual, referencia, queda in encontradas:
+        print(f'REGRESSÃO {nome}: {atual:,.0f} ops/s vs {referencia:,.0f} (-{queda:.0%})')
+    return 1 if encontradas else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
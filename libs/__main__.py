@@ -0,0 +1,5 @@
+import sys
+
+from libs.processador import main
+
+sys.exit(main())
@@ -0,0 +1,376 @@
+"""
+Modo adiado da Calculadora: grafo de expressão com CSE e fusão.
+
+Em ``pense_num_numero2`` cada chamada da Calculadora é avaliada na hora e
+aloca um valor intermediário; em lote, ``soma_lote`` e companhia alocam uma
+lista inteira por etapa. Com ``CalculadoraAdiada`` as operações devolvem nós
+de um grafo em vez de valores, e nada é calculado até ``avaliar``:
+
+- CSE: os nós são internados (hash-consing), então a mesma operação sobre os
+  mesmos operandos é sempre o mesmo nó, e é calculada uma única vez;
+- fusão: o grafo vira uma única função Python com os operadores em linha;
+  em lote é um só laço sobre a entrada, sem listas intermediárias;
+- a função gerada é um ``Plano`` de ``libs.expressao`` e segue as mesmas
+  regras de ``Plano.lote`` (broadcasting de escalar, array.array, NumPy).
+
+Exemplo:
+    >>> from libs.jogo import pense_num_numero2
+    >>> grafo = pense_num_numero2(entrada('num'), calculadora=CalculadoraAdiada)
+    >>> grafo.avaliar(10)
+    3.0
+    >>> grafo.avaliar(num=[1, 2, 3])
+    [3.0, 3.0, 3.0]
+"""
+
+import threading
+import weakref
+
+from libs.calculadora import Calculadora, _eh_escalar
+from libs.expressao import Plano, nome_valido
+
+ENTRADA = 'entrada'
+CONSTANTE = 'constante'
+
+_SIMBOLOS = {
+    'soma': '+',
+    'subtracao': '-',
+    'multiplicacao': '*',
+    'divisao': '/',
+}
+
+# Acima desta profundidade de operadores em linha o nó vira uma variável
+# local: o parser do CPython limita o aninhamento de parênteses
+_PROFUNDIDADE_MAXIMA = 32
+
+# Tipos escalares mais comuns, testados antes do isinstance com numbers.Number
+_ESCALARES = frozenset((int, float))
+
+# Nós vivos, indexados pela operação e pela identidade dos operandos. Um nó
+# mantém os operandos vivos, então os ids da chave nunca são reaproveitados
+# enquanto a entrada existir
+_internados = weakref.WeakValueDictionary()
+_lock = threading.Lock()
+
+
+class No:
+    """Nó do grafo: entrada, constante ou operação da Calculadora.
+
+    Não crie diretamente; use ``entrada``, ``constante``, as operações de
+    ``CalculadoraAdiada`` ou os operadores ``+ - * /``.
+    """
+
+    __slots__ = ('tipo', 'valor', 'operandos', '_plano', '__weakref__')
+
+    def __init__(self, tipo, valor=None, operandos=()):
+        self.tipo = tipo
+        self.valor = valor
+        self.operandos = operandos
+        self._plano = None
+
+    # ------------------------------------------------------------------
+    # Construção
+    # ------------------------------------------------------------------
+
+    def __add__(self, outro):
+        return CalculadoraAdiada.soma(self, outro)
+
+    def __radd__(self, outro):
+        return CalculadoraAdiada.soma(outro, self)
+
+    def __sub__(self, outro):
+        return CalculadoraAdiada.subtracao(self, outro)
+
+    def __rsub__(self, outro):
+        return CalculadoraAdiada.subtracao(outro, self)
+
+    def __mul__(self, outro):
+        return CalculadoraAdiada.multiplicacao(self, outro)
+
+    def __rmul__(self, outro):
+        return CalculadoraAdiada.multiplicacao(outro, self)
+
+    def __truediv__(self, outro):
+        return CalculadoraAdiada.divisao(self, outro)
+
+    def __rtruediv__(self, outro):
+        return CalculadoraAdiada.divisao(outro, self)
+
+    def __neg__(self):
+        return CalculadoraAdiada.multiplicacao(-1, self)
+
+    # ------------------------------------------------------------------
+    # Avaliação
+    # ------------------------------------------------------------------
+
+    @property
+    def variaveis(self):
+        """Nomes das entradas, na ordem dos argumentos posicionais de ``avaliar``."""
+        return self.compilar().variaveis
+
+    def compilar(self):
+        """Retorna o ``Plano`` fundido do grafo (gerado uma vez por nó)."""
+        plano = self._plano
+        if plano is None:
+            plano = self._plano = _compilar(self)
+        return plano
+
+    def avaliar(self, *args, **valores):
+        """Calcula o grafo para escalares ou lotes.
+
+        As entradas vêm por posição (na ordem de ``variaveis``) ou por nome.
+        Se todas forem escalares o resultado é escalar; se alguma for
+        sequência, o grafo inteiro é avaliado em um único laço fundido.
+        """
+        plano = self._plano or self.compilar()
+        if valores or len(args) != len(plano.variaveis):
+            args = _argumentos(plano.variaveis, args, valores)
+        for valor in args:
+            if type(valor) not in _ESCALARES and not _eh_escalar(valor):
+                return plano.lote(*args)
+        return plano.funcao(*args)
+
+    def __repr__(self):
+        if self.tipo == ENTRADA:
+            return f'entrada({self.valor!r})'
+        if self.tipo == CONSTANTE:
+            return f'constante({self.valor!r})'
+        return f'No({self.compilar().expressao!r})'
+
+
+def _argumentos(nomes, args, valores):
+    if len(args) > len(nomes):
+        raise TypeError(f'grafo espera {len(nomes)} entrada(s), recebeu {len(args)}')
+    argumentos = list(args)
+    for nome in nomes[len(args):]:
+        try:
+            argumentos.append(valores.pop(nome))
+        except KeyError:
+            raise TypeError(f'entrada {nome!r} não informada') from None
+    if valores:
+        raise TypeError(f'entradas desconhecidas: {", ".join(sorted(valores))}')
+    return argumentos
+
+
+def _interna(chave, tipo, valor=None, operandos=()):
+    with _lock:
+        no = _internados.get(chave)
+        if no is None:
+            no = _internados[chave] = No(tipo, valor, operandos)
+        return no
+
+
+def entrada(nome):
+    """Nó de entrada; ``nome`` é o parâmetro correspondente em ``avaliar``."""
+    if not nome_valido(nome):
+        raise ValueError(f'nome de entrada inválido {nome!r}')
+    return _interna((ENTRADA, nome), ENTRADA, nome)
+
+
+def constante(valor):
+    """Nó constante; valores já iguais e do mesmo tipo viram o mesmo nó."""
+    if isinstance(valor, No):
+        return valor
+    if not _eh_escalar(valor):
+        raise TypeError(f'constante precisa ser um número, não {type(valor).__name__}')
+    # repr distingue 0.0 de -0.0 e Decimal('1') de Decimal('1.0')
+    return _interna((CONSTANTE, type(valor), repr(valor)), CONSTANTE, valor)
+
+
+def _operacao(nome, a, b):
+    a = constante(a)
+    b = constante(b)
+    return _interna((nome, id(a), id(b)), nome, None, (a, b))
+
+
+class CalculadoraAdiada:
+    """Mesma interface da Calculadora, mas as operações montam o grafo.
+
+    Serve de backend para ``pense_num_numero2(num, calculadora=...)`` e para
+    qualquer código que receba uma calculadora; os ``*_lote`` são as mesmas
+    operações, porque o grafo só decide entre escalar e lote em ``avaliar``.
+    """
+
+    @staticmethod
+    def soma(a, b):
+        return _operacao('soma', a, b)
+
+    @staticmethod
+    def subtracao(a, b):
+        return _operacao('subtracao', a, b)
+
+    @staticmethod
+    def multiplicacao(a, b):
+        return _operacao('multiplicacao', a, b)
+
+    @staticmethod
+    def divisao(a, b):
+        return _operacao('divisao', a, b)
+
+    soma_lote = soma
+    subtracao_lote = subtracao
+    multiplicacao_lote = multiplicacao
+    divisao_lote = divisao
+
+
+# ============================================================================
+# FUSÃO
+# ============================================================================
+
+def _ordem(raiz):
+    """Nós alcançáveis a partir de ``raiz`` em pós-ordem, cada um uma vez."""
+    ordem = []
+    vistos = set()
+    pilha = [(raiz, False)]
+    while pilha:
+        no, expandido = pilha.pop()
+        if expandido:
+            ordem.append(no)
+            continue
+        if id(no) in vistos:
+            continue
+        vistos.add(id(no))
+        pilha.append((no, True))
+        for operando in reversed(no.operandos):
+            pilha.append((operando, False))
+    return ordem
+
+
+def _literal(valor):
+    """Texto do valor no código gerado, ou None se precisa ir como global."""
+    if type(valor) is int or (type(valor) is float and valor - valor == 0):
+        texto = repr(valor)
+        return f'({texto})' if texto.startswith('-') else texto
+    return None
+
+
+def gerar_fonte(raiz):
+    """Retorna ``(variaveis, constantes, expressao, fonte)`` do grafo fundido.
+
+    Operações usadas mais de uma vez (e as muito profundas) viram variáveis
+    locais ``_tN``, calculadas uma vez por elemento; as demais ficam em linha
+    na expressão de quem as usa. ``constantes`` mapeia os nomes ``_cN`` das
+    constantes sem literal (Fraction, Decimal, inf) para os valores.
+    """
+    ordem = _ordem(raiz)
+    usos = {}
+    for no in ordem:
+        for operando in no.operandos:
+            usos[id(operando)] = usos.get(id(operando), 0) + 1
+
+    nomes = []
+    constantes = {}
+    texto = {}
+    profundidade = {}
+    locais = []
+    for no in ordem:
+        chave = id(no)
+        if no.tipo == ENTRADA:
+            nomes.append(no.valor)
+            texto[chave] = no.valor
+            profundidade[chave] = 0
+        elif no.tipo == CONSTANTE:
+            literal = _literal(no.valor)
+            if literal is None:
+                literal = f'_c{len(constantes)}'
+                constantes[literal] = no.valor
+            texto[chave] = literal
+            profundidade[chave] = 0
+        else:
+            esquerda, direita = no.operandos
+            texto[chave] = (f'({texto[id(esquerda)]} {_SIMBOLOS[no.tipo]} '
+                            f'{texto[id(direita)]})')
+            profundidade[chave] = 1 + max(profundidade[id(esquerda)],
+                                          profundidade[id(direita)])
+            if no is not raiz and (usos[chave] > 1
+                                   or profundidade[chave] >= _PROFUNDIDADE_MAXIMA):
+                local = f'_t{len(locais)}'
+                locais.append(f'{local} = {texto[chave]}')
+                texto[chave] = local
+                profundidade[chave] = 0
+
+    expressao = texto[id(raiz)]
+    parametros = ', '.join(nomes)
+    corpo = ''.join(f'    {linha}\n' for linha in locais)
+    if not nomes:
+        lote = '    raise TypeError("grafo sem entradas não tem avaliação em lote")\n'
+    else:
+        alvo = nomes[0] if len(nomes) == 1 else parametros
+        iteravel = nomes[0] if len(nomes) == 1 else f'zip({parametros})'
+        if locais:
+            # Um único laço: os locais de um elemento são sobrescritos pelo
+            # próximo, então nenhuma lista intermediária é alocada
+            lote = (
+                '    _saida = []\n'
+                '    _anexa = _saida.append\n'
+                f'    for {alvo} in {iteravel}:\n'
+                + ''.join(f'        {linha}\n' for linha in locais)
+                + f'        _anexa({expressao})\n'
+                '    return _saida\n'
+            )
+        else:
+            lote = f'    return [{expressao} for {alvo} in {iteravel}]\n'
+    fonte = (
+        f'def plano({parametros}):\n'
+        f'{corpo}'
+        f'    return {expressao}\n'
+        f'def plano_lote({parametros}):\n'
+        f'{lote}'
+    )
+    descricao = '; '.join(locais + [expressao])
+    return nomes, constantes, descricao, fonte
+
+
+class PlanoAdiado(Plano):
+    """``Plano`` cujo código recebe as constantes sem literal como globais."""
+
+    __slots__ = ()
+
+    def __init__(self, expressao, variaveis, gera_float, codigo, constantes):
+        escopo = {}
+        globais = {'__builtins__': {'zip': zip, 'TypeError': TypeError}}
+        globais.update(constantes)
+        exec(codigo, globais, escopo)
+        self.expressao = expressao
+        self.variaveis = tuple(variaveis)
+        self.gera_float = gera_float
+        self.funcao = escopo['plano']
+        self._funcao_lote = escopo['plano_lote']
+
+
+def _gera_float(ordem):
+    return any(no.tipo == 'divisao' or (no.tipo == CONSTANTE and type(no.valor) is float)
+               for no in ordem)
+
+
+def _compilar(raiz):
+    nomes, constantes, expressao, fonte = gerar_fonte(raiz)
+    codigo = compile(fonte, '<grafo adiado>', 'exec')
+    return PlanoAdiado(expressao, nomes, _gera_float(_ordem(raiz)), codigo, constantes)
+
+
+# ============================================================================
+# AVALIAÇÃO IMEDIATA (REFERÊNCIA)
+# ============================================================================
+
+def interpretar(raiz, valores, calculadora=None):
+    """Avalia o grafo etapa por etapa sobre a Calculadora (referência).
+
+    É o modo imediato: cada nó chama o método da ``calculadora`` (os
+    ``*_lote`` se algum operando for sequência) e guarda o resultado
+    intermediário. Subexpressões compartilhadas são calculadas uma vez.
+    """
+    calc = calculadora if calculadora is not None else Calculadora
+    resultados = {}
+    for no in _ordem(raiz):
+        if no.tipo == ENTRADA:
+            resultado = valores[no.valor]
+        elif no.tipo == CONSTANTE:
+            resultado = no.valor
+        else:
+            a, b = (resultados[id(operando)] for operando in no.operandos)
+            if _eh_escalar(a) and _eh_escalar(b):
+                resultado = getattr(calc, no.tipo)(a, b)
+            else:
+                resultado = getattr(calc, f'{no.tipo}_lote')(a, b)
+        resultados[id(no)] = resultado
+    return resultados[id(raiz)]
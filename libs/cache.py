@@ -0,0 +1,224 @@
+"""
+Memoização opcional para a Calculadora e para as funções do jogo.
+
+``CacheLRU`` é um dicionário limitado com despejo LRU, TTL opcional e
+estatísticas, protegido por lock. ``CalculadoraCache`` expõe as mesmas
+operações da Calculadora, mas só consulta o cache quando a operação custa
+mais que montar e buscar a chave: Fraction e Decimal em qualquer operação e
+inteiros grandes só na multiplicação. Soma, subtração e divisão de ints
+custam O(n) nos dígitos, como o hash da chave, e um acerto sairia mais caro
+que recalcular; ints pequenos e floats nunca passam pelo cache. Decimals
+entram na chave pelo expoente e pelo contexto ativo, que mudam o resultado.
+Desligado, cada método é o próprio método estático da Calculadora, sem
+camada extra.
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from decimal import Decimal, getcontext
+from fractions import Fraction
+from functools import wraps
+
+from libs.calculadora import Calculadora
+from libs.jogo import pense_num_numero, pense_num_numero2
+
+_AUSENTE = object()
+
+# Inteiros com menos bits que isso são mais baratos de recalcular que de buscar
+LIMITE_BITS_PADRAO = 256
+
+OPERACOES = ('soma', 'subtracao', 'multiplicacao', 'divisao')
+
+# Únicas operações em que um int grande custa mais que o hash da chave
+OPERACOES_INTEIRAS_CARAS = frozenset(('multiplicacao',))
+
+# Com int e float o jogo usa a forma fechada, mais barata que qualquer chave
+_JOGO_FORMA_FECHADA = (pense_num_numero, pense_num_numero2)
+
+
+class CacheLRU:
+    """Cache limitado, thread-safe, com despejo LRU e TTL opcional."""
+
+    def __init__(self, tamanho_maximo=1024, ttl=None, relogio=time.monotonic):
+        if tamanho_maximo < 1:
+            raise ValueError('tamanho_maximo precisa ser positivo')
+        self.tamanho_maximo = tamanho_maximo
+        self.ttl = ttl
+        self._relogio = relogio
+        self._dados = OrderedDict()
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+        self.despejos = 0
+        self.expirados = 0
+
+    def __len__(self):
+        return len(self._dados)
+
+    def obter(self, chave, padrao=None):
+        """Retorna o valor guardado ou ``padrao``, contabilizando acerto/falha."""
+        with self._lock:
+            entrada = self._dados.get(chave, _AUSENTE)
+            if entrada is _AUSENTE:
+                self.falhas += 1
+                return padrao
+            valor, expira_em = entrada
+            if expira_em is not None and self._relogio() >= expira_em:
+                del self._dados[chave]
+                self.expirados += 1
+                self.falhas += 1
+                return padrao
+            self._dados.move_to_end(chave)
+            self.acertos += 1
+            return valor
+
+    def guardar(self, chave, valor):
+        expira_em = None if self.ttl is None else self._relogio() + self.ttl
+        with self._lock:
+            self._dados[chave] = (valor, expira_em)
+            self._dados.move_to_end(chave)
+            while len(self._dados) > self.tamanho_maximo:
+                self._dados.popitem(last=False)
+                self.despejos += 1
+
+    def limpar(self):
+        with self._lock:
+            self._dados.clear()
+
+    def memoria(self):
+        """Estimativa em bytes do espaço ocupado por chaves, valores e índice."""
+        with self._lock:
+            itens = list(self._dados.items())
+        total = sys.getsizeof(self._dados)
+        for chave, (valor, _) in itens:
+            total += sys.getsizeof(chave) + sys.getsizeof(valor)
+            if isinstance(chave, tuple):
+                total += sum(sys.getsizeof(parte) for parte in chave)
+        return total
+
+    def estatisticas(self):
+        consultas = self.acertos + self.falhas
+        return {
+            'tamanho': len(self._dados),
+            'tamanho_maximo': self.tamanho_maximo,
+            'acertos': self.acertos,
+            'falhas': self.falhas,
+            'despejos': self.despejos,
+            'expirados': self.expirados,
+            'taxa_acerto': self.acertos / consultas if consultas else 0.0,
+            'memoria_bytes': self.memoria(),
+        }
+
+
+def _vale_cachear(valor, limite_bits):
+    # limite_bits None: ints de qualquer tamanho são recalculados
+    tipo = type(valor)
+    if tipo is int:
+        return limite_bits is not None and valor.bit_length() >= limite_bits
+    return tipo is Fraction or tipo is Decimal
+
+
+def _contexto_decimal():
+    contexto = getcontext()
+    armadilhas = tuple(sinal.__name__ for sinal, ativo in contexto.traps.items() if ativo)
+    return (contexto.prec, contexto.rounding, contexto.Emin, contexto.Emax, contexto.clamp,
+            armadilhas)
+
+
+def _parte_da_chave(valor):
+    # Decimal('1.00') == Decimal('1') mas o expoente muda o resultado: entra
+    # a representação exata (sinal, dígitos, expoente), não o valor
+    if type(valor) is Decimal:
+        return (Decimal, valor.as_tuple())
+    return (type(valor), valor)
+
+
+def _chave(nome, operandos):
+    # O tipo entra na chave para que 1, 1.0 e True não colidam
+    chave = (nome,) + tuple(map(_parte_da_chave, operandos))
+    if any(type(valor) is Decimal for valor in operandos):
+        # O resultado de um Decimal depende do contexto ativo (precisão,
+        # arredondamento, limites de expoente e armadilhas)
+        chave += (_contexto_decimal(),)
+    return chave
+
+
+def _operacao_cacheada(nome, funcao, cache, limite_bits):
+    def operacao(a, b):
+        if not (_vale_cachear(a, limite_bits) or _vale_cachear(b, limite_bits)):
+            return funcao(a, b)
+        chave = _chave(nome, (a, b))
+        resultado = cache.obter(chave, _AUSENTE)
+        if resultado is _AUSENTE:
+            resultado = funcao(a, b)
+            cache.guardar(chave, resultado)
+        return resultado
+    operacao.__name__ = nome
+    operacao.__doc__ = funcao.__doc__
+    return operacao
+
+
+class CalculadoraCache:
+    """Calculadora com memoização opcional das quatro operações.
+
+    Com ``ativo=False`` (ou após ``desligar()``) os métodos da instância são
+    os próprios métodos estáticos da Calculadora. ``cache`` aceita outro cache
+    com ``obter``/``guardar``/``estatisticas``, como ``CacheDisco``.
+    """
+
+    def __init__(self, tamanho_maximo=1024, ttl=None, limite_bits=LIMITE_BITS_PADRAO,
+                 ativo=True, cache=None):
+        self.cache = CacheLRU(tamanho_maximo, ttl) if cache is None else cache
+        self.limite_bits = limite_bits
+        if ativo:
+            self.ligar()
+        else:
+            self.desligar()
+
+    def ligar(self):
+        for nome in OPERACOES:
+            limite_bits = self.limite_bits if nome in OPERACOES_INTEIRAS_CARAS else None
+            setattr(self, nome, _operacao_cacheada(nome, getattr(Calculadora, nome),
+                                                   self.cache, limite_bits))
+        self.ativo = True
+
+    def desligar(self):
+        for nome in OPERACOES:
+            setattr(self, nome, getattr(Calculadora, nome))
+        self.ativo = False
+
+    def estatisticas(self):
+        return self.cache.estatisticas()
+
+
+def memoizar(funcao=None, tamanho_maximo=1024, ttl=None, limite_bits=LIMITE_BITS_PADRAO,
+             cache=None):
+    """Decorador de memoização para funções de um argumento, como as do jogo.
+
+    Exceções não são guardadas. O cache fica acessível em ``funcao.cache``.
+    Nas funções do jogo os ints não passam pelo cache (só Fraction e
+    Decimal): a forma fechada custa menos que o hash de um int grande.
+    """
+    if funcao is None:
+        return lambda f: memoizar(f, tamanho_maximo, ttl, limite_bits, cache)
+    if cache is None:
+        cache = CacheLRU(tamanho_maximo, ttl)
+    if funcao in _JOGO_FORMA_FECHADA:
+        limite_bits = None
+    nome = funcao.__name__
+
+    @wraps(funcao)
+    def memoizada(num):
+        if not _vale_cachear(num, limite_bits):
+            return funcao(num)
+        chave = _chave(nome, (num,))
+        resultado = cache.obter(chave, _AUSENTE)
+        if resultado is _AUSENTE:
+            resultado = funcao(num)
+            cache.guardar(chave, resultado)
+        return resultado
+
+    memoizada.cache = cache
+    return memoizada
@@ -0,0 +1,452 @@
+"""
+Cache persistente em disco, compartilhado entre processos.
+
+``CacheDisco`` tem a interface de ``CacheLRU`` (``obter``, ``guardar``,
+``estatisticas``), então serve de ``cache=`` para ``CalculadoraCache`` e
+``memoizar``; a diferença é que os resultados sobrevivem ao fim do processo
+e são vistos pelos processos irmãos que abrem o mesmo diretório.
+
+Arquivos no diretório:
+
+- ``indice.bin``: tabela hash de endereçamento aberto (sondagem linear),
+  mapeada com mmap por todos os processos. Cabeçalho ``<8sIIQQQI`` (mágico,
+  geração, obsoleto, número de slots, entradas, bytes vivos, reservado) e
+  slots ``<QQII`` (hash de 64 bits da chave, posição e tamanho do registro
+  no log, último acesso em segundos);
+- ``valores.<geração>.log``: log só de acréscimo; cada registro é
+  ``<III`` (CRC32 do resto, tamanho da chave, tamanho do valor), a chave
+  serializada e o valor no formato marcado do diário (``libs.diario``);
+- ``trava``: arquivo do lock de escrita (``flock``).
+
+Os valores não usam pickle: ler um log adulterado não executa código. A
+chave é serializada com pickle só para gerar bytes e comparar, nunca lida
+de volta. O diretório é criado com permissão 0o700.
+
+Leitores não pegam lock: o escritor grava o registro no log antes de
+publicar o slot, e escreve o hash do slot por último. Uma leitura que pegue
+um slot pela metade cai em um registro cujo CRC ou chave não confere, e
+conta como falha. Só um processo escreve por vez (``flock`` exclusivo).
+
+Quando o log passa de ``tamanho_maximo`` bytes, a compactação reescreve as
+entradas vivas em um log novo (se elas passam de 3/4 do limite, só as usadas
+mais recentemente, até metade do limite), com um índice novo trocado atomicamente (``os.replace``); o índice antigo é
+marcado como obsoleto e os leitores reabrem na próxima consulta. A mesma
+compactação dobra o índice quando ele passa de 70% de ocupação.
+"""
+
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+import threading
+import time
+import zlib
+
+from libs.diario import _codifica_valor, _decodifica_valor
+
+try:
+    import fcntl
+except ImportError:  # Sem fcntl (Windows) o lock vale só dentro do processo
+    fcntl = None
+
+_AUSENTE = object()
+
+MAGICO = b'CALCIDX1'
+_CABECALHO = struct.Struct('<8sIIQQQI')
+_SLOT = struct.Struct('<QQII')
+_REGISTRO = struct.Struct('<III')
+
+# Posições dos campos do cabeçalho que mudam depois da criação
+_POS_OBSOLETO = 12
+_POS_ENTRADAS = 24
+_POS_BYTES_VIVOS = 32
+
+SLOTS_INICIAIS = 1 << 12
+OCUPACAO_MAXIMA = 0.7
+TAMANHO_MAXIMO_PADRAO = 256 << 20
+
+# Protocolo fixo para que a mesma chave gere sempre os mesmos bytes
+_PROTOCOLO_CHAVE = 4
+
+
+def serializar_chave(chave):
+    return pickle.dumps(chave, protocol=_PROTOCOLO_CHAVE)
+
+
+def _hash(chave_bytes):
+    valor = int.from_bytes(hashlib.blake2b(chave_bytes, digest_size=8).digest(), 'little')
+    return valor or 1       # 0 marca slot vazio
+
+
+class _Indice:
+    """Um ``indice.bin`` mapeado, com o log da mesma geração aberto."""
+
+    __slots__ = ('arquivo', 'mapa', 'geracao', 'slots', 'mascara', 'log')
+
+    def __init__(self, diretorio, caminho):
+        self.arquivo = open(caminho, 'r+b')
+        try:
+            self.mapa = mmap.mmap(self.arquivo.fileno(), 0)
+        except Exception:
+            self.arquivo.close()
+            raise
+        magico, self.geracao, _, self.slots, _, _, _ = _CABECALHO.unpack_from(self.mapa, 0)
+        if magico != MAGICO:
+            self.fechar()
+            raise ValueError(f'{caminho}: não é um índice de cache')
+        self.mascara = self.slots - 1
+        self.log = os.open(_caminho_log(diretorio, self.geracao), os.O_RDWR | os.O_APPEND)
+
+    @property
+    def obsoleto(self):
+        return self.mapa[_POS_OBSOLETO] != 0
+
+    def campo(self, posicao):
+        return struct.unpack_from('<Q', self.mapa, posicao)[0]
+
+    def incrementa(self, posicao, delta):
+        struct.pack_into('<Q', self.mapa, posicao, self.campo(posicao) + delta)
+
+    def procura(self, hash_):
+        """Posição do slot com ``hash_`` (ou do primeiro vazio) e se foi achado."""
+        mapa = self.mapa
+        i = hash_ & self.mascara
+        for _ in range(self.slots):
+            posicao = _CABECALHO.size + i * _SLOT.size
+            atual = struct.unpack_from('<Q', mapa, posicao)[0]
+            if atual == hash_:
+                return posicao, True
+            if atual == 0:
+                return posicao, False
+            i = (i + 1) & self.mascara
+        return None, False
+
+    def fechar(self):
+        if getattr(self, 'log', None) is not None:
+            os.close(self.log)
+            self.log = None
+        self.mapa.close()
+        self.arquivo.close()
+
+
+def _caminho_log(diretorio, geracao):
+    return os.path.join(diretorio, f'valores.{geracao}.log')
+
+
+def _le_registro(log, posicao, tamanho, chave_bytes):
+    """Valor do registro se ele estiver íntegro e for da chave; senão _AUSENTE."""
+    dados = os.pread(log, tamanho, posicao)
+    if len(dados) != tamanho or tamanho < _REGISTRO.size:
+        return _AUSENTE
+    crc, tamanho_chave, tamanho_valor = _REGISTRO.unpack_from(dados)
+    if _REGISTRO.size + tamanho_chave + tamanho_valor != tamanho:
+        return _AUSENTE
+    corpo = memoryview(dados)[_REGISTRO.size:]
+    if zlib.crc32(corpo) != crc or corpo[:tamanho_chave] != chave_bytes:
+        return _AUSENTE
+    try:
+        valor, fim = _decodifica_valor(corpo, tamanho_chave)
+    except (ValueError, struct.error):
+        return _AUSENTE
+    return valor if fim == len(corpo) else _AUSENTE
+
+
+def _serializa_valor(valor):
+    partes = []
+    _codifica_valor(valor, partes, opacos=False)
+    return b''.join(partes)
+
+
+def _monta_registro(chave_bytes, valor_bytes):
+    corpo = chave_bytes + valor_bytes
+    return _REGISTRO.pack(zlib.crc32(corpo), len(chave_bytes), len(valor_bytes)) + corpo
+
+
+class CacheDisco:
+    """Cache chave -> valor persistente em ``diretorio``.
+
+    ``tamanho_maximo`` limita o log de valores em bytes; ao passar dele, a
+    compactação descarta registros substituídos e, se preciso, as entradas
+    acessadas há mais tempo.
+    Chaves precisam ser serializáveis com pickle. Valores podem ser None,
+    bool, int, float, complex, Fraction, Decimal, str, bytes, listas e tuplas
+    deles e ``array.array``; outros tipos levantam TypeError em ``guardar``.
+    """
+
+    def __init__(self, diretorio, tamanho_maximo=TAMANHO_MAXIMO_PADRAO,
+                 relogio=time.time):
+        if tamanho_maximo < 1:
+            raise ValueError('tamanho_maximo precisa ser positivo')
+        self.diretorio = diretorio
+        self.tamanho_maximo = tamanho_maximo
+        self._relogio = relogio
+        self._lock = threading.Lock()
+        self._indice = None
+        self._trava = None
+        self.acertos = 0
+        self.falhas = 0
+        self.gravacoes = 0
+        self.compactacoes = 0
+        self.despejos = 0
+        os.makedirs(diretorio, mode=0o700, exist_ok=True)
+        self._trava = open(os.path.join(diretorio, 'trava'), 'a+b')
+        with self._escrita():
+            if not os.path.exists(self._caminho_indice):
+                self._cria_indice(geracao=1, slots=SLOTS_INICIAIS, entradas=())
+        self._abrir()
+
+    @property
+    def _caminho_indice(self):
+        return os.path.join(self.diretorio, 'indice.bin')
+
+    # ------------------------------------------------------------------
+    # Abertura, lock e criação
+    # ------------------------------------------------------------------
+
+    def _abrir(self):
+        if self._indice is not None:
+            self._indice.fechar()
+            self._indice = None
+        for tentativa in range(100):
+            try:
+                self._indice = _Indice(self.diretorio, self._caminho_indice)
+                return
+            except FileNotFoundError:
+                # Outro processo compactou entre abrir o índice e abrir o log
+                if tentativa == 99:
+                    raise
+                time.sleep(0.001)
+
+    def _atual(self):
+        """Índice em uso, reaberto se outro processo o compactou."""
+        if self._indice.obsoleto:
+            self._abrir()
+        return self._indice
+
+    def _escrita(self):
+        return _TravaEscrita(self._lock, self._trava)
+
+    def _cria_indice(self, geracao, slots, entradas, log_origem=None):
+        """Escreve log e índice novos com ``entradas`` e troca o índice atômico.
+
+        ``entradas`` são ``(hash, posicao, tamanho, acesso)`` no log de origem.
+        """
+        caminho_log = _caminho_log(self.diretorio, geracao)
+        temporario = f'{self._caminho_indice}.{os.getpid()}.tmp'
+        conteudo = bytearray(_CABECALHO.size + slots * _SLOT.size)
+        mascara = slots - 1
+        bytes_vivos = 0
+        quantidade = 0
+        with open(caminho_log, 'wb') as log:
+            for hash_, posicao, tamanho, acesso in entradas:
+                registro = os.pread(log_origem, tamanho, posicao)
+                nova_posicao = log.tell()
+                log.write(registro)
+                i = hash_ & mascara
+                while struct.unpack_from('<Q', conteudo, _CABECALHO.size + i * _SLOT.size)[0]:
+                    i = (i + 1) & mascara
+                _SLOT.pack_into(conteudo, _CABECALHO.size + i * _SLOT.size,
+                                hash_, nova_posicao, tamanho, acesso)
+                bytes_vivos += tamanho
+                quantidade += 1
+            log.flush()
+            os.fsync(log.fileno())
+        _CABECALHO.pack_into(conteudo, 0, MAGICO, geracao, 0, slots, quantidade, bytes_vivos, 0)
+        with open(temporario, 'wb') as arquivo:
+            arquivo.write(conteudo)
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+        os.replace(temporario, self._caminho_indice)
+
+    # ------------------------------------------------------------------
+    # Leitura
+    # ------------------------------------------------------------------
+
+    def obter(self, chave, padrao=None):
+        """Retorna o valor guardado ou ``padrao``, contabilizando acerto/falha."""
+        chave_bytes = serializar_chave(chave)
+        hash_ = _hash(chave_bytes)
+        with self._lock:
+            indice = self._atual()
+            posicao, achou = indice.procura(hash_)
+            valor = _AUSENTE
+            if achou:
+                _, inicio, tamanho, _ = _SLOT.unpack_from(indice.mapa, posicao)
+                valor = _le_registro(indice.log, inicio, tamanho, chave_bytes)
+                if valor is not _AUSENTE:
+                    # Recência aproximada para o despejo; corrida inofensiva
+                    struct.pack_into('<I', indice.mapa, posicao + 20, int(self._relogio()))
+            if valor is _AUSENTE:
+                self.falhas += 1
+                return padrao
+            self.acertos += 1
+            return valor
+
+    def __contains__(self, chave):
+        return self.obter(chave, _AUSENTE) is not _AUSENTE
+
+    def __len__(self):
+        with self._lock:
+            return self._atual().campo(_POS_ENTRADAS)
+
+    # ------------------------------------------------------------------
+    # Escrita
+    # ------------------------------------------------------------------
+
+    def guardar(self, chave, valor):
+        chave_bytes = serializar_chave(chave)
+        registro = _monta_registro(chave_bytes, _serializa_valor(valor))
+        hash_ = _hash(chave_bytes)
+        with self._escrita():
+            indice = self._atual()
+            posicao, achou = indice.procura(hash_)
+            if posicao is None:
+                self._compactar(indice)
+                indice = self._indice
+                posicao, achou = indice.procura(hash_)
+            inicio = os.fstat(indice.log).st_size
+            os.write(indice.log, registro)
+            if achou:
+                tamanho_antigo = _SLOT.unpack_from(indice.mapa, posicao)[2]
+                indice.incrementa(_POS_BYTES_VIVOS, len(registro) - tamanho_antigo)
+            else:
+                indice.incrementa(_POS_ENTRADAS, 1)
+                indice.incrementa(_POS_BYTES_VIVOS, len(registro))
+            # Hash por último: um leitor só vê o slot com posição e tamanho prontos
+            struct.pack_into('<QII', indice.mapa, posicao + 8, inicio, len(registro),
+                             int(self._relogio()))
+            struct.pack_into('<Q', indice.mapa, posicao, hash_)
+            self.gravacoes += 1
+            tamanho_log = inicio + len(registro)
+            if (tamanho_log > self.tamanho_maximo
+                    or indice.campo(_POS_ENTRADAS) > OCUPACAO_MAXIMA * indice.slots):
+                self._compactar(indice)
+
+    def compactar(self):
+        """Reescreve o log só com as entradas vivas (e dentro do limite)."""
+        with self._escrita():
+            self._compactar(self._atual())
+
+    def _compactar(self, indice):
+        entradas = []
+        mapa = indice.mapa
+        for i in range(indice.slots):
+            slot = _SLOT.unpack_from(mapa, _CABECALHO.size + i * _SLOT.size)
+            if slot[0]:
+                entradas.append(slot)
+        mantidas = entradas
+        if sum(entrada[2] for entrada in entradas) > self.tamanho_maximo * 3 // 4:
+            # Despejo: mais recentes primeiro, até metade do limite. A folga
+            # entre 1/2 e 3/4 evita compactar de novo a cada gravação.
+            entradas.sort(key=lambda slot: slot[3], reverse=True)
+            mantidas = []
+            total = 0
+            for entrada in entradas:
+                if total + entrada[2] > self.tamanho_maximo // 2 and mantidas:
+                    break
+                mantidas.append(entrada)
+                total += entrada[2]
+        self.despejos += len(entradas) - len(mantidas)
+        mantidas.sort(key=lambda slot: slot[1])     # leitura sequencial do log antigo
+        slots = SLOTS_INICIAIS
+        while len(mantidas) > OCUPACAO_MAXIMA * slots / 2:
+            slots *= 2
+        geracao_antiga = indice.geracao
+        self._cria_indice(geracao_antiga + 1, slots, mantidas, log_origem=indice.log)
+        mapa[_POS_OBSOLETO] = 1
+        self._abrir()
+        try:
+            os.remove(_caminho_log(self.diretorio, geracao_antiga))
+        except OSError:
+            pass
+        self.compactacoes += 1
+
+    def limpar(self):
+        """Descarta todas as entradas (para todos os processos)."""
+        with self._escrita():
+            indice = self._atual()
+            geracao_antiga = indice.geracao
+            self._cria_indice(geracao_antiga + 1, SLOTS_INICIAIS, ())
+            indice.mapa[_POS_OBSOLETO] = 1
+            self._abrir()
+            try:
+                os.remove(_caminho_log(self.diretorio, geracao_antiga))
+            except OSError:
+                pass
+
+    # ------------------------------------------------------------------
+    # Estatísticas e fechamento
+    # ------------------------------------------------------------------
+
+    def estatisticas(self):
+        with self._lock:
+            indice = self._atual()
+            entradas = indice.campo(_POS_ENTRADAS)
+            bytes_vivos = indice.campo(_POS_BYTES_VIVOS)
+            tamanho_log = os.fstat(indice.log).st_size
+            slots = indice.slots
+        consultas = self.acertos + self.falhas
+        return {
+            'tamanho': entradas,
+            'slots': slots,
+            'acertos': self.acertos,
+            'falhas': self.falhas,
+            'gravacoes': self.gravacoes,
+            'despejos': self.despejos,
+            'compactacoes': self.compactacoes,
+            'taxa_acerto': self.acertos / consultas if consultas else 0.0,
+            'bytes_vivos': bytes_vivos,
+            'bytes_log': tamanho_log,
+            'tamanho_maximo': self.tamanho_maximo,
+        }
+
+    def fechar(self):
+        with self._lock:
+            if self._indice is not None:
+                self._indice.fechar()
+                self._indice = None
+            if self._trava is not None:
+                self._trava.close()
+                self._trava = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+    def __getstate__(self):
+        # Processos filhos reabrem o mesmo diretório
+        return {'diretorio': self.diretorio, 'tamanho_maximo': self.tamanho_maximo,
+                'relogio': self._relogio}
+
+    def __setstate__(self, estado):
+        self.__init__(estado['diretorio'], estado['tamanho_maximo'], estado['relogio'])
+
+
+class _TravaEscrita:
+    """Lock da thread e ``flock`` exclusivo do arquivo ``trava``."""
+
+    __slots__ = ('_lock', '_arquivo')
+
+    def __init__(self, lock, arquivo):
+        self._lock = lock
+        self._arquivo = arquivo
+
+    def __enter__(self):
+        self._lock.acquire()
+        if fcntl is not None:
+            try:
+                fcntl.flock(self._arquivo.fileno(), fcntl.LOCK_EX)
+            except BaseException:
+                self._lock.release()
+                raise
+        return self
+
+    def __exit__(self, *excecao):
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._arquivo.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._lock.release()
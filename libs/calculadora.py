@@ -1,6 +1,167 @@
+import numbers
+import operator
+import sys
+from array import array
+from collections import deque
+from itertools import repeat
+
+
+# Typecodes de array.array que guardam números de ponto flutuante
+_TYPECODES_FLOAT = 'fd'
+
+
+def _eh_escalar(valor):
+    """Retorna True se o valor deve ser tratado como escalar (broadcasting)."""
+    return isinstance(valor, numbers.Number)
+
+
+def _numpy():
+    """Retorna o módulo NumPy se ele já foi importado por quem chama.
+
+    Um ndarray só pode chegar aqui se o NumPy já estiver carregado, então a
+    Calculadora nunca paga o custo de importá-lo (NumPy é opcional).
+    """
+    return sys.modules.get('numpy')
+
+
+def _eh_ndarray(valor):
+    np = _numpy()
+    return np is not None and isinstance(valor, np.ndarray)
+
+
+def _typecode_resultado(op, a, b):
+    """Typecode provável do array.array de saída, só pelos operandos.
+
+    ``'q'`` ainda pode virar ``'d'`` em ``_lote`` se algum resultado não
+    for um int de 64 bits.
+    """
+    if op is operator.truediv:
+        return 'd'
+    for valor in (a, b):
+        if isinstance(valor, array) and valor.typecode in _TYPECODES_FLOAT:
+            return 'd'
+        if isinstance(valor, float):
+            return 'd'
+    return 'q'
+
+
+def _buffer(valor):
+    """memoryview 1-D sobre um objeto com protocolo de buffer."""
+    visao = valor if isinstance(valor, memoryview) else memoryview(valor)
+    if visao.ndim != 1:
+        visao = visao.cast('B').cast(visao.format)
+    return visao
+
+
+def _operando(valor):
+    """Escalares e sequências como estão; outros buffers viram memoryview."""
+    if _eh_escalar(valor) or isinstance(valor, (array, list, tuple, range, memoryview)):
+        return valor
+    try:
+        return _buffer(valor)
+    except TypeError:
+        return valor
+
+
+def _destino(out):
+    destino = _buffer(out)
+    if destino.readonly:
+        raise TypeError('out precisa ser um buffer gravável')
+    return destino
+
+
+def gravar_em(out, valores):
+    """Escreve o iterável ``valores`` em ``out`` (um buffer), posição a posição.
+
+    O laço roda em C (``map`` consumido por um ``deque`` de tamanho zero):
+    nenhuma lista ou array intermediário é criado. Retorna ``out``.
+    """
+    destino = _destino(out)
+    deque(map(destino.__setitem__, range(len(destino)), valores), maxlen=0)
+    return out
+
+
+def _lote_em(op, ufunc, a, b, out):
+    """``_lote`` gravando em ``out``, sem alocar o resultado."""
+    if _eh_ndarray(out):
+        np = _numpy()
+        if op is operator.truediv and not np.all(b):
+            raise ZeroDivisionError('divisão por zero')
+        getattr(np, ufunc)(a, b, out=out)
+        return out
+    a = _operando(a)
+    b = _operando(b)
+    tamanho = len(_destino(out))
+    for valor in (a, b):
+        if not _eh_escalar(valor) and len(valor) != tamanho:
+            raise ValueError(f'out com tamanho diferente da entrada: {tamanho} != {len(valor)}')
+    if _eh_escalar(a):
+        resultado = map(op, repeat(a, tamanho), b)
+    elif _eh_escalar(b):
+        resultado = map(op, a, repeat(b, tamanho))
+    else:
+        resultado = map(op, a, b)
+    return gravar_em(out, resultado)
+
+
+def _lote(op, ufunc, a, b, compacto=False, out=None):
+    """Aplica ``op`` elemento a elemento sobre ``a`` e ``b``.
+
+    Aceita duas sequências de mesmo tamanho ou uma sequência e um escalar.
+    Arrays NumPy são despachados para a ufunc correspondente; qualquer outro
+    iterável passa por ``map`` com o operador nativo, sem uma chamada de
+    método por elemento. Com ``compacto=True`` o resultado é sempre um
+    array.array (como quando a entrada já é array.array), nunca uma lista:
+    ``'q'`` quando todos os resultados são ints de 64 bits, senão ``'d'``.
+
+    Com ``out`` (qualquer objeto gravável com protocolo de buffer e formato
+    declarado, como ``array.array``, ``memoryview(bytearray).cast('d')`` ou
+    um mmap), o resultado é escrito nele e ``out`` é retornado; ``out`` pode
+    ser uma das entradas (operação no lugar). Entradas com protocolo de
+    buffer são lidas sem cópia. Um valor que não cabe no formato de ``out``
+    levanta TypeError/ValueError, e as posições anteriores já foram escritas.
+    """
+    a_escalar = _eh_escalar(a)
+    b_escalar = _eh_escalar(b)
+    if a_escalar and b_escalar:
+        raise TypeError('operações em lote precisam de ao menos uma sequência')
+    if out is not None:
+        return _lote_em(op, ufunc, a, b, out)
+
+    if _eh_ndarray(a) or _eh_ndarray(b):
+        np = _numpy()
+        if op is operator.truediv and not np.all(b):
+            raise ZeroDivisionError('divisão por zero')
+        return getattr(np, ufunc)(a, b)
+
+    if a_escalar:
+        resultado = map(op, repeat(a, len(b)), b)
+    elif b_escalar:
+        resultado = map(op, a, repeat(b, len(a)))
+    else:
+        if len(a) != len(b):
+            raise ValueError(
+                f'sequências com tamanhos diferentes: {len(a)} != {len(b)}'
+            )
+        resultado = map(op, a, b)
+
+    if compacto or isinstance(a, array) or isinstance(b, array):
+        typecode = _typecode_resultado(op, a, b)
+        if typecode == 'q':
+            # 'q' só se todos os resultados forem ints de 64 bits; um float
+            # numa lista ou um produto grande demais leva o lote para 'd'
+            resultado = list(resultado)
+            try:
+                return array('q', resultado)
+            except (OverflowError, TypeError):
+                typecode = 'd'
+        return array(typecode, resultado)
+    return list(resultado)
+
+
 class Calculadora:
     """Classe para realizar operações matemáticas básicas."""
-    
+
     @staticmethod
     def soma(a,b):
         return a+b
@@ -8,11 +169,55 @@ class Calculadora:
     @staticmethod
     def subtracao(a,b):
         return a-b
-    
+
     @staticmethod
     def multiplicacao(a,b):
         return a*b
-    
+
     @staticmethod
     def divisao(a,b):
-        return a/b
\ No newline at end of file
+        return a/b
+
+    # ------------------------------------------------------------------
+    # Operações em lote: sequência x sequência ou sequência x escalar
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def soma_lote(a, b, compacto=False, out=None):
+        """Soma elemento a elemento de duas sequências (ou sequência e escalar)."""
+        return _lote(operator.add, 'add', a, b, compacto, out)
+
+    @staticmethod
+    def subtracao_lote(a, b, compacto=False, out=None):
+        """Subtração elemento a elemento de duas sequências (ou sequência e escalar)."""
+        return _lote(operator.sub, 'subtract', a, b, compacto, out)
+
+    @staticmethod
+    def multiplicacao_lote(a, b, compacto=False, out=None):
+        """Multiplicação elemento a elemento de duas sequências (ou sequência e escalar)."""
+        return _lote(operator.mul, 'multiply', a, b, compacto, out)
+
+    @staticmethod
+    def divisao_lote(a, b, compacto=False, out=None):
+        """Divisão elemento a elemento de duas sequências (ou sequência e escalar).
+
+        Levanta ZeroDivisionError se algum divisor for zero, inclusive no
+        caminho NumPy, mantendo o comportamento de ``divisao``.
+        """
+        return _lote(operator.truediv, 'true_divide', a, b, compacto, out)
+
+    # ------------------------------------------------------------------
+    # Reduções: somatório e produtório de iteráveis (ver libs.reducao)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def somatorio(valores, metodo='pareada', processos=None, tamanho_bloco=1 << 16):
+        """Soma pareada (ou de Kahan) de um iterável, opcionalmente em processos."""
+        from libs.reducao import somatorio
+        return somatorio(valores, metodo, processos, tamanho_bloco)
+
+    @staticmethod
+    def produtorio(valores, processos=None, tamanho_bloco=1 << 16):
+        """Produto em árvore balanceada de um iterável, opcionalmente em processos."""
+        from libs.reducao import produtorio
+        return produtorio(valores, processos, tamanho_bloco)
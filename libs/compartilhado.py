@@ -0,0 +1,284 @@
+"""
+Pool de processos para lotes da Calculadora sobre memória compartilhada.
+
+Com ``Pool.map`` cada fatia de operandos é serializada com pickle para o
+filho e cada lista de resultados volta serializada: para floats isso custa
+mais que a própria operação. ``PoolCompartilhado`` copia as colunas de
+entrada uma vez para segmentos de ``multiprocessing.shared_memory``, cria o
+segmento de saída e manda a cada processo só os nomes dos segmentos e o
+intervalo ``[inicio, fim)`` do bloco. O filho mapeia os segmentos, processa
+o bloco com as mesmas janelas de ``libs.mapeado`` e escreve direto na saída.
+
+As colunas são float64 ou int64, como em ``libs.mapeado``: a saída é float64
+para divisão e para o jogo e segue o tipo das entradas nos outros casos. Se
+algum resultado inteiro não couber em int64, a operação é refeita com saída
+float64, como nas operações em lote da Calculadora.
+
+Os segmentos são criados e removidos só pelo processo principal, em
+``finally``: uma exceção ou a morte de um filho (``BrokenProcessPool``) não
+deixa nada em ``/dev/shm``, e o pool é recriado na próxima chamada. Se o
+próprio processo principal morrer, o ``resource_tracker`` do
+``multiprocessing`` remove os segmentos que ainda estiverem registrados.
+"""
+
+import os
+import secrets
+import struct
+import sys
+import traceback
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import ExitStack
+from multiprocessing import shared_memory
+
+from libs.calculadora import _eh_escalar
+from libs.mapeado import OPERACOES_BINARIAS, OPERACOES_JOGO, _processa_janela, _typecode
+from libs.resultados import typecode_para
+
+# Blocos por processo quando tamanho_bloco não é informado
+_BLOCOS_POR_TRABALHADOR = 4
+
+# Abaixo disso um bloco não paga o envio da tarefa e o mapeamento no filho
+BLOCO_MINIMO = 1 << 14
+
+PREFIXO = 'calc-'
+
+
+def _anexa(pilha, nome, typecode, elementos):
+    """Mapeia o segmento ``nome`` como coluna de ``elementos`` valores."""
+    segmento = shared_memory.SharedMemory(name=nome)
+    pilha.callback(segmento.close)
+    bytes_ = segmento.buf[:elementos * 8]
+    pilha.callback(bytes_.release)
+    visao = bytes_.cast(typecode)
+    pilha.callback(visao.release)
+    return visao
+
+
+def _processa_bloco(operacao, nome_a, typecode, operando, nome_b, typecode_b,
+                    nome_saida, typecode_saida, elementos, inicio, fim):
+    """Executado no processo filho: processa ``[inicio, fim)`` entre segmentos."""
+    funcao = OPERACOES_JOGO.get(operacao) or OPERACOES_BINARIAS[operacao]
+    with ExitStack() as pilha:
+        entrada_a = _anexa(pilha, nome_a, typecode, elementos)
+        entrada_b = None if nome_b is None else _anexa(pilha, nome_b, typecode_b, elementos)
+        destino = _anexa(pilha, nome_saida, typecode_saida, elementos)
+        try:
+            _processa_janela(operacao, funcao, operando, entrada_a, entrada_b, destino,
+                             typecode_saida, inicio, fim)
+        except BaseException as erro:
+            # Os frames guardam visões dos segmentos, que impediriam o close
+            traceback.clear_frames(erro.__traceback__)
+            raise
+
+
+_ORDEM_NATIVA = '<' if sys.byteorder == 'little' else '>'
+
+
+def _typecode_nativo(formato):
+    """'d' ou 'q' se os bytes de ``formato`` já são os de uma coluna, senão None.
+
+    Aceita os prefixos de ordem de bytes do ``struct`` (ctypes exporta
+    ``'<d'``) e os inteiros com sinal de 8 bytes (``'l'`` no Linux).
+    """
+    ordem, letra = (formato[0], formato[1:]) if formato[:1] in '@=<>!' else ('@', formato)
+    if ordem == '!':
+        ordem = '>'
+    if ordem not in ('@', '=', _ORDEM_NATIVA):
+        return None
+    if letra == 'd':
+        return 'd'
+    if letra in ('q', 'l', 'n') and struct.calcsize(formato) == 8:
+        return 'q'
+    return None
+
+
+def _coluna_da_visao(visao, typecode):
+    """(buffer, typecode) de uma ``memoryview`` com qualquer formato numérico."""
+    letra = visao.format.lstrip('@=<>!')
+    if letra not in tuple('bBhHiIlLqQnNefd'):
+        raise ValueError(f'formato não suportado: {visao.format!r} (use float64 ou int64)')
+    nativo = _typecode_nativo(visao.format)
+    if nativo is not None and typecode in (None, nativo):
+        # Mesmos bytes: só troca o formato declarado, sem cópia
+        return visao.cast('B').cast(nativo), nativo
+    valores = [valor for valor, in struct.iter_unpack(visao.format, visao)]
+    if typecode is None:
+        typecode = typecode_para(valores)
+    return array(typecode, valores), typecode
+
+
+def _coluna(valores, tipo):
+    """(array ou buffer, typecode) para copiar para um segmento."""
+    typecode = None if tipo is None else _typecode(tipo)
+    if isinstance(valores, memoryview):
+        return _coluna_da_visao(valores, typecode)
+    if not isinstance(valores, (array, list, tuple, range)):
+        valores = list(valores)
+    if typecode is None:
+        typecode = typecode_para(valores)
+    if isinstance(valores, array) and valores.typecode == typecode:
+        return valores, typecode
+    return array(typecode, valores), typecode
+
+
+def preparar(operacao, a, b=None, tipo=None, tipo_operando=None):
+    """Valida a operação e converte os operandos em colunas.
+
+    Retorna ``(a, typecode, b, typecode_b, operando, typecode_saida)``: ``b``
+    e ``typecode_b`` são None quando o segundo operando é o escalar
+    ``operando``. A saída é float64 para divisão, jogo e qualquer operando
+    float; senão int64, que ``executar`` troca por float64 se algum
+    resultado não couber.
+    """
+    if operacao in OPERACOES_JOGO:
+        b = None
+    elif operacao in OPERACOES_BINARIAS:
+        if b is None:
+            raise TypeError(f'{operacao} precisa de um operando (sequência ou escalar)')
+    else:
+        raise ValueError(f'operação desconhecida: {operacao!r}')
+
+    a, typecode = _coluna(a, tipo)
+    operando = typecode_b = None
+    if b is not None and _eh_escalar(b):
+        operando, b = b, None
+    elif b is not None:
+        b, typecode_b = _coluna(b, tipo_operando)
+        if len(b) != len(a):
+            raise ValueError(f'sequências com tamanhos diferentes: {len(a)} != {len(b)}')
+    if (operacao in OPERACOES_JOGO or operacao == 'divisao' or isinstance(operando, float)
+            or 'd' in (typecode, typecode_b)):
+        typecode_saida = 'd'
+    else:
+        typecode_saida = 'q'
+    return a, typecode, b, typecode_b, operando, typecode_saida
+
+
+class PoolCompartilhado:
+    """Processos que aplicam lotes da Calculadora a colunas compartilhadas.
+
+    Use como gerenciador de contexto (ou chame ``fechar``). As entradas
+    podem ser listas, ``range``, ``array.array`` ou ``memoryview`` de
+    qualquer formato numérico (``'<d'`` do ctypes, ``'i'``, ``'l'``...),
+    convertido para float64/int64; o resultado é um ``array.array``.
+    """
+
+    def __init__(self, trabalhadores=None, tamanho_bloco=None, contexto=None):
+        if trabalhadores is None:
+            trabalhadores = os.cpu_count() or 1
+        if trabalhadores < 1:
+            raise ValueError('trabalhadores precisa ser positivo')
+        if tamanho_bloco is not None and tamanho_bloco < 1:
+            raise ValueError('tamanho_bloco precisa ser positivo')
+        self.trabalhadores = trabalhadores
+        self.tamanho_bloco = tamanho_bloco
+        self._contexto = contexto
+        self._executor = None
+
+    def _executor_ativo(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.trabalhadores, mp_context=self._contexto)
+        return self._executor
+
+    def _segmento(self, pilha, tamanho):
+        segmento = shared_memory.SharedMemory(PREFIXO + secrets.token_hex(8), create=True,
+                                              size=max(tamanho, 1))
+        pilha.callback(segmento.unlink)
+        pilha.callback(segmento.close)
+        return segmento
+
+    def _copia_para_segmento(self, pilha, valores):
+        segmento = self._segmento(pilha, len(valores) * 8)
+        visao = memoryview(valores).cast('B')
+        try:
+            segmento.buf[:len(visao)] = visao
+        finally:
+            visao.release()
+        return segmento.name
+
+    def executar(self, operacao, a, b=None, tipo=None, tipo_operando=None):
+        """Aplica ``operacao`` a ``a`` (e ``b``, sequência ou escalar) em paralelo.
+
+        ``operacao`` é uma das quatro operações da Calculadora ou
+        ``pense_num_numero``/``pense_num_numero2``. ``tipo`` e
+        ``tipo_operando`` ('float64' ou 'int64') forçam o tipo das colunas;
+        sem eles o tipo é deduzido dos valores. Falhas do jogo levantam
+        ``EntradaInvalida`` com o índice global do elemento.
+        """
+        a, typecode, b, typecode_b, operando, typecode_saida = preparar(
+            operacao, a, b, tipo, tipo_operando)
+        try:
+            return self._executa(operacao, a, typecode, b, typecode_b, operando,
+                                 typecode_saida)
+        except (OverflowError, TypeError):
+            if typecode_saida != 'q':
+                raise
+        # Algum resultado não é um int de 64 bits: refaz com saída float64
+        return self._executa(operacao, a, typecode, b, typecode_b, operando, 'd')
+
+    def _executa(self, operacao, a, typecode, b, typecode_b, operando, typecode_saida):
+        elementos = len(a)
+        if elementos == 0:
+            return array(typecode_saida)
+
+        tamanho_bloco = self.tamanho_bloco or max(
+            BLOCO_MINIMO, -(-elementos // (self.trabalhadores * _BLOCOS_POR_TRABALHADOR)))
+        with ExitStack() as pilha:
+            nome_a = self._copia_para_segmento(pilha, a)
+            nome_b = None if typecode_b is None else self._copia_para_segmento(pilha, b)
+            saida = self._segmento(pilha, elementos * 8)
+            executor = self._executor_ativo()
+            futuros = [
+                executor.submit(_processa_bloco, operacao, nome_a, typecode, operando,
+                                nome_b, typecode_b, saida.name, typecode_saida, elementos,
+                                inicio, min(inicio + tamanho_bloco, elementos))
+                for inicio in range(0, elementos, tamanho_bloco)
+            ]
+            try:
+                for futuro in futuros:
+                    futuro.result()
+            except BrokenProcessPool:
+                # Um filho morreu: o pool não serve mais, o próximo é novo
+                self._descarta_executor()
+                raise
+            except BaseException:
+                for futuro in futuros:
+                    futuro.cancel()
+                raise
+            resultado = array(typecode_saida)
+            resultado.frombytes(saida.buf[:elementos * 8])
+        return resultado
+
+    def soma(self, a, b):
+        return self.executar('soma', a, b)
+
+    def subtracao(self, a, b):
+        return self.executar('subtracao', a, b)
+
+    def multiplicacao(self, a, b):
+        return self.executar('multiplicacao', a, b)
+
+    def divisao(self, a, b):
+        return self.executar('divisao', a, b)
+
+    def pense_num_numero(self, entradas):
+        return self.executar('pense_num_numero', entradas)
+
+    def pense_num_numero2(self, entradas):
+        return self.executar('pense_num_numero2', entradas)
+
+    def _descarta_executor(self):
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def fechar(self):
+        self._descarta_executor()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
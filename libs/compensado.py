@@ -0,0 +1,277 @@
+"""
+Aritmética compensada (double-double) para cadeias longas de floats.
+
+Cada valor é um par ``(hi, lo)`` de floats não sobrepostos cuja soma exata
+é o número representado: ``hi`` é o float mais próximo e ``lo`` carrega o
+erro de arredondamento que um float sozinho descartaria. As operações usam
+as transformações sem erro TwoSum (Knuth) e TwoProduct (Dekker, ou
+``math.fma`` quando disponível), o que dá cerca de 106 bits de mantissa,
+contra 53 do float, por um custo constante por operação, bem menor que o
+de Decimal ou Fraction.
+
+Ints entram exatos até ~106 bits de mantissa; ints fora da faixa do float
+(acima de ~1.8e308) levantam OverflowError, como ``float(n)``, exceto nas
+comparações, que usam o valor exato.
+
+``CalculadoraCompensada`` tem a mesma interface da Calculadora sobre esse
+tipo e pode ser passada ao jogo
+(``pense_num_numero(x, calculadora=CalculadoraCompensada)``).
+"""
+
+import math
+from fractions import Fraction
+
+# 2**27 + 1: divide um float de 53 bits em duas metades de 26 bits (Dekker)
+_DIVISOR = 134217729.0
+
+_fma = getattr(math, 'fma', None)
+
+
+def two_sum(a, b):
+    """Retorna ``(s, e)`` com ``s = fl(a + b)`` e ``a + b = s + e`` exatamente."""
+    s = a + b
+    bb = s - a
+    return s, (a - (s - bb)) + (b - bb)
+
+
+def _separa(a):
+    c = _DIVISOR * a
+    alto = c - (c - a)
+    return alto, a - alto
+
+
+def two_product(a, b):
+    """Retorna ``(p, e)`` com ``p = fl(a * b)`` e ``a * b = p + e`` exatamente.
+
+    Sem ``math.fma`` usa a separação de Dekker, exata enquanto os produtos
+    parciais não estouram (``|a|``, ``|b|`` abaixo de ~1e300).
+    """
+    p = a * b
+    if _fma is not None:
+        return p, _fma(a, b, -p)
+    a_alto, a_baixo = _separa(a)
+    b_alto, b_baixo = _separa(b)
+    return p, ((a_alto * b_alto - p) + a_alto * b_baixo + a_baixo * b_alto) + a_baixo * b_baixo
+
+
+def _partes(valor):
+    """Retorna ``(hi, lo)`` de um operando, ou None se o tipo não é suportado."""
+    tipo = type(valor)
+    if tipo is Compensado:
+        return valor.hi, valor.lo
+    if tipo is float:
+        return valor, 0.0
+    if tipo is int or tipo is bool:
+        try:
+            hi = float(valor)
+        except OverflowError:
+            raise OverflowError(f'int de {valor.bit_length()} bits fora da faixa do float '
+                                'não cabe em Compensado') from None
+        return hi, float(valor - int(hi))
+    return None
+
+
+class Compensado:
+    """Float com termo de erro: o valor é ``hi + lo`` calculado exatamente."""
+
+    __slots__ = ('hi', 'lo')
+
+    def __init__(self, valor=0.0, lo=None):
+        if lo is None:
+            partes = _partes(valor)
+            if partes is None:
+                raise TypeError('Compensado aceita apenas int, float ou Compensado')
+            valor, lo = partes
+        self.hi = valor
+        self.lo = lo
+
+    @classmethod
+    def _novo(cls, s, e):
+        """Normaliza ``s + e`` (FastTwoSum) sem validação."""
+        obj = object.__new__(cls)
+        hi = s + e
+        if hi - hi != 0:
+            # inf ou nan: o termo de erro deixa de ter sentido
+            obj.hi = s if s - s != 0 else hi
+            obj.lo = 0.0
+            return obj
+        obj.hi = hi
+        obj.lo = e - (hi - s)
+        return obj
+
+    # ------------------------------------------------------------------
+    # Aritmética
+    # ------------------------------------------------------------------
+
+    def __add__(self, outro):
+        partes = _partes(outro)
+        if partes is None:
+            return NotImplemented
+        b_hi, b_lo = partes
+        a_hi = self.hi
+        # TwoSum dos termos altos e dos baixos, depois renormaliza
+        s = a_hi + b_hi
+        if s - s != 0:
+            return Compensado(s, 0.0)
+        bb = s - a_hi
+        e = (a_hi - (s - bb)) + (b_hi - bb)
+        t = self.lo + b_lo
+        bb = t - self.lo
+        f = (self.lo - (t - bb)) + (b_lo - bb)
+        e += t
+        hi = s + e
+        e = e - (hi - s)
+        return Compensado._novo(hi, e + f)
+
+    __radd__ = __add__
+
+    def __neg__(self):
+        obj = object.__new__(Compensado)
+        obj.hi = -self.hi
+        obj.lo = -self.lo
+        return obj
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return -self if self.hi < 0 else self
+
+    def __sub__(self, outro):
+        partes = _partes(outro)
+        if partes is None:
+            return NotImplemented
+        negado = object.__new__(Compensado)
+        negado.hi = -partes[0]
+        negado.lo = -partes[1]
+        return self + negado
+
+    def __rsub__(self, outro):
+        partes = _partes(outro)
+        if partes is None:
+            return NotImplemented
+        return Compensado(*partes) + -self
+
+    def __mul__(self, outro):
+        partes = _partes(outro)
+        if partes is None:
+            return NotImplemented
+        b_hi, b_lo = partes
+        p, e = two_product(self.hi, b_hi)
+        if p - p != 0:
+            return Compensado(p, 0.0)
+        return Compensado._novo(p, e + (self.hi * b_lo + self.lo * b_hi))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, outro):
+        partes = _partes(outro)
+        if partes is None:
+            return NotImplemented
+        return _divide(self.hi, self.lo, *partes)
+
+    def __rtruediv__(self, outro):
+        partes = _partes(outro)
+        if partes is None:
+            return NotImplemented
+        return _divide(partes[0], partes[1], self.hi, self.lo)
+
+    # ------------------------------------------------------------------
+    # Leitura: comparações e conversões
+    # ------------------------------------------------------------------
+
+    def _compara(self, outro):
+        try:
+            partes = _partes(outro)
+        except OverflowError:
+            # int além da faixa do float: compara com o valor exato
+            hi = self.hi
+            return (hi if hi - hi != 0 else self.para_fracao()), outro
+        if partes is None:
+            return None
+        return (self.hi, self.lo), partes
+
+    def __eq__(self, outro):
+        pares = self._compara(outro)
+        return NotImplemented if pares is None else pares[0] == pares[1]
+
+    def __lt__(self, outro):
+        pares = self._compara(outro)
+        return NotImplemented if pares is None else pares[0] < pares[1]
+
+    def __le__(self, outro):
+        pares = self._compara(outro)
+        return NotImplemented if pares is None else pares[0] <= pares[1]
+
+    def __gt__(self, outro):
+        pares = self._compara(outro)
+        return NotImplemented if pares is None else pares[0] > pares[1]
+
+    def __ge__(self, outro):
+        pares = self._compara(outro)
+        return NotImplemented if pares is None else pares[0] >= pares[1]
+
+    def __hash__(self):
+        # Valores iguais precisam do mesmo hash: sem termo de erro é o do
+        # float; com ele, o do valor exato (o mesmo do int igual, se houver)
+        return hash(self.hi) if self.lo == 0 else hash(self.para_fracao())
+
+    def __bool__(self):
+        return self.hi != 0
+
+    def __float__(self):
+        return self.hi
+
+    def para_fracao(self):
+        """Valor exato ``hi + lo`` como Fraction."""
+        return Fraction(self.hi) + Fraction(self.lo)
+
+    def __repr__(self):
+        return f'Compensado({self.hi!r}, {self.lo!r})'
+
+    def __str__(self):
+        return repr(self.hi)
+
+
+def _divide(a_hi, a_lo, b_hi, b_lo):
+    """Divisão double-double: quociente float mais uma correção pelo resto exato."""
+    q1 = a_hi / b_hi
+    if q1 - q1 != 0:
+        return Compensado(q1, 0.0)
+    # resto = a - q1 * b, com q1 * b_hi calculado sem erro por TwoProduct
+    p, e = two_product(q1, b_hi)
+    resto = (((a_hi - p) - e) + a_lo) - q1 * b_lo
+    return Compensado._novo(q1, resto / b_hi)
+
+
+def _converte(valor):
+    if type(valor) is Compensado:
+        return valor
+    partes = _partes(valor)
+    if partes is None:
+        raise TypeError(f'operando não suportado: {type(valor).__name__}')
+    return Compensado(*partes)
+
+
+class CalculadoraCompensada:
+    """Calculadora double-double: mesma interface da Calculadora.
+
+    Aceita int, float e Compensado e sempre retorna Compensado; use
+    ``float(resultado)`` para voltar ao float mais próximo.
+    """
+
+    @staticmethod
+    def soma(a, b):
+        return _converte(a) + b
+
+    @staticmethod
+    def subtracao(a, b):
+        return _converte(a) - b
+
+    @staticmethod
+    def multiplicacao(a, b):
+        return _converte(a) * b
+
+    @staticmethod
+    def divisao(a, b):
+        return _converte(a) / b
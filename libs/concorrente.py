@@ -0,0 +1,258 @@
+"""
+Execução de lotes da Calculadora e do jogo em threads, segura sem o GIL.
+
+No CPython com threads livres (3.13t+) várias threads executam bytecode ao
+mesmo tempo, e qualquer estado compartilhado mutável vira corrida de dados.
+``ExecutorConcorrente`` divide as colunas em blocos e os processa em um
+``ThreadPoolExecutor`` sem compartilhar nada mutável entre as threads:
+
+- as entradas só são lidas (não as altere durante a chamada);
+- cada bloco produz o próprio ``array.array``, juntado na ordem pela thread
+  que chamou, em vez de várias threads escreverem no mesmo resultado;
+- cada thread tem seu estado em ``threading.local``: a instância de
+  ``calculadora`` (uma por thread, criada pela fábrica informada, para
+  backends com estado como caches ou contadores) e os contadores de blocos
+  e elementos, que só a própria thread incrementa. O estado de cada thread
+  entra na lista do executor uma única vez, sob um lock (a lista é
+  compartilhada); depois disso nenhum bloco toma lock. ``estatisticas``
+  soma os contadores de todas as threads.
+
+A ``Calculadora`` só tem métodos estáticos, então a instância ``c`` de
+``libs.jogo`` não guarda estado e continua segura; estado novo deve entrar
+por ``calculadora=`` e não por atributos globais.
+
+Em builds com GIL as threads não rodam em paralelo: o modo automático usa
+processos (``PoolCompartilhado``, colunas em memória compartilhada).
+"""
+
+import os
+import sys
+import threading
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import repeat
+
+from libs.compartilhado import PoolCompartilhado, preparar
+from libs.jogo import LEVANTAR, _processa_lote
+from libs.mapeado import OPERACOES_BINARIAS, OPERACOES_JOGO
+
+THREADS = 'threads'
+PROCESSOS = 'processos'
+
+_MODOS = (THREADS, PROCESSOS)
+
+# Blocos por thread quando tamanho_bloco não é informado
+_BLOCOS_POR_TRABALHADOR = 4
+
+# Abaixo disso o envio da tarefa ao pool custa mais que o bloco
+BLOCO_MINIMO = 1 << 12
+
+
+def gil_ativo():
+    """True se o interpretador atual executa com o GIL."""
+    verifica = getattr(sys, '_is_gil_enabled', None)
+    return True if verifica is None else verifica()
+
+
+class _EstadoThread:
+    """Estado de uma thread do pool; só a própria thread o altera."""
+
+    __slots__ = ('calculadora', 'blocos', 'elementos')
+
+    def __init__(self, calculadora):
+        self.calculadora = calculadora
+        self.blocos = 0
+        self.elementos = 0
+
+
+def _fatia(coluna, inicio, fim):
+    fatia = coluna[inicio:fim]
+    if isinstance(fatia, memoryview):
+        valores = array(fatia.format)
+        valores.frombytes(fatia.cast('B'))
+        return valores
+    return fatia
+
+
+def _confere_exatos(resultados, inicio):
+    """Recusa resultados (Racional, Fraction, Decimal) que o float64 arredondaria."""
+    for deslocamento, valor in enumerate(resultados):
+        tipo = type(valor)
+        if tipo is not float and tipo is not int and float(valor) != valor:
+            raise TypeError(
+                f'índice {inicio + deslocamento}: {valor!r} ({tipo.__name__}) não cabe '
+                'em float64 sem perda; use a calculadora diretamente para resultados exatos')
+    return resultados
+
+
+def _aplica_jogo(funcao, valores, inicio, exatos=False):
+    try:
+        if not exatos:
+            return array('d', map(funcao, valores))
+        resultados = list(map(funcao, valores))
+    except Exception:
+        # Refaz um a um só para achar o índice do elemento inválido
+        _processa_lote(funcao, valores, inicio, LEVANTAR, None, None)
+        raise
+    return array('d', _confere_exatos(resultados, inicio))
+
+
+class ExecutorConcorrente:
+    """Aplica as operações da Calculadora e o jogo a colunas em paralelo.
+
+    ``modo`` é ``'threads'``, ``'processos'`` ou None (threads sem GIL,
+    processos com GIL). ``calculadora`` é uma fábrica (por exemplo a própria
+    classe ``CalculadoraRacional``) chamada uma vez por thread; sem ela as
+    operações usam ``Calculadora.*_lote`` e o jogo a forma fechada. O
+    resultado é um ``array.array``, como no ``PoolCompartilhado``.
+
+    Resultados da ``calculadora`` que não são int nem float (``Racional``,
+    ``Fraction``, ``Decimal``) só entram no array float64 se couberem nele
+    exatamente; uma divisão racional como 1/3 levanta ``TypeError`` em vez de
+    virar float calado. Para resultados exatos use a calculadora diretamente.
+    """
+
+    def __init__(self, trabalhadores=None, modo=None, calculadora=None, tamanho_bloco=None):
+        if trabalhadores is None:
+            trabalhadores = os.cpu_count() or 1
+        if trabalhadores < 1:
+            raise ValueError('trabalhadores precisa ser positivo')
+        if tamanho_bloco is not None and tamanho_bloco < 1:
+            raise ValueError('tamanho_bloco precisa ser positivo')
+        if modo is None:
+            modo = PROCESSOS if gil_ativo() else THREADS
+        if modo not in _MODOS:
+            raise ValueError(f'modo inválido: {modo!r}')
+        if modo == PROCESSOS and calculadora is not None:
+            raise ValueError('calculadora por thread só existe no modo threads')
+        self.trabalhadores = trabalhadores
+        self.modo = modo
+        self.tamanho_bloco = tamanho_bloco
+        self._fabrica = calculadora
+        self._local = threading.local()
+        self._estados = []
+        self._lock_estados = threading.Lock()
+        if modo == THREADS:
+            self._executor = ThreadPoolExecutor(trabalhadores, thread_name_prefix='calculo')
+        else:
+            self._executor = PoolCompartilhado(trabalhadores, tamanho_bloco)
+
+    def _estado(self):
+        estado = getattr(self._local, 'estado', None)
+        if estado is None:
+            fabrica = self._fabrica
+            estado = _EstadoThread(fabrica() if fabrica is not None else None)
+            self._local.estado = estado
+            # Uma vez por thread; a lista é compartilhada entre as threads do pool
+            with self._lock_estados:
+                self._estados.append(estado)
+        return estado
+
+    def _bloco(self, operacao, a, b, operando, typecode_saida, inicio, fim):
+        """Executado em uma thread do pool: resultado do bloco ``[inicio, fim)``."""
+        estado = self._estado()
+        calculadora = estado.calculadora
+        valores = _fatia(a, inicio, fim)
+        if operacao in OPERACOES_JOGO:
+            funcao = OPERACOES_JOGO[operacao]
+            if calculadora is not None:
+                funcao = partial(funcao, calculadora=calculadora)
+            resultado = _aplica_jogo(funcao, valores, inicio, calculadora is not None)
+        else:
+            segundo = operando if b is None else _fatia(b, inicio, fim)
+            if calculadora is None:
+                resultado = OPERACOES_BINARIAS[operacao](valores, segundo, compacto=True)
+            else:
+                segundos = repeat(segundo) if b is None else segundo
+                resultado = list(map(getattr(calculadora, operacao), valores, segundos))
+                if typecode_saida == 'd':
+                    _confere_exatos(resultado, inicio)
+            if not isinstance(resultado, array) or resultado.typecode != typecode_saida:
+                resultado = array(typecode_saida, resultado)
+        estado.blocos += 1
+        estado.elementos += fim - inicio
+        return resultado
+
+    def executar(self, operacao, a, b=None, tipo=None, tipo_operando=None):
+        """Aplica ``operacao`` a ``a`` (e ``b``, sequência ou escalar).
+
+        Mesmos argumentos e regras de tipo de ``PoolCompartilhado.executar``;
+        falhas do jogo levantam ``EntradaInvalida`` com o índice global.
+        """
+        if self.modo == PROCESSOS:
+            return self._executor.executar(operacao, a, b, tipo, tipo_operando)
+        a, _, b, _, operando, typecode_saida = preparar(operacao, a, b, tipo, tipo_operando)
+        try:
+            return self._executa(operacao, a, b, operando, typecode_saida)
+        except (OverflowError, TypeError):
+            if typecode_saida != 'q':
+                raise
+        # Algum resultado não é um int de 64 bits: refaz com saída float64
+        return self._executa(operacao, a, b, operando, 'd')
+
+    def _executa(self, operacao, a, b, operando, typecode_saida):
+        elementos = len(a)
+        tamanho_bloco = self.tamanho_bloco or max(
+            BLOCO_MINIMO, -(-elementos // (self.trabalhadores * _BLOCOS_POR_TRABALHADOR)))
+        futuros = [
+            self._executor.submit(self._bloco, operacao, a, b, operando, typecode_saida,
+                                  inicio, min(inicio + tamanho_bloco, elementos))
+            for inicio in range(0, elementos, tamanho_bloco)
+        ]
+        resultado = array(typecode_saida)
+        try:
+            for futuro in futuros:
+                resultado.extend(futuro.result())
+        except BaseException:
+            for futuro in futuros:
+                futuro.cancel()
+            raise
+        return resultado
+
+    def soma(self, a, b):
+        return self.executar('soma', a, b)
+
+    def subtracao(self, a, b):
+        return self.executar('subtracao', a, b)
+
+    def multiplicacao(self, a, b):
+        return self.executar('multiplicacao', a, b)
+
+    def divisao(self, a, b):
+        return self.executar('divisao', a, b)
+
+    def pense_num_numero(self, entradas):
+        return self.executar('pense_num_numero', entradas)
+
+    def pense_num_numero2(self, entradas):
+        return self.executar('pense_num_numero2', entradas)
+
+    def estatisticas(self):
+        """Soma dos contadores de cada thread.
+
+        A lista de estados é copiada sob o lock; os contadores são lidos sem
+        ele, então blocos em andamento podem ou não entrar na soma.
+        """
+        with self._lock_estados:
+            estados = list(self._estados)
+        return {
+            'modo': self.modo,
+            'gil': gil_ativo(),
+            'trabalhadores': self.trabalhadores,
+            'threads': len(estados),
+            'blocos': sum(estado.blocos for estado in estados),
+            'elementos': sum(estado.elementos for estado in estados),
+        }
+
+    def fechar(self):
+        if self.modo == THREADS:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+        else:
+            self._executor.fechar()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
@@ -0,0 +1,555 @@
+"""
+Compilador de expressões do jogo com cache persistente de planos.
+
+Variantes do jogo são descritas como texto, por exemplo
+``"((x+5)*2-4)/2-x"``. ``analisar`` transforma o texto em uma árvore cujos
+nós de operação são as operações da Calculadora (soma, subtracao,
+multiplicacao, divisao). ``compilar`` gera a partir da árvore uma única
+função Python com os operadores em linha, sem uma chamada de método por
+etapa, e uma versão em lote que avalia a expressão dentro de uma list
+comprehension.
+
+Os planos compilados ficam em um CacheLRU em memória e, em disco, como o
+fonte gerado (um arquivo por expressão). Um processo novo que encontra o
+arquivo não analisa a expressão de novo, só compila o fonte. Cada arquivo é
+assinado com HMAC-SHA256 por uma chave aleatória do usuário, guardada no
+próprio diretório (criado com permissão 0o700); um arquivo com assinatura
+inválida é ignorado, e um diretório de outro usuário ou gravável por outros
+desliga o cache em disco. O fonte é executado com ``exec``: só o que o
+próprio usuário gravou pode chegar lá.
+
+Exemplo:
+    >>> plano = compilar('((x+5)*2-4)/2-x')
+    >>> plano(10)
+    3.0
+    >>> plano.lote([1, 2, 3])
+    [3.0, 3.0, 3.0]
+"""
+
+import hashlib
+import hmac
+import json
+import keyword
+import os
+import secrets
+import threading
+from array import array
+from itertools import repeat
+
+from libs.cache import CacheLRU
+from libs.calculadora import Calculadora, _eh_escalar, _numpy
+
+# Muda quando o conteúdo dos arquivos de plano muda de formato ou quando
+# planos já gravados deixam de valer (2: variáveis reservadas recusadas;
+# 3: fonte assinado no lugar de code objects)
+VERSAO_FORMATO = 3
+
+DIRETORIO_PADRAO = os.environ.get(
+    'CALCULADORA_PLANOS',
+    os.path.join(os.path.expanduser('~'), '.cache', 'calculadora', 'planos'),
+)
+
+OPERADORES = {
+    '+': 'soma',
+    '-': 'subtracao',
+    '*': 'multiplicacao',
+    '/': 'divisao',
+}
+_SIMBOLOS = {nome: simbolo for simbolo, nome in OPERADORES.items()}
+
+# Nomes que o código gerado usa; uma variável com um deles o esconderia
+NOMES_RESERVADOS = frozenset(('zip', 'TypeError', 'plano', 'plano_lote'))
+
+# Arquivo da chave que assina os planos em disco
+NOME_CHAVE = 'chave'
+_TAMANHO_CHAVE = 32
+_TAMANHO_ASSINATURA = hashlib.sha256().digest_size
+
+
+class ErroSintaxe(ValueError):
+    """Expressão mal formada; ``posicao`` é o índice do caractere no texto."""
+
+    def __init__(self, mensagem, expressao, posicao):
+        super().__init__(f'{mensagem} (posição {posicao}): {expressao!r}')
+        self.expressao = expressao
+        self.posicao = posicao
+
+
+# ============================================================================
+# ÁRVORE
+# ============================================================================
+
+class Numero:
+    __slots__ = ('valor',)
+
+    def __init__(self, valor):
+        self.valor = valor
+
+    def __eq__(self, outro):
+        return type(outro) is Numero and type(outro.valor) is type(self.valor) \
+            and outro.valor == self.valor
+
+    def __repr__(self):
+        return f'Numero({self.valor!r})'
+
+
+class Variavel:
+    __slots__ = ('nome',)
+
+    def __init__(self, nome):
+        self.nome = nome
+
+    def __eq__(self, outro):
+        return type(outro) is Variavel and outro.nome == self.nome
+
+    def __repr__(self):
+        return f'Variavel({self.nome!r})'
+
+
+class Negacao:
+    __slots__ = ('operando',)
+
+    def __init__(self, operando):
+        self.operando = operando
+
+    def __eq__(self, outro):
+        return type(outro) is Negacao and outro.operando == self.operando
+
+    def __repr__(self):
+        return f'Negacao({self.operando!r})'
+
+
+class Operacao:
+    """Nó binário; ``nome`` é o método correspondente da Calculadora."""
+
+    __slots__ = ('nome', 'esquerda', 'direita')
+
+    def __init__(self, nome, esquerda, direita):
+        self.nome = nome
+        self.esquerda = esquerda
+        self.direita = direita
+
+    def __eq__(self, outro):
+        return (type(outro) is Operacao and outro.nome == self.nome
+                and outro.esquerda == self.esquerda and outro.direita == self.direita)
+
+    def __repr__(self):
+        return f'Operacao({self.nome!r}, {self.esquerda!r}, {self.direita!r})'
+
+
+# ============================================================================
+# ANÁLISE SINTÁTICA
+# ============================================================================
+
+def nome_valido(nome):
+    """True se ``nome`` pode ser parâmetro do código gerado.
+
+    Recusa palavras-chave (``if``, ``None``...), nomes com ``_`` no início
+    (reservados aos temporários) e ``NOMES_RESERVADOS``.
+    """
+    return (nome.isidentifier() and not nome.startswith('_')
+            and not keyword.iskeyword(nome) and nome not in NOMES_RESERVADOS)
+
+
+def _tokens(expressao):
+    """Gera ``(tipo, valor, posicao)``; tipo é 'num', 'nome' ou o próprio símbolo."""
+    i = 0
+    n = len(expressao)
+    while i < n:
+        caractere = expressao[i]
+        if caractere.isspace():
+            i += 1
+        elif caractere in '+-*/()':
+            yield caractere, caractere, i
+            i += 1
+        elif caractere.isdigit() or caractere == '.':
+            inicio = i
+            while i < n and (expressao[i].isdigit() or expressao[i] == '.'):
+                i += 1
+            if i < n and expressao[i] in 'eE':
+                j = i + 1
+                if j < n and expressao[j] in '+-':
+                    j += 1
+                if j < n and expressao[j].isdigit():
+                    i = j
+                    while i < n and expressao[i].isdigit():
+                        i += 1
+            texto = expressao[inicio:i]
+            try:
+                valor = int(texto) if texto.isdigit() else float(texto)
+            except ValueError:
+                raise ErroSintaxe(f'número inválido {texto!r}', expressao, inicio) from None
+            if valor - valor != 0:
+                raise ErroSintaxe(f'número não finito {texto!r}', expressao, inicio)
+            yield 'num', valor, inicio
+        elif caractere.isalpha() or caractere == '_':
+            inicio = i
+            while i < n and (expressao[i].isalnum() or expressao[i] == '_'):
+                i += 1
+            nome = expressao[inicio:i]
+            if not nome_valido(nome):
+                raise ErroSintaxe(f'nome de variável inválido {nome!r}', expressao, inicio)
+            yield 'nome', nome, inicio
+        else:
+            raise ErroSintaxe(f'caractere inesperado {caractere!r}', expressao, i)
+    yield 'fim', None, n
+
+
+class _Analisador:
+    """Descida recursiva com a precedência usual: ``* /`` antes de ``+ -``."""
+
+    def __init__(self, expressao):
+        self.expressao = expressao
+        self.tokens = _tokens(expressao)
+        self.atual = next(self.tokens)
+
+    def _avanca(self):
+        token = self.atual
+        self.atual = next(self.tokens)
+        return token
+
+    def _erro(self, mensagem):
+        return ErroSintaxe(mensagem, self.expressao, self.atual[2])
+
+    def expressao_completa(self):
+        arvore = self._soma()
+        if self.atual[0] != 'fim':
+            raise self._erro(f'token inesperado {self.atual[1]!r}')
+        return arvore
+
+    def _soma(self):
+        arvore = self._produto()
+        while self.atual[0] in '+-':
+            simbolo = self._avanca()[0]
+            arvore = Operacao(OPERADORES[simbolo], arvore, self._produto())
+        return arvore
+
+    def _produto(self):
+        arvore = self._unario()
+        while self.atual[0] in '*/':
+            simbolo = self._avanca()[0]
+            arvore = Operacao(OPERADORES[simbolo], arvore, self._unario())
+        return arvore
+
+    def _unario(self):
+        if self.atual[0] == '+':
+            self._avanca()
+            return self._unario()
+        if self.atual[0] == '-':
+            self._avanca()
+            operando = self._unario()
+            if type(operando) is Numero:
+                return Numero(-operando.valor)
+            return Negacao(operando)
+        return self._atomo()
+
+    def _atomo(self):
+        tipo, valor, _ = self.atual
+        if tipo == 'num':
+            self._avanca()
+            return Numero(valor)
+        if tipo == 'nome':
+            self._avanca()
+            return Variavel(valor)
+        if tipo == '(':
+            self._avanca()
+            arvore = self._soma()
+            if self.atual[0] != ')':
+                raise self._erro("esperado ')'")
+            self._avanca()
+            return arvore
+        if tipo == 'fim':
+            raise self._erro('expressão incompleta')
+        raise self._erro(f'token inesperado {valor!r}')
+
+
+def analisar(expressao):
+    """Transforma o texto em árvore; levanta ErroSintaxe se mal formado."""
+    return _Analisador(expressao).expressao_completa()
+
+
+def variaveis(arvore):
+    """Nomes das variáveis na ordem em que aparecem pela primeira vez."""
+    nomes = []
+    pilha = [arvore]
+    while pilha:
+        no = pilha.pop()
+        if type(no) is Variavel:
+            if no.nome not in nomes:
+                nomes.append(no.nome)
+        elif type(no) is Negacao:
+            pilha.append(no.operando)
+        elif type(no) is Operacao:
+            pilha.append(no.direita)
+            pilha.append(no.esquerda)
+    return nomes
+
+
+def interpretar(arvore, valores, calculadora=None):
+    """Avalia a árvore chamando a Calculadora etapa por etapa (referência).
+
+    ``valores`` mapeia nome da variável em valor. ``calculadora`` permite
+    trocar o backend, como em ``jogo.pense_num_numero``.
+    """
+    calc = calculadora if calculadora is not None else Calculadora
+    tipo = type(arvore)
+    if tipo is Numero:
+        return arvore.valor
+    if tipo is Variavel:
+        return valores[arvore.nome]
+    if tipo is Negacao:
+        return calc.multiplicacao(-1, interpretar(arvore.operando, valores, calculadora))
+    return getattr(calc, arvore.nome)(interpretar(arvore.esquerda, valores, calculadora),
+                                      interpretar(arvore.direita, valores, calculadora))
+
+
+# ============================================================================
+# GERAÇÃO DE CÓDIGO
+# ============================================================================
+
+def _fonte(arvore):
+    tipo = type(arvore)
+    if tipo is Numero:
+        texto = repr(arvore.valor)
+        return f'({texto})' if arvore.valor < 0 else texto
+    if tipo is Variavel:
+        return arvore.nome
+    if tipo is Negacao:
+        return f'(-{_fonte(arvore.operando)})'
+    return f'({_fonte(arvore.esquerda)} {_SIMBOLOS[arvore.nome]} {_fonte(arvore.direita)})'
+
+
+def _gera_float(arvore):
+    """True se o resultado é float mesmo para operandos inteiros."""
+    tipo = type(arvore)
+    if tipo is Numero:
+        return type(arvore.valor) is float
+    if tipo is Negacao:
+        return _gera_float(arvore.operando)
+    if tipo is Operacao:
+        return (arvore.nome == 'divisao' or _gera_float(arvore.esquerda)
+                or _gera_float(arvore.direita))
+    return False
+
+
+def gerar_fonte(arvore):
+    """Retorna ``(variaveis, fonte)`` das funções escalar e em lote."""
+    nomes = variaveis(arvore)
+    parametros = ', '.join(nomes)
+    corpo = _fonte(arvore)
+    if nomes:
+        alvo = nomes[0] if len(nomes) == 1 else parametros
+        iteravel = nomes[0] if len(nomes) == 1 else f'zip({parametros})'
+        lote = f'    return [{corpo} for {alvo} in {iteravel}]\n'
+    else:
+        lote = '    raise TypeError("expressão sem variáveis não tem avaliação em lote")\n'
+    fonte = (
+        f'def plano({parametros}):\n'
+        f'    return {corpo}\n'
+        f'def plano_lote({parametros}):\n'
+        f'{lote}'
+    )
+    return nomes, fonte
+
+
+# ============================================================================
+# PLANOS
+# ============================================================================
+
+class Plano:
+    """Expressão compilada: chame para um valor ou use ``lote`` para sequências."""
+
+    __slots__ = ('expressao', 'variaveis', 'gera_float', 'funcao', '_funcao_lote')
+
+    def __init__(self, expressao, variaveis, gera_float, codigo):
+        escopo = {}
+        # Os builtins reduzidos só evitam que o código gerado veja nomes por
+        # acaso; não isolam nada, então ``codigo`` precisa ser confiável
+        exec(codigo, {'__builtins__': {'zip': zip, 'TypeError': TypeError}}, escopo)
+        self.expressao = expressao
+        self.variaveis = tuple(variaveis)
+        self.gera_float = gera_float
+        self.funcao = escopo['plano']
+        self._funcao_lote = escopo['plano_lote']
+
+    def __call__(self, *args):
+        return self.funcao(*args)
+
+    def lote(self, *args):
+        """Avalia a expressão elemento a elemento.
+
+        Segue a convenção de ``Calculadora.*_lote``: sequências do mesmo
+        tamanho ou escalares (repetidos); ao menos uma sequência. Entrada
+        array.array gera array.array; ndarray é avaliado pelo próprio NumPy.
+        """
+        if len(args) != len(self.variaveis):
+            raise TypeError(f'plano espera {len(self.variaveis)} argumento(s), '
+                            f'recebeu {len(args)}')
+        np = _numpy()
+        if np is not None and any(isinstance(arg, np.ndarray) for arg in args):
+            with np.errstate(divide='raise', invalid='raise'):
+                try:
+                    return self.funcao(*args)
+                except FloatingPointError:
+                    raise ZeroDivisionError('divisão por zero') from None
+
+        tamanhos = {len(arg) for arg in args if not _eh_escalar(arg)}
+        if not tamanhos:
+            raise TypeError('operações em lote precisam de ao menos uma sequência')
+        if len(tamanhos) > 1:
+            raise ValueError(f'sequências com tamanhos diferentes: {sorted(tamanhos)}')
+        tamanho = tamanhos.pop()
+        argumentos = [repeat(arg, tamanho) if _eh_escalar(arg) else arg for arg in args]
+        resultado = self._funcao_lote(*argumentos)
+
+        arrays = [arg for arg in args if isinstance(arg, array)]
+        if arrays:
+            flutuante = self.gera_float or any(arg.typecode in 'fd' for arg in arrays) \
+                or any(type(arg) is float for arg in args)
+            return array('d' if flutuante else 'q', resultado)
+        return resultado
+
+    def __repr__(self):
+        return f'Plano({self.expressao!r})'
+
+
+def _compila(fonte, expressao):
+    return compile(fonte, f'<plano {expressao}>', 'exec')
+
+
+def _confere_dono(caminho, info, permissoes_proibidas):
+    """Levanta PermissionError se ``caminho`` é de outro usuário ou tem permissões demais."""
+    if not hasattr(os, 'getuid'):   # Windows: sem uid nem bits de permissão
+        return
+    if info.st_uid != os.getuid() or info.st_mode & permissoes_proibidas:
+        raise PermissionError(f'{caminho}: é de outro usuário ou acessível por outros')
+
+
+def _assinatura(chave, conteudo):
+    return hmac.new(chave, conteudo, hashlib.sha256).digest()
+
+
+class Compilador:
+    """Compila expressões com cache em memória (LRU) e em disco (fonte assinado).
+
+    ``diretorio=None`` desliga o cache em disco. Falhas de E/S no diretório
+    de cache nunca impedem a compilação: o plano só deixa de ser gravado ou
+    lido, o que também vale para um diretório que não seja só do usuário.
+    """
+
+    def __init__(self, diretorio=DIRETORIO_PADRAO, tamanho_maximo=1024):
+        self.diretorio = diretorio
+        self._memoria = CacheLRU(tamanho_maximo)
+        self._lock = threading.Lock()
+        self._chave = None
+        self.compilacoes = 0
+        self.carregados_do_disco = 0
+
+    def _caminho(self, expressao):
+        resumo = hashlib.sha256(expressao.encode()).hexdigest()[:32]
+        return os.path.join(self.diretorio, f'{resumo}.plano')
+
+    def _chave_do_usuario(self):
+        """Chave HMAC do diretório, criada na primeira vez; OSError se inseguro."""
+        if self._chave is not None:
+            return self._chave
+        os.makedirs(self.diretorio, mode=0o700, exist_ok=True)
+        _confere_dono(self.diretorio, os.stat(self.diretorio), 0o022)
+        caminho = os.path.join(self.diretorio, NOME_CHAVE)
+        if not os.path.exists(caminho):
+            # Grava em um temporário e publica com link, que falha se outro
+            # processo publicou primeiro: ninguém lê uma chave pela metade
+            temporario = f'{caminho}.{os.getpid()}.{threading.get_ident()}.tmp'
+            descritor = os.open(temporario, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            try:
+                with os.fdopen(descritor, 'wb') as arquivo:
+                    arquivo.write(secrets.token_bytes(_TAMANHO_CHAVE))
+                os.link(temporario, caminho)
+            except FileExistsError:
+                pass
+            finally:
+                os.remove(temporario)
+        with open(caminho, 'rb') as arquivo:
+            _confere_dono(caminho, os.fstat(arquivo.fileno()), 0o077)
+            chave = arquivo.read()
+        if len(chave) != _TAMANHO_CHAVE:
+            raise PermissionError(f'{caminho}: chave com tamanho inválido')
+        self._chave = chave
+        return chave
+
+    def _carregar(self, expressao):
+        try:
+            chave = self._chave_do_usuario()
+            with open(self._caminho(expressao), 'rb') as arquivo:
+                dados = arquivo.read()
+        except OSError:
+            return None
+        assinatura, conteudo = dados[:_TAMANHO_ASSINATURA], dados[_TAMANHO_ASSINATURA:]
+        if not hmac.compare_digest(assinatura, _assinatura(chave, conteudo)):
+            return None
+        try:
+            versao, texto, nomes, gera_float, fonte = json.loads(conteudo)
+        except (ValueError, TypeError):
+            return None
+        if versao != VERSAO_FORMATO or texto != expressao:
+            return None
+        return Plano(expressao, nomes, gera_float, _compila(fonte, expressao))
+
+    def _gravar(self, expressao, nomes, gera_float, fonte):
+        caminho = self._caminho(expressao)
+        temporario = f'{caminho}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            chave = self._chave_do_usuario()
+            conteudo = json.dumps([VERSAO_FORMATO, expressao, list(nomes), gera_float,
+                                   fonte]).encode()
+            with open(temporario, 'wb') as arquivo:
+                arquivo.write(_assinatura(chave, conteudo) + conteudo)
+            os.replace(temporario, caminho)
+        except OSError:
+            try:
+                os.remove(temporario)
+            except OSError:
+                pass
+
+    def compilar(self, expressao):
+        """Retorna o Plano de ``expressao``, da memória, do disco ou compilado agora."""
+        plano = self._memoria.obter(expressao)
+        if plano is not None:
+            return plano
+        with self._lock:
+            plano = self._memoria.obter(expressao)
+            if plano is not None:
+                return plano
+            if self.diretorio is not None:
+                plano = self._carregar(expressao)
+                if plano is not None:
+                    self.carregados_do_disco += 1
+            if plano is None:
+                arvore = analisar(expressao)
+                nomes, fonte = gerar_fonte(arvore)
+                gera_float = _gera_float(arvore)
+                plano = Plano(expressao, nomes, gera_float, _compila(fonte, expressao))
+                self.compilacoes += 1
+                if self.diretorio is not None:
+                    self._gravar(expressao, nomes, gera_float, fonte)
+            self._memoria.guardar(expressao, plano)
+            return plano
+
+    def limpar_memoria(self):
+        self._memoria.limpar()
+
+    def estatisticas(self):
+        dados = self._memoria.estatisticas()
+        dados.update(compilacoes=self.compilacoes, carregados_do_disco=self.carregados_do_disco)
+        return dados
+
+
+# Compilador global usado pelas funções de conveniência abaixo
+compilador = Compilador()
+
+compilar = compilador.compilar
+
+
+def avaliar(expressao, *args):
+    """Atalho para ``compilar(expressao)(*args)``."""
+    return compilar(expressao)(*args)
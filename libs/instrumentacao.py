@@ -0,0 +1,263 @@
+"""
+Contadores de chamadas e histogramas de latência da Calculadora e do jogo.
+
+Ativar a instrumentação troca os métodos da classe Calculadora (escalares e
+em lote) e as etapas internas do jogo por versões que medem cada chamada;
+desativar devolve os objetos originais (registros empilhados, como uma
+``Instrumentacao`` e um ``Diario``, desativam na ordem inversa). Desligada, portanto, não existe
+nenhuma verificação no caminho da chamada: ``Calculadora.soma`` é a própria
+função original.
+
+Os dados saem como dicionário (``snapshot``) ou no formato texto do
+Prometheus, gravado atomicamente em arquivo (``exportar_prometheus``).
+"""
+
+import os
+import threading
+import time
+
+from libs import jogo
+from libs.calculadora import Calculadora
+
+OPERACOES_CALCULADORA = (
+    'soma', 'subtracao', 'multiplicacao', 'divisao',
+    'soma_lote', 'subtracao_lote', 'multiplicacao_lote', 'divisao_lote',
+)
+
+# nome da métrica -> globais do módulo jogo que executam aquela função
+ETAPAS_JOGO = {
+    'pense_num_numero': ('_pense_num_numero_dobrada', '_passos_pense_num_numero'),
+    'pense_num_numero2': ('_pense_num_numero2_dobrada', '_passos_pense_num_numero2'),
+}
+
+# O histograma usa baldes de potência de dois em nanossegundos: o balde de
+# uma duração d é ``d.bit_length()``, sem busca. O balde k guarda durações
+# menores que 2**k ns; 64 baldes cobrem qualquer int64.
+NUM_BALDES = 64
+
+
+class Histograma:
+    """Histograma de baldes log2 em nanossegundos (não cumulativos internamente)."""
+
+    __slots__ = ('baldes',)
+
+    def __init__(self):
+        self.baldes = [0] * NUM_BALDES
+
+    def observar(self, duracao_ns):
+        self.baldes[duracao_ns.bit_length()] += 1
+
+    def cumulativo(self):
+        """Retorna ``[(limite_segundos, contagem_acumulada), ...]`` até +Inf.
+
+        Omite os baldes vazios abaixo da primeira observação e acima da última.
+        """
+        ocupados = [k for k, contagem in enumerate(self.baldes) if contagem]
+        if not ocupados:
+            return [(float('inf'), 0)]
+        acumulado = 0
+        pares = []
+        for k in range(ocupados[0], ocupados[-1] + 1):
+            acumulado += self.baldes[k]
+            pares.append(((1 << k) * 1e-9, acumulado))
+        pares.append((float('inf'), acumulado))
+        return pares
+
+
+class _Fatia:
+    """Contadores de uma métrica em uma única thread."""
+
+    __slots__ = ('chamadas', 'erros', 'tempo_total_ns', 'histograma')
+
+    def __init__(self):
+        self.chamadas = 0
+        self.erros = 0
+        self.tempo_total_ns = 0
+        self.histograma = Histograma()
+
+
+class Metrica:
+    """Contagem, erros, tempo acumulado e histograma de uma operação.
+
+    Cada thread escreve na sua própria ``_Fatia`` (sem lock no caminho da
+    chamada); ``para_dict`` soma as fatias. Fatias de threads encerradas são
+    mantidas, então nenhuma contagem se perde.
+    """
+
+    __slots__ = ('_local', '_fatias', '_lock')
+
+    def __init__(self):
+        self._local = threading.local()
+        self._fatias = []
+        self._lock = threading.Lock()
+
+    def _nova_fatia(self):
+        fatia = _Fatia()
+        with self._lock:
+            self._fatias.append(fatia)
+        self._local.fatia = fatia
+        return fatia
+
+    def registrar(self, duracao_ns, erro=False):
+        try:
+            fatia = self._local.fatia
+        except AttributeError:
+            fatia = self._nova_fatia()
+        fatia.chamadas += 1
+        fatia.tempo_total_ns += duracao_ns
+        if erro:
+            fatia.erros += 1
+        fatia.histograma.baldes[duracao_ns.bit_length()] += 1
+
+    def zerar(self):
+        with self._lock:
+            for fatia in self._fatias:
+                fatia.chamadas = fatia.erros = fatia.tempo_total_ns = 0
+                fatia.histograma.baldes[:] = [0] * NUM_BALDES
+
+    def para_dict(self):
+        with self._lock:
+            fatias = list(self._fatias)
+        total = Histograma()
+        for fatia in fatias:
+            for k, contagem in enumerate(fatia.histograma.baldes):
+                total.baldes[k] += contagem
+        return {
+            'chamadas': sum(fatia.chamadas for fatia in fatias),
+            'erros': sum(fatia.erros for fatia in fatias),
+            'tempo_total': sum(fatia.tempo_total_ns for fatia in fatias) * 1e-9,
+            'histograma': [[limite, contagem] for limite, contagem in total.cumulativo()],
+        }
+
+
+def _instrumentada(funcao, metrica, relogio=time.perf_counter_ns):
+    registrar = metrica.registrar
+
+    def instrumentada(*args, **kwargs):
+        inicio = relogio()
+        try:
+            resultado = funcao(*args, **kwargs)
+        except BaseException:
+            registrar(relogio() - inicio, True)
+            raise
+        registrar(relogio() - inicio)
+        return resultado
+    instrumentada.__name__ = getattr(funcao, '__name__', 'instrumentada')
+    instrumentada.__doc__ = funcao.__doc__
+    instrumentada.__wrapped__ = funcao
+    return instrumentada
+
+
+def _restaura(trocas, quem):
+    """Devolve os originais de ``trocas``: ``{(dono, nome): (original, instalado)}``.
+
+    Só desfaz se cada atributo ainda é o que ``quem`` instalou; senão outra
+    troca foi feita por cima e restaurar reinstalaria um invólucro velho.
+    """
+    for (dono, nome), (_, instalado) in trocas.items():
+        if vars(dono)[nome] is not instalado:
+            raise RuntimeError(f'{quem}: {nome} foi trocado depois da ativação; '
+                               'desative primeiro o que foi ativado por último')
+    for (dono, nome), (original, _) in trocas.items():
+        setattr(dono, nome, original)
+
+
+def _formata_limite(limite):
+    return '+Inf' if limite == float('inf') else repr(limite)
+
+
+class Instrumentacao:
+    """Registro de métricas que pode ser ligado e desligado em tempo de execução."""
+
+    def __init__(self):
+        self.metricas = {}
+        self._originais = None
+        self._lock = threading.Lock()
+
+    @property
+    def ativa(self):
+        return self._originais is not None
+
+    def _metrica(self, nome):
+        if nome not in self.metricas:
+            self.metricas[nome] = Metrica()
+        return self.metricas[nome]
+
+    def ativar(self):
+        with self._lock:
+            if self._originais is not None:
+                return
+            originais = {}
+            for nome in OPERACOES_CALCULADORA:
+                original = Calculadora.__dict__[nome]
+                instalado = staticmethod(_instrumentada(original.__func__, self._metrica(nome)))
+                originais[(Calculadora, nome)] = (original, instalado)
+                setattr(Calculadora, nome, instalado)
+            for nome, globais in ETAPAS_JOGO.items():
+                metrica = self._metrica(nome)
+                for global_ in globais:
+                    original = getattr(jogo, global_)
+                    instalado = _instrumentada(original, metrica)
+                    originais[(jogo, global_)] = (original, instalado)
+                    setattr(jogo, global_, instalado)
+            self._originais = originais
+
+    def desativar(self):
+        """Devolve os originais; fora da ordem inversa da ativação levanta ``RuntimeError``."""
+        with self._lock:
+            if self._originais is None:
+                return
+            _restaura(self._originais, 'instrumentação')
+            self._originais = None
+
+    def zerar(self):
+        """Descarta as métricas acumuladas (as ativas continuam registrando)."""
+        for metrica in self.metricas.values():
+            metrica.zerar()
+
+    def snapshot(self):
+        """Retorna ``{operacao: {chamadas, erros, tempo_total, histograma}}``."""
+        return {nome: metrica.para_dict() for nome, metrica in sorted(self.metricas.items())}
+
+    def texto_prometheus(self, prefixo='calculadora'):
+        dados = self.snapshot()
+        linhas = [
+            f'# HELP {prefixo}_chamadas_total Chamadas por operação.',
+            f'# TYPE {prefixo}_chamadas_total counter',
+        ]
+        linhas += [f'{prefixo}_chamadas_total{{operacao="{nome}"}} {m["chamadas"]}'
+                   for nome, m in dados.items()]
+        linhas += [
+            f'# HELP {prefixo}_erros_total Chamadas que levantaram exceção.',
+            f'# TYPE {prefixo}_erros_total counter',
+        ]
+        linhas += [f'{prefixo}_erros_total{{operacao="{nome}"}} {m["erros"]}'
+                   for nome, m in dados.items()]
+        linhas += [
+            f'# HELP {prefixo}_latencia_segundos Latência das chamadas.',
+            f'# TYPE {prefixo}_latencia_segundos histogram',
+        ]
+        for nome, m in dados.items():
+            for limite, contagem in m['histograma']:
+                linhas.append(f'{prefixo}_latencia_segundos_bucket'
+                              f'{{operacao="{nome}",le="{_formata_limite(limite)}"}} {contagem}')
+            linhas.append(f'{prefixo}_latencia_segundos_sum{{operacao="{nome}"}} {m["tempo_total"]!r}')
+            linhas.append(f'{prefixo}_latencia_segundos_count{{operacao="{nome}"}} {m["chamadas"]}')
+        return '\n'.join(linhas) + '\n'
+
+    def exportar_prometheus(self, caminho, prefixo='calculadora'):
+        """Grava o texto Prometheus em ``caminho`` (troca atômica, para o node exporter)."""
+        temporario = f'{caminho}.{os.getpid()}.tmp'
+        with open(temporario, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(self.texto_prometheus(prefixo))
+        os.replace(temporario, caminho)
+
+
+# Registro global usado pelas funções de conveniência abaixo
+instrumentacao = Instrumentacao()
+
+ativar = instrumentacao.ativar
+desativar = instrumentacao.desativar
+zerar = instrumentacao.zerar
+snapshot = instrumentacao.snapshot
+exportar_prometheus = instrumentacao.exportar_prometheus
@@ -0,0 +1,75 @@
+"""
+Divisão que preserva inteiros de precisão arbitrária.
+
+``Calculadora.divisao`` usa divisão verdadeira, que converte o resultado para
+float: acima de ~10**308 isso levanta OverflowError, e acima de 2**53 perde
+precisão. ``CalculadoraInteira`` mantém o resultado como int sempre que a
+divisão é exata. Quando não é, devolve um ``Racional`` exato ou o float
+corretamente arredondado, calculado direto dos inteiros (a divisão
+verdadeira entre ints do CPython arredonda corretamente), sem passar por
+floats intermediários.
+"""
+
+from libs.racional import Racional
+
+RACIONAL = 'racional'
+FLOAT = 'float'
+
+_MODOS_INEXATA = (RACIONAL, FLOAT)
+
+
+def dividir_inteiros(a, b, inexata=RACIONAL):
+    """Divide dois ints; retorna int se exata, senão Racional ou float.
+
+    Divisores que são potência de dois (como o ``/2`` do jogo) usam só
+    máscara e deslocamento de bits, em tempo linear no tamanho de ``a``.
+    """
+    if b == 0:
+        raise ZeroDivisionError('divisão por zero')
+    negativo = b < 0
+    if negativo:
+        a, b = -a, -b
+    if b & (b - 1) == 0:
+        deslocamento = b.bit_length() - 1
+        if a & (b - 1) == 0:
+            return a >> deslocamento
+    else:
+        quociente, resto = divmod(a, b)
+        if resto == 0:
+            return quociente
+    if inexata == FLOAT:
+        return a / b
+    return Racional._novo(a, b)
+
+
+class CalculadoraInteira:
+    """Calculadora em que divisões exatas entre ints continuam ints.
+
+    ``inexata`` escolhe o resultado das divisões inexatas entre ints:
+    ``'racional'`` (exato) ou ``'float'`` (corretamente arredondado). Com
+    operandos que não são ints o comportamento é o da Calculadora.
+    """
+
+    def __init__(self, inexata=RACIONAL):
+        if inexata not in _MODOS_INEXATA:
+            raise ValueError(f'modo inválido: {inexata!r}')
+        self.inexata = inexata
+
+    @staticmethod
+    def soma(a, b):
+        return a + b
+
+    @staticmethod
+    def subtracao(a, b):
+        return a - b
+
+    @staticmethod
+    def multiplicacao(a, b):
+        return a * b
+
+    def divisao(self, a, b):
+        if type(a) is int and type(b) is int:
+            return dividir_inteiros(a, b, self.inexata)
+        if type(a) is int and type(b) is Racional:
+            return Racional._novo(a, 1) / b
+        return a / b
@@ -0,0 +1,242 @@
+"""
+Agregados incrementais em janelas deslizantes sobre a Calculadora.
+
+Recalcular ``soma`` sobre a janela inteira a cada evento custa O(janela).
+As janelas daqui atualizam os agregados a cada entrada e saída de valor:
+
+- soma, média e diferença (mais novo menos mais antigo): O(1) por evento,
+  somando o valor que entra e subtraindo o que sai;
+- produto (opcional, ``com_produto=True``): O(1) amortizado com duas pilhas
+  de agregados, sem dividir pelo valor que sai (zeros e deriva de
+  arredondamento não são problema).
+
+``JanelaContagem`` guarda os últimos ``tamanho`` valores; ``JanelaTempo``
+guarda os valores dos últimos ``duracao`` segundos. As operações vêm da
+Calculadora, ou de outro backend com a mesma interface (``calculadora=``).
+Com ``compensada=True`` a soma carrega o erro de cada adição e subtração
+(TwoSum), então não acumula deriva em execuções longas.
+"""
+
+import time
+from collections import deque
+
+from libs.calculadora import Calculadora
+
+
+class _Produto:
+    """Fila com produto em O(1) amortizado (duas pilhas de agregados).
+
+    Novos valores entram em ``_entrada`` com o produto acumulado
+    ``_produto_entrada``. Quando a saída fica vazia, a entrada é virada para
+    ``_saida`` guardando, para cada posição, o produto dela até a mais nova
+    virada; assim ``_saida[-1]`` é sempre o produto da pilha de saída.
+    """
+
+    __slots__ = ('_mul', '_entrada', '_produto_entrada', '_saida')
+
+    def __init__(self, multiplicacao):
+        self._mul = multiplicacao
+        self._entrada = []
+        self._produto_entrada = 1
+        self._saida = []
+
+    def entra(self, valor):
+        self._entrada.append(valor)
+        self._produto_entrada = self._mul(self._produto_entrada, valor)
+
+    def sai(self):
+        if not self._saida:
+            mul = self._mul
+            acumulado = 1
+            saida = self._saida
+            for valor in reversed(self._entrada):
+                acumulado = mul(valor, acumulado)
+                saida.append(acumulado)
+            self._entrada.clear()
+            self._produto_entrada = 1
+        self._saida.pop()
+
+    def valor(self):
+        if self._saida:
+            return self._mul(self._saida[-1], self._produto_entrada)
+        return self._produto_entrada
+
+
+class _Janela:
+    """Estado e agregados comuns; as subclasses decidem quando um valor sai."""
+
+    def __init__(self, compensada=False, com_produto=False, calculadora=None):
+        calc = calculadora if calculadora is not None else Calculadora
+        self.compensada = compensada
+        self._calc = calc
+        self._soma_op = calc.soma
+        self._subtracao_op = calc.subtracao
+        self._valores = deque()
+        self._soma = 0
+        self._erro = 0
+        self._produto = _Produto(calc.multiplicacao) if com_produto else None
+
+    def __len__(self):
+        return len(self._valores)
+
+    def __iter__(self):
+        return iter(self._valores)
+
+    def _entra(self, valor):
+        self._valores.append(valor)
+        if self.compensada:
+            # TwoSum em linha (ver libs.compensado.two_sum)
+            soma = self._soma
+            total = soma + valor
+            parcial = total - soma
+            self._erro += (soma - (total - parcial)) + (valor - parcial)
+            self._soma = total
+        else:
+            self._soma = self._soma_op(self._soma, valor)
+        if self._produto is not None:
+            self._produto.entra(valor)
+
+    def _sai(self):
+        valor = self._valores.popleft()
+        if self.compensada:
+            soma = self._soma
+            total = soma - valor
+            parcial = total - soma
+            self._erro += (soma - (total - parcial)) - (valor + parcial)
+            self._soma = total
+        else:
+            self._soma = self._subtracao_op(self._soma, valor)
+        if self._produto is not None:
+            self._produto.sai()
+        return valor
+
+    @property
+    def soma(self):
+        if self.compensada:
+            return self._soma + self._erro
+        return self._soma
+
+    @property
+    def media(self):
+        if not self._valores:
+            raise ZeroDivisionError('média de janela vazia')
+        return self._calc.divisao(self.soma, len(self._valores))
+
+    @property
+    def diferenca(self):
+        """Valor mais novo menos o mais antigo da janela."""
+        if not self._valores:
+            raise ValueError('diferença de janela vazia')
+        return self._calc.subtracao(self._valores[-1], self._valores[0])
+
+    @property
+    def produto(self):
+        if self._produto is None:
+            raise AttributeError('janela criada sem com_produto=True')
+        return self._produto.valor()
+
+    def limpar(self):
+        self._valores.clear()
+        self._soma = 0
+        self._erro = 0
+        if self._produto is not None:
+            self._produto = _Produto(self._calc.multiplicacao)
+
+
+class JanelaContagem(_Janela):
+    """Janela com os últimos ``tamanho`` valores."""
+
+    def __init__(self, tamanho, compensada=False, com_produto=False, calculadora=None):
+        if tamanho < 1:
+            raise ValueError('tamanho precisa ser positivo')
+        super().__init__(compensada, com_produto, calculadora)
+        self.tamanho = tamanho
+
+    def adicionar(self, valor):
+        """Insere ``valor``; retorna o valor que saiu da janela, ou None."""
+        self._entra(valor)
+        if len(self._valores) > self.tamanho:
+            return self._sai()
+        return None
+
+    def estender(self, valores):
+        """Insere vários valores em sequência (mais rápido que um ``adicionar`` por valor)."""
+        if self._produto is not None:
+            for valor in valores:
+                self.adicionar(valor)
+            return
+        # Caminhos rápidos da soma: tudo em variáveis locais
+        fila = self._valores
+        entra = fila.append
+        sai = fila.popleft
+        tamanho = self.tamanho
+        soma = self._soma
+        if self.compensada:
+            erro = self._erro
+            for valor in valores:
+                entra(valor)
+                total = soma + valor
+                parcial = total - soma
+                erro += (soma - (total - parcial)) + (valor - parcial)
+                soma = total
+                if len(fila) > tamanho:
+                    valor = -sai()
+                    total = soma + valor
+                    parcial = total - soma
+                    erro += (soma - (total - parcial)) + (valor - parcial)
+                    soma = total
+            self._erro = erro
+        else:
+            soma_op = self._soma_op
+            subtracao_op = self._subtracao_op
+            for valor in valores:
+                entra(valor)
+                soma = soma_op(soma, valor)
+                if len(fila) > tamanho:
+                    soma = subtracao_op(soma, sai())
+        self._soma = soma
+
+
+class JanelaTempo(_Janela):
+    """Janela com os valores dos últimos ``duracao`` segundos.
+
+    Cada valor é registrado com um instante (por padrão ``relogio()``) e sai
+    quando fica ``duracao`` ou mais segundos atrás do instante mais recente
+    informado em ``adicionar`` ou ``expirar``. Os instantes precisam ser
+    não decrescentes.
+    """
+
+    def __init__(self, duracao, compensada=False, com_produto=False, calculadora=None,
+                 relogio=time.monotonic):
+        if duracao <= 0:
+            raise ValueError('duracao precisa ser positiva')
+        super().__init__(compensada, com_produto, calculadora)
+        self.duracao = duracao
+        self._relogio = relogio
+        self._instantes = deque()
+
+    def adicionar(self, valor, instante=None):
+        if instante is None:
+            instante = self._relogio()
+        if self._instantes and instante < self._instantes[-1]:
+            raise ValueError('instantes precisam ser não decrescentes')
+        self._instantes.append(instante)
+        self._entra(valor)
+        return self.expirar(instante)
+
+    def expirar(self, instante=None):
+        """Remove os valores antigos em relação a ``instante``; retorna quantos saíram."""
+        if instante is None:
+            instante = self._relogio()
+        limite = instante - self.duracao
+        instantes = self._instantes
+        removidos = 0
+        while instantes and instantes[0] <= limite:
+            instantes.popleft()
+            self._sai()
+            removidos += 1
+        return removidos
+
+    def limpar(self):
+        super().limpar()
+        self._instantes.clear()
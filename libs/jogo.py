@@ -1,17 +1,203 @@
-from libs.calculadora import Calculadora
+from array import array
+from itertools import islice
+
+from libs.calculadora import Calculadora, _destino, _operando, gravar_em
+from libs.simbolico import dobrar
 
 c= Calculadora()
 
-def pense_num_numero(num):
+def _passos_pense_num_numero(num, calc=c):
+    passo_0 = calc.soma(num,5)
+    passo_1 = calc.multiplicacao(passo_0,2)
+    passo_2 = calc.subtracao(passo_1,4)
+    passo_3 = calc.divisao(passo_2,2)
+    passo_4 = calc.subtracao(passo_3,num)
+    return passo_4
+
+def _passos_pense_num_numero2(num, calc=c):
+    return calc.subtracao(calc.divisao(calc.subtracao(calc.multiplicacao(calc.soma(num,5),2),4),2),num)
+
+# As cadeias são provadas uma única vez na importação; entradas int, float e
+# Fraction usam a forma fechada e o resto volta para o passo a passo
+_pense_num_numero_dobrada = dobrar(_passos_pense_num_numero)
+_pense_num_numero2_dobrada = dobrar(_passos_pense_num_numero2)
+
+# Os passos do lote em colunas usam um nome próprio, que libs.instrumentacao
+# não troca: as entradas já foram contadas em pense_num_numero
+_passos_do_lote = _passos_pense_num_numero
+
+# Só o caminho de erro passa por aqui; libs.diario troca este global para
+# registrar a recusa como falha da chamada
+def _rejeita_negativo(num):
+    raise Exception('Número precisa ser positivo!')
+
+# Com ``calculadora`` informada, a cadeia roda passo a passo sobre ela; é o
+# ponto de extensão para backends alternativos (racional, compensado, ...)
+def pense_num_numero(num, calculadora=None):
     if num <0:
-        raise Exception('Número precisa ser positivo!')
-    else:
-        passo_0 = c.soma(num,5)
-        passo_1 = c.multiplicacao(passo_0,2)
-        passo_2 = c.subtracao(passo_1,4)
-        passo_3 = c.divisao(passo_2,2)
-        passo_4 = c.subtracao(passo_3,num)
-    return passo_4    # sempre será igual a 4
-
-def pense_num_numero2(num):
-    return c.subtracao(c.divisao(c.subtracao(c.multiplicacao(c.soma(num,5),2),4),2),num)
+        _rejeita_negativo(num)
+    if calculadora is not None:
+        return _passos_pense_num_numero(num, calculadora)
+    return _pense_num_numero_dobrada(num)    # sempre será igual a 3
+
+def pense_num_numero2(num, calculadora=None):
+    if calculadora is not None:
+        return _passos_pense_num_numero2(num, calculadora)
+    return _pense_num_numero2_dobrada(num)
+
+
+# ----------------------------------------------------------------------------
+# API de fluxo: consome iteráveis sem limite de tamanho em lotes
+# ----------------------------------------------------------------------------
+
+LEVANTAR = 'levantar'
+PULAR = 'pular'
+SENTINELA = 'sentinela'
+COLETAR = 'coletar'
+
+_MODOS_INVALIDO = (LEVANTAR, PULAR, SENTINELA, COLETAR)
+
+
+class EntradaInvalida(Exception):
+    """Entrada rejeitada no fluxo, com o índice do elemento na entrada."""
+
+    def __init__(self, indice, valor, erro):
+        super().__init__(f'entrada inválida no índice {indice}: {valor!r} ({erro})')
+        self.indice = indice
+        self.valor = valor
+        self.erro = erro
+
+    def __reduce__(self):
+        # Permite devolver a exceção de processos filhos sem perder os campos
+        return (EntradaInvalida, (self.indice, self.valor, self.erro))
+
+
+def _processa_lote(funcao, lote, inicio, ao_invalido, sentinela, invalidos):
+    try:
+        return [funcao(num) for num in lote]
+    except Exception:
+        pass
+    # Algum elemento falhou: refaz o lote um a um para tratar cada erro
+    resultados = []
+    for deslocamento, num in enumerate(lote):
+        try:
+            resultados.append(funcao(num))
+        except Exception as erro:
+            indice = inicio + deslocamento
+            if ao_invalido == LEVANTAR:
+                raise EntradaInvalida(indice, num, erro) from erro
+            if ao_invalido == SENTINELA:
+                resultados.append(sentinela)
+            elif ao_invalido == COLETAR:
+                invalidos.append(EntradaInvalida(indice, num, erro))
+    return resultados
+
+
+def pense_num_numero_fluxo(entradas, funcao=None, tamanho_lote=1024,
+                           agrupar=False, ao_invalido=LEVANTAR,
+                           sentinela=None, invalidos=None):
+    """Gera os resultados de ``funcao`` para cada entrada, de forma preguiçosa.
+
+    ``entradas`` pode ser qualquer iterável, inclusive infinito; apenas um lote
+    de ``tamanho_lote`` elementos fica em memória por vez. Com ``agrupar=True``
+    cada lote é entregue como uma lista.
+
+    ``ao_invalido`` define o tratamento das entradas que levantam exceção:
+    ``LEVANTAR`` propaga ``EntradaInvalida``; ``PULAR`` descarta o elemento;
+    ``SENTINELA`` emite ``sentinela`` no lugar; ``COLETAR`` descarta e anexa
+    um ``EntradaInvalida`` à lista ``invalidos`` fornecida pelo chamador.
+    """
+    if funcao is None:
+        funcao = pense_num_numero
+    if ao_invalido not in _MODOS_INVALIDO:
+        raise ValueError(f'modo inválido: {ao_invalido!r}')
+    if ao_invalido == COLETAR and invalidos is None:
+        raise ValueError('o modo coletar precisa da lista invalidos')
+    if tamanho_lote < 1:
+        raise ValueError('tamanho_lote precisa ser positivo')
+
+    iterador = iter(entradas)
+    inicio = 0
+    while True:
+        lote = list(islice(iterador, tamanho_lote))
+        if not lote:
+            return
+        resultados = _processa_lote(funcao, lote, inicio, ao_invalido,
+                                    sentinela, invalidos)
+        inicio += len(lote)
+        if agrupar:
+            yield resultados
+        else:
+            yield from resultados
+
+
+# ----------------------------------------------------------------------------
+# API em lote compacta: resultados em colunas array.array (libs.resultados)
+# ----------------------------------------------------------------------------
+
+class _GravaPassos:
+    """Calculadora que executa cada etapa em lote compacto e guarda o resultado."""
+
+    def __init__(self):
+        self.passos = []
+
+    def _grava(self, resultado):
+        self.passos.append(resultado)
+        return resultado
+
+    def soma(self, a, b):
+        return self._grava(c.soma_lote(a, b, compacto=True))
+
+    def subtracao(self, a, b):
+        return self._grava(c.subtracao_lote(a, b, compacto=True))
+
+    def multiplicacao(self, a, b):
+        return self._grava(c.multiplicacao_lote(a, b, compacto=True))
+
+    def divisao(self, a, b):
+        return self._grava(c.divisao_lote(a, b, compacto=True))
+
+
+def pense_num_numero_lote(entradas, com_passos=False, out=None):
+    """Aplica ``pense_num_numero`` a uma sequência e retorna uma ``Tabela``.
+
+    A tabela tem as colunas ``entrada`` e ``resultado`` (e ``passo_0`` a
+    ``passo_4`` com ``com_passos=True``), cada uma em um array.array, em vez
+    de uma lista de floats ou de dicts. Cada passo é int64 enquanto todos os
+    seus valores couberem, senão float64. Uma entrada inválida levanta
+    ``EntradaInvalida`` com o índice do elemento.
+
+    Com ``out`` (buffer gravável com formato declarado, como nas operações
+    em lote da Calculadora) os resultados são escritos nele e ``out`` é
+    retornado no lugar da Tabela, sem alocar nada por lote; ``entradas``
+    pode ser qualquer objeto com protocolo de buffer, inclusive o próprio
+    ``out``.
+    """
+    from libs.resultados import Tabela, coluna
+
+    if out is not None:
+        if com_passos:
+            raise ValueError('com_passos não pode ser usado com out')
+        entrada = _operando(entradas)
+        tamanho = len(_destino(out))
+        if len(entrada) != tamanho:
+            raise ValueError(f'out com tamanho diferente da entrada: {tamanho} != {len(entrada)}')
+        try:
+            return gravar_em(out, map(pense_num_numero, entrada))
+        except Exception:
+            _processa_lote(pense_num_numero, entrada, 0, LEVANTAR, None, None)
+            raise
+    entrada = coluna(entradas)
+    try:
+        resultado = array('d', map(pense_num_numero, entrada))
+    except Exception:
+        # Refaz um a um só para achar o índice do elemento inválido
+        _processa_lote(pense_num_numero, entrada, 0, LEVANTAR, None, None)
+        raise
+    colunas = {'entrada': entrada}
+    if com_passos:
+        gravador = _GravaPassos()
+        _passos_do_lote(entrada, gravador)
+        colunas.update((f'passo_{i}', passo) for i, passo in enumerate(gravador.passos))
+    colunas['resultado'] = resultado
+    return Tabela.de_colunas(**colunas)
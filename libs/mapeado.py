@@ -0,0 +1,201 @@
+"""
+Operações da Calculadora aplicadas diretamente a arquivos binários.
+
+Os arquivos de entrada são colunas cruas de float64 ou int64 (ordem de bytes
+nativa). Eles são mapeados em memória e percorridos em janelas sequenciais
+de tamanho fixo; cada janela vira um ``array.array`` (ou uma visão NumPy, sem
+cópia, quando NumPy está disponível), passa pelas operações em lote da
+Calculadora e é escrita no arquivo de saída, também mapeado. Em nenhum
+momento o arquivo inteiro vira uma lista de objetos Python.
+"""
+
+import mmap
+import os
+import traceback
+from array import array
+from contextlib import ExitStack
+
+from libs.calculadora import Calculadora
+from libs.jogo import pense_num_numero, pense_num_numero2, EntradaInvalida
+
+try:
+    import numpy as np
+except ImportError:  # Sem NumPy as janelas viram array.array (uma cópia por janela)
+    np = None
+
+TIPOS = {'float64': 'd', 'int64': 'q', 'd': 'd', 'q': 'q'}
+
+# Elementos por janela: 1 Mi x 8 bytes = 8 MiB por coluna em memória
+JANELA_PADRAO = 1 << 20
+
+OPERACOES_BINARIAS = {
+    'soma': Calculadora.soma_lote,
+    'subtracao': Calculadora.subtracao_lote,
+    'multiplicacao': Calculadora.multiplicacao_lote,
+    'divisao': Calculadora.divisao_lote,
+}
+OPERACOES_JOGO = {
+    'pense_num_numero': pense_num_numero,
+    'pense_num_numero2': pense_num_numero2,
+}
+
+
+def _typecode(tipo):
+    try:
+        return TIPOS[tipo]
+    except KeyError:
+        raise ValueError(f'tipo não suportado: {tipo!r} (use float64 ou int64)') from None
+
+
+def _mesmo_arquivo(caminho, outro):
+    return os.path.exists(caminho) and os.path.exists(outro) and os.path.samefile(caminho, outro)
+
+
+def _mapeia_leitura(pilha, caminho, typecode):
+    tamanho = os.path.getsize(caminho)
+    if tamanho % 8:
+        raise ValueError(f'{caminho}: tamanho {tamanho} não é múltiplo de 8 bytes')
+    if tamanho == 0:
+        return memoryview(b'').cast(typecode)
+    arquivo = pilha.enter_context(open(caminho, 'rb'))
+    mapa = pilha.enter_context(mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ))
+    if hasattr(mapa, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+        mapa.madvise(mmap.MADV_SEQUENTIAL)
+    visao = memoryview(mapa).cast(typecode)
+    pilha.callback(visao.release)
+    return visao
+
+
+def _mapeia_escrita(pilha, caminho, typecode, elementos):
+    arquivo = pilha.enter_context(open(caminho, 'w+b'))
+    arquivo.truncate(elementos * 8)
+    if elementos == 0:
+        return memoryview(bytearray()).cast(typecode)
+    mapa = pilha.enter_context(mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_WRITE))
+    visao = memoryview(mapa).cast(typecode)
+    pilha.callback(visao.release)
+    return visao
+
+
+def _janela(visao, inicio, fim):
+    """Converte um trecho mapeado no operando de lote mais barato disponível."""
+    trecho = visao[inicio:fim]
+    if np is not None:
+        return np.frombuffer(trecho, dtype=trecho.format)
+    valores = array(trecho.format)
+    valores.frombytes(trecho.cast('B'))
+    return valores
+
+
+def _aplica_jogo(funcao, janela, inicio):
+    try:
+        return array('d', map(funcao, janela))
+    except Exception:
+        pass
+    for deslocamento, num in enumerate(janela):
+        try:
+            funcao(num)
+        except Exception as erro:
+            raise EntradaInvalida(inicio + deslocamento, num, erro) from erro
+    raise AssertionError('janela falhou sem elemento inválido')
+
+
+def _processa_janela(operacao, funcao, operando, entrada_a, entrada_b, destino,
+                     typecode_saida, inicio, fim):
+    # Em função separada para que as visões da janela sejam liberadas ao
+    # retornar; um mmap não pode ser fechado com visões exportadas vivas
+    a = _janela(entrada_a, inicio, fim)
+    if operacao in OPERACOES_JOGO:
+        if np is not None and isinstance(a, np.ndarray):
+            a = a.tolist()
+        resultado = _aplica_jogo(funcao, a, inicio)
+    else:
+        b = operando if entrada_b is None else _janela(entrada_b, inicio, fim)
+        resultado = funcao(a, b)
+    if np is not None and isinstance(resultado, np.ndarray):
+        destino[inicio:fim] = resultado.astype(typecode_saida, copy=False)
+    elif resultado.typecode == typecode_saida:
+        destino[inicio:fim] = resultado
+    else:
+        destino[inicio:fim] = array(typecode_saida, resultado)
+
+
+def aplicar_arquivo(operacao, entrada, saida, operando=None, tipo='float64',
+                    tipo_operando=None, janela=JANELA_PADRAO):
+    """Aplica ``operacao`` ao arquivo ``entrada`` e grava o resultado em ``saida``.
+
+    ``operacao`` é uma das quatro operações da Calculadora, que exigem
+    ``operando`` (outro arquivo, com o mesmo número de elementos, ou um
+    escalar), ou ``pense_num_numero``/``pense_num_numero2``. A saída é float64
+    para divisão e para o jogo, e segue o tipo da entrada nos outros casos;
+    um resultado int64 que não caiba levanta OverflowError. Se a operação
+    falhar, o arquivo de saída é removido. Retorna o número de elementos
+    processados.
+    """
+    typecode = _typecode(tipo)
+    if janela < 1:
+        raise ValueError('janela precisa ser positiva')
+
+    if operacao in OPERACOES_JOGO:
+        funcao = OPERACOES_JOGO[operacao]
+        typecode_saida = 'd'
+    elif operacao in OPERACOES_BINARIAS:
+        funcao = OPERACOES_BINARIAS[operacao]
+        if operando is None:
+            raise TypeError(f'{operacao} precisa de um operando (arquivo ou escalar)')
+        typecode_b = _typecode(tipo_operando or tipo)
+        escalar_float = isinstance(operando, float)
+        if operacao == 'divisao' or 'd' in (typecode, typecode_b) or escalar_float:
+            typecode_saida = 'd'
+        else:
+            typecode_saida = 'q'
+    else:
+        raise ValueError(f'operação desconhecida: {operacao!r}')
+
+    # Mapear a saída trunca o arquivo antes de a entrada ser lida
+    arquivos = [entrada]
+    if operacao in OPERACOES_BINARIAS and isinstance(operando, (str, os.PathLike)):
+        arquivos.append(operando)
+    for arquivo in arquivos:
+        if _mesmo_arquivo(arquivo, saida):
+            raise ValueError(f'saída {os.fspath(saida)!r} é o mesmo arquivo que uma entrada')
+
+    saida_mapeada = False
+    try:
+        with ExitStack() as pilha:
+            entrada_a = _mapeia_leitura(pilha, entrada, typecode)
+            elementos = len(entrada_a)
+            entrada_b = None
+            if operacao in OPERACOES_BINARIAS and isinstance(operando, (str, os.PathLike)):
+                entrada_b = _mapeia_leitura(pilha, operando, typecode_b)
+                if len(entrada_b) != elementos:
+                    raise ValueError(
+                        f'arquivos com tamanhos diferentes: {elementos} != {len(entrada_b)}'
+                    )
+            destino = _mapeia_escrita(pilha, saida, typecode_saida, elementos)
+            saida_mapeada = True
+
+            try:
+                for inicio in range(0, elementos, janela):
+                    _processa_janela(operacao, funcao, operando, entrada_a, entrada_b,
+                                     destino, typecode_saida, inicio,
+                                     min(inicio + janela, elementos))
+            except BaseException as erro:
+                # Os frames do traceback mantêm visões da janela vivas e
+                # impediriam o fechamento dos mmaps
+                traceback.clear_frames(erro.__traceback__)
+                if typecode_saida == 'q' and isinstance(erro, (OverflowError, TypeError)):
+                    # O arquivo não diz o próprio tipo: trocar a saída por
+                    # float64 em silêncio, como fazem os pools, enganaria quem lê
+                    raise OverflowError(f'{operacao}: resultado não cabe em int64; '
+                                        f"use tipo='float64'") from erro
+                raise
+    except BaseException:
+        if saida_mapeada:
+            # A saída já foi truncada e ficou pela metade: não serve para nada
+            try:
+                os.remove(saida)
+            except OSError:
+                pass
+        raise
+    return elementos
@@ -0,0 +1,75 @@
+"""
+Avaliação paralela das funções do jogo em um ProcessPoolExecutor.
+
+A entrada é dividida em fatias contíguas; cada processo avalia uma fatia e
+devolve a lista de resultados, que são reunidos na ordem original. Intervalos
+(``range``) são enviados como ``range`` fatiados, então o custo de pickling
+independe do número de elementos.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from libs.jogo import pense_num_numero, EntradaInvalida
+
+# Fatias por processo quando tamanho_lote não é informado: mais de uma por
+# processo equilibra a carga sem multiplicar o custo de envio
+_FATIAS_POR_TRABALHADOR = 4
+
+
+def _avalia_fatia(funcao, fatia, inicio):
+    """Executado no processo filho: avalia uma fatia e reporta o índice global."""
+    resultados = []
+    anexa = resultados.append
+    for deslocamento, num in enumerate(fatia):
+        try:
+            anexa(funcao(num))
+        except Exception as erro:
+            raise EntradaInvalida(inicio + deslocamento, num, erro) from None
+    return resultados
+
+
+def _fatias(entradas, tamanho_lote):
+    for inicio in range(0, len(entradas), tamanho_lote):
+        yield entradas[inicio:inicio + tamanho_lote], inicio
+
+
+def pense_num_numero_paralelo(entradas, funcao=None, trabalhadores=None,
+                              tamanho_lote=None):
+    """Avalia ``funcao`` sobre ``entradas`` usando vários processos.
+
+    ``entradas`` precisa suportar ``len`` e fatiamento (listas, tuplas,
+    ``range``, ``array.array``). Os resultados voltam na ordem da entrada.
+    Se algum elemento falhar, levanta ``EntradaInvalida`` com o índice do
+    elemento na entrada original.
+    """
+    if funcao is None:
+        funcao = pense_num_numero
+    if trabalhadores is None:
+        trabalhadores = os.cpu_count() or 1
+    if trabalhadores < 1:
+        raise ValueError('trabalhadores precisa ser positivo')
+    total = len(entradas)
+    if total == 0:
+        return []
+    if tamanho_lote is None:
+        tamanho_lote = -(-total // (trabalhadores * _FATIAS_POR_TRABALHADOR))
+    if tamanho_lote < 1:
+        raise ValueError('tamanho_lote precisa ser positivo')
+
+    if trabalhadores == 1:
+        # Sem processos filhos: evita o custo de criar o pool
+        return _avalia_fatia(funcao, entradas, 0)
+
+    fatias = list(_fatias(entradas, tamanho_lote))
+    resultados = []
+    executor = ProcessPoolExecutor(max_workers=trabalhadores)
+    try:
+        for parcial in executor.map(_avalia_fatia,
+                                    [funcao] * len(fatias),
+                                    [fatia for fatia, _ in fatias],
+                                    [inicio for _, inicio in fatias]):
+            resultados.extend(parcial)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+    return resultados
@@ -0,0 +1,263 @@
+"""
+Processador em lote de registros CSV ou JSONL pela linha de comando.
+
+Cada registro é uma operação da Calculadora com dois operandos ou uma função
+do jogo com um:
+
+    CSV:    soma,2,3             pense_num_numero,5
+    JSONL:  {"operacao": "soma", "a": 2, "b": 3}
+            {"operacao": "pense_num_numero", "num": 5}
+            ["divisao", 1, 4]
+
+Os operandos JSONL precisam ser números JSON (int ou float); texto, listas,
+booleanos e null viram linha de erro.
+
+A entrada é lida em blocos de bytes terminados em fim de linha; cada bloco é
+interpretado, calculado e formatado de uma vez e escrito com uma única
+chamada. A memória é limitada pelo tamanho do bloco (vezes o número de
+blocos em voo, com ``--processos``). Registros inválidos não interrompem o
+processamento: viram uma linha de erro na saída.
+
+Saída: uma linha por registro, na ordem da entrada (``resultado`` ou
+``erro:Tipo:mensagem`` em CSV; ``{"resultado": ...}`` ou ``{"erro": ...}``
+em JSONL). Ao final, o throughput medido é informado em stderr.
+
+Uso:
+    python -m libs [entrada] [-o saida] [-f csv|jsonl] [-p processos]
+"""
+
+import sys
+import time
+
+CSV = 'csv'
+JSONL = 'jsonl'
+
+BLOCO_PADRAO = 1 << 20
+
+_operacoes = None
+
+
+def _tabela_operacoes():
+    """Monta a tabela de operações na primeira chamada (importação adiada)."""
+    global _operacoes
+    if _operacoes is None:
+        from libs.calculadora import Calculadora
+        from libs.jogo import pense_num_numero, pense_num_numero2
+        _operacoes = {
+            'soma': (Calculadora.soma, 2),
+            'subtracao': (Calculadora.subtracao, 2),
+            'multiplicacao': (Calculadora.multiplicacao, 2),
+            'divisao': (Calculadora.divisao, 2),
+            'pense_num_numero': (pense_num_numero, 1),
+            'pense_num_numero2': (pense_num_numero2, 1),
+        }
+        # Chaves em bytes para o CSV, que não decodifica as linhas
+        _operacoes.update({nome.encode(): valor for nome, valor in list(_operacoes.items())})
+    return _operacoes
+
+
+def _numero(texto):
+    try:
+        return int(texto)
+    except ValueError:
+        return float(texto)
+
+
+def _executa(operacoes, nome, operandos):
+    try:
+        funcao, aridade = operacoes[nome]
+    except KeyError:
+        raise ValueError(f'operação desconhecida: {nome!r}') from None
+    if len(operandos) != aridade:
+        raise ValueError(f'{nome} espera {aridade} operando(s), recebeu {len(operandos)}')
+    return funcao(*operandos)
+
+
+def _formata(resultado):
+    return repr(resultado) if type(resultado) is float else str(resultado)
+
+
+def _linha_csv_lenta(operacoes, linha):
+    """Caminho completo de uma linha CSV: espaços, floats, erros e linhas ignoradas.
+
+    Retorna (texto, erro) ou None para linhas que não são registros.
+    """
+    linha = linha.strip()
+    if not linha or linha[:1] == b'#' or linha.startswith(b'operacao'):
+        return None
+    campos = [campo.strip() for campo in linha.split(b',')]
+    try:
+        nome = campos[0].decode(errors='replace')
+        resultado = _executa(operacoes, nome, [_numero(campo) for campo in campos[1:]])
+    except Exception as erro:
+        return f'erro:{type(erro).__name__}:{erro}', True
+    return _formata(resultado), False
+
+
+def _processa_csv(bloco):
+    operacoes = _tabela_operacoes()
+    saida = []
+    anexa = saida.append
+    erros = 0
+    for linha in bloco.split(b'\n'):
+        campos = linha.split(b',')
+        # Caminho rápido: registro bem formado com operandos inteiros
+        try:
+            funcao, aridade = operacoes[campos[0]]
+            if aridade == 2 and len(campos) == 3:
+                resultado = funcao(int(campos[1]), int(campos[2]))
+            elif aridade == 1 and len(campos) == 2:
+                resultado = funcao(int(campos[1]))
+            else:
+                raise ValueError
+        except Exception:
+            registro = _linha_csv_lenta(operacoes, linha)
+            if registro is not None:
+                anexa(registro[0])
+                erros += registro[1]
+            continue
+        anexa(repr(resultado) if type(resultado) is float else str(resultado))
+    texto = '\n'.join(saida)
+    return (texto + '\n' if saida else '').encode(), len(saida), erros
+
+
+def _registro_json(registro):
+    if isinstance(registro, list):
+        nome, operandos = registro[0], registro[1:]
+    elif 'num' in registro:
+        nome, operandos = registro['operacao'], [registro['num']]
+    else:
+        nome, operandos = registro['operacao'], [registro['a'], registro['b']]
+    for operando in operandos:
+        # Só números: "2" + "3" concatenaria, [0] * n alocaria n elementos e
+        # true/false passariam por 1/0
+        if type(operando) is not int and type(operando) is not float:
+            raise TypeError(f'operando precisa ser número, recebeu {type(operando).__name__}')
+    return nome, operandos
+
+
+def _json_resultado(json, resultado):
+    tipo = type(resultado)
+    if tipo is int or (tipo is float and resultado - resultado == 0):
+        # Formatação direta para int e float finito, bem mais barata que dumps
+        return f'{{"resultado": {_formata(resultado)}}}'
+    return json.dumps({'resultado': resultado})
+
+
+def _processa_jsonl(bloco):
+    import json
+
+    operacoes = _tabela_operacoes()
+    # Um valor por linha, nem mais nem menos: um json.loads do bloco inteiro
+    # não vê onde cada linha termina. raw_decode evita o custo fixo de
+    # json.loads por linha e devolve onde o valor acabou
+    decodifica = json.JSONDecoder().raw_decode
+    saida = []
+    erros = 0
+    for linha in bloco.split(b'\n'):
+        if not linha.strip():
+            continue
+        try:
+            texto = linha.decode().strip()
+            registro, fim = decodifica(texto)
+            if fim != len(texto):
+                raise json.JSONDecodeError('Extra data', texto, fim)
+            resultado = _executa(operacoes, *_registro_json(registro))
+            saida.append(_json_resultado(json, resultado))
+        except Exception as erro:
+            erros += 1
+            saida.append(json.dumps({'erro': f'{type(erro).__name__}: {erro}'}))
+    texto = '\n'.join(saida)
+    return (texto + '\n' if saida else '').encode(), len(saida), erros
+
+
+PROCESSADORES = {CSV: _processa_csv, JSONL: _processa_jsonl}
+
+
+def processar_bloco(bloco, formato=CSV):
+    """Processa um bloco de linhas completas; retorna (bytes, registros, erros)."""
+    return PROCESSADORES[formato](bloco)
+
+
+def ler_blocos(arquivo, tamanho=BLOCO_PADRAO):
+    """Gera blocos de ~``tamanho`` bytes que sempre terminam em fim de linha."""
+    while True:
+        bloco = arquivo.read(tamanho)
+        if not bloco:
+            return
+        if not bloco.endswith(b'\n'):
+            bloco += arquivo.readline()
+        yield bloco
+
+
+def processar(entrada, saida, formato=CSV, processos=1, tamanho_bloco=BLOCO_PADRAO):
+    """Processa o arquivo binário ``entrada`` em ``saida``; retorna (registros, erros)."""
+    registros = erros = 0
+    blocos = ler_blocos(entrada, tamanho_bloco)
+    if processos <= 1:
+        for bloco in blocos:
+            dados, n, e = processar_bloco(bloco, formato)
+            saida.write(dados)
+            registros += n
+            erros += e
+        return registros, erros
+
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Janela de blocos em voo: mantém a ordem e limita a memória
+    em_voo = deque()
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        for bloco in blocos:
+            em_voo.append(executor.submit(processar_bloco, bloco, formato))
+            if len(em_voo) >= 2 * processos:
+                dados, n, e = em_voo.popleft().result()
+                saida.write(dados)
+                registros += n
+                erros += e
+        while em_voo:
+            dados, n, e = em_voo.popleft().result()
+            saida.write(dados)
+            registros += n
+            erros += e
+    return registros, erros
+
+
+def _formato_por_nome(caminho):
+    return JSONL if caminho.endswith(('.jsonl', '.json', '.ndjson')) else CSV
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog='python -m libs',
+        description='Processa registros (operacao, a, b) ou do jogo em CSV ou JSONL.')
+    parser.add_argument('entrada', nargs='?', default='-', help="arquivo de entrada ('-' = stdin)")
+    parser.add_argument('-o', '--saida', default='-', help="arquivo de saída ('-' = stdout)")
+    parser.add_argument('-f', '--formato', choices=(CSV, JSONL), default=None,
+                        help='formato da entrada (padrão: pela extensão, senão csv)')
+    parser.add_argument('-p', '--processos', type=int, default=1)
+    parser.add_argument('--bloco', type=int, default=BLOCO_PADRAO, help='bytes por bloco')
+    parser.add_argument('-q', '--silencioso', action='store_true',
+                        help='não informa o throughput em stderr')
+    args = parser.parse_args(argv)
+
+    formato = args.formato or _formato_por_nome(args.entrada)
+    entrada = sys.stdin.buffer if args.entrada == '-' else open(args.entrada, 'rb')
+    saida = sys.stdout.buffer if args.saida == '-' else open(args.saida, 'wb')
+    inicio = time.perf_counter()
+    try:
+        registros, erros = processar(entrada, saida, formato, args.processos, args.bloco)
+        saida.flush()
+    finally:
+        if entrada is not sys.stdin.buffer:
+            entrada.close()
+        if saida is not sys.stdout.buffer:
+            saida.close()
+    segundos = time.perf_counter() - inicio
+    if not args.silencioso:
+        taxa = registros / segundos if segundos > 0 else 0.0
+        print(f'{registros} registros em {segundos:.3f}s ({taxa:,.0f} registros/s, '
+              f'{erros} erros)', file=sys.stderr)
+    return 0
@@ -0,0 +1,265 @@
+"""
+Aritmética racional exata com redução preguiçosa.
+
+``fractions.Fraction`` calcula um mdc depois de cada operação para manter a
+fração irredutível. ``Racional`` adia essa normalização: numerador e
+denominador só são reduzidos quando passam de ``LIMITE_BITS`` bits ou quando o
+valor é lido (comparação, hash, conversão, exibição). Em cadeias longas isso
+troca muitos mdc pequenos por poucos.
+
+``CalculadoraRacional`` tem a mesma interface da Calculadora sobre esse tipo,
+com um atalho para inteiros: uma divisão exata entre ints retorna int e nem
+chega a criar um Racional.
+"""
+
+import math
+from fractions import Fraction
+
+# Acima deste tamanho (em bits) numerador/denominador são reduzidos na hora
+LIMITE_BITS = 128
+
+
+def _partes(valor):
+    """Retorna (numerador, denominador) de um operando exato, ou None."""
+    tipo = type(valor)
+    if tipo is Racional:
+        return valor._num, valor._den
+    if tipo is int:
+        return valor, 1
+    if tipo is bool:
+        return int(valor), 1
+    if tipo is Fraction:
+        return valor.numerator, valor.denominator
+    if tipo is float:
+        if not math.isfinite(valor):
+            return None
+        return valor.as_integer_ratio()
+    return None
+
+
+class Racional:
+    """Número racional exato, reduzido apenas sob demanda."""
+
+    __slots__ = ('_num', '_den')
+
+    def __init__(self, numerador=0, denominador=1):
+        if type(numerador) is not int or type(denominador) is not int:
+            # Caminho lento: converte float/Fraction/Racional sem perda
+            partes_n = _partes(numerador)
+            partes_d = _partes(denominador)
+            if partes_n is None or partes_d is None:
+                raise TypeError('Racional aceita apenas int, float finito, Fraction ou Racional')
+            numerador = partes_n[0] * partes_d[1]
+            denominador = partes_n[1] * partes_d[0]
+        if denominador == 0:
+            raise ZeroDivisionError('denominador zero')
+        if denominador < 0:
+            numerador, denominador = -numerador, -denominador
+        self._num = numerador
+        self._den = denominador
+
+    @classmethod
+    def _novo(cls, numerador, denominador):
+        """Constrói sem validação; reduz só se os termos cresceram demais."""
+        obj = object.__new__(cls)
+        if numerador.bit_length() > LIMITE_BITS or denominador.bit_length() > LIMITE_BITS:
+            divisor = math.gcd(numerador, denominador)
+            if divisor > 1:
+                numerador //= divisor
+                denominador //= divisor
+        obj._num = numerador
+        obj._den = denominador
+        return obj
+
+    def reduzir(self):
+        """Normaliza no lugar e retorna self."""
+        if self._den != 1:
+            divisor = math.gcd(self._num, self._den)
+            if divisor > 1:
+                self._num //= divisor
+                self._den //= divisor
+        return self
+
+    @property
+    def numerator(self):
+        return self.reduzir()._num
+
+    @property
+    def denominator(self):
+        return self.reduzir()._den
+
+    def para_fracao(self):
+        self.reduzir()
+        return Fraction(self._num, self._den)
+
+    def para_int_se_exato(self):
+        """Retorna int quando o valor é inteiro; senão o próprio Racional."""
+        self.reduzir()
+        return self._num if self._den == 1 else self
+
+    # ------------------------------------------------------------------
+    # Aritmética
+    # ------------------------------------------------------------------
+
+    def __add__(self, outro):
+        partes = _partes(outro)
+        if partes is None:
+            return NotImplemented
+        n, d = partes
+        if d == self._den:
+            return Racional._novo(self._num + n, d)
+        return Racional._novo(self._num * d + n * self._den, self._den * d)
+
+    __radd__ = __add__
+
+    def __sub__(self, outro):
+        partes = _partes(outro)
+        if partes is None:
+            return NotImplemented
+        n, d = partes
+        if d == self._den:
+            return Racional._novo(self._num - n, d)
+        return Racional._novo(self._num * d - n * self._den, self._den * d)
+
+    def __rsub__(self, outro):
+        partes = _partes(outro)
+        if partes is None:
+            return NotImplemented
+        n, d = partes
+        if d == self._den:
+            return Racional._novo(n - self._num, d)
+        return Racional._novo(n * self._den - self._num * d, self._den * d)
+
+    def __mul__(self, outro):
+        partes = _partes(outro)
+        if partes is None:
+            return NotImplemented
+        return Racional._novo(self._num * partes[0], self._den * partes[1])
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, outro):
+        partes = _partes(outro)
+        if partes is None:
+            return NotImplemented
+        n, d = partes
+        if n == 0:
+            raise ZeroDivisionError('divisão por zero')
+        if n < 0:
+            n, d = -n, -d
+        return Racional._novo(self._num * d, self._den * n)
+
+    def __rtruediv__(self, outro):
+        partes = _partes(outro)
+        if partes is None:
+            return NotImplemented
+        if self._num == 0:
+            raise ZeroDivisionError('divisão por zero')
+        n, d = partes
+        num, den = n * self._den, d * self._num
+        if den < 0:
+            num, den = -num, -den
+        return Racional._novo(num, den)
+
+    def __neg__(self):
+        return Racional._novo(-self._num, self._den)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return Racional._novo(abs(self._num), self._den)
+
+    # ------------------------------------------------------------------
+    # Leitura: comparações e conversões
+    # ------------------------------------------------------------------
+
+    def _compara(self, outro):
+        partes = _partes(outro)
+        if partes is None:
+            return None
+        n, d = partes
+        return self._num * d - n * self._den
+
+    def __eq__(self, outro):
+        diferenca = self._compara(outro)
+        if diferenca is None:
+            return NotImplemented
+        return diferenca == 0
+
+    def __lt__(self, outro):
+        diferenca = self._compara(outro)
+        return NotImplemented if diferenca is None else diferenca < 0
+
+    def __le__(self, outro):
+        diferenca = self._compara(outro)
+        return NotImplemented if diferenca is None else diferenca <= 0
+
+    def __gt__(self, outro):
+        diferenca = self._compara(outro)
+        return NotImplemented if diferenca is None else diferenca > 0
+
+    def __ge__(self, outro):
+        diferenca = self._compara(outro)
+        return NotImplemented if diferenca is None else diferenca >= 0
+
+    def __hash__(self):
+        # Mesmo hash de int/Fraction de valor igual
+        return hash(self.para_fracao())
+
+    def __bool__(self):
+        return self._num != 0
+
+    def __float__(self):
+        # Divisão verdadeira entre ints é corretamente arredondada
+        return self._num / self._den
+
+    def __int__(self):
+        quociente = abs(self._num) // self._den
+        return quociente if self._num >= 0 else -quociente
+
+    def __repr__(self):
+        self.reduzir()
+        return f'Racional({self._num}, {self._den})'
+
+    def __str__(self):
+        self.reduzir()
+        return str(self._num) if self._den == 1 else f'{self._num}/{self._den}'
+
+
+def _converte(valor):
+    if type(valor) is float:
+        return Racional(valor)
+    return valor
+
+
+class CalculadoraRacional:
+    """Calculadora exata: mesma interface da Calculadora sobre Racional.
+
+    Floats são convertidos sem perda (``float.as_integer_ratio``); ints
+    continuam ints enquanto as divisões forem exatas.
+    """
+
+    @staticmethod
+    def soma(a, b):
+        return _converte(a) + _converte(b)
+
+    @staticmethod
+    def subtracao(a, b):
+        return _converte(a) - _converte(b)
+
+    @staticmethod
+    def multiplicacao(a, b):
+        return _converte(a) * _converte(b)
+
+    @staticmethod
+    def divisao(a, b):
+        if type(a) is int and type(b) is int:
+            quociente, resto = divmod(a, b)
+            if resto == 0:
+                return quociente
+            return Racional._novo(a, b) if b > 0 else Racional._novo(-a, -b)
+        a = _converte(a)
+        if type(a) is int:
+            a = Racional._novo(a, 1)
+        return a / _converte(b)
@@ -0,0 +1,164 @@
+"""
+Reduções precisas sobre iteráveis grandes: somatório e produtório.
+
+``functools.reduce(Calculadora.soma, valores)`` acumula da esquerda para a
+direita: o erro de arredondamento cresce com o número de termos e cada
+elemento paga uma chamada de método. Aqui o iterável é consumido em folhas
+pequenas e as folhas são combinadas em árvore binária balanceada, sem
+materializar a entrada:
+
+- ``somatorio(..., metodo='pareada')``: soma pareada; erro O(log n) em vez
+  de O(n), cada folha somada pelo ``sum`` nativo;
+- ``somatorio(..., metodo='kahan')``: soma compensada de Kahan-Babuška
+  (Neumaier), erro praticamente independente de n;
+- ``produtorio``: produto em árvore; para inteiros grandes os operandos de
+  cada multiplicação têm tamanhos parecidos, o que aproveita a
+  multiplicação de Karatsuba do CPython e é muito mais rápido que o produto
+  da esquerda para a direita.
+
+Com ``processos`` o iterável é dividido em blocos de ``tamanho_bloco``
+elementos, reduzidos em um ProcessPoolExecutor; os resultados parciais são
+combinados na ordem da entrada, pela mesma árvore.
+"""
+
+import math
+import operator
+from collections import deque
+from itertools import islice
+
+PAREADA = 'pareada'
+KAHAN = 'kahan'
+
+_METODOS = (PAREADA, KAHAN)
+
+BLOCO_PADRAO = 1 << 16
+
+# Elementos por folha: somados/multiplicados em sequência por código nativo
+_FOLHA_SOMA = 128
+_FOLHA_PRODUTO = 8
+
+
+class _Arvore:
+    """Combina valores em árvore binária balanceada à medida que chegam.
+
+    Funciona como um contador binário: a pilha guarda no máximo um valor por
+    nível, então a memória é O(log n) e a ordem da entrada é preservada.
+    """
+
+    __slots__ = ('_op', '_pilha')
+
+    def __init__(self, op):
+        self._op = op
+        self._pilha = []
+
+    def adicionar(self, valor):
+        pilha = self._pilha
+        op = self._op
+        nivel = 0
+        while pilha and pilha[-1][0] == nivel:
+            valor = op(pilha.pop()[1], valor)
+            nivel += 1
+        pilha.append((nivel, valor))
+
+    def resultado(self, vazio):
+        pilha = self._pilha
+        if not pilha:
+            return vazio
+        valor = pilha[-1][1]
+        for _, anterior in reversed(pilha[:-1]):
+            valor = self._op(anterior, valor)
+        return valor
+
+
+def _folhas(iteravel, tamanho):
+    iterador = iter(iteravel)
+    while True:
+        folha = list(islice(iterador, tamanho))
+        if not folha:
+            return
+        yield folha
+
+
+def _soma_pareada(iteravel):
+    arvore = _Arvore(operator.add)
+    adicionar = arvore.adicionar
+    for folha in _folhas(iteravel, _FOLHA_SOMA):
+        adicionar(sum(folha[1:], folha[0]))
+    return arvore.resultado(0)
+
+
+def _soma_kahan(iteravel, soma=0, compensacao=0):
+    """Retorna ``(soma, compensacao)``; o total é ``soma + compensacao``."""
+    for valor in iteravel:
+        total = soma + valor
+        if abs(total) == math.inf:
+            # Com o total infinito (ou após overflow) a compensação seria
+            # inf - inf = nan; o infinito já é o resultado, como no sum()
+            pass
+        elif abs(soma) >= abs(valor):
+            compensacao += (soma - total) + valor
+        else:
+            compensacao += (valor - total) + soma
+        soma = total
+    return soma, compensacao
+
+
+def _produto_arvore(iteravel):
+    arvore = _Arvore(operator.mul)
+    adicionar = arvore.adicionar
+    for folha in _folhas(iteravel, _FOLHA_PRODUTO):
+        adicionar(math.prod(folha))
+    return arvore.resultado(1)
+
+
+def _parciais(funcao, iteravel, processos, tamanho_bloco):
+    """Gera os resultados de ``funcao`` sobre cada bloco, na ordem da entrada."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Janela de blocos em voo: mantém a ordem e limita a memória
+    em_voo = deque()
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        for bloco in _folhas(iteravel, tamanho_bloco):
+            em_voo.append(executor.submit(funcao, bloco))
+            if len(em_voo) >= 2 * processos:
+                yield em_voo.popleft().result()
+        while em_voo:
+            yield em_voo.popleft().result()
+
+
+def _valida(processos, tamanho_bloco):
+    if processos is not None and processos < 1:
+        raise ValueError('processos precisa ser positivo')
+    if tamanho_bloco < 1:
+        raise ValueError('tamanho_bloco precisa ser positivo')
+
+
+def somatorio(iteravel, metodo=PAREADA, processos=None, tamanho_bloco=BLOCO_PADRAO):
+    """Soma todos os elementos de ``iteravel`` (0 se vazio).
+
+    ``metodo`` é ``'pareada'`` ou ``'kahan'``. Inteiros, Fraction e Decimal
+    continuam exatos em ambos; a diferença está no erro com floats.
+    """
+    if metodo not in _METODOS:
+        raise ValueError(f'método inválido: {metodo!r}')
+    _valida(processos, tamanho_bloco)
+    if metodo == PAREADA:
+        if processos is None or processos == 1:
+            return _soma_pareada(iteravel)
+        return _soma_pareada(_parciais(_soma_pareada, iteravel, processos, tamanho_bloco))
+
+    if processos is None or processos == 1:
+        soma, compensacao = _soma_kahan(iteravel)
+        return soma + compensacao
+    soma = compensacao = 0
+    for parcial, erro in _parciais(_soma_kahan, iteravel, processos, tamanho_bloco):
+        soma, compensacao = _soma_kahan((parcial, erro), soma, compensacao)
+    return soma + compensacao
+
+
+def produtorio(iteravel, processos=None, tamanho_bloco=BLOCO_PADRAO):
+    """Multiplica todos os elementos de ``iteravel`` (1 se vazio), em árvore."""
+    _valida(processos, tamanho_bloco)
+    if processos is None or processos == 1:
+        return _produto_arvore(iteravel)
+    return _produto_arvore(_parciais(_produto_arvore, iteravel, processos, tamanho_bloco))
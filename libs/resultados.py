@@ -0,0 +1,182 @@
+"""
+Contêineres compactos para resultados em lote.
+
+Uma lista de floats custa ~32 bytes por valor (ponteiro de 8 bytes mais o
+objeto float de 24), e uma lista de dicts com ``passo_0``...``passo_4`` passa
+de 200 bytes por registro. ``Tabela`` guarda cada coluna em um
+``array.array``: 8 bytes por valor em ``'d'``/``'q'``, sem objeto por
+elemento. Os registros só viram objetos quando lidos, como ``Registro``
+(uma view com ``__slots__``, sem cópia dos valores).
+
+As colunas expõem o protocolo de buffer do próprio ``array.array``:
+``memoryview(tabela.coluna('resultado'))`` e ``tabela.para_numpy()`` não
+copiam nada; ``para_bytes`` copia, porque ``bytes`` é imutável.
+"""
+
+from array import array
+
+# Typecodes aceitos: inteiros de 64 bits ou double
+_TYPECODES = ('q', 'd')
+
+# dtype do NumPy equivalente a cada typecode
+_DTYPES = {'q': 'int64', 'd': 'float64'}
+
+
+def typecode_para(valores):
+    """``'q'`` se todos os valores são ints que cabem em 64 bits, senão ``'d'``."""
+    if isinstance(valores, array):
+        return 'd' if valores.typecode in 'fd' else 'q'
+    for valor in valores:
+        if type(valor) is not int or not -2**63 <= valor < 2**63:
+            return 'd'
+    return 'q'
+
+
+def coluna(valores, typecode=None):
+    """Converte ``valores`` em ``array.array``; reaproveita arrays do mesmo typecode."""
+    if typecode is None:
+        if not isinstance(valores, (array, list, tuple, range)):
+            valores = list(valores)     # geradores: percorre uma vez só
+        typecode = typecode_para(valores)
+    if typecode not in _TYPECODES:
+        raise ValueError(f'typecode inválido: {typecode!r} (use "q" ou "d")')
+    if isinstance(valores, array) and valores.typecode == typecode:
+        return valores
+    return array(typecode, valores)
+
+
+class Registro:
+    """Uma linha da Tabela; os atributos são lidos das colunas sob demanda."""
+
+    __slots__ = ('_tabela', 'indice')
+
+    def __init__(self, tabela, indice):
+        self._tabela = tabela
+        self.indice = indice
+
+    def __getattr__(self, nome):
+        try:
+            return self._tabela._colunas[nome][self.indice]
+        except KeyError:
+            raise AttributeError(nome) from None
+
+    def para_dict(self):
+        return {nome: valores[self.indice] for nome, valores in self._tabela._colunas.items()}
+
+    def __eq__(self, outro):
+        if not isinstance(outro, Registro):
+            return NotImplemented
+        return self.para_dict() == outro.para_dict()
+
+    def __repr__(self):
+        campos = ', '.join(f'{nome}={valor!r}' for nome, valor in self.para_dict().items())
+        return f'Registro({self.indice}, {campos})'
+
+
+class Tabela:
+    """Colunas numéricas de mesmo tamanho, cada uma em um ``array.array``.
+
+    Monte com ``Tabela.de_colunas(entrada=..., resultado=...)`` (sem cópia
+    quando as colunas já são arrays) ou crie vazia com os nomes e typecodes
+    e use ``anexar``/``estender``.
+    """
+
+    __slots__ = ('_colunas',)
+
+    def __init__(self, nomes, typecodes='d'):
+        nomes = tuple(nomes)
+        if isinstance(typecodes, str) and len(typecodes) == 1:
+            typecodes = typecodes * len(nomes)
+        if len(typecodes) != len(nomes):
+            raise ValueError('um typecode por coluna')
+        if len(set(nomes)) != len(nomes):
+            raise ValueError('nomes de coluna repetidos')
+        self._colunas = {nome: coluna((), typecode) for nome, typecode in zip(nomes, typecodes)}
+
+    @classmethod
+    def de_colunas(cls, **colunas):
+        """Tabela a partir de sequências do mesmo tamanho, uma por coluna."""
+        tabela = cls.__new__(cls)
+        tabela._colunas = {nome: coluna(valores) for nome, valores in colunas.items()}
+        tamanhos = {len(valores) for valores in tabela._colunas.values()}
+        if len(tamanhos) > 1:
+            raise ValueError(f'colunas com tamanhos diferentes: {sorted(tamanhos)}')
+        return tabela
+
+    @property
+    def nomes(self):
+        return tuple(self._colunas)
+
+    def coluna(self, nome):
+        """O ``array.array`` da coluna (o próprio, não uma cópia)."""
+        return self._colunas[nome]
+
+    def __len__(self):
+        for valores in self._colunas.values():
+            return len(valores)
+        return 0
+
+    def __getitem__(self, indice):
+        tamanho = len(self)
+        if indice < 0:
+            indice += tamanho
+        if not 0 <= indice < tamanho:
+            raise IndexError('índice fora da tabela')
+        return Registro(self, indice)
+
+    def __iter__(self):
+        for indice in range(len(self)):
+            yield Registro(self, indice)
+
+    def anexar(self, *valores, **por_nome):
+        """Acrescenta uma linha, por posição (na ordem de ``nomes``) ou por nome."""
+        if por_nome:
+            valores = valores + tuple(por_nome.pop(nome) for nome in self.nomes[len(valores):])
+        if len(valores) != len(self._colunas) or por_nome:
+            raise TypeError(f'a tabela tem {len(self._colunas)} colunas: {", ".join(self.nomes)}')
+        for valores_coluna, valor in zip(self._colunas.values(), valores):
+            valores_coluna.append(valor)
+
+    def estender(self, **colunas):
+        """Acrescenta várias linhas; ``colunas`` precisa trazer todas, do mesmo tamanho."""
+        if set(colunas) != set(self._colunas):
+            raise TypeError(f'informe as colunas {", ".join(self.nomes)}')
+        tamanhos = {len(valores) for valores in colunas.values()}
+        if len(tamanhos) > 1:
+            raise ValueError(f'colunas com tamanhos diferentes: {sorted(tamanhos)}')
+        for nome, valores in colunas.items():
+            self._colunas[nome].extend(valores)
+
+    @property
+    def nbytes(self):
+        """Bytes ocupados pelos valores (sem o cabeçalho dos arrays)."""
+        return sum(len(valores) * valores.itemsize for valores in self._colunas.values())
+
+    def memoryview(self, nome):
+        """View sem cópia sobre os bytes da coluna."""
+        return memoryview(self._colunas[nome])
+
+    def para_bytes(self, nome):
+        """Cópia dos bytes da coluna, na ordem de bytes da máquina."""
+        return self._colunas[nome].tobytes()
+
+    def para_numpy(self, nome=None):
+        """ndarray que compartilha a memória da coluna (ou dict de todas).
+
+        O array do NumPy aponta para o buffer do ``array.array``: não cresça
+        a coluna enquanto ele estiver em uso.
+        """
+        import numpy as np
+
+        if nome is not None:
+            valores = self._colunas[nome]
+            return np.frombuffer(valores, dtype=_DTYPES[valores.typecode])
+        return {nome: self.para_numpy(nome) for nome in self._colunas}
+
+    def para_dicts(self):
+        """Lista de dicts, um por linha (materializa tudo; para depuração)."""
+        return [registro.para_dict() for registro in self]
+
+    def __repr__(self):
+        colunas = ', '.join(f'{nome}:{valores.typecode}' for nome, valores in self._colunas.items())
+        return f'Tabela({len(self)} linhas; {colunas})'
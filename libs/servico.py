@@ -0,0 +1,360 @@
+"""
+Servidor asyncio da Calculadora e do jogo, com cliente em pool e pipelining.
+
+Protocolo binário (big-endian), um quadro por requisição ou resposta:
+
+    quadro     = tamanho:uint32 corpo
+    requisição = id:uint32 operacao:uint8 operando*
+    resposta   = id:uint32 status:uint8 (operando | "tipo\\0mensagem")
+
+Cada operando é uma tag de um byte seguida do valor: ``d`` float64, ``q``
+int64 ou ``g`` inteiro arbitrário (uint32 de tamanho + bytes com sinal). O
+``id`` permite que o cliente envie muitas requisições sem esperar respostas
+(pipelining) e as associe quando chegarem. Um quadro mal formado recebe uma
+resposta de erro ``ValueError`` (com id 0 se nem o id couber no quadro); um
+tamanho declarado acima de ``tamanho_maximo_quadro`` encerra a conexão antes
+de qualquer leitura do corpo.
+
+Uso:
+    python -m libs.servico [--host H] [--porta P | --unix CAMINHO]
+"""
+
+import argparse
+import asyncio
+import builtins
+import itertools
+import struct
+
+from libs.calculadora import Calculadora
+from libs.jogo import pense_num_numero, pense_num_numero2
+
+_TAMANHO = struct.Struct('!I')
+_CABECALHO = struct.Struct('!IB')
+_FLOAT = struct.Struct('!d')
+_INT64 = struct.Struct('!q')
+
+_MIN_INT64 = -2**63
+_MAX_INT64 = 2**63 - 1
+
+# Libera o buffer de escrita quando passar deste tamanho
+_LIMITE_BUFFER = 1 << 16
+
+# Maior corpo de requisição aceito pelo servidor (inteiros de milhões de bits)
+TAMANHO_MAXIMO_QUADRO = 1 << 24
+
+OK = 0
+ERRO = 1
+
+# operação -> (código, função, número de operandos)
+OPERACOES = {
+    'soma': (1, Calculadora.soma, 2),
+    'subtracao': (2, Calculadora.subtracao, 2),
+    'multiplicacao': (3, Calculadora.multiplicacao, 2),
+    'divisao': (4, Calculadora.divisao, 2),
+    'pense_num_numero': (5, pense_num_numero, 1),
+    'pense_num_numero2': (6, pense_num_numero2, 1),
+}
+_POR_CODIGO = {codigo: (funcao, aridade) for codigo, funcao, aridade in OPERACOES.values()}
+
+# Exceções embutidas recriadas no cliente com o mesmo tipo
+_ERROS_EMBUTIDOS = ('ZeroDivisionError', 'TypeError', 'ValueError', 'OverflowError')
+
+
+class ErroRemoto(Exception):
+    """Erro levantado pelo servidor que não corresponde a uma exceção embutida."""
+
+    def __init__(self, tipo, mensagem):
+        super().__init__(f'{tipo}: {mensagem}')
+        self.tipo = tipo
+        self.mensagem = mensagem
+
+
+# ============================================================================
+# CODIFICAÇÃO
+# ============================================================================
+
+def codifica_valor(valor):
+    """Codifica um int ou float como operando do protocolo."""
+    tipo = type(valor)
+    if tipo is float:
+        return b'd' + _FLOAT.pack(valor)
+    if tipo is int or tipo is bool:
+        valor = int(valor)
+        if _MIN_INT64 <= valor <= _MAX_INT64:
+            return b'q' + _INT64.pack(valor)
+        dados = valor.to_bytes(valor.bit_length() // 8 + 1, 'big', signed=True)
+        return b'g' + _TAMANHO.pack(len(dados)) + dados
+    raise TypeError(f'tipo não suportado pelo protocolo: {tipo.__name__}')
+
+
+def decodifica_valor(dados, posicao):
+    """Decodifica um operando a partir de ``posicao``; retorna (valor, nova posição)."""
+    tag = dados[posicao:posicao + 1]
+    posicao += 1
+    if tag == b'd':
+        return _FLOAT.unpack_from(dados, posicao)[0], posicao + 8
+    if tag == b'q':
+        return _INT64.unpack_from(dados, posicao)[0], posicao + 8
+    if tag == b'g':
+        tamanho = _TAMANHO.unpack_from(dados, posicao)[0]
+        posicao += 4
+        if posicao + tamanho > len(dados):
+            raise ValueError('operando inteiro cortado')
+        valor = int.from_bytes(dados[posicao:posicao + tamanho], 'big', signed=True)
+        return valor, posicao + tamanho
+    raise ValueError(f'tag de operando desconhecida: {tag!r}')
+
+
+def _quadro(corpo):
+    return _TAMANHO.pack(len(corpo)) + corpo
+
+
+def codifica_requisicao(identificador, operacao, operandos):
+    codigo, _, aridade = OPERACOES[operacao]
+    if len(operandos) != aridade:
+        raise TypeError(f'{operacao} espera {aridade} operando(s), recebeu {len(operandos)}')
+    corpo = _CABECALHO.pack(identificador, codigo) + b''.join(map(codifica_valor, operandos))
+    return _quadro(corpo)
+
+
+def _resposta(corpo):
+    """Executa uma requisição já sem o prefixo de tamanho e monta a resposta."""
+    # Sem os 4 bytes do id não há a quem responder: o erro vai com id 0
+    identificador = _TAMANHO.unpack_from(corpo)[0] if len(corpo) >= _TAMANHO.size else 0
+    try:
+        _, codigo = _CABECALHO.unpack_from(corpo)
+        funcao, aridade = _POR_CODIGO[codigo]
+        posicao = _CABECALHO.size
+        operandos = []
+        for _ in range(aridade):
+            valor, posicao = decodifica_valor(corpo, posicao)
+            operandos.append(valor)
+        resultado = codifica_valor(funcao(*operandos))
+    except KeyError:
+        erro = f'ValueError\0operação desconhecida: {codigo}'.encode()
+        return _quadro(_CABECALHO.pack(identificador, ERRO) + erro)
+    except struct.error as excecao:
+        erro = f'ValueError\0quadro mal formado: {excecao}'.encode()
+        return _quadro(_CABECALHO.pack(identificador, ERRO) + erro)
+    except Exception as excecao:
+        erro = f'{type(excecao).__name__}\0{excecao}'.encode()
+        return _quadro(_CABECALHO.pack(identificador, ERRO) + erro)
+    return _quadro(_CABECALHO.pack(identificador, OK) + resultado)
+
+
+def _erro_da_resposta(dados):
+    tipo, _, mensagem = dados.decode().partition('\0')
+    if tipo in _ERROS_EMBUTIDOS:
+        return getattr(builtins, tipo)(mensagem)
+    return ErroRemoto(tipo, mensagem)
+
+
+# ============================================================================
+# SERVIDOR
+# ============================================================================
+
+class Servidor:
+    """Servidor TCP (ou socket Unix) das operações da Calculadora e do jogo."""
+
+    def __init__(self, host='127.0.0.1', porta=0, caminho=None,
+                 tamanho_maximo_quadro=TAMANHO_MAXIMO_QUADRO):
+        self.host = host
+        self.porta = porta
+        self.caminho = caminho
+        self.tamanho_maximo_quadro = tamanho_maximo_quadro
+        self._servidor = None
+
+    async def iniciar(self):
+        if self.caminho is not None:
+            self._servidor = await asyncio.start_unix_server(self._atende, path=self.caminho)
+        else:
+            self._servidor = await asyncio.start_server(self._atende, self.host, self.porta)
+            self.porta = self._servidor.sockets[0].getsockname()[1]
+        return self
+
+    async def fechar(self):
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+            self._servidor = None
+
+    async def servir_para_sempre(self):
+        await self._servidor.serve_forever()
+
+    async def __aenter__(self):
+        return await self.iniciar()
+
+    async def __aexit__(self, *exc):
+        await self.fechar()
+
+    async def _atende(self, reader, writer):
+        transporte = writer.transport
+        maximo = self.tamanho_maximo_quadro
+        try:
+            while True:
+                cabecalho = await reader.readexactly(_TAMANHO.size)
+                tamanho = _TAMANHO.unpack(cabecalho)[0]
+                if tamanho > maximo:
+                    # Não há como pular o corpo sem lê-lo: encerra a conexão
+                    break
+                corpo = await reader.readexactly(tamanho)
+                writer.write(_resposta(corpo))
+                if transporte.get_write_buffer_size() > _LIMITE_BUFFER:
+                    await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+# ============================================================================
+# CLIENTE
+# ============================================================================
+
+class _Conexao:
+    """Uma conexão com leitura em segundo plano das respostas pendentes."""
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._pendentes = {}
+        self._tarefa = asyncio.get_running_loop().create_task(self._le_respostas())
+
+    def enviar(self, identificador, quadro):
+        futuro = asyncio.get_running_loop().create_future()
+        self._pendentes[identificador] = futuro
+        self._writer.write(quadro)
+        return futuro
+
+    async def drenar(self):
+        await self._writer.drain()
+
+    async def _le_respostas(self):
+        try:
+            while True:
+                cabecalho = await self._reader.readexactly(_TAMANHO.size)
+                corpo = await self._reader.readexactly(_TAMANHO.unpack(cabecalho)[0])
+                identificador, status = _CABECALHO.unpack_from(corpo)
+                futuro = self._pendentes.pop(identificador, None)
+                if futuro is None or futuro.done():
+                    continue
+                if status == OK:
+                    futuro.set_result(decodifica_valor(corpo, _CABECALHO.size)[0])
+                else:
+                    futuro.set_exception(_erro_da_resposta(corpo[_CABECALHO.size:]))
+        except (asyncio.IncompleteReadError, ConnectionError) as erro:
+            falha = ConnectionError(f'conexão encerrada: {erro}')
+        except asyncio.CancelledError:
+            falha = ConnectionError('conexão fechada pelo cliente')
+        for futuro in self._pendentes.values():
+            if not futuro.done():
+                futuro.set_exception(falha)
+        self._pendentes.clear()
+
+    async def fechar(self):
+        self._tarefa.cancel()
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+class Cliente:
+    """Cliente com pool de conexões e pipelining de requisições.
+
+    As requisições são distribuídas em rodízio entre ``conexoes`` conexões;
+    ``executar_varios`` escreve todos os quadros antes de esperar qualquer
+    resposta, então um lote inteiro custa uma única ida e volta.
+    """
+
+    def __init__(self, host='127.0.0.1', porta=None, caminho=None, conexoes=4):
+        if conexoes < 1:
+            raise ValueError('conexoes precisa ser positivo')
+        self.host = host
+        self.porta = porta
+        self.caminho = caminho
+        self.num_conexoes = conexoes
+        self._conexoes = []
+        self._rodizio = None
+        self._ids = itertools.count()
+
+    async def conectar(self):
+        for _ in range(self.num_conexoes):
+            if self.caminho is not None:
+                reader, writer = await asyncio.open_unix_connection(self.caminho)
+            else:
+                reader, writer = await asyncio.open_connection(self.host, self.porta)
+            self._conexoes.append(_Conexao(reader, writer))
+        self._rodizio = itertools.cycle(self._conexoes)
+        return self
+
+    async def fechar(self):
+        for conexao in self._conexoes:
+            await conexao.fechar()
+        self._conexoes.clear()
+
+    async def __aenter__(self):
+        return await self.conectar()
+
+    async def __aexit__(self, *exc):
+        await self.fechar()
+
+    def _enviar(self, operacao, operandos):
+        identificador = next(self._ids) & 0xFFFFFFFF
+        conexao = next(self._rodizio)
+        quadro = codifica_requisicao(identificador, operacao, operandos)
+        return conexao, conexao.enviar(identificador, quadro)
+
+    async def executar(self, operacao, *operandos):
+        conexao, futuro = self._enviar(operacao, operandos)
+        await conexao.drenar()
+        return await futuro
+
+    async def executar_varios(self, chamadas):
+        """Envia ``[(operacao, operando, ...), ...]`` de uma vez e retorna os resultados em ordem."""
+        futuros = [self._enviar(chamada[0], chamada[1:])[1] for chamada in chamadas]
+        for conexao in self._conexoes:
+            await conexao.drenar()
+        return await asyncio.gather(*futuros)
+
+    async def soma(self, a, b):
+        return await self.executar('soma', a, b)
+
+    async def subtracao(self, a, b):
+        return await self.executar('subtracao', a, b)
+
+    async def multiplicacao(self, a, b):
+        return await self.executar('multiplicacao', a, b)
+
+    async def divisao(self, a, b):
+        return await self.executar('divisao', a, b)
+
+    async def pense_num_numero(self, num):
+        return await self.executar('pense_num_numero', num)
+
+    async def pense_num_numero2(self, num):
+        return await self.executar('pense_num_numero2', num)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Servidor da Calculadora e do jogo.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=8765)
+    parser.add_argument('--unix', dest='caminho', default=None,
+                        help='caminho de socket Unix (substitui host/porta)')
+    args = parser.parse_args(argv)
+
+    async def _roda():
+        servidor = await Servidor(args.host, args.porta, args.caminho).iniciar()
+        print(f'servindo em {args.caminho or f"{args.host}:{servidor.porta}"}')
+        await servidor.servir_para_sempre()
+
+    try:
+        asyncio.run(_roda())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+"""
+Camada simbólica mínima para cadeias de operações da Calculadora.
+
+Uma cadeia como a de ``pense_num_numero`` é executada uma única vez sobre uma
+variável simbólica ``x``; como as quatro operações da Calculadora apenas
+delegam para ``+ - * /``, o resultado é a forma fechada ``coef * x + const``
+com coeficientes racionais exatos. Quando ``coef`` é zero a cadeia está
+provada constante e pode ser dobrada para o seu valor.
+"""
+
+import math
+from fractions import Fraction
+
+
+class NaoLinear(Exception):
+    """A cadeia não é linear na variável, então não há forma fechada."""
+
+
+def _para_fracao(valor):
+    """Converte constantes numéricas para Fraction exata (ou None)."""
+    if isinstance(valor, bool):
+        return None
+    if isinstance(valor, (int, Fraction)):
+        return Fraction(valor)
+    if isinstance(valor, float) and math.isfinite(valor):
+        return Fraction(valor)
+    return None
+
+
+class Linear:
+    """Expressão ``coef * x + const`` sobre uma única variável."""
+
+    __slots__ = ('coef', 'const', 'gera_float')
+
+    def __init__(self, coef=0, const=0, gera_float=False):
+        self.coef = Fraction(coef)
+        self.const = Fraction(const)
+        # Indica se houve divisão verdadeira ou constante float na cadeia: com
+        # entrada int o resultado passo a passo é float, e a forma dobrada
+        # deve respeitar isso
+        self.gera_float = gera_float
+
+    @classmethod
+    def variavel(cls):
+        """Retorna a variável ``x``."""
+        return cls(1, 0)
+
+    @property
+    def eh_constante(self):
+        return self.coef == 0
+
+    def _coage(self, outro):
+        if isinstance(outro, Linear):
+            return outro
+        fracao = _para_fracao(outro)
+        if fracao is None:
+            return None
+        return Linear(0, fracao, isinstance(outro, float))
+
+    def __add__(self, outro):
+        outro = self._coage(outro)
+        if outro is None:
+            return NotImplemented
+        return Linear(self.coef + outro.coef, self.const + outro.const,
+                      self.gera_float or outro.gera_float)
+
+    __radd__ = __add__
+
+    def __sub__(self, outro):
+        outro = self._coage(outro)
+        if outro is None:
+            return NotImplemented
+        return Linear(self.coef - outro.coef, self.const - outro.const,
+                      self.gera_float or outro.gera_float)
+
+    def __rsub__(self, outro):
+        outro = self._coage(outro)
+        if outro is None:
+            return NotImplemented
+        return outro - self
+
+    def __mul__(self, outro):
+        outro = self._coage(outro)
+        if outro is None:
+            return NotImplemented
+        if not self.eh_constante and not outro.eh_constante:
+            raise NaoLinear(f'({self}) * ({outro}) não é linear')
+        return Linear(self.coef * outro.const + outro.coef * self.const,
+                      self.const * outro.const,
+                      self.gera_float or outro.gera_float)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, outro):
+        outro = self._coage(outro)
+        if outro is None:
+            return NotImplemented
+        if not outro.eh_constante:
+            raise NaoLinear(f'({self}) / ({outro}) não é linear')
+        if outro.const == 0:
+            raise ZeroDivisionError('divisão por zero')
+        return Linear(self.coef / outro.const, self.const / outro.const, True)
+
+    def __rtruediv__(self, outro):
+        outro = self._coage(outro)
+        if outro is None:
+            return NotImplemented
+        return outro / self
+
+    def __repr__(self):
+        return f'Linear({self})'
+
+    def __str__(self):
+        if self.eh_constante:
+            return str(self.const)
+        termo = 'x' if self.coef == 1 else f'{self.coef}*x'
+        if self.const == 0:
+            return termo
+        sinal = '-' if self.const < 0 else '+'
+        return f'{termo} {sinal} {abs(self.const)}'
+
+
+def simplificar(funcao):
+    """Executa ``funcao`` sobre ``x`` simbólico e retorna a forma ``Linear``.
+
+    Retorna None quando a cadeia não pode ser provada linear (operação não
+    linear, tipo desconhecido, divisão por zero ou retorno não simbólico).
+    """
+    try:
+        forma = funcao(Linear.variavel())
+    except (NaoLinear, TypeError, ZeroDivisionError):
+        return None
+    if not isinstance(forma, Linear):
+        return None
+    return forma
+
+
+class CadeiaDobrada:
+    """Executa uma cadeia pela forma fechada, com fallback passo a passo.
+
+    A forma fechada é usada apenas para ``int``, ``float`` finito e
+    ``Fraction``, tipos em que o valor exato da expressão é conhecido; o
+    resultado segue o tipo que a execução passo a passo produziria (``float``
+    quando há divisão sobre ``int``). Qualquer outra entrada (Decimal, strings,
+    infinito, NaN, tipos do usuário) percorre a cadeia original.
+    """
+
+    def __init__(self, funcao):
+        self.funcao = funcao
+        self.forma = simplificar(funcao)
+        constante = self.forma is not None and self.forma.eh_constante
+        self._constante_float = float(self.forma.const) if constante else None
+        self._constante_int = (
+            int(self.forma.const)
+            if constante and not self.forma.gera_float and self.forma.const.denominator == 1
+            else None
+        )
+
+    @property
+    def eh_constante(self):
+        return self.forma is not None and self.forma.eh_constante
+
+    def descrever(self):
+        """Descrição legível do resultado da prova."""
+        if self.forma is None:
+            return 'sem forma fechada'
+        if self.eh_constante:
+            return f'constante {self.forma.const}'
+        return str(self.forma)
+
+    def __call__(self, x):
+        tipo = type(x)
+        forma = self.forma
+        if forma is None or (tipo is float and not math.isfinite(x)):
+            return self.funcao(x)
+        if tipo is float or (tipo is int and forma.gera_float):
+            if self._constante_float is not None:
+                return self._constante_float
+            return float(forma.coef * Fraction(x) + forma.const)
+        if tipo is int:
+            if self._constante_int is not None:
+                return self._constante_int
+            return int(forma.coef * x + forma.const)
+        if tipo is Fraction:
+            return forma.coef * x + forma.const
+        return self.funcao(x)
+
+
+def dobrar(funcao):
+    """Atalho para ``CadeiaDobrada(funcao)``."""
+    return CadeiaDobrada(funcao)
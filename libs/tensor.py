@@ -0,0 +1,380 @@
+"""
+Arrays N-D sobre array.array, com broadcasting e views, sem NumPy.
+
+``Tensor`` guarda os elementos em um ``array.array`` e descreve a
+disposição por ``forma`` (tamanho de cada eixo), ``passos`` (distância em
+elementos entre vizinhos de cada eixo) e ``inicio``. Fatiar, transpor e
+remodelar um tensor contíguo criam views que compartilham o mesmo buffer,
+sem cópia.
+
+As quatro operações da Calculadora funcionam sobre tensores (os operadores
+``+ - * /`` estão definidos, então ``Calculadora.soma(t, u)`` também), com o
+broadcasting do NumPy: formas alinhadas pela direita, eixos de tamanho 1
+esticados. O núcleo elemento a elemento trabalha por linhas do último eixo:
+cada linha vira um fatiamento do ``array.array`` (ou um ``repeat`` em eixos
+esticados) e é combinada por ``map`` com a função de ``operator`` da
+operação, sem uma chamada Python por elemento. O despacho é só por
+operador: int64 e float64 passam pelo mesmo núcleo, e o tipo decide apenas
+o typecode da saída.
+
+Tipos: ``'q'`` (int64) e ``'d'`` (float64). Divisão e qualquer operando
+float produzem ``'d'``; resultados inteiros fora de int64 levantam
+OverflowError, como no próprio array.array.
+"""
+
+import numbers
+import operator
+from array import array
+from itertools import product, repeat
+
+INTEIRO = 'q'
+REAL = 'd'
+
+_TYPECODES_REAIS = 'fd'
+
+
+def _eh_escalar(valor):
+    return isinstance(valor, numbers.Number)
+
+
+def _passos_contiguos(forma):
+    passos = []
+    passo = 1
+    for tamanho in reversed(forma):
+        passos.append(passo)
+        passo *= tamanho
+    return tuple(reversed(passos))
+
+
+def _total(forma):
+    total = 1
+    for tamanho in forma:
+        total *= tamanho
+    return total
+
+
+def _achata(dados):
+    """Retorna ``(forma, lista_plana)`` de uma lista aninhada retangular."""
+    forma = []
+    nivel = dados
+    while isinstance(nivel, (list, tuple)):
+        forma.append(len(nivel))
+        if not nivel:
+            break
+        nivel = nivel[0]
+    plana = dados
+    for tamanho in forma[1:]:
+        proxima = []
+        for item in plana:
+            if not isinstance(item, (list, tuple)) or len(item) != tamanho:
+                raise ValueError('lista aninhada não é retangular')
+            proxima.extend(item)
+        plana = proxima
+    if forma and any(isinstance(item, (list, tuple)) for item in plana):
+        raise ValueError('lista aninhada não é retangular')
+    return tuple(forma), list(plana) if forma else [dados]
+
+
+def _typecode_para(valores):
+    return INTEIRO if all(type(valor) is int for valor in valores) else REAL
+
+
+class Tensor:
+    """Array N-D de int64 ou float64 sobre um ``array.array``."""
+
+    __slots__ = ('dados', 'forma', 'passos', 'inicio')
+
+    def __init__(self, dados, forma=None, typecode=None):
+        if isinstance(dados, array):
+            if forma is None:
+                forma = (len(dados),)
+            if typecode is not None and typecode != dados.typecode:
+                dados = array(typecode, dados)
+        else:
+            forma_lida, plana = _achata(dados)
+            if forma is None:
+                forma = forma_lida
+            dados = array(typecode or _typecode_para(plana), plana)
+        forma = tuple(forma)
+        if _total(forma) != len(dados):
+            raise ValueError(f'forma {forma} incompatível com {len(dados)} elementos')
+        self.dados = dados
+        self.forma = forma
+        self.passos = _passos_contiguos(forma)
+        self.inicio = 0
+
+    @classmethod
+    def _view(cls, dados, forma, passos, inicio):
+        obj = object.__new__(cls)
+        obj.dados = dados
+        obj.forma = tuple(forma)
+        obj.passos = tuple(passos)
+        obj.inicio = inicio
+        return obj
+
+    @classmethod
+    def zeros(cls, forma, typecode=INTEIRO):
+        forma = tuple(forma)
+        return cls(array(typecode, bytes(_total(forma) * array(typecode).itemsize)), forma)
+
+    @classmethod
+    def cheio(cls, forma, valor):
+        forma = tuple(forma)
+        typecode = INTEIRO if type(valor) is int else REAL
+        return cls(array(typecode, [valor]) * _total(forma), forma)
+
+    # ------------------------------------------------------------------
+    # Propriedades
+    # ------------------------------------------------------------------
+
+    @property
+    def typecode(self):
+        return self.dados.typecode
+
+    @property
+    def ndim(self):
+        return len(self.forma)
+
+    @property
+    def tamanho(self):
+        return _total(self.forma)
+
+    def __len__(self):
+        if not self.forma:
+            raise TypeError('tensor 0-d não tem len')
+        return self.forma[0]
+
+    def eh_contiguo(self):
+        return (self.inicio == 0 and len(self.dados) == self.tamanho
+                and self.passos == _passos_contiguos(self.forma))
+
+    # ------------------------------------------------------------------
+    # Linhas do último eixo: a unidade de trabalho dos núcleos
+    # ------------------------------------------------------------------
+
+    def _inicios_linhas(self):
+        """Gera o deslocamento do primeiro elemento de cada linha do último eixo."""
+        forma = self.forma[:-1]
+        passos = self.passos[:-1]
+        if not forma:
+            yield self.inicio
+            return
+        for indice in product(*map(range, forma)):
+            yield self.inicio + sum(map(operator.mul, indice, passos))
+
+    def _linhas(self):
+        """Gera cada linha do último eixo como iterável de valores."""
+        dados = self.dados
+        if not self.forma:
+            yield (dados[self.inicio],)
+            return
+        n = self.forma[-1]
+        passo = self.passos[-1]
+        for inicio in self._inicios_linhas():
+            if passo == 0:
+                yield repeat(dados[inicio], n)
+            elif n == 0:
+                yield ()
+            else:
+                fim = inicio + n * passo
+                yield dados[inicio:fim if fim >= 0 else None:passo]
+
+    def _plano(self):
+        """Todos os elementos em ordem C, sem copiar quando já é contíguo."""
+        if self.eh_contiguo():
+            return self.dados
+        resultado = array(self.typecode)
+        for linha in self._linhas():
+            resultado.extend(linha)
+        return resultado
+
+    def contiguo(self):
+        """Retorna o próprio tensor se contíguo, senão uma cópia contígua."""
+        if self.eh_contiguo():
+            return self
+        return Tensor(self._plano(), self.forma)
+
+    def copia(self):
+        return Tensor(array(self.typecode, self._plano()), self.forma)
+
+    def tolist(self):
+        plana = self._plano().tolist()
+        if not self.forma:
+            return plana[0]
+        for tamanho in reversed(self.forma[1:]):
+            plana = [plana[i:i + tamanho] for i in range(0, len(plana), tamanho)]
+        return plana
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __repr__(self):
+        return f'Tensor({self.tolist()!r}, typecode={self.typecode!r})'
+
+    # ------------------------------------------------------------------
+    # Views: indexação, transposição e remodelagem
+    # ------------------------------------------------------------------
+
+    def __getitem__(self, chave):
+        if not isinstance(chave, tuple):
+            chave = (chave,)
+        if len(chave) > len(self.forma):
+            raise IndexError(f'{len(chave)} índices para tensor de {len(self.forma)} eixos')
+        inicio = self.inicio
+        forma = []
+        passos = []
+        for eixo, indice in enumerate(chave):
+            tamanho = self.forma[eixo]
+            passo = self.passos[eixo]
+            if isinstance(indice, slice):
+                comeco, _, salto = indice.indices(tamanho)
+                forma.append(len(range(*indice.indices(tamanho))))
+                passos.append(passo * salto)
+                inicio += comeco * passo
+            else:
+                indice = operator.index(indice)
+                if indice < 0:
+                    indice += tamanho
+                if not 0 <= indice < tamanho:
+                    raise IndexError(f'índice fora do eixo {eixo} de tamanho {tamanho}')
+                inicio += indice * passo
+        forma.extend(self.forma[len(chave):])
+        passos.extend(self.passos[len(chave):])
+        if not forma:
+            return self.dados[inicio]
+        return Tensor._view(self.dados, forma, passos, inicio)
+
+    def transpor(self, *eixos):
+        """View com os eixos permutados (padrão: ordem invertida)."""
+        if len(eixos) == 1 and isinstance(eixos[0], (tuple, list)):
+            eixos = tuple(eixos[0])
+        if not eixos:
+            eixos = tuple(reversed(range(self.ndim)))
+        if sorted(eixos) != list(range(self.ndim)):
+            raise ValueError(f'eixos inválidos: {eixos}')
+        return Tensor._view(self.dados, [self.forma[e] for e in eixos],
+                            [self.passos[e] for e in eixos], self.inicio)
+
+    @property
+    def T(self):
+        return self.transpor()
+
+    def remodelar(self, *forma):
+        """Nova forma com os mesmos elementos; view se contíguo, senão cópia."""
+        if len(forma) == 1 and isinstance(forma[0], (tuple, list)):
+            forma = tuple(forma[0])
+        if forma.count(-1) > 1:
+            raise ValueError('no máximo um eixo pode ser -1')
+        if -1 in forma:
+            conhecido = _total(tamanho for tamanho in forma if tamanho != -1)
+            if conhecido == 0 or self.tamanho % conhecido:
+                raise ValueError(f'não é possível remodelar {self.forma} em {forma}')
+            forma = tuple(self.tamanho // conhecido if t == -1 else t for t in forma)
+        if _total(forma) != self.tamanho:
+            raise ValueError(f'não é possível remodelar {self.forma} em {forma}')
+        base = self.contiguo()
+        return Tensor._view(base.dados, forma, _passos_contiguos(forma), 0)
+
+    # ------------------------------------------------------------------
+    # Elemento a elemento
+    # ------------------------------------------------------------------
+
+    def mapear(self, funcao, typecode=None):
+        """Aplica ``funcao`` a cada elemento (ex.: ``pense_num_numero``)."""
+        resultado = list(map(funcao, self._plano()))
+        return Tensor(array(typecode or _typecode_para(resultado), resultado), self.forma)
+
+    def __add__(self, outro):
+        return _binaria(operator.add, self, outro)
+
+    def __radd__(self, outro):
+        return _binaria(operator.add, outro, self)
+
+    def __sub__(self, outro):
+        return _binaria(operator.sub, self, outro)
+
+    def __rsub__(self, outro):
+        return _binaria(operator.sub, outro, self)
+
+    def __mul__(self, outro):
+        return _binaria(operator.mul, self, outro)
+
+    def __rmul__(self, outro):
+        return _binaria(operator.mul, outro, self)
+
+    def __truediv__(self, outro):
+        return _binaria(operator.truediv, self, outro)
+
+    def __rtruediv__(self, outro):
+        return _binaria(operator.truediv, outro, self)
+
+    def __neg__(self):
+        return _binaria(operator.mul, self, -1)
+
+
+def forma_broadcast(forma_a, forma_b):
+    """Forma resultante do broadcasting (regras do NumPy)."""
+    resultado = []
+    for i in range(1, max(len(forma_a), len(forma_b)) + 1):
+        a = forma_a[-i] if i <= len(forma_a) else 1
+        b = forma_b[-i] if i <= len(forma_b) else 1
+        if a != b and a != 1 and b != 1:
+            raise ValueError(f'formas incompatíveis para broadcasting: {forma_a} e {forma_b}')
+        resultado.append(b if a == 1 else a)
+    return tuple(reversed(resultado))
+
+
+def _esticar(tensor, forma):
+    """View de ``tensor`` com a forma ``forma`` (passo 0 nos eixos esticados)."""
+    extra = len(forma) - tensor.ndim
+    passos = [0] * extra
+    for tamanho, alvo, passo in zip(tensor.forma, forma[extra:], tensor.passos):
+        passos.append(0 if tamanho == 1 and alvo != 1 else passo)
+    return Tensor._view(tensor.dados, forma, passos, tensor.inicio)
+
+
+def _typecode_binaria(op, a, b):
+    if op is operator.truediv:
+        return REAL
+    for valor in (a, b):
+        if isinstance(valor, Tensor):
+            if valor.typecode in _TYPECODES_REAIS:
+                return REAL
+        elif not isinstance(valor, numbers.Integral):
+            return REAL
+    return INTEIRO
+
+
+def _binaria(op, a, b):
+    a_tensor = isinstance(a, Tensor)
+    b_tensor = isinstance(b, Tensor)
+    if not a_tensor and not _eh_escalar(a) or not b_tensor and not _eh_escalar(b):
+        return NotImplemented
+    typecode = _typecode_binaria(op, a, b)
+
+    if not b_tensor:
+        forma = a.forma
+        if a.eh_contiguo():
+            return Tensor(array(typecode, map(op, a.dados, repeat(b, len(a.dados)))), forma)
+        resultado = array(typecode)
+        for linha in a._linhas():
+            resultado.extend(map(op, linha, repeat(b)))
+        return Tensor(resultado, forma)
+
+    if not a_tensor:
+        forma = b.forma
+        if b.eh_contiguo():
+            return Tensor(array(typecode, map(op, repeat(a, len(b.dados)), b.dados)), forma)
+        resultado = array(typecode)
+        for linha in b._linhas():
+            resultado.extend(map(op, repeat(a), linha))
+        return Tensor(resultado, forma)
+
+    if a.forma == b.forma and a.eh_contiguo() and b.eh_contiguo():
+        return Tensor(array(typecode, map(op, a.dados, b.dados)), a.forma)
+    forma = forma_broadcast(a.forma, b.forma)
+    resultado = array(typecode)
+    for linha_a, linha_b in zip(_esticar(a, forma)._linhas(), _esticar(b, forma)._linhas()):
+        resultado.extend(map(op, linha_a, linha_b))
+    return Tensor(resultado, forma)
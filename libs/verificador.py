@@ -0,0 +1,520 @@
+"""
+Verificação em massa da propriedade "o jogo sempre retorna 3".
+
+Um domínio é uma sequência indexável de entradas, gerada bloco a bloco a
+partir do índice do bloco (inclusive as aleatórias, com semente por bloco).
+Assim um bloco pode ser avaliado em qualquer processo sem enviar os
+valores, e o progresso é só "quantos blocos de cada domínio já foram
+verificados", gravado em um checkpoint JSON para retomar depois.
+
+Cada bloco é avaliado de uma vez, por padrão pela cadeia real de operações
+da Calculadora em lote (``*_lote``), que é onde aparecem deriva de ponto
+flutuante e overflow. Com ``passo_a_passo=False`` (``--no-passo-a-passo``)
+usa a função pública, cuja forma fechada devolve 3 por construção: serve só
+para medir o custo da verificação. O acerto do bloco inteiro é conferido com
+``list.count(3)``; só blocos com falha são percorridos elemento a elemento.
+
+Cada contraexemplo é reduzido (``encolher``) a uma entrada mínima que falha
+do mesmo jeito.
+
+Uso:
+    python -m libs.verificador --inteiros 0 1000000000 --processos 8
+    python -m libs.verificador --floats 1000000 --potencias 0 1023 --grandes 10000 \\
+        --checkpoint progresso.json
+"""
+
+from abc import ABC, abstractmethod
+import json
+import math
+import os
+import random
+import struct
+import sys
+import time
+from collections import deque
+
+from libs.calculadora import Calculadora
+from libs import jogo
+
+FUNCOES = ('pense_num_numero', 'pense_num_numero2')
+
+BLOCO_PADRAO = 1 << 16
+
+# Falhas guardadas (com entrada reduzida) por domínio; as demais só contam
+LIMITE_CONTRAEXEMPLOS = 100
+
+
+# ============================================================================
+# DOMÍNIOS
+# ============================================================================
+
+class Dominio(ABC):
+    """Sequência de entradas gerada por blocos a partir do índice."""
+
+    tipo = None
+
+    def __init__(self, tamanho, tamanho_bloco=BLOCO_PADRAO):
+        if tamanho_bloco < 1:
+            raise ValueError('tamanho_bloco precisa ser positivo')
+        self.tamanho = tamanho
+        self.tamanho_bloco = tamanho_bloco
+
+    @property
+    def blocos(self):
+        return -(-self.tamanho // self.tamanho_bloco)
+
+    def limites(self, bloco):
+        inicio = bloco * self.tamanho_bloco
+        return inicio, min(inicio + self.tamanho_bloco, self.tamanho)
+
+    @abstractmethod
+    def valores(self, bloco):
+        """Lista com as entradas do ``bloco``."""
+
+    def parametros(self):
+        """Descrição que identifica o domínio no checkpoint."""
+        return {'tipo': self.tipo, 'tamanho_bloco': self.tamanho_bloco}
+
+    @property
+    def nome(self):
+        extras = ','.join(f'{chave}={valor}' for chave, valor in self.parametros().items()
+                          if chave not in ('tipo', 'tamanho_bloco'))
+        return f'{self.tipo}({extras})'
+
+
+class DominioInteiros(Dominio):
+    """Todos os ints em ``[inicio, fim)``."""
+
+    tipo = 'inteiros'
+
+    def __init__(self, inicio, fim, tamanho_bloco=BLOCO_PADRAO):
+        super().__init__(max(0, fim - inicio), tamanho_bloco)
+        self.inicio = inicio
+        self.fim = fim
+
+    def valores(self, bloco):
+        inicio, fim = self.limites(bloco)
+        return list(range(self.inicio + inicio, self.inicio + fim))
+
+    def parametros(self):
+        return dict(super().parametros(), inicio=self.inicio, fim=self.fim)
+
+
+class DominioFloats(Dominio):
+    """``quantidade`` floats uniformes em ``[minimo, maximo)``, com semente."""
+
+    tipo = 'floats'
+
+    def __init__(self, quantidade, minimo=0.0, maximo=1e6, semente=0,
+                 tamanho_bloco=BLOCO_PADRAO):
+        super().__init__(quantidade, tamanho_bloco)
+        self.minimo = minimo
+        self.maximo = maximo
+        self.semente = semente
+
+    def valores(self, bloco):
+        inicio, fim = self.limites(bloco)
+        aleatorio = random.Random(f'{self.semente}:{bloco}')
+        uniforme = aleatorio.uniform
+        return [uniforme(self.minimo, self.maximo) for _ in range(fim - inicio)]
+
+    def parametros(self):
+        return dict(super().parametros(), quantidade=self.tamanho, minimo=self.minimo,
+                    maximo=self.maximo, semente=self.semente)
+
+
+def _desloca_ulps(valor, ulps):
+    """O float ``ulps`` posições de ``valor`` (positivo) na reta dos floats.
+
+    Não passa de 0.0: abaixo dele o padrão de bits ficaria negativo, que
+    lido como float tem o sinal e o expoente todos ligados, um NaN.
+    """
+    bits = max(struct.unpack('<q', struct.pack('<d', valor))[0] + ulps, 0)
+    return struct.unpack('<d', struct.pack('<q', bits))[0]
+
+
+class DominioPotenciasDeDois(Dominio):
+    """``2**e`` e os ``vizinhos`` floats de cada lado, para ``e`` no intervalo."""
+
+    tipo = 'potencias_de_dois'
+
+    def __init__(self, expoente_min=-1074, expoente_max=1023, vizinhos=16,
+                 tamanho_bloco=BLOCO_PADRAO):
+        if not -1074 <= expoente_min <= expoente_max <= 1023:
+            raise ValueError('expoentes precisam estar entre -1074 e 1023 (faixa dos floats)')
+        self.expoente_min = expoente_min
+        self.expoente_max = expoente_max
+        self.vizinhos = vizinhos
+        self._por_expoente = 2 * vizinhos + 1
+        super().__init__((expoente_max - expoente_min + 1) * self._por_expoente, tamanho_bloco)
+
+    def valores(self, bloco):
+        inicio, fim = self.limites(bloco)
+        resultado = []
+        for indice in range(inicio, fim):
+            expoente, posicao = divmod(indice, self._por_expoente)
+            base = math.ldexp(1.0, self.expoente_min + expoente)
+            resultado.append(_desloca_ulps(base, posicao - self.vizinhos))
+        return resultado
+
+    def parametros(self):
+        return dict(super().parametros(), expoente_min=self.expoente_min,
+                    expoente_max=self.expoente_max, vizinhos=self.vizinhos)
+
+
+class DominioInteirosGrandes(Dominio):
+    """``quantidade`` ints aleatórios com ``bits_min`` a ``bits_max`` bits."""
+
+    tipo = 'inteiros_grandes'
+
+    def __init__(self, quantidade, bits_min=64, bits_max=4096, semente=0,
+                 tamanho_bloco=1 << 12):
+        super().__init__(quantidade, tamanho_bloco)
+        self.bits_min = bits_min
+        self.bits_max = bits_max
+        self.semente = semente
+
+    def valores(self, bloco):
+        inicio, fim = self.limites(bloco)
+        aleatorio = random.Random(f'{self.semente}:{bloco}')
+        resultado = []
+        for _ in range(fim - inicio):
+            bits = aleatorio.randint(self.bits_min, self.bits_max)
+            resultado.append(aleatorio.getrandbits(bits) | (1 << (bits - 1)))
+        return resultado
+
+    def parametros(self):
+        return dict(super().parametros(), quantidade=self.tamanho, bits_min=self.bits_min,
+                    bits_max=self.bits_max, semente=self.semente)
+
+
+# ============================================================================
+# AVALIAÇÃO
+# ============================================================================
+
+def _funcao(nome, passo_a_passo):
+    if nome not in FUNCOES:
+        raise ValueError(f'função desconhecida: {nome!r}')
+    funcao = getattr(jogo, nome)
+    if passo_a_passo:
+        return lambda num: funcao(num, calculadora=Calculadora)
+    return funcao
+
+
+def descrever_falha(funcao, valor):
+    """Retorna None se ``funcao(valor) == 3``, senão ``(tipo, descricao)``.
+
+    ``tipo`` é o nome da exceção ou ``'resultado'``; é o que o
+    encolhimento preserva.
+    """
+    try:
+        resultado = funcao(valor)
+    except Exception as erro:
+        return type(erro).__name__, f'{type(erro).__name__}: {erro}'
+    if resultado == 3:
+        return None
+    return 'resultado', f'retornou {resultado!r}'
+
+
+def _cadeia_lote(valores):
+    """A cadeia do jogo sobre o bloco inteiro, com as operações em lote."""
+    calc = Calculadora
+    passo = calc.soma_lote(valores, 5)
+    passo = calc.multiplicacao_lote(passo, 2)
+    passo = calc.subtracao_lote(passo, 4)
+    passo = calc.divisao_lote(passo, 2)
+    return calc.subtracao_lote(passo, valores)
+
+
+def _avalia(nome, passo_a_passo, valores):
+    """Resultados do bloco de uma vez; None se alguma entrada levanta exceção."""
+    try:
+        if passo_a_passo:
+            return _cadeia_lote(valores)
+        return list(map(getattr(jogo, nome), valores))
+    except Exception:
+        return None
+
+
+def verificar_bloco(nome, passo_a_passo, dominio, bloco):
+    """Verifica um bloco; retorna ``(verificados, ignorados, total_falhas, falhas)``.
+
+    ``falhas`` traz até LIMITE_CONTRAEXEMPLOS tuplas ``(indice, valor, tipo,
+    descricao)``. Negativos em ``pense_num_numero`` estão fora do domínio da
+    propriedade (a função os rejeita por contrato) e contam como ignorados.
+    """
+    valores = dominio.valores(bloco)
+    inicio, _ = dominio.limites(bloco)
+    ignorados = 0
+    if nome == 'pense_num_numero' and valores and min(valores) < 0:
+        validos = [valor for valor in valores if valor >= 0]
+        ignorados = len(valores) - len(validos)
+        posicoes = [i for i, valor in enumerate(valores) if valor >= 0]
+    else:
+        validos = valores
+        posicoes = None
+
+    resultados = _avalia(nome, passo_a_passo, validos)
+    if resultados is not None and resultados.count(3) == len(resultados):
+        return len(validos), ignorados, 0, []
+
+    # Há falha no bloco: percorre elemento a elemento para localizá-las
+    funcao = _funcao(nome, passo_a_passo)
+    falhas = []
+    total = 0
+    for i, valor in enumerate(validos):
+        if resultados is not None and resultados[i] == 3:
+            continue
+        falha = descrever_falha(funcao, valor)
+        if falha is None:
+            continue
+        total += 1
+        if len(falhas) < LIMITE_CONTRAEXEMPLOS:
+            indice = inicio + (posicoes[i] if posicoes is not None else i)
+            falhas.append((indice, valor, falha[0], falha[1]))
+    return len(validos), ignorados, total, falhas
+
+
+# ============================================================================
+# ENCOLHIMENTO
+# ============================================================================
+
+def _candidatos_float(valor):
+    """Floats possivelmente mais simples que ``valor``, dos mais simples para os menos."""
+    yield 0.0
+    yield 1.0
+    if valor.is_integer():
+        if abs(valor) < 2 ** 53:
+            yield int(valor)
+    else:
+        yield float(math.floor(valor))
+    _, expoente = math.frexp(valor)
+    yield math.ldexp(0.5, expoente)
+    yield valor / 2
+    for digitos in range(1, 17):
+        yield float(f'{valor:.{digitos}g}')
+
+
+def _encolher_inteiro(falha_igual, valor):
+    """Menor quantidade de bits primeiro, depois menos bits ligados."""
+    sinal = -1 if valor < 0 else 1
+    magnitude = abs(valor)
+    for candidato in (0, 1):
+        if candidato < magnitude and falha_igual(sinal * candidato):
+            return sinal * candidato
+    # Menor tamanho em bits: testa o menor e o maior valor de cada tamanho
+    for bits in range(2, magnitude.bit_length()):
+        candidato = next((c for c in (1 << (bits - 1), (1 << bits) - 1)
+                          if falha_igual(sinal * c)), None)
+        if candidato is not None:
+            magnitude = candidato
+            break
+    # Mesmo tamanho: desliga cada bit, do mais alto para o mais baixo, se ainda falhar
+    for posicao in reversed(range(magnitude.bit_length() - 1)):
+        if magnitude >> posicao & 1:
+            candidato = magnitude & ~(1 << posicao)
+            if falha_igual(sinal * candidato):
+                magnitude = candidato
+    return sinal * magnitude
+
+
+def _simplicidade(valor):
+    """Chave de ordenação: int antes de float; menos bits/dígitos antes de magnitude."""
+    if type(valor) is int:
+        magnitude = abs(valor)
+        return (0, magnitude.bit_length(), bin(magnitude).count('1'), magnitude)
+    return (1, len(repr(valor)), abs(valor))
+
+
+def encolher(funcao, valor, tipo, max_passos=1000):
+    """Reduz ``valor`` a uma entrada mais simples que falha com o mesmo ``tipo``.
+
+    Inteiros são reduzidos bit a bit; floats por uma busca gulosa que troca
+    ``valor`` pelo primeiro candidato mais simples que ainda falha do mesmo
+    jeito, até nenhum candidato servir.
+    """
+    def falha_igual(candidato):
+        falha = descrever_falha(funcao, candidato)
+        return falha is not None and falha[0] == tipo
+
+    if type(valor) is int:
+        return _encolher_inteiro(falha_igual, valor)
+    if type(valor) is not float or not math.isfinite(valor):
+        return valor
+    passos = 0
+    melhorou = True
+    while melhorou and passos < max_passos:
+        melhorou = False
+        chave = _simplicidade(valor)
+        for candidato in _candidatos_float(valor):
+            passos += 1
+            if _simplicidade(candidato) < chave and falha_igual(candidato):
+                valor = candidato
+                melhorou = True
+                break
+    return valor
+
+
+# ============================================================================
+# EXECUÇÃO COM CHECKPOINT
+# ============================================================================
+
+def _estado_inicial(dominio):
+    return {'parametros': dominio.parametros(), 'proximo_bloco': 0, 'verificados': 0,
+            'ignorados': 0, 'falhas': 0, 'contraexemplos': []}
+
+
+def carregar_checkpoint(caminho):
+    if caminho is None or not os.path.exists(caminho):
+        return None
+    with open(caminho, encoding='utf-8') as arquivo:
+        return json.load(arquivo)
+
+
+def salvar_checkpoint(caminho, estado):
+    temporario = f'{caminho}.{os.getpid()}.tmp'
+    with open(temporario, 'w', encoding='utf-8') as arquivo:
+        json.dump(estado, arquivo)
+    os.replace(temporario, caminho)
+
+
+def _blocos_em_ordem(tarefas, processos):
+    """Gera ``(tarefa, resultado)`` na ordem das tarefas, em processos se pedido."""
+    if processos <= 1:
+        for tarefa in tarefas:
+            yield tarefa, verificar_bloco(*tarefa)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    em_voo = deque()
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        for tarefa in tarefas:
+            em_voo.append((tarefa, executor.submit(verificar_bloco, *tarefa)))
+            if len(em_voo) >= 2 * processos:
+                tarefa_pronta, futuro = em_voo.popleft()
+                yield tarefa_pronta, futuro.result()
+        while em_voo:
+            tarefa_pronta, futuro = em_voo.popleft()
+            yield tarefa_pronta, futuro.result()
+
+
+def verificar(dominios, funcoes=FUNCOES, passo_a_passo=True, processos=1,
+              checkpoint=None, intervalo_checkpoint=30.0, relogio=time.monotonic,
+              ao_progresso=None):
+    """Verifica a propriedade em todos os domínios e retorna o relatório.
+
+    O relatório é ``{'funcao:dominio': estado}``, com contagens e a lista de
+    contraexemplos ``{indice, valor, reduzido, descricao}``. Com
+    ``checkpoint``, o estado é gravado a cada ``intervalo_checkpoint``
+    segundos e no fim, e uma execução com a mesma configuração continua de
+    onde a anterior parou.
+    """
+    chaves = {f'{nome}:{dominio.nome}': (nome, dominio) for nome in funcoes for dominio in dominios}
+    configuracao = {'passo_a_passo': passo_a_passo}
+    salvo = carregar_checkpoint(checkpoint)
+    relatorio = {}
+    for chave, (_, dominio) in chaves.items():
+        anterior = None
+        if salvo is not None and salvo.get('configuracao') == configuracao:
+            anterior = salvo['relatorio'].get(chave)
+        if anterior is not None and anterior['parametros'] == dominio.parametros():
+            relatorio[chave] = anterior
+        else:
+            relatorio[chave] = _estado_inicial(dominio)
+
+    def tarefas():
+        for chave, (nome, dominio) in chaves.items():
+            for bloco in range(relatorio[chave]['proximo_bloco'], dominio.blocos):
+                yield chave, nome, dominio, bloco
+
+    def grava():
+        if checkpoint is not None:
+            salvar_checkpoint(checkpoint, {'configuracao': configuracao, 'relatorio': relatorio})
+
+    ultimo = relogio()
+    trabalhos = ((nome, passo_a_passo, dominio, bloco) for _, nome, dominio, bloco in tarefas())
+    for (nome, _, dominio, bloco), resultado in _blocos_em_ordem(trabalhos, processos):
+        chave = f'{nome}:{dominio.nome}'
+        estado = relatorio[chave]
+        verificados, ignorados, total, falhas = resultado
+        estado['proximo_bloco'] = bloco + 1
+        estado['verificados'] += verificados
+        estado['ignorados'] += ignorados
+        estado['falhas'] += total
+        if falhas and len(estado['contraexemplos']) < LIMITE_CONTRAEXEMPLOS:
+            funcao = _funcao(nome, passo_a_passo)
+            for indice, valor, tipo, descricao in falhas:
+                if len(estado['contraexemplos']) >= LIMITE_CONTRAEXEMPLOS:
+                    break
+                estado['contraexemplos'].append({
+                    'indice': indice, 'valor': valor, 'descricao': descricao,
+                    'reduzido': encolher(funcao, valor, tipo),
+                })
+        if ao_progresso is not None:
+            ao_progresso(chave, estado)
+        if checkpoint is not None and relogio() - ultimo >= intervalo_checkpoint:
+            grava()
+            ultimo = relogio()
+    grava()
+    return relatorio
+
+
+def _resumo(valor):
+    if type(valor) is int and valor.bit_length() > 64:
+        return f'int de {valor.bit_length()} bits ({str(valor)[:12]}...)'
+    return repr(valor)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog='python -m libs.verificador',
+        description='Verifica em massa que o jogo sempre retorna 3.')
+    parser.add_argument('--inteiros', nargs=2, type=int, metavar=('INICIO', 'FIM'))
+    parser.add_argument('--floats', type=int, metavar='QUANTIDADE')
+    parser.add_argument('--potencias', nargs=2, type=int, metavar=('EXP_MIN', 'EXP_MAX'))
+    parser.add_argument('--grandes', type=int, metavar='QUANTIDADE')
+    parser.add_argument('--funcao', choices=FUNCOES, action='append',
+                        help='padrão: as duas funções')
+    parser.add_argument('--passo-a-passo', action=argparse.BooleanOptionalAction, default=True,
+                        help='avalia a cadeia de operações da Calculadora (padrão); com '
+                             '--no-passo-a-passo usa a forma fechada, que sempre dá 3')
+    parser.add_argument('-p', '--processos', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--checkpoint', default=None)
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    dominios = []
+    if args.inteiros:
+        dominios.append(DominioInteiros(*args.inteiros))
+    if args.floats:
+        dominios.append(DominioFloats(args.floats, semente=args.semente))
+    if args.potencias:
+        dominios.append(DominioPotenciasDeDois(*args.potencias))
+    if args.grandes:
+        dominios.append(DominioInteirosGrandes(args.grandes, semente=args.semente))
+    if not dominios:
+        parser.error('informe ao menos um domínio')
+
+    inicio = time.perf_counter()
+    relatorio = verificar(dominios, args.funcao or FUNCOES, args.passo_a_passo,
+                          args.processos, args.checkpoint)
+    segundos = time.perf_counter() - inicio
+
+    total = 0
+    for chave, estado in relatorio.items():
+        total += estado['verificados']
+        print(f'{chave}: {estado["verificados"]} verificados, {estado["ignorados"]} ignorados, '
+              f'{estado["falhas"]} falhas')
+        for exemplo in estado['contraexemplos'][:10]:
+            print(f'  {_resumo(exemplo["valor"])} -> {exemplo["descricao"]} '
+                  f'(reduzido: {_resumo(exemplo["reduzido"])})')
+    taxa = total / segundos if segundos > 0 else 0.0
+    print(f'{total} verificações em {segundos:.1f}s ({taxa:,.0f}/s)', file=sys.stderr)
+    return 1 if any(estado['falhas'] for estado in relatorio.values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""
+Testes do modo adiado: grafo com CSE, fusão e avaliação escalar ou em lote.
+"""
+
+import tracemalloc
+from array import array
+from decimal import Decimal
+from fractions import Fraction
+
+from libs.adiado import CalculadoraAdiada, constante, entrada, gerar_fonte, interpretar
+from libs.calculadora import Calculadora
+from libs.jogo import pense_num_numero2
+from libs.racional import CalculadoraRacional
+from pytest import mark, raises
+
+
+def _jogo():
+    return pense_num_numero2(entrada('num'), calculadora=CalculadoraAdiada)
+
+
+# ============================================================================
+# TESTES DA CONSTRUÇÃO
+# ============================================================================
+
+class TestConstrucao:
+    """Operações adiadas montam o grafo sem calcular nada."""
+
+    @mark.basic
+    def test_subexpressoes_iguais_sao_o_mesmo_no(self):
+        """Testa o hash-consing: mesma operação e operandos, mesmo nó."""
+        x = entrada('x')
+        assert entrada('x') is x
+        assert x + 5 is CalculadoraAdiada.soma(x, 5)
+        assert x + 5 is not x + 5.0
+        assert constante(0.0) is not constante(-0.0)
+        assert x * 2 is not 2 * x
+
+    def test_jogo_como_backend(self):
+        """Testa pense_num_numero2 com calculadora=CalculadoraAdiada."""
+        grafo = _jogo()
+        assert grafo.variaveis == ('num',)
+        assert repr(grafo) == "No('(((((num + 5) * 2) - 4) / 2) - num)')"
+
+    def test_entradas_invalidas(self):
+        """Testa nomes de entrada e constantes rejeitados."""
+        with raises(ValueError):
+            entrada('_oculto')
+        with raises(ValueError):
+            entrada('a b')
+        for nome in ('lambda', 'True', 'zip', 'plano'):
+            with raises(ValueError):
+                entrada(nome)
+        with raises(TypeError):
+            entrada('x') + 'texto'
+
+
+# ============================================================================
+# TESTES DA FUSÃO
+# ============================================================================
+
+class TestFusao:
+    """Código gerado: um único laço, compartilhadas calculadas uma vez."""
+
+    @mark.basic
+    def test_cadeia_fundida_em_uma_expressao(self):
+        """Testa que uma cadeia sem repetição vira uma list comprehension."""
+        _, _, _, fonte = gerar_fonte(_jogo())
+        assert 'return [(((((num + 5) * 2) - 4) / 2) - num) for num in num]' in fonte
+
+    def test_subexpressao_comum_em_local(self):
+        """Testa que a subexpressão repetida vira um único local por elemento."""
+        x, y = entrada('x'), entrada('y')
+        s = x + y
+        grafo = s * s - s / 2
+        _, _, descricao, fonte = gerar_fonte(grafo)
+        assert descricao == '_t0 = (x + y); ((_t0 * _t0) - (_t0 / 2))'
+        assert fonte.count('(x + y)') == 2   # uma vez no escalar, uma no lote
+        assert 'for x, y in zip(x, y):' in fonte
+
+    def test_cadeia_profunda(self):
+        """Testa cadeias mais profundas que o limite de parênteses do parser."""
+        x = entrada('x')
+        grafo = x
+        for i in range(1000):
+            grafo = grafo + i
+        assert grafo.avaliar(1) == 1 + sum(range(1000))
+        assert grafo.avaliar([0, 1]) == [sum(range(1000)), 1 + sum(range(1000))]
+
+    def test_constantes_sem_literal(self):
+        """Testa Fraction, Decimal e inf como constantes do grafo."""
+        x = entrada('x')
+        assert (x * Fraction(1, 3)).avaliar(Fraction(3)) == 1
+        assert (x + Decimal('0.1')).avaliar(Decimal('0.2')) == Decimal('0.3')
+        assert (x + float('inf')).avaliar(1.0) == float('inf')
+
+
+# ============================================================================
+# TESTES DA AVALIAÇÃO
+# ============================================================================
+
+class TestAvaliacao:
+    """Mesmos resultados da avaliação imediata, em escalar e em lote."""
+
+    @mark.parametrize('num', [0, 1, 10, 2.5, Fraction(7, 3), Decimal('1.5'), 10**30])
+    def test_escalar_igual_ao_imediato(self, num):
+        """Testa o grafo do jogo contra a cadeia passo a passo."""
+        esperado = pense_num_numero2(num, calculadora=Calculadora)
+        resultado = _jogo().avaliar(num)
+        assert resultado == esperado
+        assert type(resultado) is type(esperado)
+
+    def test_lote_igual_ao_imediato(self):
+        """Testa o lote fundido contra os *_lote etapa por etapa."""
+        x, y = entrada('x'), entrada('y')
+        s = x - y
+        grafo = (s * s + s) / (y + 1)
+        xs = [0.5 * i for i in range(50)]
+        ys = list(range(50))
+        assert grafo.avaliar(xs, ys) == interpretar(grafo, {'x': xs, 'y': ys})
+        assert grafo.avaliar(y=3, x=xs) == interpretar(grafo, {'x': xs, 'y': 3})
+
+    def test_array_e_broadcasting(self):
+        """Testa array.array e escalar repetido, como em Plano.lote."""
+        x, y = entrada('x'), entrada('y')
+        resultado = (x * y + 1).avaliar(array('q', [1, 2, 3]), 2)
+        assert resultado == array('q', [3, 5, 7])
+        assert _jogo().avaliar(array('q', [1, 2])) == array('d', [3.0, 3.0])
+
+    def test_interpretar_com_backend(self):
+        """Testa a referência imediata sobre outra calculadora."""
+        resultado = interpretar(_jogo(), {'num': Fraction(1, 3)}, CalculadoraRacional)
+        assert resultado == 3
+
+    def test_argumentos(self):
+        """Testa entradas faltando, sobrando ou desconhecidas."""
+        grafo = entrada('x') + entrada('y')
+        assert grafo.avaliar(1, y=2) == 3
+        with raises(TypeError):
+            grafo.avaliar(1)
+        with raises(TypeError):
+            grafo.avaliar(1, 2, 3)
+        with raises(TypeError):
+            grafo.avaliar(1, 2, z=3)
+        with raises(TypeError):
+            (constante(1) + 2).avaliar([1])
+
+    def test_divisao_por_zero(self):
+        """Testa que o erro aparece na avaliação, não na construção."""
+        grafo = entrada('x') / 0
+        with raises(ZeroDivisionError):
+            grafo.avaliar(1)
+        with raises(ZeroDivisionError):
+            grafo.avaliar([1, 2])
+
+    @mark.performance
+    def test_lote_sem_intermediarios(self):
+        """Testa com tracemalloc que o pico fica perto do tamanho do resultado."""
+        valores = [float(i) for i in range(100_000)]
+        grafo = _jogo()
+        grafo.avaliar(valores[:1])
+
+        def pico(funcao):
+            tracemalloc.start()
+            try:
+                funcao()
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        imediato = pico(lambda: interpretar(grafo, {'num': valores}))
+        adiado = pico(lambda: grafo.avaliar(valores))
+        # Resultado: lista de 100 mil ponteiros + 100 mil floats (~3.2 MB)
+        assert adiado < 4_000_000
+        assert adiado * 3 < imediato
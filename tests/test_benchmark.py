@@ -0,0 +1,114 @@
+"""
+Testes da suíte de benchmarks e do gate de regressão.
+"""
+
+import os
+
+from benchmarks.suite import (medir, casos, executar, comparar_jogo, regressoes,
+                              salvar_baseline, carregar_baselines, chave_maquina,
+                              BASELINE_PADRAO, LIMITE_PADRAO)
+from pytest import mark, approx
+import pytest
+
+
+class RelogioFalso:
+    """Relógio em que cada chamada da função medida custa ``custo`` segundos."""
+
+    def __init__(self, custo):
+        self.custo = custo
+        self.agora = 0.0
+
+    def __call__(self):
+        return self.agora
+
+    def funcao(self):
+        self.agora += self.custo
+
+
+# ============================================================================
+# TESTES DA MEDIÇÃO
+# ============================================================================
+
+class TestMedicao:
+    """Calibração e cálculo de throughput."""
+
+    @mark.performance
+    def test_calibracao_atinge_tempo_minimo(self):
+        """Testa que a medição calibra repetições e calcula ops/s."""
+        relogio = RelogioFalso(custo=1e-6)
+        ops = medir(relogio.funcao, tempo_minimo=0.01, rodadas=3, relogio=relogio)
+        assert ops == approx(1e6)
+
+    @mark.performance
+    def test_casos_cobrem_operacoes_tipos_e_jogo(self):
+        """Testa que a suíte tem todas as operações, tipos e jogos."""
+        nomes = casos()
+        assert len(nomes) == 4 * 6
+        assert 'divisao[int_grande]' in nomes
+        assert 'pense_num_numero2[decimal]' in nomes
+
+    @mark.performance
+    def test_execucao_filtrada(self):
+        """Testa uma execução real e curta da suíte."""
+        resultados = executar(filtro='soma[int]', tempo_minimo=0.001, rodadas=1)
+        assert list(resultados) == ['soma[int]']
+        assert resultados['soma[int]'] > 0
+
+    @mark.comparativo
+    def test_comparativo_do_jogo(self):
+        """Testa a comparação cabeça a cabeça das duas implementações."""
+        comparacao = comparar_jogo({
+            'pense_num_numero[int]': 10.0,
+            'pense_num_numero2[int]': 20.0,
+            'pense_num_numero[float]': 5.0,
+        })
+        assert comparacao == {'int': (10.0, 20.0, 'pense_num_numero2')}
+
+
+# ============================================================================
+# TESTES DE BASELINE E REGRESSÃO
+# ============================================================================
+
+class TestBaseline:
+    """Persistência e gate de regressão."""
+
+    @mark.performance
+    def test_baseline_por_maquina(self, tmp_path):
+        """Testa que cada máquina tem sua própria baseline."""
+        caminho = str(tmp_path / 'baselines.json')
+        salvar_baseline({'soma[int]': 100.0}, caminho, maquina='a')
+        salvar_baseline({'soma[int]': 200.0}, caminho, maquina='b')
+        salvar_baseline({'divisao[int]': 50.0}, caminho, maquina='a')
+        assert carregar_baselines(caminho) == {
+            'a': {'soma[int]': 100.0, 'divisao[int]': 50.0},
+            'b': {'soma[int]': 200.0},
+        }
+
+    @mark.performance
+    def test_regressao_acima_do_limite(self):
+        """Testa que só quedas maiores que o limite são regressões."""
+        baseline = {'a': 100.0, 'b': 100.0, 'c': 100.0}
+        atuais = {'a': 85.0, 'b': 70.0, 'c': 150.0, 'novo': 1.0}
+        encontradas = regressoes(atuais, baseline, limite=0.2)
+        assert [nome for nome, *_ in encontradas] == ['b']
+        assert encontradas[0][3] == approx(0.3)
+
+
+@mark.performance
+@mark.slow
+def test_sem_regressao_contra_baseline():
+    """Gate: falha se algum caso ficar abaixo da baseline desta máquina.
+
+    Gere a baseline com ``python -m benchmarks.suite --salvar``; o arquivo e
+    o limite podem ser trocados por BENCHMARK_BASELINE e BENCHMARK_LIMITE.
+    """
+    caminho = os.environ.get('BENCHMARK_BASELINE', BASELINE_PADRAO)
+    baseline = carregar_baselines(caminho).get(chave_maquina())
+    if not baseline:
+        pytest.skip('sem baseline para esta máquina (python -m benchmarks.suite --salvar)')
+    limite = float(os.environ.get('BENCHMARK_LIMITE', LIMITE_PADRAO))
+    encontradas = regressoes(executar(), baseline, limite)
+    assert not encontradas, '\n'.join(
+        f'{nome}: {atual:,.0f} ops/s vs {referencia:,.0f} (-{queda:.0%})'
+        for nome, atual, referencia, queda in encontradas
+    )
@@ -0,0 +1,188 @@
+"""
+Testes da memoização opcional da Calculadora e do jogo.
+"""
+
+import threading
+from decimal import Decimal, localcontext
+from fractions import Fraction
+
+from libs.cache import CacheLRU, CalculadoraCache, memoizar
+from libs.calculadora import Calculadora
+from libs.jogo import pense_num_numero
+from pytest import mark, raises, fixture
+
+GRANDE = 7 ** 500
+
+
+class RelogioFalso:
+    """Relógio controlável para testar TTL."""
+
+    def __init__(self):
+        self.agora = 0.0
+
+    def __call__(self):
+        return self.agora
+
+
+@fixture
+def calculadora_cache():
+    """Fixture com uma CalculadoraCache pequena."""
+    return CalculadoraCache(tamanho_maximo=2)
+
+
+# ============================================================================
+# TESTES DO CACHE LRU
+# ============================================================================
+
+class TestCacheLRU:
+    """Despejo, TTL e estatísticas."""
+
+    @mark.basic
+    def test_acerto_e_falha(self):
+        """Testa a contagem de acertos e falhas."""
+        cache = CacheLRU(4)
+        assert cache.obter('a') is None
+        cache.guardar('a', 1)
+        assert cache.obter('a') == 1
+        estatisticas = cache.estatisticas()
+        assert (estatisticas['acertos'], estatisticas['falhas']) == (1, 1)
+        assert estatisticas['taxa_acerto'] == 0.5
+        assert estatisticas['memoria_bytes'] > 0
+
+    def test_despejo_lru(self):
+        """Testa que o item menos recente é despejado."""
+        cache = CacheLRU(2)
+        cache.guardar('a', 1)
+        cache.guardar('b', 2)
+        cache.obter('a')
+        cache.guardar('c', 3)
+        assert cache.obter('b') is None
+        assert cache.obter('a') == 1
+        assert cache.despejos == 1
+
+    def test_ttl(self):
+        """Testa que entradas expiram depois do TTL."""
+        relogio = RelogioFalso()
+        cache = CacheLRU(4, ttl=10, relogio=relogio)
+        cache.guardar('a', 1)
+        relogio.agora = 9.9
+        assert cache.obter('a') == 1
+        relogio.agora = 10.0
+        assert cache.obter('a') is None
+        assert cache.expirados == 1
+
+    @mark.exception
+    def test_tamanho_invalido(self):
+        """Testa que o tamanho máximo precisa ser positivo."""
+        with raises(ValueError):
+            CacheLRU(0)
+
+    def test_concorrencia(self):
+        """Testa que várias threads não corrompem o cache."""
+        cache = CacheLRU(50)
+
+        def trabalho(base):
+            for i in range(2000):
+                cache.guardar((base, i % 100), i)
+                cache.obter((base, (i * 7) % 100))
+
+        threads = [threading.Thread(target=trabalho, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(cache) == 50
+        assert cache.acertos + cache.falhas == 8000
+
+
+# ============================================================================
+# TESTES DA CALCULADORA COM CACHE
+# ============================================================================
+
+class TestCalculadoraCache:
+    """Memoização seletiva das operações."""
+
+    def test_inteiros_grandes_sao_cacheados(self, calculadora_cache):
+        """Testa que multiplicações de inteiros grandes usam o cache."""
+        esperado = GRANDE * GRANDE
+        assert calculadora_cache.multiplicacao(GRANDE, GRANDE) == esperado
+        assert calculadora_cache.multiplicacao(GRANDE, GRANDE) == esperado
+        assert calculadora_cache.estatisticas()['acertos'] == 1
+
+    def test_inteiros_grandes_so_na_multiplicacao(self, calculadora_cache):
+        """Testa que soma, subtração e divisão de ints grandes não pagam o hash da chave."""
+        assert calculadora_cache.soma(GRANDE, GRANDE) == 2 * GRANDE
+        assert calculadora_cache.subtracao(GRANDE, 1) == GRANDE - 1
+        assert calculadora_cache.divisao(GRANDE, GRANDE) == 1.0
+        assert calculadora_cache.estatisticas()['falhas'] == 0
+        assert calculadora_cache.soma(Fraction(1, 3), GRANDE) == GRANDE + Fraction(1, 3)
+        assert calculadora_cache.estatisticas()['falhas'] == 1
+
+    def test_tipos_baratos_nao_consultam_cache(self, calculadora_cache):
+        """Testa que ints pequenos e floats não passam pelo cache."""
+        assert calculadora_cache.soma(1, 2) == 3
+        assert calculadora_cache.divisao(1.0, 4.0) == 0.25
+        assert calculadora_cache.estatisticas()['falhas'] == 0
+
+    def test_chave_considera_tipo(self):
+        """Testa que operandos iguais de tipos diferentes não colidem."""
+        calc = CalculadoraCache(limite_bits=0)
+        assert type(calc.soma(Fraction(1), 1)) is Fraction
+        assert type(calc.soma(Decimal(1), 1)) is Decimal
+        assert type(calc.soma(Fraction(1), True)) is Fraction
+        assert calc.estatisticas()['acertos'] == 0
+
+    def test_chave_decimal_considera_expoente_e_contexto(self):
+        """Testa que Decimals iguais com expoentes ou contextos diferentes não colidem."""
+        calc = CalculadoraCache()
+        assert str(calc.soma(Decimal('1'), Decimal('1'))) == '2'
+        assert str(calc.soma(Decimal('1.00'), Decimal('1'))) == '2.00'
+        terco = calc.divisao(Decimal(1), Decimal(3))
+        with localcontext() as contexto:
+            contexto.prec = 5
+            assert calc.divisao(Decimal(1), Decimal(3)) == Decimal('0.33333')
+        assert calc.divisao(Decimal(1), Decimal(3)) == terco
+        assert calc.estatisticas()['acertos'] == 1
+
+    def test_desligado_usa_metodos_originais(self):
+        """Testa que, desligado, não há nenhuma camada extra."""
+        calc = CalculadoraCache(ativo=False)
+        assert calc.multiplicacao is Calculadora.multiplicacao
+        calc.ligar()
+        assert calc.multiplicacao is not Calculadora.multiplicacao
+        calc.desligar()
+        assert calc.soma is Calculadora.soma
+
+
+# ============================================================================
+# TESTES DO DECORADOR
+# ============================================================================
+
+class TestMemoizar:
+    """Memoização das funções do jogo."""
+
+    @mark.jogo
+    def test_jogo_memoizado(self):
+        """Testa o jogo memoizado com Decimal."""
+        jogo = memoizar(pense_num_numero, tamanho_maximo=8)
+        assert jogo(Decimal('2.5')) == 3
+        assert jogo(Decimal('2.5')) == 3
+        assert jogo.cache.acertos == 1
+        assert jogo(5) == 3
+
+    @mark.jogo
+    def test_jogo_com_inteiros_usa_forma_fechada(self):
+        """Testa que ints grandes vão direto para a forma fechada, sem chave."""
+        jogo = memoizar(pense_num_numero)
+        assert jogo(GRANDE) == 3
+        assert len(jogo.cache) == 0 and jogo.cache.falhas == 0
+
+    @mark.jogo
+    @mark.exception
+    def test_excecoes_nao_sao_guardadas(self):
+        """Testa que exceções continuam sendo levantadas e não são cacheadas."""
+        jogo = memoizar(pense_num_numero)
+        for _ in range(2):
+            with raises(Exception, match="positivo"):
+                jogo(Decimal(-1))
+        assert len(jogo.cache) == 0
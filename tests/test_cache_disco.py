@@ -0,0 +1,251 @@
+"""
+Testes do cache persistente em disco.
+"""
+
+import multiprocessing
+import os
+import pickle
+import sys
+from array import array
+from decimal import Decimal
+from fractions import Fraction
+
+from libs.cache import CalculadoraCache, memoizar
+from libs.cache_disco import (CacheDisco, SLOTS_INICIAIS, _AUSENTE, _le_registro,
+                               _monta_registro, serializar_chave)
+from libs.jogo import pense_num_numero
+from pytest import fixture, mark, raises
+
+GRANDE = 7 ** 500
+
+
+class Carga:
+    """Objeto que, se despicklado, cria o arquivo ``marca``."""
+
+    def __init__(self, marca):
+        self.marca = marca
+
+    def __reduce__(self):
+        return (open, (self.marca, 'w'))
+
+
+class RelogioFalso:
+    """Relógio controlável para testar a ordem de despejo."""
+
+    def __init__(self):
+        self.agora = 1_000.0
+
+    def __call__(self):
+        return self.agora
+
+
+@fixture
+def diretorio(tmp_path):
+    return str(tmp_path / 'cache')
+
+
+def _trabalho(diretorio, base):
+    # Processo filho: grava e lê chaves que os irmãos também usam
+    with CacheDisco(diretorio, tamanho_maximo=30_000) as cache:
+        for i in range(300):
+            chave = ('multiplicacao', (int, (base + i) % 150 * GRANDE))
+            valor = cache.obter(chave)
+            if valor is None:
+                cache.guardar(chave, chave[1][1] * 3)
+            elif valor != chave[1][1] * 3:
+                return False
+    return True
+
+
+# ============================================================================
+# TESTES BÁSICOS
+# ============================================================================
+
+class TestCacheDisco:
+    """Leitura, escrita e persistência."""
+
+    @mark.basic
+    def test_acerto_falha_e_persistencia(self, diretorio):
+        """Testa que os valores sobrevivem ao fechamento do cache."""
+        with CacheDisco(diretorio) as cache:
+            assert cache.obter('a', 'nada') == 'nada'
+            cache.guardar('a', GRANDE)
+            cache.guardar(('soma', (Fraction, Fraction(1, 3))), Fraction(4, 3))
+            assert cache.obter('a') == GRANDE
+            assert cache.acertos == 1 and cache.falhas == 1
+        with CacheDisco(diretorio) as cache:
+            assert len(cache) == 2
+            assert cache.obter(('soma', (Fraction, Fraction(1, 3)))) == Fraction(4, 3)
+            assert 'b' not in cache
+
+    def test_substituir_e_compactar(self, diretorio):
+        """Testa que regravar a chave troca o valor e a compactação libera o log."""
+        with CacheDisco(diretorio) as cache:
+            for i in range(50):
+                cache.guardar('x', str(i) * 100)
+            assert len(cache) == 1
+            antes = cache.estatisticas()['bytes_log']
+            cache.compactar()
+            estatisticas = cache.estatisticas()
+            assert estatisticas['bytes_log'] == estatisticas['bytes_vivos'] < antes / 40
+            assert cache.obter('x') == '49' * 100
+            assert os.listdir(diretorio).count('valores.2.log') == 1
+
+    def test_limpar(self, diretorio):
+        """Testa que limpar descarta tudo, também para outras instâncias."""
+        with CacheDisco(diretorio) as cache, CacheDisco(diretorio) as outro:
+            cache.guardar('a', 1)
+            assert outro.obter('a') == 1
+            cache.limpar()
+            assert outro.obter('a') is None
+            assert len(outro) == 0
+
+    def test_registro_corrompido_e_falha(self, diretorio):
+        """Testa que o CRC transforma um registro adulterado em falha."""
+        with CacheDisco(diretorio) as cache:
+            cache.guardar('a', b'valor')
+        caminho = os.path.join(diretorio, 'valores.1.log')
+        with open(caminho, 'r+b') as log:
+            log.seek(-1, os.SEEK_END)
+            log.write(b'!')
+        with CacheDisco(diretorio) as cache:
+            assert cache.obter('a') is None
+
+    def test_tipos_dos_valores(self, diretorio):
+        """Testa valores numéricos e contêineres lidos de volta com o tipo exato."""
+        valores = [None, True, GRANDE, 0.1, 1 + 2j, Fraction(1, 3), Decimal('1.50'), 'txt',
+                   b'\x00', [1, (2.5, Decimal('3'))], array('d', [1.0, 2.0])]
+        with CacheDisco(diretorio) as cache:
+            for i, valor in enumerate(valores):
+                cache.guardar(i, valor)
+        with CacheDisco(diretorio) as cache:
+            for i, valor in enumerate(valores):
+                lido = cache.obter(i)
+                assert lido == valor and type(lido) is type(valor)
+            with raises(TypeError):
+                cache.guardar('objeto', object())
+
+    @mark.exception
+    def test_registro_em_pickle_nao_executa(self, tmp_path):
+        """Testa que um registro com CRC válido mas valor em pickle não é despicklado."""
+        marca = tmp_path / 'executado'
+        chave = serializar_chave('a')
+        registro = _monta_registro(chave, pickle.dumps(Carga(str(marca))))
+        caminho = tmp_path / 'log'
+        caminho.write_bytes(registro)
+        descritor = os.open(caminho, os.O_RDONLY)
+        try:
+            assert _le_registro(descritor, 0, len(registro), chave) is _AUSENTE
+        finally:
+            os.close(descritor)
+        assert not marca.exists()
+
+    @mark.unix
+    @mark.skipif(sys.platform == 'win32', reason='Usa permissões POSIX')
+    def test_diretorio_privado(self, diretorio):
+        """Testa que o diretório do cache é criado só para o usuário."""
+        with CacheDisco(diretorio):
+            assert os.stat(diretorio).st_mode & 0o777 == 0o700
+
+    def test_tamanho_invalido(self, diretorio):
+        """Testa que tamanho_maximo precisa ser positivo."""
+        with raises(ValueError):
+            CacheDisco(diretorio, tamanho_maximo=0)
+
+
+# ============================================================================
+# TESTES DE DESPEJO E CRESCIMENTO
+# ============================================================================
+
+class TestDespejo:
+    """Limite de tamanho e crescimento do índice."""
+
+    def test_despejo_das_menos_recentes(self, diretorio):
+        """Testa que, ao passar do limite, ficam as entradas usadas por último."""
+        relogio = RelogioFalso()
+        with CacheDisco(diretorio, tamanho_maximo=20_000, relogio=relogio) as cache:
+            for i in range(20):
+                relogio.agora += 1
+                if i == 19:
+                    assert cache.obter(0) is not None   # 0 passa a ser recente
+                cache.guardar(i, bytes(1_000))
+            estatisticas = cache.estatisticas()
+            assert estatisticas['compactacoes'] >= 1 and estatisticas['despejos'] > 0
+            assert estatisticas['bytes_log'] <= 20_000
+            assert 0 in cache and 19 in cache
+            assert 1 not in cache
+
+    def test_indice_cresce(self, diretorio):
+        """Testa que o índice dobra ao passar da ocupação máxima."""
+        with CacheDisco(diretorio) as cache:
+            for i in range(SLOTS_INICIAIS):
+                cache.guardar(i, i)
+            assert cache.estatisticas()['slots'] > SLOTS_INICIAIS
+            assert len(cache) == SLOTS_INICIAIS
+            assert all(cache.obter(i) == i for i in range(0, SLOTS_INICIAIS, 97))
+
+
+# ============================================================================
+# TESTES ENTRE PROCESSOS
+# ============================================================================
+
+class TestProcessos:
+    """Leitores e escritores em instâncias e processos diferentes."""
+
+    def test_leitor_ve_compactacao_de_outro(self, diretorio):
+        """Testa que um leitor reabre o índice compactado por outra instância."""
+        with CacheDisco(diretorio) as escritor, CacheDisco(diretorio) as leitor:
+            escritor.guardar('a', 1)
+            assert leitor.obter('a') == 1
+            escritor.compactar()
+            escritor.guardar('b', 2)
+            assert leitor.obter('a') == 1 and leitor.obter('b') == 2
+
+    @mark.slow
+    def test_processos_concorrentes(self, diretorio):
+        """Testa processos irmãos gravando, lendo e compactando ao mesmo tempo."""
+        contexto = multiprocessing.get_context('spawn')
+        with contexto.Pool(4) as pool:
+            assert all(pool.starmap(_trabalho, [(diretorio, base) for base in range(8)]))
+        with CacheDisco(diretorio, tamanho_maximo=30_000) as cache:
+            assert cache.estatisticas()['bytes_log'] <= 30_000
+            assert sorted(os.listdir(diretorio)) == [
+                'indice.bin', 'trava', f'valores.{cache._indice.geracao}.log']
+
+
+# ============================================================================
+# TESTES DA INTEGRAÇÃO COM A MEMOIZAÇÃO
+# ============================================================================
+
+class TestIntegracao:
+    """CacheDisco como cache da CalculadoraCache e do memoizar."""
+
+    def test_calculadora_cache_em_disco(self, diretorio):
+        """Testa que um processo novo encontra os produtos já calculados."""
+        with CacheDisco(diretorio) as cache:
+            assert CalculadoraCache(cache=cache).multiplicacao(GRANDE, GRANDE) == GRANDE ** 2
+        with CacheDisco(diretorio) as cache:
+            calculadora = CalculadoraCache(cache=cache)
+            assert calculadora.multiplicacao(GRANDE, GRANDE) == GRANDE ** 2
+            assert calculadora.soma(1, 2) == 3
+            assert calculadora.estatisticas()['acertos'] == 1
+            assert calculadora.estatisticas()['falhas'] == 0
+
+    @mark.jogo
+    def test_jogo_memoizado_em_disco(self, diretorio):
+        """Testa o jogo memoizado em disco, com o tipo do operando na chave."""
+        with CacheDisco(diretorio) as cache:
+            jogo = memoizar(pense_num_numero, cache=cache)
+            assert jogo(Decimal('2.5')) == 3
+            assert jogo(Fraction(5, 2)) == 3
+            assert jogo(Decimal('2.5')) == 3
+            assert (cache.acertos, cache.falhas) == (1, 2)
+
+    def test_chave_decimal_em_disco(self, diretorio):
+        """Testa que o expoente de um Decimal entra na chave serializada."""
+        with CacheDisco(diretorio) as cache:
+            calculadora = CalculadoraCache(cache=cache)
+            assert str(calculadora.soma(Decimal('1'), Decimal('1'))) == '2'
+            assert str(calculadora.soma(Decimal('1.00'), Decimal('1'))) == '2.00'
+            assert str(calculadora.soma(Decimal('1.00'), Decimal('1'))) == '2.00'
+            assert (cache.acertos, cache.falhas) == (1, 2)
@@ -0,0 +1,232 @@
+"""
+Testes das operações em lote da classe Calculadora.
+Inclui: sequências, broadcasting com escalar, array.array, buffers com out= e
+despacho NumPy.
+"""
+
+import tracemalloc
+from array import array
+
+from libs.calculadora import Calculadora
+from libs.jogo import EntradaInvalida, pense_num_numero_lote
+from pytest import mark, raises, fixture, approx
+import pytest
+
+
+# ============================================================================
+# FIXTURES - Configuração reutilizável
+# ============================================================================
+
+@fixture
+def calculadora():
+    """Fixture que retorna uma instância da Calculadora."""
+    return Calculadora()
+
+
+# ============================================================================
+# TESTES COM LISTAS E BROADCASTING
+# ============================================================================
+
+class TestLoteListas:
+    """Operações em lote sobre listas e escalares."""
+
+    @mark.lote
+    @mark.basic
+    def test_quatro_operacoes_com_listas(self, calculadora):
+        """Testa as quatro operações com duas listas do mesmo tamanho."""
+        a = [1, 2, 3]
+        b = [4, 5, 6]
+        assert calculadora.soma_lote(a, b) == [5, 7, 9]
+        assert calculadora.subtracao_lote(a, b) == [-3, -3, -3]
+        assert calculadora.multiplicacao_lote(a, b) == [4, 10, 18]
+        assert calculadora.divisao_lote(b, a) == approx([4.0, 2.5, 2.0])
+
+    @mark.lote
+    def test_broadcasting_com_escalar(self, calculadora):
+        """Testa sequência x escalar e escalar x sequência."""
+        assert calculadora.soma_lote([1, 2, 3], 10) == [11, 12, 13]
+        assert calculadora.subtracao_lote(10, [1, 2, 3]) == [9, 8, 7]
+        assert calculadora.divisao_lote([2, 4], 2) == [1.0, 2.0]
+
+    @mark.lote
+    @mark.comparativo
+    @mark.parametrize("nome", ["soma", "subtracao", "multiplicacao", "divisao"])
+    def test_lote_equivale_ao_escalar(self, calculadora, nome):
+        """Testa que o lote produz o mesmo que o laço escalar."""
+        a = [1, 2.5, -3, 10**20, 7]
+        b = [3, 0.5, 4, 3, -2]
+        escalar = getattr(calculadora, nome)
+        lote = getattr(calculadora, nome + '_lote')
+        assert lote(a, b) == [escalar(x, y) for x, y in zip(a, b)]
+
+    @mark.lote
+    @mark.exception
+    def test_tamanhos_diferentes_levanta_excecao(self, calculadora):
+        """Testa que sequências de tamanhos diferentes são rejeitadas."""
+        with raises(ValueError, match="tamanhos diferentes"):
+            calculadora.soma_lote([1, 2], [1, 2, 3])
+
+    @mark.lote
+    @mark.exception
+    def test_dois_escalares_levanta_excecao(self, calculadora):
+        """Testa que o lote exige ao menos uma sequência."""
+        with raises(TypeError):
+            calculadora.soma_lote(1, 2)
+
+    @mark.lote
+    @mark.exception
+    def test_divisao_por_zero_no_lote(self, calculadora):
+        """Testa que a divisão em lote mantém o ZeroDivisionError."""
+        with raises(ZeroDivisionError):
+            calculadora.divisao_lote([1, 2], [1, 0])
+
+
+# ============================================================================
+# TESTES COM array.array
+# ============================================================================
+
+class TestLoteArray:
+    """Operações em lote sobre array.array."""
+
+    @mark.lote
+    def test_array_inteiro_preserva_tipo(self, calculadora):
+        """Testa que arrays inteiros geram array inteiro."""
+        resultado = calculadora.soma_lote(array('q', [1, 2]), array('q', [3, 4]))
+        assert resultado == array('q', [4, 6])
+
+    @mark.lote
+    def test_array_inteiro_promovido_pelo_resultado(self, calculadora):
+        """Testa que floats de outro operando e overflow de int64 geram 'd'."""
+        assert calculadora.soma_lote(array('q', [1]), [0.5]) == array('d', [1.5])
+        resultado = calculadora.soma_lote(array('q', [2**62]), array('q', [2**62]))
+        assert resultado == array('d', [2.0**63])
+
+    @mark.lote
+    def test_divisao_de_array_gera_float(self, calculadora):
+        """Testa que a divisão de arrays inteiros gera array de doubles."""
+        resultado = calculadora.divisao_lote(array('q', [1, 3]), 2)
+        assert resultado.typecode == 'd'
+        assert list(resultado) == [0.5, 1.5]
+
+    @mark.lote
+    def test_compacto_retorna_array(self, calculadora):
+        """Testa compacto=True com listas: array.array em vez de lista."""
+        assert calculadora.soma_lote([1, 2], 3, compacto=True) == array('q', [4, 5])
+        assert calculadora.multiplicacao_lote([1.5], [2], compacto=True) == array('d', [3.0])
+        # Inteiros que não cabem em 64 bits viram doubles
+        resultado = calculadora.soma_lote([2**63], 1, compacto=True)
+        assert resultado.typecode == 'd'
+
+
+# ============================================================================
+# TESTES COM BUFFERS E out=
+# ============================================================================
+
+class TestLoteBuffer:
+    """Entradas com protocolo de buffer e resultado escrito em out."""
+
+    @mark.lote
+    def test_buffers_com_formato(self, calculadora):
+        """Testa bytearray, memoryview e array.array como entradas e saída."""
+        a = memoryview(bytearray(array('d', [1.0, 2.0, 3.0]))).cast('d')
+        b = array('d', [0.5, 0.5, 0.5])
+        out = bytearray(24)
+        assert calculadora.soma_lote(a, b, out=memoryview(out).cast('d')).tolist() == [1.5, 2.5, 3.5]
+        assert array('d', bytes(out)) == array('d', [1.5, 2.5, 3.5])
+        saida = array('q', [0, 0])
+        assert calculadora.multiplicacao_lote(array('q', [3, 4]), 2, out=saida) is saida
+        assert saida == array('q', [6, 8])
+
+    @mark.lote
+    def test_no_lugar(self, calculadora):
+        """Testa out igual a uma das entradas."""
+        valores = array('d', [2.0, 4.0, 8.0])
+        calculadora.divisao_lote(valores, 2, out=valores)
+        calculadora.subtracao_lote(10.0, valores, out=valores)
+        assert valores == array('d', [9.0, 8.0, 6.0])
+
+    @mark.lote
+    @mark.jogo
+    def test_jogo_em_out(self):
+        """Testa pense_num_numero_lote escrevendo em out, inclusive no lugar."""
+        valores = array('d', [1.5, 7.0, 10.0])
+        assert pense_num_numero_lote(valores, out=valores) is valores
+        assert valores == array('d', [3.0] * 3)
+        invalidos = array('d', [1.0, -2.0])
+        with raises(EntradaInvalida) as info:
+            pense_num_numero_lote(invalidos, out=array('d', [0.0, 0.0]))
+        assert info.value.indice == 1
+
+    @mark.lote
+    @mark.exception
+    def test_out_invalido(self, calculadora):
+        """Testa tamanho diferente, buffer somente leitura e formato incompatível."""
+        with raises(ValueError):
+            calculadora.soma_lote([1, 2], 1, out=array('q', [0]))
+        with raises(TypeError):
+            calculadora.soma_lote([1, 2], 1, out=bytes(16))
+        with raises(TypeError):
+            calculadora.divisao_lote(array('q', [1, 2]), 2, out=array('q', [0, 0]))
+        with raises(ValueError):
+            pense_num_numero_lote([1.0], com_passos=True, out=array('d', [0.0]))
+
+    @mark.performance
+    def test_sem_alocacao_por_lote(self, calculadora):
+        """Testa com tracemalloc que lotes com out não alocam nada em regime."""
+        a = array('d', (i + 0.5 for i in range(10_000)))
+        out = array('d', bytes(len(a) * 8))
+
+        def lote():
+            calculadora.soma_lote(a, 1.5, out=out)
+            calculadora.multiplicacao_lote(out, a, out=out)
+            calculadora.divisao_lote(out, a, out=out)
+            pense_num_numero_lote(out, out=out)
+
+        lote()      # aquece caches internos do interpretador
+        tracemalloc.start()
+        try:
+            lote()
+            tracemalloc.reset_peak()
+            antes = tracemalloc.get_traced_memory()[0]
+            for _ in range(5):
+                lote()
+            atual, pico = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert out == array('d', [3.0] * len(a))
+        # Nada retido entre lotes e nenhum pico proporcional ao tamanho: um
+        # resultado novo ocuparia 80 KB (array) ou 320 KB (lista)
+        assert atual - antes <= 256
+        assert pico - antes < 8 * 1024
+
+
+# ============================================================================
+# TESTES COM NUMPY (opcional)
+# ============================================================================
+
+class TestLoteNumpy:
+    """Despacho para ufuncs quando arrays NumPy são recebidos."""
+
+    @mark.lote
+    def test_ndarray_retorna_ndarray(self, calculadora):
+        """Testa que entradas NumPy retornam ndarray."""
+        np = pytest.importorskip("numpy")
+        resultado = calculadora.multiplicacao_lote(np.arange(4), 2)
+        assert isinstance(resultado, np.ndarray)
+        assert resultado.tolist() == [0, 2, 4, 6]
+
+    @mark.lote
+    @mark.exception
+    def test_ndarray_divisao_por_zero(self, calculadora):
+        """Testa que o caminho NumPy também levanta ZeroDivisionError."""
+        np = pytest.importorskip("numpy")
+        with raises(ZeroDivisionError):
+            calculadora.divisao_lote(np.ones(3), np.array([1.0, 0.0, 2.0]))
+
+    @mark.lote
+    def test_ndarray_out(self, calculadora):
+        """Testa out ndarray usando a ufunc sem alocar o resultado."""
+        np = pytest.importorskip("numpy")
+        out = np.zeros(3)
+        assert calculadora.soma_lote(np.arange(3.0), 1.0, out=out) is out
+        assert out.tolist() == [1.0, 2.0, 3.0]
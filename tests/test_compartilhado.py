@@ -0,0 +1,145 @@
+"""
+Testes do pool sobre memória compartilhada.
+"""
+
+import ctypes
+import multiprocessing
+import os
+import sys
+from array import array
+from concurrent.futures.process import BrokenProcessPool
+
+from libs import compartilhado
+from libs.calculadora import Calculadora
+from libs.compartilhado import PREFIXO, PoolCompartilhado, preparar
+from libs.jogo import EntradaInvalida
+from pytest import fixture, mark, raises
+
+
+@fixture
+def pool():
+    with PoolCompartilhado(trabalhadores=2, tamanho_bloco=7,
+                           contexto=multiprocessing.get_context('fork')) as pool:
+        yield pool
+
+
+def _segmentos():
+    if not os.path.isdir('/dev/shm'):
+        return []
+    return [nome for nome in os.listdir('/dev/shm') if nome.startswith(PREFIXO)]
+
+
+def _morre(*args):
+    # Simula um filho derrubado no meio do bloco
+    os._exit(1)
+
+
+# ============================================================================
+# TESTES DAS OPERAÇÕES
+# ============================================================================
+
+@mark.unix
+@mark.skipif(sys.platform == 'win32', reason='Usa o contexto fork')
+class TestOperacoes:
+    """As quatro operações e o jogo sobre colunas compartilhadas."""
+
+    @mark.basic
+    def test_quatro_operacoes(self, pool):
+        """Testa que cada operação bate com a versão em lote da Calculadora."""
+        a = [float(i) for i in range(1, 50)]
+        b = array('d', (i * 0.5 for i in range(1, 50)))
+        for nome in ('soma', 'subtracao', 'multiplicacao', 'divisao'):
+            esperado = getattr(Calculadora, f'{nome}_lote')(a, b, compacto=True)
+            assert getattr(pool, nome)(a, b) == esperado
+
+    def test_tipos_da_saida(self, pool):
+        """Testa int64 preservado, float64 na divisão, escalares e overflow."""
+        assert pool.soma(range(20), 1) == array('q', range(1, 21))
+        assert pool.soma([2**62], [2**62]) == array('d', [2.0**63])
+        assert pool.multiplicacao([2**40] * 3, [2**40] * 3) == array('d', [2.0**80] * 3)
+        assert pool.multiplicacao(range(20), 1.5).typecode == 'd'
+        assert pool.divisao(range(20), 2) == array('d', [i / 2 for i in range(20)])
+        assert pool.subtracao(memoryview(array('q', [5, 6])), [1, 1]) == array('q', [4, 5])
+        assert pool.soma(memoryview((ctypes.c_double * 3)(1, 2, 3)), 1.0) == array('d', [2, 3, 4])
+        assert pool.soma([], 1) == array('q')
+
+    @mark.jogo
+    def test_jogo(self, pool):
+        """Testa as duas funções do jogo, inclusive negativos na versão 2."""
+        assert pool.pense_num_numero(range(30)) == array('d', [3.0] * 30)
+        assert pool.pense_num_numero2([-5.0, 0.5, 9.0]) == array('d', [3.0] * 3)
+
+    @mark.exception
+    def test_erros(self, pool):
+        """Testa o índice global no jogo e parâmetros inválidos."""
+        entradas = list(range(40))
+        entradas[33] = -1
+        with raises(EntradaInvalida) as info:
+            pool.pense_num_numero(entradas)
+        assert info.value.indice == 33
+        with raises(ValueError):
+            pool.soma([1, 2], [1])
+        with raises(TypeError):
+            pool.soma([1, 2], None)
+        with raises(ValueError):
+            pool.executar('potencia', [1], 2)
+        with raises(ValueError):
+            PoolCompartilhado(trabalhadores=0)
+        assert _segmentos() == []
+
+
+# ============================================================================
+# TESTES DAS COLUNAS
+# ============================================================================
+
+class TestColunas:
+    """memoryview de qualquer formato numérico vira coluna float64/int64."""
+
+    def test_mesmos_bytes_sem_copia(self):
+        """Testa '<d' e '<q' do ctypes e 'l' nativo, só com o formato trocado."""
+        for visao, typecode in ((memoryview((ctypes.c_double * 3)(1, 2, 3)), 'd'),
+                                (memoryview((ctypes.c_int64 * 2)(5, -6)), 'q'),
+                                (memoryview(array('l', [7])), 'q')):
+            coluna, tipo, *_ = preparar('soma', visao, 1)
+            assert tipo == typecode
+            assert isinstance(coluna, memoryview) and coluna.format == typecode
+            assert coluna.tobytes() == visao.tobytes()
+
+    def test_formatos_convertidos(self):
+        """Testa inteiros menores, float32, big-endian e uint64 fora de int64."""
+        assert preparar('soma', memoryview(array('i', [1, -2])), 1)[:2] == (array('q', [1, -2]), 'q')
+        assert preparar('soma', memoryview(array('f', [0.5])), 1)[:2] == (array('d', [0.5]), 'd')
+        invertida = memoryview((ctypes.c_double.__ctype_be__ * 2)(1.5, -2.0))
+        if sys.byteorder == 'little':
+            assert invertida.format == '>d'
+        assert preparar('soma', invertida, 1)[:2] == (array('d', [1.5, -2.0]), 'd')
+        assert preparar('soma', memoryview(array('Q', [2**64 - 1])), 1)[:2] == (
+            array('d', [2.0**64]), 'd')
+        assert preparar('soma', memoryview(array('q', [1, 2])), 1, tipo='float64')[:2] == (
+            array('d', [1.0, 2.0]), 'd')
+
+    @mark.exception
+    def test_formato_nao_numerico(self):
+        """Testa que bytes ('c') não viram coluna."""
+        with raises(ValueError, match='formato'):
+            preparar('soma', memoryview(b'abcdefgh').cast('c'), 1)
+
+
+# ============================================================================
+# TESTES DA LIMPEZA
+# ============================================================================
+
+@mark.unix
+@mark.skipif(sys.platform == 'win32', reason='Usa o contexto fork')
+class TestLimpeza:
+    """Segmentos removidos mesmo com falhas."""
+
+    def test_filho_derrubado(self, pool, monkeypatch):
+        """Testa que a morte de um filho não deixa segmentos e o pool se recupera."""
+        monkeypatch.setattr(compartilhado, '_processa_bloco', _morre)
+        with raises(BrokenProcessPool):
+            pool.soma([1.0] * 30, 1.0)
+        assert _segmentos() == []
+        monkeypatch.undo()
+        assert pool.soma([1.0] * 30, 1.0) == array('d', [2.0] * 30)
+        assert _segmentos() == []
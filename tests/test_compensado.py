@@ -0,0 +1,151 @@
+"""
+Testes da aritmética compensada (double-double).
+"""
+
+import math
+import random
+from fractions import Fraction
+
+from libs.compensado import Compensado, CalculadoraCompensada, two_product, two_sum
+from libs.jogo import pense_num_numero, pense_num_numero2
+from pytest import mark, raises
+
+# Erro relativo esperado de uma operação double-double (~2**-104, com folga)
+TOLERANCIA = 2.0 ** -100
+
+
+def _erro_relativo(resultado, exato):
+    return abs((resultado.para_fracao() - exato) / exato)
+
+
+# ============================================================================
+# TESTES DAS TRANSFORMAÇÕES SEM ERRO
+# ============================================================================
+
+class TestTransformacoes:
+    """TwoSum e TwoProduct recuperam exatamente o erro de arredondamento."""
+
+    @mark.parametrize('a,b', [(0.1, 0.2), (1e16, 1.0), (-3.5, 1e-20), (1 / 3, 2 / 3)])
+    def test_two_sum(self, a, b):
+        """Testa que s + e é exatamente a + b."""
+        s, e = two_sum(a, b)
+        assert s == a + b
+        assert Fraction(s) + Fraction(e) == Fraction(a) + Fraction(b)
+
+    @mark.parametrize('a,b', [(0.1, 0.2), (1e16 + 1, 3.0), (1 / 3, 3.0), (-7.25e-10, 1.1)])
+    def test_two_product(self, a, b):
+        """Testa que p + e é exatamente a * b."""
+        p, e = two_product(a, b)
+        assert p == a * b
+        assert Fraction(p) + Fraction(e) == Fraction(a) * Fraction(b)
+
+
+# ============================================================================
+# TESTES DO TIPO Compensado
+# ============================================================================
+
+class TestCompensado:
+    """Precisão e casos especiais das quatro operações."""
+
+    @mark.basic
+    def test_soma_classica(self):
+        """Testa que 0.1 + 0.2 guarda o erro que o float descarta."""
+        resultado = Compensado(0.1) + 0.2
+        assert float(resultado) == 0.1 + 0.2
+        assert resultado.para_fracao() == Fraction(0.1) + Fraction(0.2)
+
+    @mark.float_precision
+    def test_operacoes_aleatorias(self):
+        """Testa o erro relativo de cada operação contra Fraction."""
+        aleatorio = random.Random(3)
+        for _ in range(2000):
+            a = Compensado(aleatorio.uniform(-1, 1) * 10 ** aleatorio.randint(-10, 10)) / 3
+            b = Compensado(aleatorio.uniform(-1, 1) * 10 ** aleatorio.randint(-10, 10)) / 7
+            fa, fb = a.para_fracao(), b.para_fracao()
+            assert _erro_relativo(a * b, fa * fb) < TOLERANCIA
+            assert _erro_relativo(a / b, fa / fb) < TOLERANCIA
+            if fa + fb:
+                assert abs((a + b).para_fracao() - (fa + fb)) <= TOLERANCIA * (abs(fa) + abs(fb))
+
+    @mark.float_precision
+    def test_soma_com_cancelamento(self):
+        """Testa uma soma longa em que o float perde quase todos os dígitos."""
+        valores = [1e16, 1.0, -1e16, 1e-3] * 1000
+        total = Compensado(0.0)
+        for valor in valores:
+            total = total + valor
+        assert float(total) == math.fsum(valores)
+        assert sum(valores) != math.fsum(valores)
+
+    def test_inteiros(self):
+        """Testa que ints maiores que 2**53 entram sem perda."""
+        grande = 2 ** 60 + 1
+        assert Compensado(grande).para_fracao() == grande
+        assert (Compensado(grande) - grande).para_fracao() == 0
+
+    @mark.edge_case
+    def test_nao_finitos(self):
+        """Testa que estouros viram inf em vez de nan."""
+        assert float(Compensado(1e308) * 10) == math.inf
+        assert float(Compensado(1e308) + 1e308) == math.inf
+        assert math.isnan(float(Compensado(math.nan) + 1))
+
+    @mark.exception
+    def test_erros(self):
+        """Testa divisão por zero e tipos não suportados."""
+        with raises(ZeroDivisionError):
+            Compensado(1.0) / 0
+        with raises(TypeError):
+            Compensado('1')
+        with raises(TypeError):
+            CalculadoraCompensada.soma(1.0, '2')
+
+    def test_comparacoes_e_hash(self):
+        """Testa comparação com floats e hash igual ao do float."""
+        assert Compensado(3.0) == 3.0
+        assert hash(Compensado(3.0)) == hash(3.0)
+        assert 0.3 < Compensado(0.1) + 0.2 < 0.30000000000000004
+        assert Compensado(-2.0) < 1
+
+    def test_hash_com_termo_de_erro(self):
+        """Testa que valores iguais com lo != 0 têm o hash do int ou Fraction igual."""
+        grande = 2 ** 60 + 1
+        assert Compensado(grande) == grande and hash(Compensado(grande)) == hash(grande)
+        fracao = Compensado(0.1) + 0.2
+        assert hash(fracao) == hash(fracao.para_fracao())
+        assert len({Compensado(grande), grande}) == 1
+
+    @mark.exception
+    def test_inteiros_fora_da_faixa_do_float(self):
+        """Testa OverflowError documentado e comparações exatas com ints enormes."""
+        with raises(OverflowError, match='fora da faixa do float'):
+            Compensado(10 ** 400)
+        with raises(OverflowError):
+            Compensado(1.0) + 10 ** 400
+        assert Compensado(1e308) < 10 ** 400
+        assert Compensado(1e308) != 10 ** 400
+        assert Compensado(math.inf) > 10 ** 400
+
+
+# ============================================================================
+# TESTES DA CalculadoraCompensada
+# ============================================================================
+
+class TestCalculadoraCompensada:
+    """Mesma interface da Calculadora e uso como backend do jogo."""
+
+    @mark.basic
+    def test_operacoes(self):
+        """Testa as quatro operações."""
+        calc = CalculadoraCompensada
+        assert float(calc.soma(2, 3)) == 5.0
+        assert float(calc.subtracao(2, 3)) == -1.0
+        assert float(calc.multiplicacao(2.5, 4)) == 10.0
+        assert calc.divisao(1, 3).para_fracao() != Fraction(1 / 3)
+
+    @mark.jogo
+    @mark.parametrize('num', [0.1, math.pi, math.e, 1e15 + 0.3, 12345.678])
+    def test_jogo_exato(self, num):
+        """Testa que a cadeia do jogo dá exatamente 3 no modo compensado."""
+        assert pense_num_numero(num, calculadora=CalculadoraCompensada) == 3
+        assert pense_num_numero2(num, calculadora=CalculadoraCompensada) == 3
@@ -0,0 +1,141 @@
+"""
+Testes da execução concorrente em threads (e do fallback em processos).
+"""
+
+import threading
+from array import array
+
+from libs.concorrente import PROCESSOS, THREADS, ExecutorConcorrente, gil_ativo
+from libs.jogo import EntradaInvalida
+from libs.racional import CalculadoraRacional
+from pytest import fixture, mark, raises
+
+
+class CalculadoraContada:
+    """Calculadora com estado: conta as chamadas e lembra a thread dona."""
+
+    instancias = []
+
+    def __init__(self):
+        self.dona = threading.get_ident()
+        self.chamadas = 0
+        CalculadoraContada.instancias.append(self)
+
+    def _confere(self):
+        assert threading.get_ident() == self.dona
+        self.chamadas += 1
+
+    def soma(self, a, b):
+        self._confere()
+        return a + b
+
+    def subtracao(self, a, b):
+        self._confere()
+        return a - b
+
+    def multiplicacao(self, a, b):
+        self._confere()
+        return a * b
+
+    def divisao(self, a, b):
+        self._confere()
+        return a / b
+
+
+@fixture
+def executor():
+    with ExecutorConcorrente(trabalhadores=4, modo=THREADS, tamanho_bloco=16) as executor:
+        yield executor
+
+
+# ============================================================================
+# TESTES DO MODO THREADS
+# ============================================================================
+
+class TestThreads:
+    """Blocos em threads, juntados na ordem."""
+
+    @mark.basic
+    def test_operacoes_e_jogo(self, executor):
+        """Testa as quatro operações e o jogo contra o resultado sequencial."""
+        a = [float(i) for i in range(1, 200)]
+        assert executor.soma(a, 1.0) == array('d', [x + 1.0 for x in a])
+        assert executor.subtracao(range(100), range(100)) == array('q', [0] * 100)
+        assert executor.multiplicacao(range(100), 3) == array('q', range(0, 300, 3))
+        assert executor.divisao(a, 2) == array('d', [x / 2 for x in a])
+        assert executor.pense_num_numero(a) == array('d', [3.0] * len(a))
+        assert executor.pense_num_numero2([-1.0, 5.0]) == array('d', [3.0, 3.0])
+        assert executor.soma([], 1) == array('q')
+        assert executor.soma(memoryview(array('i', range(40))), 1) == array('q', range(1, 41))
+        assert executor.divisao(memoryview(array('d', a)), 2) == array('d', [x / 2 for x in a])
+        assert executor.soma([2**62] * 40, [2**62] * 40) == array('d', [2.0**63] * 40)
+
+    @mark.jogo
+    @mark.exception
+    def test_indice_global(self, executor):
+        """Testa que a entrada inválida traz o índice na entrada original."""
+        entradas = list(range(100))
+        entradas[61] = -2
+        with raises(EntradaInvalida) as info:
+            executor.pense_num_numero(entradas)
+        assert info.value.indice == 61
+
+    def test_estatisticas_por_thread(self, executor):
+        """Testa os contadores de cada thread somados."""
+        executor.pense_num_numero(range(160))
+        estatisticas = executor.estatisticas()
+        assert estatisticas['modo'] == THREADS
+        assert estatisticas['blocos'] == 10 and estatisticas['elementos'] == 160
+        assert 1 <= estatisticas['threads'] <= 4
+
+    def test_calculadora_por_thread(self):
+        """Testa que cada thread usa só a própria instância da calculadora."""
+        CalculadoraContada.instancias = []
+        with ExecutorConcorrente(4, modo=THREADS, calculadora=CalculadoraContada,
+                                 tamanho_bloco=8) as executor:
+            assert executor.soma(range(256), 1) == array('q', range(1, 257))
+            assert executor.pense_num_numero([7.0] * 64) == array('d', [3.0] * 64)
+        instancias = CalculadoraContada.instancias
+        assert len({instancia.dona for instancia in instancias}) == len(instancias)
+        assert sum(instancia.chamadas for instancia in instancias) == 256 + 5 * 64
+
+    def test_calculadora_racional(self):
+        """Testa um backend exato passo a passo em várias threads."""
+        with ExecutorConcorrente(2, modo=THREADS, calculadora=CalculadoraRacional,
+                                 tamanho_bloco=3) as executor:
+            assert executor.pense_num_numero([0.1, 1.5, 7, 10**6]) == array('d', [3.0] * 4)
+
+    @mark.exception
+    def test_calculadora_racional_sem_perda(self):
+        """Testa que resultados exatos não viram float arredondado."""
+        with ExecutorConcorrente(2, modo=THREADS, calculadora=CalculadoraRacional,
+                                 tamanho_bloco=2) as executor:
+            assert executor.divisao([1, 6, 3], [2, 3, 4]) == array('d', [0.5, 2.0, 0.75])
+            with raises(TypeError, match='índice 3'):
+                executor.divisao([1, 6, 3, 1], [2, 3, 4, 3])
+            with raises(TypeError, match='float64 sem perda'):
+                executor.soma([1, 2], 0.1)
+
+
+# ============================================================================
+# TESTES DA ESCOLHA DO MODO
+# ============================================================================
+
+class TestModo:
+    """Modo automático e validação."""
+
+    def test_modo_automatico(self):
+        """Testa processos com GIL e threads sem GIL."""
+        with ExecutorConcorrente(1) as executor:
+            assert executor.modo == (PROCESSOS if gil_ativo() else THREADS)
+            assert executor.soma([1.0, 2.0], 1) == array('d', [2.0, 3.0])
+
+    @mark.exception
+    def test_parametros_invalidos(self):
+        """Testa a validação dos parâmetros."""
+        with raises(ValueError):
+            ExecutorConcorrente(0)
+        with raises(ValueError):
+            ExecutorConcorrente(modo='fibras')
+        with raises(ValueError):
+            ExecutorConcorrente(modo=PROCESSOS, calculadora=CalculadoraRacional)
@@ -0,0 +1,267 @@
+"""
+Testes do diário de auditoria binário.
+"""
+
+import os
+import zlib
+from array import array
+from decimal import Decimal
+from fractions import Fraction
+
+from libs import jogo
+from libs.calculadora import Calculadora
+from libs.diario import (_CABECALHO, _MARCA_BLOCO, Diario, Falha, MAGICO, ValorOpaco,
+                         codificar_bloco, reproduzir, reverificar, segmentos)
+from libs.instrumentacao import Instrumentacao
+from pytest import fixture, mark, raises
+
+
+class RelogioFalso:
+    """Relógio em ns que avança 1 a cada leitura."""
+
+    def __init__(self):
+        self.agora = 1_000
+
+    def __call__(self):
+        self.agora += 1
+        return self.agora
+
+
+@fixture
+def diretorio(tmp_path):
+    return str(tmp_path / 'diario')
+
+
+def _bloco_cru(conteudo, quantidade):
+    cabecalho = _CABECALHO.pack(_MARCA_BLOCO, len(conteudo), quantidade, zlib.crc32(conteudo))
+    return cabecalho + conteudo
+
+
+def _registros(diretorio):
+    return [(r.operacao, r.a, r.b, r.resultado) for r in reproduzir(diretorio)]
+
+
+# ============================================================================
+# TESTES DO REGISTRO
+# ============================================================================
+
+class TestRegistro:
+    """Chamadas registradas enquanto o diário está ativo."""
+
+    @mark.basic
+    def test_registra_e_reproduz(self, diretorio):
+        """Testa operações, jogo, falhas e lotes na ordem das chamadas."""
+        with Diario(diretorio, relogio=RelogioFalso()) as diario:
+            diario.ativar()
+            Calculadora.soma(1, 2)
+            Calculadora().multiplicacao(1.5, 2.0)
+            with raises(ZeroDivisionError):
+                Calculadora.divisao(1, 0)
+            jogo.pense_num_numero(10)
+            Calculadora.soma_lote([1, 2], 3, compacto=True)
+        assert _registros(diretorio) == [
+            ('soma', 1, 2, 3),
+            ('multiplicacao', 1.5, 2.0, 3.0),
+            ('divisao', 1, 0, Falha('ZeroDivisionError', 'division by zero')),
+            ('pense_num_numero', 10, None, 3.0),
+            ('soma_lote', [1, 2], 3, array('q', [4, 5])),
+        ]
+        assert [r.instante_ns for r in reproduzir(diretorio)] == [1001, 1002, 1003, 1004, 1005]
+
+    def test_lote_com_out_guarda_copia(self, diretorio):
+        """Testa que lotes com out= registram os valores da chamada, não o buffer."""
+        valores = array('d', [1.0, 2.0])
+        with Diario(diretorio) as diario:
+            diario.ativar()
+            assert Calculadora.soma_lote(valores, 1.0, out=valores) is valores
+            Calculadora.soma_lote(valores, 1.0, out=valores)
+        assert _registros(diretorio) == [
+            ('soma_lote', array('d', [1.0, 2.0]), 1.0, array('d', [2.0, 3.0])),
+            ('soma_lote', array('d', [2.0, 3.0]), 1.0, array('d', [3.0, 4.0])),
+        ]
+        assert reverificar(diretorio)['divergencias'] == 0
+
+    def test_lote_alterado_depois_da_chamada(self, diretorio):
+        """Testa que alterar a entrada antes do descarregar não muda o registro."""
+        valores = [1.0, 2.0]
+        with Diario(diretorio) as diario:
+            diario.ativar()
+            resultado = Calculadora.soma_lote(valores, 1.0)
+            valores[0] = 100.0
+            resultado[1] = -1.0
+        assert _registros(diretorio) == [('soma_lote', [1.0, 2.0], 1.0, [2.0, 3.0])]
+        assert reverificar(diretorio)['divergencias'] == 0
+
+    @mark.jogo
+    @mark.exception
+    def test_jogo_negativo_registrado(self, diretorio):
+        """Testa que a recusa de um número negativo fica no diário como falha."""
+        with Diario(diretorio) as diario:
+            diario.ativar()
+            with raises(Exception, match='positivo'):
+                jogo.pense_num_numero(-1)
+        assert _registros(diretorio) == [
+            ('pense_num_numero', -1, None, Falha('Exception', 'Número precisa ser positivo!')),
+        ]
+        assert reverificar(diretorio)['divergencias'] == 0
+
+    def test_desativar_restaura_originais(self, diretorio):
+        """Testa que desativar devolve as funções originais."""
+        soma = Calculadora.__dict__['soma']
+        dobrada = jogo._pense_num_numero_dobrada
+        with Diario(diretorio) as diario:
+            diario.ativar()
+            assert Calculadora.__dict__['soma'] is not soma
+            diario.desativar()
+            assert Calculadora.__dict__['soma'] is soma
+            assert jogo._pense_num_numero_dobrada is dobrada
+            assert jogo._rejeita_negativo.__name__ == '_rejeita_negativo'
+            assert not hasattr(jogo._rejeita_negativo, '__wrapped__')
+            Calculadora.soma(1, 2)
+        assert _registros(diretorio) == []
+
+    @mark.exception
+    def test_desativar_fora_de_ordem_com_instrumentacao(self, diretorio):
+        """Testa que o diário não desfaz a instrumentação ativada depois dele."""
+        soma = Calculadora.__dict__['soma']
+        with Diario(diretorio) as diario:
+            diario.ativar()
+            instrumentacao = Instrumentacao()
+            instrumentacao.ativar()
+            with raises(RuntimeError, match='diário'):
+                diario.desativar()
+            instrumentacao.desativar()
+            diario.desativar()
+        assert Calculadora.__dict__['soma'] is soma
+
+    def test_um_diario_ativo_por_vez(self, tmp_path):
+        """Testa que ativar um segundo diário levanta RuntimeError."""
+        with Diario(str(tmp_path / 'a')) as primeiro, Diario(str(tmp_path / 'b')) as segundo:
+            primeiro.ativar()
+            with raises(RuntimeError):
+                segundo.ativar()
+
+    def test_colunas_de_tipos_variados(self, diretorio):
+        """Testa ints grandes, Fraction e tipos misturados (colunas marcadas)."""
+        with Diario(diretorio) as diario:
+            diario.registrar('soma', 2**70, 1, 2**70 + 1)
+            diario.registrar('soma', Fraction(1, 3), 1.5, Fraction(1, 3) + 1.5)
+            diario.registrar('pense_num_numero2', 7, None, 3.0)
+            diario.registrar('soma_lote', (Decimal('1.50'), -2**65), 'x', [1j, True, None])
+        assert _registros(diretorio) == [
+            ('soma', 2**70, 1, 2**70 + 1),
+            ('soma', Fraction(1, 3), 1.5, Fraction(1, 3) + 1.5),
+            ('pense_num_numero2', 7, None, 3.0),
+            ('soma_lote', (Decimal('1.50'), -2**65), 'x', [1j, True, None]),
+        ]
+
+    def test_tipo_sem_codificacao(self, diretorio):
+        """Testa que um tipo desconhecido vira ValorOpaco e não é reverificado."""
+        with Diario(diretorio) as diario:
+            diario.registrar('soma', RelogioFalso, 1, 2)
+            diario.registrar('soma', 1, 1, 2)
+        registro = next(reproduzir(diretorio))
+        assert registro.a == ValorOpaco('builtins.type', repr(RelogioFalso))
+        relatorio = reverificar(diretorio)
+        assert (relatorio['ignorados'], relatorio['divergencias']) == (1, 0)
+
+
+# ============================================================================
+# TESTES DA DURABILIDADE
+# ============================================================================
+
+class TestDurabilidade:
+    """Blocos, fsync em grupo, rotação e caudas cortadas."""
+
+    def test_fsync_por_bloco(self, diretorio):
+        """Testa intervalo_fsync=0: um fsync por bloco escrito."""
+        with Diario(diretorio, intervalo_fsync=0, tamanho_buffer=2) as diario:
+            for i in range(6):
+                diario.registrar('soma', i, i, 2 * i)
+            assert diario.registros_gravados == 6
+            assert diario.sincronizacoes == 3
+
+    def test_fsync_em_grupo(self, diretorio):
+        """Testa intervalo_fsync=None: só o fechamento sincroniza."""
+        diario = Diario(diretorio, intervalo_fsync=None, tamanho_buffer=2)
+        for i in range(6):
+            diario.registrar('soma', i, i, 2 * i)
+        assert diario.sincronizacoes == 0
+        diario.fechar()
+        assert diario.sincronizacoes == 1
+
+    def test_rotacao(self, diretorio):
+        """Testa segmentos novos por tamanho e a cada abertura."""
+        with Diario(diretorio, tamanho_segmento=200, tamanho_buffer=4) as diario:
+            for i in range(40):
+                diario.registrar('soma', i, 1, i + 1)
+        quantidade = len(segmentos(diretorio))
+        assert quantidade > 2
+        with Diario(diretorio) as diario:
+            diario.registrar('soma', 0.5, 0.5, 1.0)
+        assert len(segmentos(diretorio)) == quantidade + 1
+        assert [r.a for r in reproduzir(diretorio)] == list(range(40)) + [0.5]
+
+    def test_cauda_cortada_e_ignorada(self, diretorio):
+        """Testa que um bloco incompleto no fim não estraga os anteriores."""
+        with Diario(diretorio, tamanho_buffer=3) as diario:
+            for i in range(6):
+                diario.registrar('soma', i, 1, i + 1)
+        caminho = segmentos(diretorio)[-1]
+        with open(caminho, 'r+b') as arquivo:
+            arquivo.truncate(os.path.getsize(caminho) - 5)
+        assert [r.a for r in reproduzir(diretorio)] == [0, 1, 2]
+
+    def test_bloco_corrompido(self, diretorio):
+        """Testa que o CRC detecta bytes trocados no conteúdo."""
+        os.makedirs(diretorio)
+        bloco = bytearray(codificar_bloco([1, 5, 1.0, 2.0, 3.0]))
+        bloco[-1] ^= 0xFF
+        with open(os.path.join(diretorio, 'diario-00000001.bin'), 'wb') as arquivo:
+            arquivo.write(MAGICO + bytes(bloco))
+        assert list(reproduzir(diretorio)) == []
+
+    @mark.exception
+    def test_coluna_em_pickle_recusada(self, diretorio):
+        """Testa que colunas fora do formato marcado (como pickle) não são lidas."""
+        os.makedirs(diretorio)
+        conteudo = bytes([1]) + array('q', [0]).tobytes()
+        conteudo += b'p' + (5).to_bytes(4, 'little') + b'\x80\x04N.\x00'
+        with open(os.path.join(diretorio, 'diario-00000001.bin'), 'wb') as arquivo:
+            arquivo.write(MAGICO + _bloco_cru(conteudo, 1))
+        with raises(ValueError):
+            list(reproduzir(diretorio))
+
+
+# ============================================================================
+# TESTES DA REVERIFICAÇÃO
+# ============================================================================
+
+class TestReverificacao:
+    """Reexecução dos registros contra os resultados gravados."""
+
+    @mark.basic
+    def test_sem_divergencias(self, diretorio):
+        """Testa uma execução real reverificada sem divergências."""
+        with Diario(diretorio) as diario:
+            diario.ativar()
+            for n in range(100):
+                jogo.pense_num_numero(n)
+                Calculadora.divisao(n, 7)
+            Calculadora.divisao_lote([1.0, 2.0], 2)
+            with raises(ZeroDivisionError):
+                Calculadora.divisao(1, 0)
+        relatorio = reverificar(diretorio)
+        assert relatorio['registros'] == 202
+        assert relatorio['divergencias'] == 0
+
+    def test_divergencia(self, diretorio):
+        """Testa que um resultado adulterado é apontado."""
+        with Diario(diretorio) as diario:
+            diario.registrar('soma', 1, 2, 3)
+            diario.registrar('soma', 1, 2, 4)
+            diario.registrar('divisao', float('nan'), 1, float('nan'))
+        relatorio = reverificar(diretorio)
+        assert relatorio['divergencias'] == 1
+        registro, obtido = relatorio['exemplos'][0]
+        assert (registro.operacao, registro.resultado, obtido) == ('soma', 4, 3)
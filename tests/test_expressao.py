@@ -0,0 +1,193 @@
+"""
+Testes do compilador de expressões e do cache de planos.
+"""
+
+import os
+import subprocess
+import sys
+from array import array
+from decimal import Decimal
+from fractions import Fraction
+
+from libs.expressao import (NOME_CHAVE, Compilador, ErroSintaxe, Negacao, Numero, Operacao,
+                            Variavel, analisar, interpretar)
+from libs.jogo import pense_num_numero2
+from libs.racional import CalculadoraRacional
+from pytest import fixture, mark, raises
+
+JOGO2 = '((x+5)*2-4)/2-x'
+
+
+@fixture
+def compilador(tmp_path):
+    """Fixture com um compilador cujo cache em disco fica em tmp_path."""
+    return Compilador(diretorio=str(tmp_path))
+
+
+# ============================================================================
+# TESTES DA ANÁLISE
+# ============================================================================
+
+class TestAnalise:
+    """Texto -> árvore de operações da Calculadora."""
+
+    @mark.basic
+    def test_precedencia_e_parenteses(self):
+        """Testa que * e / ligam mais forte que + e -."""
+        assert analisar('1+x*2') == Operacao('soma', Numero(1),
+                                             Operacao('multiplicacao', Variavel('x'), Numero(2)))
+        assert analisar('(1+x)*2') == Operacao('multiplicacao',
+                                               Operacao('soma', Numero(1), Variavel('x')), Numero(2))
+
+    def test_associatividade_a_esquerda(self):
+        """Testa que x-1-2 é (x-1)-2."""
+        assert analisar('x-1-2') == Operacao('subtracao',
+                                             Operacao('subtracao', Variavel('x'), Numero(1)),
+                                             Numero(2))
+
+    def test_unario_e_literais(self):
+        """Testa menos unário, floats e notação científica."""
+        assert analisar('-3') == Numero(-3)
+        assert analisar('-x') == Negacao(Variavel('x'))
+        assert analisar('2.5e1') == Numero(25.0)
+
+    @mark.exception
+    @mark.parametrize('expressao', ['', '(x+1', 'x+', 'x $ 2', '1..2', '_x+1', 'x y', '1e999',
+                                    'if+1', 'None+1', 'zip*2', 'plano_lote-1'])
+    def test_erros_de_sintaxe(self, expressao):
+        """Testa que expressões mal formadas levantam ErroSintaxe."""
+        with raises(ErroSintaxe):
+            analisar(expressao)
+
+    def test_posicao_do_erro(self):
+        """Testa que o erro indica a posição do problema."""
+        with raises(ErroSintaxe) as erro:
+            analisar('x + * 2')
+        assert erro.value.posicao == 4
+
+
+# ============================================================================
+# TESTES DOS PLANOS
+# ============================================================================
+
+class TestPlano:
+    """Avaliação escalar e em lote dos planos compilados."""
+
+    @mark.basic
+    @mark.parametrize('num', [0, 1, 7, -3, 2.5, 10**6])
+    def test_equivale_ao_jogo(self, compilador, num):
+        """Testa que o plano reproduz pense_num_numero2."""
+        assert compilador.compilar(JOGO2)(num) == pense_num_numero2(num)
+
+    @mark.parametrize('valor', [3, 0.1, Decimal('1.5'), Fraction(1, 3)])
+    def test_equivale_a_calculadora(self, compilador, valor):
+        """Testa que o plano dá o mesmo resultado das chamadas à Calculadora."""
+        expressao = '-(x*3 - 1.5)/4 + x*x'
+        if isinstance(valor, (Decimal, Fraction)):
+            expressao = '-(x*3 - 2)/4 + x*x'
+        plano = compilador.compilar(expressao)
+        assert plano(valor) == interpretar(analisar(expressao), {'x': valor})
+
+    def test_varias_variaveis(self, compilador):
+        """Testa que os parâmetros seguem a ordem de aparição."""
+        plano = compilador.compilar('b - a*2')
+        assert plano.variaveis == ('b', 'a')
+        assert plano(10, 3) == 4
+        assert plano.lote([10, 20], 3) == [4, 14]
+
+    def test_lote(self, compilador):
+        """Testa lote com listas, escalares e array.array."""
+        plano = compilador.compilar(JOGO2)
+        assert plano.lote([1, 2, 3]) == [3.0, 3.0, 3.0]
+        soma = compilador.compilar('x + y')
+        resultado = soma.lote(array('q', [1, 2]), 10)
+        assert resultado == array('q', [11, 12])
+        assert plano.lote(array('q', [1, 2])).typecode == 'd'
+
+    @mark.exception
+    def test_erros_do_lote(self, compilador):
+        """Testa os erros do lote, como em Calculadora.*_lote."""
+        plano = compilador.compilar('x / y')
+        with raises(ValueError):
+            plano.lote([1, 2], [1])
+        with raises(TypeError):
+            plano.lote(1, 2)
+        with raises(ZeroDivisionError):
+            plano.lote([1, 2], 0)
+
+    def test_interpretar_com_outro_backend(self):
+        """Testa o interpretador de referência com a CalculadoraRacional."""
+        assert interpretar(analisar(JOGO2), {'x': 5}, CalculadoraRacional) == 3
+
+
+# ============================================================================
+# TESTES DO CACHE
+# ============================================================================
+
+class TestCachePlanos:
+    """Cache em memória e em disco."""
+
+    def test_memoria(self, compilador):
+        """Testa que a mesma expressão é compilada uma vez."""
+        assert compilador.compilar(JOGO2) is compilador.compilar(JOGO2)
+        assert compilador.compilacoes == 1
+
+    def test_disco_evita_recompilar(self, tmp_path):
+        """Testa que um compilador novo carrega o plano do disco."""
+        Compilador(diretorio=str(tmp_path)).compilar(JOGO2)
+        novo = Compilador(diretorio=str(tmp_path))
+        assert novo.compilar(JOGO2)(10) == 3.0
+        assert (novo.compilacoes, novo.carregados_do_disco) == (0, 1)
+
+    def test_arquivo_corrompido_e_ignorado(self, tmp_path):
+        """Testa que um arquivo de plano inválido leva a recompilar."""
+        Compilador(diretorio=str(tmp_path)).compilar(JOGO2)
+        for nome in os.listdir(tmp_path):
+            (tmp_path / nome).write_bytes(b'lixo')
+        novo = Compilador(diretorio=str(tmp_path))
+        assert novo.compilar(JOGO2)(10) == 3.0
+        assert novo.compilacoes == 1
+
+    @mark.exception
+    def test_plano_adulterado_nao_executa(self, tmp_path):
+        """Testa que um fonte trocado sem a chave não é executado."""
+        Compilador(diretorio=str(tmp_path)).compilar(JOGO2)
+        marca = tmp_path / 'executado'
+        carga = f"open({str(marca)!r}, 'w')".encode()
+        for nome in os.listdir(tmp_path):
+            if nome.endswith('.plano'):
+                dados = (tmp_path / nome).read_bytes()
+                (tmp_path / nome).write_bytes(dados.replace(b'return', carga + b' or 1;return', 1))
+        novo = Compilador(diretorio=str(tmp_path))
+        assert novo.compilar(JOGO2)(10) == 3.0
+        assert (novo.compilacoes, novo.carregados_do_disco) == (1, 0)
+        assert not marca.exists()
+
+    @mark.unix
+    @mark.skipif(sys.platform == 'win32', reason='Usa permissões POSIX')
+    def test_diretorio_privado(self, tmp_path):
+        """Testa o diretório 0o700, a chave 0o600 e a recusa de um diretório aberto."""
+        diretorio = tmp_path / 'planos'
+        Compilador(diretorio=str(diretorio)).compilar(JOGO2)
+        assert diretorio.stat().st_mode & 0o777 == 0o700
+        assert (diretorio / NOME_CHAVE).stat().st_mode & 0o777 == 0o600
+        diretorio.chmod(0o777)
+        novo = Compilador(diretorio=str(diretorio))
+        assert novo.compilar(JOGO2)(10) == 3.0
+        assert (novo.compilacoes, novo.carregados_do_disco) == (1, 0)
+
+    def test_sem_disco(self, tmp_path):
+        """Testa o compilador só com cache em memória."""
+        compilador = Compilador(diretorio=None)
+        assert compilador.compilar('x*2')(4) == 8
+
+    @mark.integracao
+    def test_processo_novo_nao_recompila(self, tmp_path):
+        """Testa o início a quente em outro processo."""
+        codigo = ('from libs.expressao import compilar, compilador;'
+                  f'compilar({JOGO2!r});print(compilador.compilacoes)')
+        ambiente = dict(os.environ, CALCULADORA_PLANOS=str(tmp_path))
+        saidas = [subprocess.run([sys.executable, '-c', codigo], env=ambiente, check=True,
+                                 capture_output=True, text=True).stdout.strip()
+                  for _ in range(2)]
+        assert saidas == ['1', '0']
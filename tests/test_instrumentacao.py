@@ -0,0 +1,180 @@
+"""
+Testes da instrumentação (contadores e histogramas) da Calculadora e do jogo.
+"""
+
+import threading
+
+from libs import jogo
+from libs.calculadora import Calculadora
+from libs.instrumentacao import ETAPAS_JOGO, Instrumentacao, Histograma
+from libs.jogo import pense_num_numero, pense_num_numero2, pense_num_numero_lote
+from libs.racional import CalculadoraRacional
+from pytest import mark, raises, fixture
+
+
+@fixture
+def instrumentacao():
+    """Fixture com uma instrumentação ativa, sempre desativada ao final."""
+    registro = Instrumentacao()
+    registro.ativar()
+    yield registro
+    registro.desativar()
+
+
+# ============================================================================
+# TESTES DE CONTAGEM
+# ============================================================================
+
+class TestContagem:
+    """Contagem de chamadas e erros."""
+
+    def test_conta_operacoes(self, instrumentacao):
+        """Testa a contagem por operação e o histograma."""
+        c = Calculadora()
+        c.soma(1, 2)
+        c.soma(3, 4)
+        Calculadora.divisao(1, 2)
+        Calculadora.soma_lote([1, 2], 1)
+        dados = instrumentacao.snapshot()
+        assert dados['soma']['chamadas'] == 2
+        assert dados['divisao']['chamadas'] == 1
+        assert dados['soma_lote']['chamadas'] == 1
+        assert dados['soma']['histograma'][-1] == [float('inf'), 2]
+        assert dados['soma']['tempo_total'] > 0
+
+    @mark.exception
+    def test_conta_erros(self, instrumentacao):
+        """Testa que exceções são contadas e propagadas."""
+        with raises(ZeroDivisionError):
+            Calculadora.divisao(1, 0)
+        assert instrumentacao.snapshot()['divisao']['erros'] == 1
+
+    @mark.jogo
+    def test_jogo_dobrado_e_passo_a_passo(self, instrumentacao):
+        """Testa que o jogo é contado nos dois caminhos de execução."""
+        pense_num_numero(5)
+        pense_num_numero2(5)
+        pense_num_numero(5, calculadora=CalculadoraRacional())
+        dados = instrumentacao.snapshot()
+        assert dados['pense_num_numero']['chamadas'] == 2
+        assert dados['pense_num_numero2']['chamadas'] == 1
+        # A forma dobrada não chama a Calculadora
+        assert dados['soma']['chamadas'] == 0
+
+    @mark.jogo
+    def test_jogo_passo_a_passo_conta_operacoes(self, instrumentacao):
+        """Testa quantas operações uma execução passo a passo dispara."""
+        pense_num_numero(5, calculadora=Calculadora())
+        dados = instrumentacao.snapshot()
+        assert dados['soma']['chamadas'] == 1
+        assert dados['subtracao']['chamadas'] == 2
+        assert dados['multiplicacao']['chamadas'] == 1
+        assert dados['divisao']['chamadas'] == 1
+
+    @mark.jogo
+    def test_lote_com_passos_conta_cada_entrada_uma_vez(self, instrumentacao):
+        """Testa que gravar os passos do lote não conta uma chamada a mais."""
+        pense_num_numero_lote([1, 2, 3], com_passos=True)
+        assert instrumentacao.snapshot()['pense_num_numero']['chamadas'] == 3
+
+    def test_desativar_restaura_originais(self):
+        """Testa que, desativada, nada fica no caminho da chamada."""
+        original = Calculadora.__dict__['soma']
+        registro = Instrumentacao()
+        registro.ativar()
+        assert Calculadora.__dict__['soma'] is not original
+        registro.desativar()
+        assert Calculadora.__dict__['soma'] is original
+        Calculadora.soma(1, 1)
+        assert registro.snapshot()['soma']['chamadas'] == 0
+
+    @mark.exception
+    def test_desativar_fora_de_ordem(self):
+        """Testa que desativar fora da ordem inversa não reinstala invólucros velhos."""
+        original = Calculadora.__dict__['soma']
+        primeiro, segundo = Instrumentacao(), Instrumentacao()
+        primeiro.ativar()
+        segundo.ativar()
+        with raises(RuntimeError, match='ativado por último'):
+            primeiro.desativar()
+        assert primeiro.ativa
+        Calculadora.soma(1, 1)
+        segundo.desativar()
+        primeiro.desativar()
+        assert Calculadora.__dict__['soma'] is original
+        assert primeiro.snapshot()['soma']['chamadas'] == 1
+        assert segundo.snapshot()['soma']['chamadas'] == 1
+
+    def test_zerar(self, instrumentacao):
+        """Testa que zerar descarta as contagens."""
+        Calculadora.soma(1, 1)
+        instrumentacao.zerar()
+        assert instrumentacao.snapshot()['soma']['chamadas'] == 0
+
+
+# ============================================================================
+# TESTES DE EXPORTAÇÃO
+# ============================================================================
+
+class TestExportacao:
+    """Histograma e formato Prometheus."""
+
+    def test_histograma_cumulativo(self):
+        """Testa os baldes do histograma."""
+        histograma = Histograma()
+        for duracao_ns in (5, 6, 8, 100):
+            histograma.observar(duracao_ns)
+        # 5 e 6 < 8 ns; 8 < 16 ns; 100 < 128 ns
+        assert histograma.cumulativo() == [
+            (8e-9, 2), (16e-9, 3), (32e-9, 3), (64e-9, 3), (128e-9, 4), (float('inf'), 4),
+        ]
+
+    def test_prometheus(self, instrumentacao, tmp_path):
+        """Testa o texto Prometheus gravado em arquivo."""
+        Calculadora.multiplicacao(2, 3)
+        caminho = tmp_path / 'calc.prom'
+        instrumentacao.exportar_prometheus(str(caminho))
+        texto = caminho.read_text(encoding='utf-8')
+        assert '# TYPE calculadora_chamadas_total counter' in texto
+        assert 'calculadora_chamadas_total{operacao="multiplicacao"} 1' in texto
+        assert 'calculadora_latencia_segundos_bucket{operacao="multiplicacao",le="+Inf"} 1' in texto
+        assert 'calculadora_latencia_segundos_count{operacao="multiplicacao"} 1' in texto
+
+
+# ============================================================================
+# TESTES DE OVERHEAD
+# ============================================================================
+
+def test_desativada_devolve_o_mesmo_objeto():
+    """Testa que ativar e desativar não deixa nada no caminho da chamada.
+
+    O custo por chamada em nanossegundos é medido por
+    ``python -m benchmarks.bench_instrumentacao``.
+    """
+    original = Calculadora.soma
+    etapas = {nome: getattr(jogo, nome) for nome in ETAPAS_JOGO['pense_num_numero']}
+    registro = Instrumentacao()
+    registro.ativar()
+    assert Calculadora.soma is not original
+    registro.desativar()
+    assert Calculadora.soma is original
+    assert all(getattr(jogo, nome) is etapa for nome, etapa in etapas.items())
+
+
+def test_contagem_com_varias_threads():
+    """Testa que as fatias por thread somam todas as chamadas."""
+    registro = Instrumentacao()
+    registro.ativar()
+    try:
+        def trabalho():
+            for _ in range(5000):
+                Calculadora.soma(1, 1)
+
+        threads = [threading.Thread(target=trabalho) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        registro.desativar()
+    assert registro.snapshot()['soma']['chamadas'] == 20000
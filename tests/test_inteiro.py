@@ -0,0 +1,85 @@
+"""
+Testes da divisão que preserva inteiros de precisão arbitrária.
+"""
+
+from libs.inteiro import CalculadoraInteira, dividir_inteiros
+from libs.racional import Racional
+from libs.jogo import pense_num_numero, pense_num_numero2
+from pytest import mark, raises, fixture
+
+ENORME = 10**100_000 + 7
+
+
+@fixture(params=['racional', 'float'])
+def calculadora(request):
+    """Fixture com os dois modos de divisão inexata."""
+    return CalculadoraInteira(inexata=request.param)
+
+
+class TestDividirInteiros:
+    """Divisão exata e inexata entre ints."""
+
+    @mark.divisao
+    @mark.parametrize("a,b,esperado", [
+        (10, 2, 5), (-10, 2, -5), (10, -2, -5), (0, 7, 0),
+        (10**400, 10**200, 10**200), (2**5000, 2**4000, 2**1000),
+        (-(3 * 2**300), -(2**300), 3),
+    ])
+    def test_divisao_exata_retorna_int(self, a, b, esperado):
+        """Testa que divisões exatas retornam int exato."""
+        resultado = dividir_inteiros(a, b)
+        assert resultado == esperado
+        assert type(resultado) is int
+
+    @mark.divisao
+    def test_inexata_racional(self):
+        """Testa que a divisão inexata em modo racional é exata."""
+        resultado = dividir_inteiros(10**400 + 1, 2)
+        assert isinstance(resultado, Racional)
+        assert resultado * 2 == 10**400 + 1
+
+    @mark.divisao
+    @mark.float_precision
+    def test_inexata_float_corretamente_arredondada(self):
+        """Testa o arredondamento correto sem floats intermediários."""
+        assert dividir_inteiros(2**53 + 1, 2, 'float') == float(2**52)
+        assert dividir_inteiros(10**400 + 1, 10**399 * 3, 'float') == 10 / 3
+
+    @mark.divisao
+    @mark.exception
+    def test_divisao_por_zero(self):
+        """Testa ZeroDivisionError."""
+        with raises(ZeroDivisionError):
+            dividir_inteiros(1, 0)
+
+    @mark.exception
+    def test_modo_invalido(self):
+        """Testa a validação do modo."""
+        with raises(ValueError):
+            CalculadoraInteira(inexata='decimal')
+
+
+class TestJogoComInteiros:
+    """O jogo com inteiros enormes, sem overflow."""
+
+    @mark.jogo
+    @mark.edge_case
+    def test_jogo_acima_de_10_308(self, calculadora):
+        """Testa o caso que a Calculadora padrão não suporta passo a passo."""
+        for num in (10**308, 10**400, 2**2000 + 1):
+            resultado = pense_num_numero(num, calculadora=calculadora)
+            assert resultado == 3
+            assert type(resultado) is int
+            assert pense_num_numero2(num, calculadora=calculadora) == 3
+
+    @mark.jogo
+    def test_operandos_de_100_mil_digitos(self, calculadora):
+        """Testa o jogo exato com operandos de 10^5 dígitos."""
+        assert pense_num_numero(ENORME, calculadora=calculadora) == 3
+        assert pense_num_numero2(ENORME + 1, calculadora=calculadora) == 3
+
+    @mark.divisao
+    def test_operandos_nao_inteiros_seguem_calculadora(self, calculadora):
+        """Testa que floats e Racional continuam funcionando."""
+        assert calculadora.divisao(1.0, 4) == 0.25
+        assert calculadora.divisao(3, Racional(3, 2)) == 2
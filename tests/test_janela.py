@@ -0,0 +1,164 @@
+"""
+Testes das janelas deslizantes incrementais.
+"""
+
+import math
+import random
+from decimal import Decimal
+from fractions import Fraction
+
+from libs.janela import JanelaContagem, JanelaTempo
+from libs.racional import CalculadoraRacional
+from pytest import approx, mark, raises
+
+
+class RelogioFalso:
+    """Relógio controlável para a janela de tempo."""
+
+    def __init__(self):
+        self.agora = 0.0
+
+    def __call__(self):
+        return self.agora
+
+
+# ============================================================================
+# TESTES DA JANELA POR CONTAGEM
+# ============================================================================
+
+class TestJanelaContagem:
+    """Últimos N valores."""
+
+    @mark.basic
+    def test_agregados(self):
+        """Testa soma, média, diferença e produto ao longo da janela."""
+        janela = JanelaContagem(3, com_produto=True)
+        saidas = [janela.adicionar(valor) for valor in [2, 3, 4, 5]]
+        assert saidas == [None, None, None, 2]
+        assert list(janela) == [3, 4, 5]
+        assert janela.soma == 12
+        assert janela.media == 4
+        assert janela.diferenca == 2
+        assert janela.produto == 60
+
+    @mark.parametrize('compensada', [False, True])
+    @mark.parametrize('com_produto', [False, True])
+    def test_equivale_ao_recalculo(self, compensada, com_produto):
+        """Testa cada passo contra o recálculo sobre a janela inteira."""
+        aleatorio = random.Random(4)
+        janela = JanelaContagem(7, compensada=compensada, com_produto=com_produto)
+        valores = [aleatorio.randint(-5, 5) for _ in range(200)]
+        for i, valor in enumerate(valores):
+            janela.adicionar(valor)
+            atual = valores[max(0, i - 6):i + 1]
+            assert janela.soma == sum(atual)
+            if com_produto:
+                assert janela.produto == math.prod(atual)
+
+    @mark.parametrize('compensada', [False, True])
+    def test_estender_equivale_a_adicionar(self, compensada):
+        """Testa o caminho rápido de estender."""
+        valores = [random.Random(5).uniform(-1e6, 1e6) for _ in range(1000)]
+        um_a_um = JanelaContagem(50, compensada=compensada)
+        for valor in valores:
+            um_a_um.adicionar(valor)
+        em_lote = JanelaContagem(50, compensada=compensada)
+        em_lote.estender(valores)
+        assert list(em_lote) == list(um_a_um)
+        assert em_lote.soma == um_a_um.soma
+
+    @mark.float_precision
+    def test_compensada_sem_deriva(self):
+        """Testa que a soma compensada não acumula erro em execuções longas."""
+        aleatorio = random.Random(6)
+        valores = [aleatorio.uniform(-1, 1) * 10.0 ** aleatorio.randint(-3, 8)
+                   for _ in range(100000)]
+        janela = JanelaContagem(100, compensada=True)
+        simples = JanelaContagem(100)
+        janela.estender(valores)
+        simples.estender(valores)
+        exato = float(sum(map(Fraction, valores[-100:])))
+        assert janela.soma == approx(exato, rel=1e-15, abs=1e-9)
+        assert abs(janela.soma - exato) <= abs(simples.soma - exato)
+
+    def test_produto_com_zero(self):
+        """Testa que um zero saindo da janela não quebra o produto."""
+        janela = JanelaContagem(2, com_produto=True)
+        for valor in [0, 3, 4]:
+            janela.adicionar(valor)
+        assert janela.produto == 12
+
+    def test_outra_calculadora(self):
+        """Testa o backend racional como função de combinação."""
+        janela = JanelaContagem(3, calculadora=CalculadoraRacional)
+        for valor in [1, 2, 4]:
+            janela.adicionar(valor)
+        assert janela.media == Fraction(7, 3)
+
+    def test_decimal(self):
+        """Testa que Decimal continua exato."""
+        janela = JanelaContagem(10)
+        janela.estender([Decimal('0.1')] * 25)
+        assert janela.soma == Decimal('1.0')
+
+    def test_limpar(self):
+        """Testa que limpar zera os agregados."""
+        janela = JanelaContagem(3, com_produto=True)
+        janela.estender([1, 2, 3])
+        janela.limpar()
+        janela.adicionar(5)
+        assert (len(janela), janela.soma, janela.produto) == (1, 5, 5)
+
+    @mark.exception
+    def test_erros(self):
+        """Testa janela vazia, produto desligado e tamanho inválido."""
+        janela = JanelaContagem(2)
+        with raises(ZeroDivisionError):
+            janela.media
+        with raises(ValueError):
+            janela.diferenca
+        with raises(AttributeError):
+            janela.produto
+        with raises(ValueError):
+            JanelaContagem(0)
+
+
+# ============================================================================
+# TESTES DA JANELA POR TEMPO
+# ============================================================================
+
+class TestJanelaTempo:
+    """Valores dos últimos N segundos."""
+
+    @mark.basic
+    def test_expiracao(self):
+        """Testa que valores antigos saem ao adicionar e ao expirar."""
+        relogio = RelogioFalso()
+        janela = JanelaTempo(10, relogio=relogio, com_produto=True)
+        for instante, valor in [(0, 1), (4, 2), (9, 3)]:
+            relogio.agora = instante
+            janela.adicionar(valor)
+        assert janela.soma == 6
+        relogio.agora = 12
+        assert janela.adicionar(4) == 1
+        assert (janela.soma, janela.produto) == (9, 24)
+        assert janela.expirar(19) == 2
+        assert list(janela) == [4]
+
+    def test_instante_explicito(self):
+        """Testa instantes informados pelo chamador."""
+        janela = JanelaTempo(1.0, compensada=True)
+        for i in range(100):
+            janela.adicionar(0.1, i * 0.25)
+        assert len(janela) == 4
+        assert janela.soma == approx(0.4)
+
+    @mark.exception
+    def test_instantes_fora_de_ordem(self):
+        """Testa que instantes decrescentes são rejeitados."""
+        janela = JanelaTempo(5)
+        janela.adicionar(1, 10)
+        with raises(ValueError):
+            janela.adicionar(1, 9)
+        with raises(ValueError):
+            JanelaTempo(0)
@@ -0,0 +1,117 @@
+"""
+Testes da API de fluxo do módulo jogo.
+Inclui: consumo preguiçoso, lotes, modos de tratamento de inválidos e memória.
+"""
+
+import itertools
+import tracemalloc
+
+from libs.jogo import (pense_num_numero2, pense_num_numero_fluxo, EntradaInvalida,
+                       LEVANTAR, PULAR, SENTINELA, COLETAR)
+from pytest import mark, raises
+
+
+# ============================================================================
+# TESTES BÁSICOS
+# ============================================================================
+
+class TestFluxoBasico:
+    """Consumo de iteráveis e iteradores."""
+
+    @mark.jogo
+    @mark.basic
+    def test_resultados_elemento_a_elemento(self):
+        """Testa que o fluxo gera um resultado por entrada."""
+        assert list(pense_num_numero_fluxo([1, 2, 3])) == [3, 3, 3]
+
+    @mark.jogo
+    def test_agrupado_por_lote(self):
+        """Testa a entrega em lotes."""
+        lotes = list(pense_num_numero_fluxo(range(5), tamanho_lote=2, agrupar=True))
+        assert lotes == [[3.0, 3.0], [3.0, 3.0], [3.0]]
+
+    @mark.jogo
+    def test_iterador_infinito_eh_preguicoso(self):
+        """Testa que entradas infinitas são consumidas sob demanda."""
+        fluxo = pense_num_numero_fluxo(itertools.count(), tamanho_lote=10)
+        assert list(itertools.islice(fluxo, 25)) == [3.0] * 25
+
+    @mark.jogo
+    def test_funcao_configuravel(self):
+        """Testa o fluxo com pense_num_numero2 (aceita negativos)."""
+        resultados = list(pense_num_numero_fluxo([-1, 4], funcao=pense_num_numero2))
+        assert resultados == [3.0, 3.0]
+
+
+# ============================================================================
+# TESTES DOS MODOS DE ENTRADA INVÁLIDA
+# ============================================================================
+
+class TestFluxoInvalidos:
+    """Tratamento configurável das entradas inválidas."""
+
+    @mark.jogo
+    @mark.exception
+    def test_levantar_informa_indice(self):
+        """Testa que o modo padrão propaga a exceção com o índice."""
+        with raises(EntradaInvalida) as info:
+            list(pense_num_numero_fluxo([1, 2, -3, 4], ao_invalido=LEVANTAR))
+        assert info.value.indice == 2
+        assert info.value.valor == -3
+
+    @mark.jogo
+    def test_pular(self):
+        """Testa que inválidos são descartados."""
+        assert list(pense_num_numero_fluxo([1, -1, 2], ao_invalido=PULAR)) == [3, 3]
+
+    @mark.jogo
+    def test_sentinela(self):
+        """Testa que inválidos viram sentinela."""
+        resultados = list(pense_num_numero_fluxo(
+            [1, -1, 'abc'], ao_invalido=SENTINELA, sentinela=None))
+        assert resultados == [3, None, None]
+
+    @mark.jogo
+    def test_coletar(self):
+        """Testa que inválidos são anexados à lista do chamador."""
+        invalidos = []
+        entradas = [1, -1, 2, -2] * 3
+        resultados = list(pense_num_numero_fluxo(
+            entradas, tamanho_lote=3, ao_invalido=COLETAR, invalidos=invalidos))
+        assert resultados == [3] * 6
+        assert [e.indice for e in invalidos] == [1, 3, 5, 7, 9, 11]
+
+    @mark.jogo
+    @mark.exception
+    def test_parametros_invalidos(self):
+        """Testa a validação dos parâmetros."""
+        with raises(ValueError):
+            list(pense_num_numero_fluxo([1], ao_invalido='ignorar'))
+        with raises(ValueError):
+            list(pense_num_numero_fluxo([1], ao_invalido=COLETAR))
+        with raises(ValueError):
+            list(pense_num_numero_fluxo([1], tamanho_lote=0))
+
+
+# ============================================================================
+# TESTES DE MEMÓRIA
+# ============================================================================
+
+class TestFluxoMemoria:
+    """Perfil de memória constante."""
+
+    @mark.jogo
+    @mark.performance
+    def test_memoria_nao_cresce_com_a_entrada(self):
+        """Testa que o pico de memória independe do tamanho da entrada."""
+        def pico(n):
+            tracemalloc.start()
+            for _ in pense_num_numero_fluxo(range(n), tamanho_lote=256):
+                pass
+            _, maximo = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            return maximo
+
+        pequeno = pico(10_000)
+        grande = pico(200_000)
+        assert grande < pequeno * 2
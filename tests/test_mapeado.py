@@ -0,0 +1,125 @@
+"""
+Testes das operações da Calculadora sobre arquivos mapeados em memória.
+"""
+
+from array import array
+
+from libs.mapeado import aplicar_arquivo
+from libs.jogo import EntradaInvalida
+from pytest import mark, raises, fixture
+
+
+def _escreve(caminho, typecode, valores):
+    with open(caminho, 'wb') as arquivo:
+        array(typecode, valores).tofile(arquivo)
+    return str(caminho)
+
+
+def _le(caminho, typecode):
+    valores = array(typecode)
+    with open(caminho, 'rb') as arquivo:
+        valores.frombytes(arquivo.read())
+    return list(valores)
+
+
+@fixture
+def colunas(tmp_path):
+    """Fixture com duas colunas float64 e uma int64 em disco."""
+    a = _escreve(tmp_path / 'a.f64', 'd', [float(i) for i in range(1000)])
+    b = _escreve(tmp_path / 'b.f64', 'd', [float(i % 7 + 1) for i in range(1000)])
+    q = _escreve(tmp_path / 'q.i64', 'q', range(1000))
+    return a, b, q
+
+
+class TestAplicarArquivo:
+    """Operações em janelas sobre arquivos binários."""
+
+    @mark.basic
+    @mark.parametrize("operacao,esperado", [
+        ("soma", lambda x, y: x + y),
+        ("subtracao", lambda x, y: x - y),
+        ("multiplicacao", lambda x, y: x * y),
+        ("divisao", lambda x, y: x / y),
+    ])
+    def test_arquivo_com_arquivo(self, tmp_path, colunas, operacao, esperado):
+        """Testa as quatro operações entre dois arquivos, com janelas pequenas."""
+        a, b, _ = colunas
+        saida = tmp_path / 'saida.f64'
+        assert aplicar_arquivo(operacao, a, saida, operando=b, janela=64) == 1000
+        resultado = _le(saida, 'd')
+        assert resultado == [esperado(float(i), float(i % 7 + 1)) for i in range(1000)]
+
+    def test_int64_com_escalar_preserva_tipo(self, tmp_path, colunas):
+        """Testa int64 com escalar inteiro gerando saída int64."""
+        _, _, q = colunas
+        saida = tmp_path / 'saida.i64'
+        aplicar_arquivo('multiplicacao', q, saida, operando=3, tipo='int64', janela=100)
+        assert _le(saida, 'q') == [3 * i for i in range(1000)]
+
+    @mark.exception
+    def test_overflow_int64_remove_saida(self, tmp_path):
+        """Testa que um resultado fora de int64 levanta OverflowError sem deixar saída."""
+        entrada = _escreve(tmp_path / 'grandes.i64', 'q', [1] * 150 + [2**62] * 10)
+        saida = tmp_path / 'saida.i64'
+        with raises(OverflowError, match='int64'):
+            aplicar_arquivo('multiplicacao', entrada, saida, operando=4, tipo='int64', janela=100)
+        assert not saida.exists()
+        aplicar_arquivo('multiplicacao', entrada, saida, operando=4.0, tipo='int64')
+        assert _le(saida, 'd')[-1] == 2.0**64
+
+    def test_divisao_int64_gera_float64(self, tmp_path, colunas):
+        """Testa que a divisão de int64 grava float64."""
+        _, _, q = colunas
+        saida = tmp_path / 'saida.f64'
+        aplicar_arquivo('divisao', q, saida, operando=2, tipo='int64')
+        assert _le(saida, 'd') == [i / 2 for i in range(1000)]
+
+    @mark.jogo
+    def test_cadeia_do_jogo(self, tmp_path, colunas):
+        """Testa a cadeia completa do jogo sobre um arquivo."""
+        a, _, _ = colunas
+        saida = tmp_path / 'jogo.f64'
+        aplicar_arquivo('pense_num_numero', a, saida, janela=128)
+        assert _le(saida, 'd') == [3.0] * 1000
+
+    @mark.jogo
+    @mark.exception
+    def test_jogo_informa_indice_invalido(self, tmp_path):
+        """Testa que um negativo no arquivo reporta o índice global."""
+        entrada = _escreve(tmp_path / 'neg.f64', 'd', [1.0] * 300 + [-1.0] + [2.0] * 10)
+        with raises(EntradaInvalida) as info:
+            aplicar_arquivo('pense_num_numero', entrada, tmp_path / 'saida.f64', janela=100)
+        assert info.value.indice == 300
+        assert not (tmp_path / 'saida.f64').exists()
+
+    def test_arquivo_vazio(self, tmp_path):
+        """Testa arquivos vazios."""
+        entrada = _escreve(tmp_path / 'vazio.f64', 'd', [])
+        assert aplicar_arquivo('soma', entrada, tmp_path / 's.f64', operando=1.0) == 0
+
+    @mark.exception
+    def test_erros_de_parametro(self, tmp_path, colunas):
+        """Testa validações de tipo, operação, operando e tamanho."""
+        a, b, _ = colunas
+        saida = tmp_path / 's.f64'
+        with raises(ValueError, match="tipo"):
+            aplicar_arquivo('soma', a, saida, operando=1, tipo='float32')
+        with raises(ValueError, match="operação"):
+            aplicar_arquivo('potencia', a, saida, operando=1)
+        with raises(TypeError):
+            aplicar_arquivo('soma', a, saida)
+        curto = _escreve(tmp_path / 'curto.f64', 'd', [1.0])
+        with raises(ValueError, match="tamanhos"):
+            aplicar_arquivo('soma', a, saida, operando=curto)
+        with raises(ValueError, match="mesmo arquivo"):
+            aplicar_arquivo('soma', a, a, operando=1.0)
+        with raises(ValueError, match="mesmo arquivo"):
+            aplicar_arquivo('soma', a, tmp_path / '.' / 'b.f64', operando=b)
+        assert _le(a, 'd') == [float(i) for i in range(1000)]
+
+    @mark.exception
+    def test_divisao_por_zero(self, tmp_path, colunas):
+        """Testa que zeros no divisor levantam ZeroDivisionError."""
+        a, _, _ = colunas
+        with raises(ZeroDivisionError):
+            aplicar_arquivo('divisao', a, tmp_path / 's.f64', operando=a)
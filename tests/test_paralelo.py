@@ -0,0 +1,58 @@
+"""
+Testes da avaliação paralela das funções do jogo.
+"""
+
+from libs.jogo import pense_num_numero, pense_num_numero2, EntradaInvalida
+from libs.paralelo import pense_num_numero_paralelo
+from pytest import mark, raises
+
+
+class TestParalelo:
+    """Avaliação em ProcessPoolExecutor."""
+
+    @mark.jogo
+    @mark.basic
+    def test_range_mantem_ordem(self):
+        """Testa que os resultados de um range voltam completos e em ordem."""
+        resultados = pense_num_numero_paralelo(range(1000), trabalhadores=2,
+                                               tamanho_lote=64)
+        assert resultados == [pense_num_numero(i) for i in range(1000)]
+
+    @mark.jogo
+    def test_lista_com_funcao2(self):
+        """Testa uma lista com pense_num_numero2, que aceita negativos."""
+        entradas = [-5, 0.5, 7, 10**400]
+        resultados = pense_num_numero_paralelo(entradas, funcao=pense_num_numero2,
+                                               trabalhadores=2, tamanho_lote=1)
+        assert resultados == [3.0, 3.0, 3.0, 3.0]
+
+    @mark.jogo
+    def test_um_trabalhador_roda_no_processo_atual(self):
+        """Testa o caminho sem pool."""
+        assert pense_num_numero_paralelo([1, 2], trabalhadores=1) == [3, 3]
+
+    @mark.jogo
+    def test_entrada_vazia(self):
+        """Testa que entradas vazias retornam lista vazia."""
+        assert pense_num_numero_paralelo([], trabalhadores=2) == []
+
+    @mark.jogo
+    @mark.exception
+    def test_excecao_traz_indice_global(self):
+        """Testa que o erro de um filho informa o índice na entrada original."""
+        entradas = list(range(100))
+        entradas[73] = -1
+        with raises(EntradaInvalida) as info:
+            pense_num_numero_paralelo(entradas, trabalhadores=2, tamanho_lote=10)
+        assert info.value.indice == 73
+        assert info.value.valor == -1
+        assert "positivo" in str(info.value.erro)
+
+    @mark.jogo
+    @mark.exception
+    def test_parametros_invalidos(self):
+        """Testa a validação dos parâmetros."""
+        with raises(ValueError):
+            pense_num_numero_paralelo([1], trabalhadores=0)
+        with raises(ValueError):
+            pense_num_numero_paralelo([1], tamanho_lote=0)
@@ -0,0 +1,155 @@
+"""
+Testes do processador em lote pela linha de comando (python -m libs).
+"""
+
+import io
+import json
+import subprocess
+import sys
+
+from libs.processador import processar, processar_bloco, ler_blocos, main, CSV, JSONL
+from pytest import mark
+
+
+def _processa(texto, formato=CSV, **kwargs):
+    saida = io.BytesIO()
+    registros, erros = processar(io.BytesIO(texto.encode()), saida, formato, **kwargs)
+    return saida.getvalue().decode().splitlines(), registros, erros
+
+
+# ============================================================================
+# TESTES CSV
+# ============================================================================
+
+class TestCsv:
+    """Registros em CSV."""
+
+    @mark.basic
+    def test_operacoes_e_jogo(self):
+        """Testa as quatro operações e as funções do jogo."""
+        texto = 'soma,2,3\nsubtracao,2,3\nmultiplicacao,4,2.5\ndivisao,1,4\n' \
+                'pense_num_numero,7\npense_num_numero2,-7\n'
+        linhas, registros, erros = _processa(texto)
+        assert linhas == ['5', '-1', '10.0', '0.25', '3.0', '3.0']
+        assert (registros, erros) == (6, 0)
+
+    def test_cabecalho_comentarios_e_espacos(self):
+        """Testa que cabeçalho, comentários e linhas vazias são ignorados."""
+        linhas, registros, _ = _processa('operacao,a,b\n# nota\n\n soma , 1 , 2 \n')
+        assert linhas == ['3']
+        assert registros == 1
+
+    @mark.exception
+    def test_erros_viram_linhas(self):
+        """Testa que registros inválidos não interrompem o processamento."""
+        texto = 'divisao,1,0\npense_num_numero,-1\npotencia,2,2\nsoma,1\nsoma,a,1\nsoma,1,1\n'
+        linhas, registros, erros = _processa(texto)
+        assert linhas[0] == 'erro:ZeroDivisionError:division by zero'
+        assert linhas[1] == 'erro:Exception:Número precisa ser positivo!'
+        assert linhas[2].startswith('erro:ValueError:operação desconhecida')
+        assert linhas[3].startswith('erro:ValueError:soma espera 2')
+        assert linhas[4].startswith('erro:ValueError')
+        assert linhas[5] == '2'
+        assert (registros, erros) == (6, 5)
+
+    def test_inteiros_grandes(self):
+        """Testa que inteiros grandes não perdem precisão."""
+        linhas, _, _ = _processa(f'multiplicacao,{10**30},{10**30}\n')
+        assert linhas == [str(10**60)]
+
+
+# ============================================================================
+# TESTES JSONL
+# ============================================================================
+
+class TestJsonl:
+    """Registros em JSONL."""
+
+    def test_objetos_e_listas(self):
+        """Testa registros como objeto e como lista."""
+        texto = '{"operacao": "soma", "a": 1, "b": 2.5}\n' \
+                '{"operacao": "pense_num_numero", "num": 5}\n' \
+                '["divisao", 1, 0]\n'
+        linhas, registros, erros = _processa(texto, JSONL)
+        assert json.loads(linhas[0]) == {'resultado': 3.5}
+        assert json.loads(linhas[1]) == {'resultado': 3.0}
+        assert json.loads(linhas[2])['erro'].startswith('ZeroDivisionError')
+        assert (registros, erros) == (3, 1)
+
+    @mark.exception
+    def test_linha_malformada(self):
+        """Testa que uma linha JSON inválida só afeta o próprio registro."""
+        linhas, _, erros = _processa('["soma", 1, 1]\n{ruim\n["soma", 2, 2]\n', JSONL)
+        assert json.loads(linhas[0]) == {'resultado': 2}
+        assert 'erro' in json.loads(linhas[1])
+        assert json.loads(linhas[2]) == {'resultado': 4}
+        assert erros == 1
+
+    @mark.exception
+    def test_um_registro_por_linha(self):
+        """Testa que um valor em duas linhas ou dois valores numa linha viram erros."""
+        linhas, registros, erros = _processa('["soma", 1\n2]\n["soma", 3, 4]\n', JSONL)
+        assert (registros, erros) == (3, 2)
+        assert json.loads(linhas[2]) == {'resultado': 7}
+        linhas, registros, erros = _processa('["soma", 1, 2], ["soma", 3, 4]\n[1]\n', JSONL)
+        assert (registros, erros) == (2, 2)
+        assert json.loads(linhas[0])['erro'].startswith('JSONDecodeError: Extra data')
+
+    @mark.exception
+    def test_operandos_so_numeros(self):
+        """Testa que texto, listas, booleanos e null viram erros, não resultados."""
+        texto = '{"operacao": "soma", "a": "2", "b": "3"}\n' \
+                '["multiplicacao", [0], 1000000000]\n' \
+                '["soma", true, 1]\n' \
+                '{"operacao": "pense_num_numero", "num": null}\n' \
+                '["soma", 2, 3.5]\n'
+        linhas, registros, erros = _processa(texto, JSONL)
+        assert (registros, erros) == (5, 4)
+        for linha, tipo in zip(linhas, ('str', 'list', 'bool', 'NoneType')):
+            assert json.loads(linha)['erro'] == \
+                f'TypeError: operando precisa ser número, recebeu {tipo}'
+        assert json.loads(linhas[4]) == {'resultado': 5.5}
+
+
+# ============================================================================
+# TESTES DE BLOCOS, PROCESSOS E CLI
+# ============================================================================
+
+class TestExecucao:
+    """Blocos, múltiplos processos e linha de comando."""
+
+    def test_blocos_terminam_em_linha_completa(self):
+        """Testa que nenhum registro é cortado entre blocos."""
+        texto = b''.join(b'soma,%d,1\n' % i for i in range(1000))
+        blocos = list(ler_blocos(io.BytesIO(texto), tamanho=100))
+        assert b''.join(blocos) == texto
+        assert all(bloco.endswith(b'\n') for bloco in blocos)
+
+    def test_multiplos_processos_mantem_ordem(self):
+        """Testa que a saída com processos é idêntica à sequencial."""
+        texto = ''.join(f'soma,{i},1\n' for i in range(5000))
+        sequencial, _, _ = _processa(texto, tamanho_bloco=512)
+        paralelo, registros, _ = _processa(texto, processos=2, tamanho_bloco=512)
+        assert paralelo == sequencial
+        assert registros == 5000
+
+    def test_bloco_vazio(self):
+        """Testa um bloco sem registros."""
+        assert processar_bloco(b'\n\n') == (b'', 0, 0)
+
+    def test_main_com_arquivos(self, tmp_path, capsys):
+        """Testa a CLI com arquivo de entrada e saída."""
+        entrada = tmp_path / 'entrada.csv'
+        saida = tmp_path / 'saida.csv'
+        entrada.write_text('soma,1,2\npense_num_numero,3\n')
+        assert main([str(entrada), '-o', str(saida)]) == 0
+        assert saida.read_text().splitlines() == ['3', '3.0']
+        assert 'registros/s' in capsys.readouterr().err
+
+    @mark.integracao
+    def test_python_m_libs(self):
+        """Testa a execução como módulo, via stdin e stdout."""
+        resultado = subprocess.run(
+            [sys.executable, '-m', 'libs', '-f', 'jsonl', '-q'],
+            input=b'["multiplicacao", 6, 7]\n', capture_output=True, check=True)
+        assert json.loads(resultado.stdout) == {'resultado': 42}
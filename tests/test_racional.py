@@ -0,0 +1,123 @@
+"""
+Testes do backend racional exato com redução preguiçosa.
+"""
+
+import math
+from fractions import Fraction
+
+from libs import racional
+from libs.racional import Racional, CalculadoraRacional
+from libs.jogo import pense_num_numero, pense_num_numero2
+from pytest import mark, raises, fixture
+
+
+@fixture
+def calculadora():
+    """Fixture que retorna uma CalculadoraRacional."""
+    return CalculadoraRacional()
+
+
+# ============================================================================
+# TESTES DO TIPO Racional
+# ============================================================================
+
+class TestRacional:
+    """Aritmética e leitura do tipo Racional."""
+
+    @mark.basic
+    @mark.parametrize("a,b", [
+        (Fraction(1, 3), Fraction(2, 7)),
+        (Fraction(-5, 4), Fraction(3, 8)),
+        (Fraction(7), Fraction(1, 9)),
+        (Fraction(0), Fraction(5, 2)),
+    ])
+    def test_equivale_a_fraction(self, a, b):
+        """Testa as quatro operações contra Fraction."""
+        ra, rb = Racional(a), Racional(b)
+        assert (ra + rb).para_fracao() == a + b
+        assert (ra - rb).para_fracao() == a - b
+        assert (ra * rb).para_fracao() == a * b
+        assert (ra / rb).para_fracao() == a / b
+        assert (2 - ra).para_fracao() == 2 - a
+        assert (1 / rb).para_fracao() == 1 / b
+
+    def test_reducao_preguicosa(self):
+        """Testa que a normalização só acontece na leitura."""
+        r = Racional(1, 2) * 2
+        assert (r._num, r._den) == (2, 2)
+        assert r == 1
+        assert (r.numerator, r.denominator) == (1, 1)
+
+    def test_reducao_acima_do_limite(self):
+        """Testa que termos grandes são reduzidos imediatamente."""
+        grande = 2 ** (racional.LIMITE_BITS + 10)
+        r = Racional(1, 3) * Racional(grande, grande)
+        assert (r._num, r._den) == (1, 3)
+
+    def test_comparacoes_e_hash(self):
+        """Testa comparação e hash consistentes com int e Fraction."""
+        assert Racional(1, 2) < 1
+        assert Racional(3, 2) >= Fraction(3, 2)
+        assert Racional(4, 2) == 2
+        assert hash(Racional(4, 2)) == hash(2)
+        assert Racional(1, 4) == 0.25
+        assert float(Racional(1, 3)) == 1 / 3
+
+    @mark.exception
+    def test_divisao_por_zero(self):
+        """Testa ZeroDivisionError."""
+        with raises(ZeroDivisionError):
+            Racional(1, 0)
+        with raises(ZeroDivisionError):
+            Racional(1, 2) / 0
+        with raises(ZeroDivisionError):
+            1 / Racional(0)
+
+
+# ============================================================================
+# TESTES DA CalculadoraRacional
+# ============================================================================
+
+class TestCalculadoraRacional:
+    """Mesma interface da Calculadora, com resultados exatos."""
+
+    @mark.divisao
+    def test_divisao_exata_de_inteiros_continua_int(self, calculadora):
+        """Testa o atalho que evita criar Racional."""
+        resultado = calculadora.divisao(10**40, 10**20)
+        assert resultado == 10**20
+        assert type(resultado) is int
+
+    @mark.divisao
+    def test_divisao_inexata_gera_racional(self, calculadora):
+        """Testa que divisões inexatas são exatas."""
+        resultado = calculadora.divisao(1, 3)
+        assert isinstance(resultado, Racional)
+        assert calculadora.multiplicacao(resultado, 3) == 1
+
+    @mark.float_precision
+    def test_float_sem_perda(self, calculadora):
+        """Testa que 0.1 + 0.2 é exatamente a soma dos dois doubles."""
+        resultado = calculadora.soma(0.1, 0.2)
+        assert resultado.para_fracao() == Fraction(0.1) + Fraction(0.2)
+
+    @mark.jogo
+    @mark.float_precision
+    @mark.parametrize("num", [0, 7, 10**400, 0.1, math.pi, math.e, 1e300, Fraction(1, 3)])
+    def test_jogo_exatamente_tres(self, calculadora, num):
+        """Testa que o jogo sobre o backend racional dá exatamente 3."""
+        assert pense_num_numero(num, calculadora=calculadora) == 3
+        assert pense_num_numero2(num, calculadora=calculadora) == 3
+
+    @mark.jogo
+    def test_jogo_com_inteiros_nao_cria_racional(self, calculadora):
+        """Testa que a cadeia do jogo com int fica toda em ints."""
+        resultado = pense_num_numero(12345, calculadora=calculadora)
+        assert type(resultado) is int
+
+    @mark.jogo
+    @mark.exception
+    def test_jogo_mantem_validacao(self, calculadora):
+        """Testa que negativos continuam levantando exceção."""
+        with raises(Exception, match="positivo"):
+            pense_num_numero(Racional(-1, 2), calculadora=calculadora)
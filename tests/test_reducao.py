@@ -0,0 +1,115 @@
+"""
+Testes das reduções (somatório e produtório) da Calculadora.
+"""
+
+import functools
+import math
+import random
+from decimal import Decimal
+from fractions import Fraction
+
+from libs.calculadora import Calculadora
+from libs.reducao import somatorio, produtorio
+from pytest import mark, raises
+
+
+def _floats(tamanho, semente=1):
+    aleatorio = random.Random(semente)
+    return [aleatorio.uniform(-1, 1) * 10.0 ** aleatorio.randint(-6, 6) for _ in range(tamanho)]
+
+
+# ============================================================================
+# TESTES DO SOMATÓRIO
+# ============================================================================
+
+class TestSomatorio:
+    """Soma pareada e de Kahan."""
+
+    @mark.basic
+    @mark.parametrize('metodo', ['pareada', 'kahan'])
+    def test_valores_exatos(self, metodo):
+        """Testa ints, Fraction e Decimal, que continuam exatos."""
+        assert Calculadora.somatorio(range(1001), metodo) == 500500
+        assert Calculadora.somatorio([Fraction(1, 3)] * 3, metodo) == 1
+        assert Calculadora.somatorio([Decimal('0.1')] * 10, metodo) == Decimal('1.0')
+
+    @mark.parametrize('metodo', ['pareada', 'kahan'])
+    def test_vazio_e_gerador(self, metodo):
+        """Testa iterável vazio e geradores (consumidos sem materializar)."""
+        assert Calculadora.somatorio([], metodo) == 0
+        assert Calculadora.somatorio((i for i in range(10)), metodo) == 45
+
+    @mark.float_precision
+    def test_mais_preciso_que_reduce(self):
+        """Testa que os dois métodos erram menos que a soma sequencial."""
+        valores = _floats(50000)
+        exato = math.fsum(valores)
+        erro_reduce = abs(functools.reduce(Calculadora.soma, valores) - exato)
+        assert abs(somatorio(valores) - exato) < erro_reduce
+        assert somatorio(valores, 'kahan') == exato
+
+    @mark.float_precision
+    def test_kahan_com_cancelamento(self):
+        """Testa o caso em que o termo pequeno some na soma ingênua."""
+        valores = [1.0, 1e100, 1.0, -1e100]
+        assert sum(valores) == 0.0
+        assert somatorio(valores, 'kahan') == 2.0
+
+    @mark.float_precision
+    @mark.parametrize('metodo', ['pareada', 'kahan'])
+    def test_infinito_e_overflow(self, metodo):
+        """Testa que infinitos e overflow dão o mesmo resultado que sum()."""
+        infinito = float('inf')
+        assert somatorio([infinito, 1.0], metodo) == infinito
+        assert somatorio([1.0, -infinito], metodo) == -infinito
+        assert somatorio([1e308, 1e308], metodo) == sum([1e308, 1e308]) == infinito
+        assert math.isnan(somatorio([infinito, -infinito], metodo))
+        assert somatorio([Decimal('Infinity'), Decimal(1)], metodo) == Decimal('Infinity')
+
+    @mark.slow
+    @mark.parametrize('metodo', ['pareada', 'kahan'])
+    def test_processos(self, metodo):
+        """Testa que a soma em processos combina os blocos corretamente."""
+        valores = _floats(20000)
+        resultado = somatorio(iter(valores), metodo, processos=2, tamanho_bloco=3000)
+        # Limite do erro da soma pareada: proporcional à soma dos módulos
+        assert abs(resultado - math.fsum(valores)) <= 1e-14 * math.fsum(map(abs, valores))
+        assert somatorio(range(10**5), metodo, processos=2, tamanho_bloco=7777) == sum(range(10**5))
+
+    @mark.exception
+    def test_argumentos_invalidos(self):
+        """Testa método, processos e bloco inválidos."""
+        with raises(ValueError):
+            somatorio([1], 'ingenua')
+        with raises(ValueError):
+            somatorio([1], processos=0)
+        with raises(ValueError):
+            somatorio([1], tamanho_bloco=0)
+
+
+# ============================================================================
+# TESTES DO PRODUTÓRIO
+# ============================================================================
+
+class TestProdutorio:
+    """Produto em árvore balanceada."""
+
+    @mark.basic
+    def test_inteiros_grandes(self):
+        """Testa o produto exato de muitos inteiros grandes."""
+        aleatorio = random.Random(5)
+        valores = [aleatorio.getrandbits(200) for _ in range(1000)]
+        assert Calculadora.produtorio(valores) == math.prod(valores)
+
+    def test_vazio_e_tipos(self):
+        """Testa o neutro, floats e Fraction."""
+        assert Calculadora.produtorio([]) == 1
+        assert Calculadora.produtorio([Fraction(1, 2)] * 10) == Fraction(1, 1024)
+        assert Calculadora.produtorio([2.0] * 10) == 1024.0
+        assert Calculadora.produtorio(range(1, 21)) == math.factorial(20)
+
+    @mark.slow
+    def test_processos(self):
+        """Testa o produto em processos contra o sequencial."""
+        valores = list(range(1, 3001))
+        assert produtorio(iter(valores), processos=2, tamanho_bloco=400) == math.factorial(3000)
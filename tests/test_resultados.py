@@ -0,0 +1,144 @@
+"""
+Testes dos contêineres compactos de resultados e da API em lote do jogo.
+"""
+
+import tracemalloc
+from array import array
+
+from libs.jogo import EntradaInvalida, pense_num_numero, pense_num_numero_lote
+from libs.resultados import Registro, Tabela, coluna
+from pytest import importorskip, mark, raises
+
+
+# ============================================================================
+# TESTES DA TABELA
+# ============================================================================
+
+class TestTabela:
+    """Colunas array.array com registros sob demanda."""
+
+    @mark.basic
+    def test_colunas_e_registros(self):
+        """Testa a leitura por coluna e por registro."""
+        tabela = Tabela.de_colunas(entrada=[1, 2, 3], resultado=[3.0, 3.0, 3.0])
+        assert tabela.nomes == ('entrada', 'resultado')
+        assert len(tabela) == 3
+        assert tabela.coluna('entrada') == array('q', [1, 2, 3])
+        assert tabela[-1].entrada == 3
+        assert tabela[0].para_dict() == {'entrada': 1, 'resultado': 3.0}
+        assert [registro.indice for registro in tabela] == [0, 1, 2]
+        with raises(AttributeError):
+            tabela[0].inexistente
+        with raises(IndexError):
+            tabela[3]
+
+    def test_registro_sem_dict(self):
+        """Testa que o registro é uma view com __slots__."""
+        registro = Tabela.de_colunas(x=[1.0])[0]
+        assert isinstance(registro, Registro)
+        assert not hasattr(registro, '__dict__')
+
+    def test_anexar_e_estender(self):
+        """Testa o crescimento linha a linha e em bloco."""
+        tabela = Tabela(('entrada', 'resultado'), 'qd')
+        tabela.anexar(1, 3.0)
+        tabela.anexar(resultado=3.0, entrada=2)
+        tabela.estender(entrada=[3, 4], resultado=[3.0, 3.0])
+        assert tabela.coluna('entrada') == array('q', [1, 2, 3, 4])
+        assert tabela.nbytes == 4 * 8 * 2
+        with raises(TypeError):
+            tabela.anexar(1)
+        with raises(ValueError):
+            tabela.estender(entrada=[1], resultado=[])
+
+    def test_de_colunas_sem_copia(self):
+        """Testa que arrays do typecode certo são usados como estão."""
+        valores = array('d', [1.0, 2.0])
+        assert Tabela.de_colunas(x=valores).coluna('x') is valores
+        with raises(ValueError):
+            Tabela.de_colunas(x=[1], y=[1, 2])
+
+    def test_coluna_typecode(self):
+        """Testa a escolha entre 'q' e 'd' (e geradores percorridos uma vez)."""
+        assert coluna([1, 2]).typecode == 'q'
+        assert coluna([1, 2.5]).typecode == 'd'
+        assert coluna([2**64]).typecode == 'd'
+        assert coluna(v for v in [1, 2]) == array('q', [1, 2])
+        with raises(ValueError):
+            coluna([1], 'i')
+
+    def test_exportacao_sem_copia(self):
+        """Testa memoryview e bytes da coluna."""
+        tabela = Tabela.de_colunas(resultado=[3.0, 3.0])
+        visao = tabela.memoryview('resultado')
+        assert visao.format == 'd' and visao.nbytes == 16
+        tabela.coluna('resultado')[0] = 4.0
+        assert visao[0] == 4.0
+        assert tabela.para_bytes('resultado') == array('d', [4.0, 3.0]).tobytes()
+
+    def test_para_numpy(self):
+        """Testa o ndarray que compartilha a memória da coluna."""
+        np = importorskip('numpy')
+        tabela = Tabela.de_colunas(entrada=[1, 2], resultado=[3.0, 3.0])
+        resultado = tabela.para_numpy('resultado')
+        assert resultado.dtype == np.float64
+        tabela.coluna('resultado')[1] = 5.0
+        assert resultado[1] == 5.0
+        assert tabela.para_numpy()['entrada'].dtype == np.int64
+
+
+# ============================================================================
+# TESTES DA API EM LOTE DO JOGO
+# ============================================================================
+
+class TestJogoLote:
+    """pense_num_numero_lote retorna uma Tabela."""
+
+    @mark.basic
+    def test_resultados(self):
+        """Testa entrada e resultado em colunas."""
+        tabela = pense_num_numero_lote(range(5))
+        assert tabela.coluna('entrada') == array('q', range(5))
+        assert list(tabela.coluna('resultado')) == [pense_num_numero(n) for n in range(5)]
+
+    def test_passos(self):
+        """Testa passo_0..passo_4 iguais à cadeia passo a passo."""
+        tabela = pense_num_numero_lote([1, 2.5], com_passos=True)
+        assert tabela.nomes == ('entrada', 'passo_0', 'passo_1', 'passo_2', 'passo_3',
+                                'passo_4', 'resultado')
+        assert tabela[0].para_dict() == {'entrada': 1, 'passo_0': 6, 'passo_1': 12,
+                                         'passo_2': 8, 'passo_3': 4.0, 'passo_4': 3.0,
+                                         'resultado': 3.0}
+        assert tabela[1].passo_0 == 7.5
+
+    def test_passos_fora_de_int64(self):
+        """Testa que um passo com valor fora de int64 vira coluna de doubles."""
+        tabela = pense_num_numero_lote([2**62, 1], com_passos=True)
+        assert tabela.coluna('passo_0') == array('q', [2**62 + 5, 6])
+        assert tabela.coluna('passo_1') == array('d', [2.0 * (2**62 + 5), 12.0])
+        assert list(tabela.coluna('resultado')) == [3.0, 3.0]
+
+    def test_entrada_invalida(self):
+        """Testa o índice do elemento inválido."""
+        with raises(EntradaInvalida) as erro:
+            pense_num_numero_lote([1, 2, -3])
+        assert erro.value.indice == 2
+
+    @mark.performance
+    def test_memoria_menor_que_dicts(self):
+        """Testa com tracemalloc a economia contra uma lista de dicts."""
+        valores = [float(i) for i in range(20_000)]
+
+        def retido(funcao):
+            tracemalloc.start()
+            try:
+                resultado = funcao()
+                return tracemalloc.get_traced_memory()[0], resultado
+            finally:
+                tracemalloc.stop()
+
+        dicts, _ = retido(lambda: [{'entrada': v, 'resultado': pense_num_numero(v)}
+                                   for v in valores])
+        compacto, tabela = retido(lambda: pense_num_numero_lote(valores))
+        assert tabela.nbytes == 20_000 * 16
+        assert compacto * 5 < dicts
@@ -0,0 +1,134 @@
+"""
+Testes do servidor asyncio e do cliente com pool e pipelining.
+"""
+
+import asyncio
+import os
+import struct
+import sys
+import tempfile
+
+from libs.servico import (ERRO, Servidor, Cliente, ErroRemoto,
+                          codifica_valor, decodifica_valor)
+from pytest import mark, raises
+
+
+def _roda(coro):
+    return asyncio.run(coro)
+
+
+async def _troca_crua(dados, **kwargs):
+    """Envia bytes crus ao servidor e retorna tudo o que voltar até o fim."""
+    async with Servidor(**kwargs) as servidor:
+        reader, writer = await asyncio.open_connection('127.0.0.1', servidor.porta)
+        writer.write(dados)
+        writer.write_eof()
+        resposta = await reader.read()
+        writer.close()
+        return resposta
+
+
+# ============================================================================
+# TESTES DO PROTOCOLO
+# ============================================================================
+
+class TestProtocolo:
+    """Codificação binária dos operandos."""
+
+    @mark.parametrize("valor", [0, -1, 2**63 - 1, -2**63, 10**40, -10**40, 1.5, float('inf')])
+    def test_ida_e_volta(self, valor):
+        """Testa que int64, inteiros grandes e floats sobrevivem à codificação."""
+        dados = codifica_valor(valor)
+        decodificado, posicao = decodifica_valor(dados, 0)
+        assert decodificado == valor
+        assert type(decodificado) is type(valor)
+        assert posicao == len(dados)
+
+    @mark.exception
+    def test_tipo_nao_suportado(self):
+        """Testa que tipos fora do protocolo são rejeitados."""
+        with raises(TypeError):
+            codifica_valor("abc")
+
+
+# ============================================================================
+# TESTES DE SERVIDOR E CLIENTE
+# ============================================================================
+
+class TestServicoTcp:
+    """Chamadas pela rede local."""
+
+    @mark.integracao
+    def test_operacoes_e_jogo(self):
+        """Testa as quatro operações e as duas funções do jogo."""
+        async def cenario():
+            async with Servidor() as servidor:
+                async with Cliente(porta=servidor.porta, conexoes=2) as cliente:
+                    return [
+                        await cliente.soma(2, 3),
+                        await cliente.subtracao(2, 3),
+                        await cliente.multiplicacao(10**30, 10**30),
+                        await cliente.divisao(7, 2),
+                        await cliente.pense_num_numero(42),
+                        await cliente.pense_num_numero2(-8),
+                    ]
+        assert _roda(cenario()) == [5, -1, 10**60, 3.5, 3.0, 3.0]
+
+    @mark.integracao
+    def test_pipelining_mantem_ordem(self):
+        """Testa que muitas requisições em pipeline voltam na ordem certa."""
+        async def cenario():
+            async with Servidor() as servidor:
+                async with Cliente(porta=servidor.porta, conexoes=3) as cliente:
+                    return await cliente.executar_varios(
+                        [('soma', i, i) for i in range(2000)])
+        assert _roda(cenario()) == [2 * i for i in range(2000)]
+
+    @mark.integracao
+    @mark.exception
+    def test_erros_remotos(self):
+        """Testa que erros do servidor chegam ao cliente com o tipo certo."""
+        async def cenario():
+            async with Servidor() as servidor:
+                async with Cliente(porta=servidor.porta, conexoes=1) as cliente:
+                    with raises(ZeroDivisionError):
+                        await cliente.divisao(1, 0)
+                    with raises(ErroRemoto, match="positivo"):
+                        await cliente.pense_num_numero(-1)
+                    # A conexão continua utilizável depois dos erros
+                    return await cliente.soma(1, 1)
+        assert _roda(cenario()) == 2
+
+    @mark.unix
+    @mark.integracao
+    @mark.skipif(sys.platform == 'win32', reason='Socket Unix indisponível no Windows')
+    def test_socket_unix(self):
+        """Testa o servidor em socket Unix."""
+        async def cenario(caminho):
+            async with Servidor(caminho=caminho):
+                async with Cliente(caminho=caminho, conexoes=2) as cliente:
+                    return await cliente.executar_varios([('divisao', 1, 4), ('pense_num_numero', 5)])
+        with tempfile.TemporaryDirectory() as diretorio:
+            assert _roda(cenario(os.path.join(diretorio, 'calc.sock'))) == [0.25, 3.0]
+
+    @mark.integracao
+    @mark.exception
+    def test_quadros_mal_formados(self):
+        """Testa respostas de erro para quadros curtos ou cortados."""
+        # Corpo de 2 bytes: nem o id cabe, o erro volta com id 0
+        resposta = _roda(_troca_crua(struct.pack('!I', 2) + b'\x00\x07'))
+        assert resposta[4:9] == struct.pack('!IB', 0, ERRO)
+        assert resposta[9:].startswith(b'ValueError\0quadro mal formado')
+        # Operando int64 cortado e inteiro grande com tamanho maior que o quadro
+        for operando in (b'q\x00\x01', b'g' + struct.pack('!I', 99) + b'\x01'):
+            corpo = struct.pack('!IB', 7, 1) + codifica_valor(1) + operando
+            resposta = _roda(_troca_crua(struct.pack('!I', len(corpo)) + corpo))
+            assert resposta[4:9] == struct.pack('!IB', 7, ERRO)
+            assert resposta[9:].startswith(b'ValueError')
+
+    @mark.integracao
+    @mark.exception
+    def test_quadro_grande_demais(self):
+        """Testa que um tamanho acima do limite fecha a conexão sem ler o corpo."""
+        resposta = _roda(_troca_crua(struct.pack('!I', 1 << 30), tamanho_maximo_quadro=1024))
+        assert resposta == b''
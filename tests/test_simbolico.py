@@ -0,0 +1,103 @@
+"""
+Testes da camada simbólica que prova e dobra cadeias da Calculadora.
+"""
+
+import math
+from decimal import Decimal
+from fractions import Fraction
+
+from libs.calculadora import Calculadora
+from libs.simbolico import Linear, NaoLinear, simplificar, dobrar
+from libs import jogo
+from pytest import mark, raises, approx
+
+c = Calculadora()
+
+
+# ============================================================================
+# TESTES DA FORMA LINEAR
+# ============================================================================
+
+class TestLinear:
+    """Álgebra sobre a variável simbólica."""
+
+    @mark.basic
+    def test_cadeia_do_jogo_eh_constante_3(self):
+        """Testa que ((x+5)*2-4)/2-x se reduz à constante 3."""
+        forma = simplificar(jogo._passos_pense_num_numero)
+        assert forma.eh_constante
+        assert forma.const == 3
+        assert str(forma) == '3'
+
+    def test_forma_fechada_reduzida(self):
+        """Testa que cadeias não constantes se reduzem a coef*x + const."""
+        forma = simplificar(lambda x: c.divisao(c.soma(c.multiplicacao(x, 4), 2), 2))
+        assert forma.coef == 2
+        assert forma.const == 1
+        assert str(forma) == '2*x + 1'
+
+    @mark.exception
+    def test_produto_de_variaveis_nao_eh_linear(self):
+        """Testa que x * x não tem prova."""
+        x = Linear.variavel()
+        with raises(NaoLinear):
+            x * x
+        assert simplificar(lambda x: c.multiplicacao(x, x)) is None
+
+    @mark.exception
+    def test_divisao_pela_variavel_nao_eh_linear(self):
+        """Testa que 1 / x não tem prova."""
+        assert simplificar(lambda x: c.divisao(1, x)) is None
+
+
+# ============================================================================
+# TESTES DA CADEIA DOBRADA
+# ============================================================================
+
+class TestCadeiaDobrada:
+    """Execução pela forma fechada com fallback passo a passo."""
+
+    def test_descricao(self):
+        """Testa a descrição legível da prova."""
+        assert jogo._pense_num_numero_dobrada.descrever() == 'constante 3'
+        assert dobrar(lambda x: x * x).descrever() == 'sem forma fechada'
+
+    @mark.parametrize("num", [0, 1, 7, 2.5, 1e9, Fraction(1, 3)])
+    def test_dobrada_igual_ao_passo_a_passo(self, num):
+        """Testa que a forma dobrada reproduz valor e tipo do passo a passo."""
+        dobrada = jogo._pense_num_numero_dobrada(num)
+        passo_a_passo = jogo._passos_pense_num_numero(num)
+        assert dobrada == passo_a_passo
+        assert type(dobrada) is type(passo_a_passo)
+
+    def test_inteiro_sem_divisao_continua_inteiro(self):
+        """Testa que cadeias sem divisão preservam int."""
+        dobrada = dobrar(lambda x: c.multiplicacao(c.soma(x, 1), 3))
+        assert dobrada(2) == 9
+        assert type(dobrada(2)) is int
+
+    def test_decimal_usa_fallback(self):
+        """Testa que tipos fora da prova percorrem a cadeia original."""
+        assert jogo.pense_num_numero(Decimal('1.5')) == Decimal(3)
+        assert isinstance(jogo.pense_num_numero(Decimal('1.5')), Decimal)
+
+    @mark.edge_case
+    def test_inteiros_gigantes_nao_estouram(self):
+        """Testa que a forma dobrada evita o OverflowError de floats intermediários."""
+        with raises(OverflowError):
+            jogo._passos_pense_num_numero(10**400)
+        assert jogo.pense_num_numero(10**400) == 3
+        assert jogo.pense_num_numero2(10**400) == 3
+
+    @mark.edge_case
+    def test_float_muito_grande_sem_deriva(self):
+        """Testa que a forma dobrada não acumula erro de arredondamento."""
+        assert jogo.pense_num_numero(1e17) == 3
+        assert jogo.pense_num_numero(math.pi) == approx(3, rel=1e-15)
+
+    @mark.exception
+    def test_string_continua_levantando_type_error(self):
+        """Testa que entradas inválidas mantêm o erro original."""
+        with raises(TypeError):
+            jogo.pense_num_numero2("abc")
+
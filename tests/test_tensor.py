@@ -0,0 +1,138 @@
+"""
+Testes do Tensor N-D sobre array.array (broadcasting e views).
+"""
+
+from array import array
+
+from libs.calculadora import Calculadora
+from libs.jogo import pense_num_numero, pense_num_numero2
+from libs.tensor import Tensor, forma_broadcast
+from pytest import fixture, mark, raises
+
+
+@fixture
+def matriz():
+    """Fixture com uma matriz 2 x 3 de inteiros."""
+    return Tensor([[1, 2, 3], [4, 5, 6]])
+
+
+# ============================================================================
+# TESTES DE CONSTRUÇÃO E VIEWS
+# ============================================================================
+
+class TestViews:
+    """Forma, passos e views sem cópia."""
+
+    @mark.basic
+    def test_construcao(self, matriz):
+        """Testa forma, tipo e conversão de volta para listas."""
+        assert matriz.forma == (2, 3)
+        assert matriz.passos == (3, 1)
+        assert matriz.typecode == 'q'
+        assert matriz.tolist() == [[1, 2, 3], [4, 5, 6]]
+        assert Tensor([1, 2.5]).typecode == 'd'
+        assert Tensor(array('d', range(6)), (3, 2)).tolist() == [[0, 1], [2, 3], [4, 5]]
+
+    def test_fatias_compartilham_buffer(self, matriz):
+        """Testa que fatiar e transpor não copiam os dados."""
+        fatia = matriz[:, ::2]
+        assert fatia.tolist() == [[1, 3], [4, 6]]
+        assert matriz.T.tolist() == [[1, 4], [2, 5], [3, 6]]
+        assert fatia.dados is matriz.dados
+        assert matriz.T.dados is matriz.dados
+        matriz.dados[0] = 100
+        assert fatia[0, 0] == 100
+
+    def test_indices(self, matriz):
+        """Testa índices inteiros, negativos e passos negativos."""
+        assert matriz[1, 2] == 6
+        assert matriz[-1].tolist() == [4, 5, 6]
+        assert matriz[::-1, ::-1].tolist() == [[6, 5, 4], [3, 2, 1]]
+        assert matriz[:, 1:1].forma == (2, 0)
+        with raises(IndexError):
+            matriz[2]
+        with raises(IndexError):
+            matriz[0, 0, 0]
+
+    def test_remodelar(self):
+        """Testa remodelar contíguo (view) e não contíguo (cópia)."""
+        tensor = Tensor(list(range(24))).remodelar(2, 3, 4)
+        assert tensor.tolist()[1][2] == [20, 21, 22, 23]
+        assert tensor.remodelar(-1, 4).forma == (6, 4)
+        assert tensor.remodelar(6, 4).dados is tensor.dados
+        transposto = tensor.transpor(2, 0, 1)
+        assert transposto.forma == (4, 2, 3)
+        assert transposto.remodelar(-1)[:6].tolist() == [0, 4, 8, 12, 16, 20]
+        with raises(ValueError):
+            tensor.remodelar(5, 5)
+
+    def test_tensor_0d_e_construtores(self):
+        """Testa tensor 0-d, zeros e cheio."""
+        assert Tensor(5).tolist() == 5
+        assert Tensor.zeros((2, 2)).tolist() == [[0, 0], [0, 0]]
+        assert Tensor.cheio((3,), 1.5).tolist() == [1.5, 1.5, 1.5]
+
+    @mark.exception
+    def test_lista_irregular(self):
+        """Testa que listas não retangulares são rejeitadas."""
+        with raises(ValueError):
+            Tensor([[1, 2], [3]])
+        with raises(ValueError):
+            Tensor(array('q', [1, 2, 3]), (2, 2))
+
+
+# ============================================================================
+# TESTES DAS OPERAÇÕES
+# ============================================================================
+
+class TestOperacoes:
+    """As quatro operações com broadcasting."""
+
+    @mark.basic
+    def test_calculadora(self, matriz):
+        """Testa as operações da Calculadora sobre tensores."""
+        assert Calculadora.soma(matriz, matriz).tolist() == [[2, 4, 6], [8, 10, 12]]
+        assert Calculadora.subtracao(matriz, 1).tolist() == [[0, 1, 2], [3, 4, 5]]
+        assert Calculadora.multiplicacao(2, matriz).tolist() == [[2, 4, 6], [8, 10, 12]]
+        divisao = Calculadora.divisao(matriz, 2)
+        assert divisao.typecode == 'd'
+        assert divisao.tolist() == [[0.5, 1.0, 1.5], [2.0, 2.5, 3.0]]
+        assert (10 - matriz)[0].tolist() == [9, 8, 7]
+        assert (-matriz)[1].tolist() == [-4, -5, -6]
+
+    @mark.parametrize('forma_a,forma_b,esperada', [
+        ((2, 3), (3,), (2, 3)),
+        ((2, 1), (1, 3), (2, 3)),
+        ((4, 1, 3), (2, 1), (4, 2, 3)),
+        ((), (2,), (2,)),
+    ])
+    def test_forma_broadcast(self, forma_a, forma_b, esperada):
+        """Testa as regras de broadcasting do NumPy."""
+        assert forma_broadcast(forma_a, forma_b) == esperada
+
+    def test_broadcasting(self, matriz):
+        """Testa linha, coluna e views não contíguas."""
+        assert (matriz + Tensor([10, 20, 30])).tolist() == [[11, 22, 33], [14, 25, 36]]
+        assert (matriz * Tensor([[1], [-1]])).tolist() == [[1, 2, 3], [-4, -5, -6]]
+        assert (Tensor([[1], [2]]) + Tensor([10, 20])).tolist() == [[11, 21], [12, 22]]
+        assert (matriz[:, ::-1] + matriz).tolist() == [[4, 4, 4], [10, 10, 10]]
+        quadrada = Tensor([[1, 2], [3, 4]])
+        assert (quadrada + quadrada.T).tolist() == [[2, 5], [5, 8]]
+
+    @mark.exception
+    def test_erros(self, matriz):
+        """Testa formas incompatíveis, divisão por zero e overflow de int64."""
+        with raises(ValueError):
+            matriz + Tensor([1, 2])
+        with raises(ZeroDivisionError):
+            matriz / 0
+        with raises(OverflowError):
+            Tensor([2 ** 62]) * 4
+        with raises(TypeError):
+            matriz + 'a'
+
+    @mark.jogo
+    def test_jogo(self, matriz):
+        """Testa o jogo elemento a elemento e a cadeia sobre o tensor inteiro."""
+        assert matriz.mapear(pense_num_numero).tolist() == [[3.0] * 3] * 2
+        assert pense_num_numero2(matriz).tolist() == [[3.0] * 3] * 2
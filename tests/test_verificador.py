@@ -0,0 +1,174 @@
+"""
+Testes do verificador em massa da propriedade "sempre retorna 3".
+"""
+
+import json
+
+from libs.verificador import (Dominio, DominioFloats, DominioInteiros, DominioInteirosGrandes,
+                              DominioPotenciasDeDois, descrever_falha, encolher,
+                              verificar, verificar_bloco, main)
+from libs.jogo import pense_num_numero
+from libs.calculadora import Calculadora
+from pytest import mark, raises
+
+
+def _passo_a_passo(num):
+    return pense_num_numero(num, calculadora=Calculadora)
+
+
+# ============================================================================
+# TESTES DOS DOMÍNIOS
+# ============================================================================
+
+class TestDominios:
+    """Geração determinística por bloco."""
+
+    @mark.basic
+    def test_inteiros_por_bloco(self):
+        """Testa que os blocos cobrem o intervalo exatamente uma vez."""
+        dominio = DominioInteiros(-5, 20, tamanho_bloco=7)
+        assert dominio.blocos == 4
+        valores = [v for bloco in range(dominio.blocos) for v in dominio.valores(bloco)]
+        assert valores == list(range(-5, 20))
+
+    def test_aleatorios_reprodutiveis(self):
+        """Testa que o mesmo bloco gera os mesmos valores em qualquer processo."""
+        floats = DominioFloats(100, semente=3, tamanho_bloco=30)
+        assert floats.valores(2) == DominioFloats(100, semente=3, tamanho_bloco=30).valores(2)
+        assert len(floats.valores(3)) == 10
+        grandes = DominioInteirosGrandes(10, bits_min=100, bits_max=100, semente=1)
+        assert all(v.bit_length() == 100 for v in grandes.valores(0))
+
+    def test_potencias_de_dois(self):
+        """Testa 2**e com seus vizinhos imediatos."""
+        dominio = DominioPotenciasDeDois(0, 1, vizinhos=1)
+        assert dominio.valores(0) == [1 - 2 ** -53, 1.0, 1 + 2 ** -52,
+                                      2 - 2 ** -52, 2.0, 2 + 2 ** -51]
+        with raises(ValueError):
+            DominioPotenciasDeDois(0, 1024)
+
+    def test_potencias_abaixo_do_menor_subnormal(self):
+        """Testa que os vizinhos abaixo de 2**-1074 param em 0.0, sem NaN."""
+        valores = DominioPotenciasDeDois(-1074, -1074, vizinhos=2).valores(0)
+        assert valores == [0.0, 0.0, 5e-324, 1e-323, 1.5e-323]
+
+    @mark.exception
+    def test_dominio_base_abstrato(self):
+        """Testa que Dominio sem valores() não pode ser instanciado."""
+        with raises(TypeError):
+            Dominio(10)
+
+
+# ============================================================================
+# TESTES DA VERIFICAÇÃO
+# ============================================================================
+
+class TestVerificacao:
+    """Blocos, contraexemplos e encolhimento."""
+
+    @mark.basic
+    def test_bloco_sem_falhas(self):
+        """Testa um bloco de inteiros pela função pública."""
+        dominio = DominioInteiros(0, 1000)
+        assert verificar_bloco('pense_num_numero2', False, dominio, 0) == (1000, 0, 0, [])
+
+    def test_negativos_ignorados(self):
+        """Testa que negativos ficam fora do contrato de pense_num_numero."""
+        dominio = DominioInteiros(-10, 10)
+        assert verificar_bloco('pense_num_numero', False, dominio, 0) == (10, 10, 0, [])
+
+    def test_deriva_passo_a_passo(self):
+        """Testa que a cadeia real expõe a deriva de ponto flutuante."""
+        dominio = DominioPotenciasDeDois(-52, -52, vizinhos=2)
+        verificados, _, total, falhas = verificar_bloco('pense_num_numero', True, dominio, 0)
+        assert verificados == 5
+        assert total == 2
+        assert [indice for indice, *_ in falhas] == [3, 4]
+        assert falhas[0][2] == 'resultado'
+
+    def test_overflow_e_encolhimento(self):
+        """Testa que o overflow é reduzido ao menor int que estoura a divisão."""
+        falha = descrever_falha(_passo_a_passo, 7 ** 2000)
+        assert falha[0] == 'OverflowError'
+        reduzido = encolher(_passo_a_passo, 7 ** 2000, 'OverflowError')
+        # (2v + 6) / 2 arredonda para inf a partir de 2**1024 - 2**970
+        assert reduzido == 2 ** 1024 - 2 ** 970 - 3
+        assert descrever_falha(_passo_a_passo, reduzido - 1)[0] != 'OverflowError'
+
+
+    def test_encolhimento_de_float(self):
+        """Testa que o float reduzido ainda falha e é mais curto."""
+        original = 524284.1247263188
+        tipo, _ = descrever_falha(_passo_a_passo, original)
+        reduzido = encolher(_passo_a_passo, original, tipo)
+        assert descrever_falha(_passo_a_passo, reduzido)[0] == tipo
+        assert len(repr(reduzido)) < len(repr(original))
+
+    def test_relatorio(self):
+        """Testa contagens e contraexemplos no relatório."""
+        relatorio = verificar([DominioInteiros(0, 100), DominioInteirosGrandes(5, 1100, 1200)],
+                              funcoes=['pense_num_numero'], passo_a_passo=True)
+        inteiros, grandes = relatorio.values()
+        assert (inteiros['verificados'], inteiros['falhas']) == (100, 0)
+        assert grandes['falhas'] == 5
+        assert all(c['reduzido'] == 2 ** 1024 - 2 ** 970 - 3 for c in grandes['contraexemplos'])
+
+
+# ============================================================================
+# TESTES DE CHECKPOINT E EXECUÇÃO
+# ============================================================================
+
+class TestExecucao:
+    """Checkpoint, processos e linha de comando."""
+
+    def test_retoma_do_checkpoint(self, tmp_path):
+        """Testa que uma execução interrompida continua do último bloco."""
+        caminho = str(tmp_path / 'progresso.json')
+        dominio = DominioInteiros(0, 1000, tamanho_bloco=100)
+        vistos = []
+
+        class Interrompe(Exception):
+            pass
+
+        def ao_progresso(chave, estado):
+            vistos.append(estado['proximo_bloco'])
+            if estado['proximo_bloco'] == 4:
+                raise Interrompe
+
+        try:
+            verificar([dominio], funcoes=['pense_num_numero2'], checkpoint=caminho,
+                      intervalo_checkpoint=0, ao_progresso=ao_progresso)
+        except Interrompe:
+            pass
+        with open(caminho, encoding='utf-8') as arquivo:
+            salvo = json.load(arquivo)
+        assert list(salvo['relatorio'].values())[0]['proximo_bloco'] == 3
+
+        vistos.clear()
+        relatorio = verificar([dominio], funcoes=['pense_num_numero2'], checkpoint=caminho,
+                              ao_progresso=lambda chave, estado: vistos.append(estado['proximo_bloco']))
+        assert vistos == list(range(4, 11))
+        assert list(relatorio.values())[0]['verificados'] == 1000
+
+    def test_configuracao_diferente_recomeca(self, tmp_path):
+        """Testa que o checkpoint de outro domínio não é reaproveitado."""
+        caminho = str(tmp_path / 'progresso.json')
+        verificar([DominioInteiros(0, 10)], funcoes=['pense_num_numero2'], checkpoint=caminho)
+        relatorio = verificar([DominioInteiros(0, 20)], funcoes=['pense_num_numero2'],
+                              checkpoint=caminho)
+        assert list(relatorio.values())[0]['verificados'] == 20
+
+    @mark.slow
+    def test_processos(self):
+        """Testa que processos dão o mesmo relatório que a execução sequencial."""
+        dominios = [DominioInteiros(0, 5000, tamanho_bloco=500),
+                    DominioPotenciasDeDois(-60, -40, vizinhos=3, tamanho_bloco=20)]
+        assert verificar(dominios, passo_a_passo=True, processos=2) == \
+            verificar(dominios, passo_a_passo=True)
+
+    def test_main(self, capsys):
+        """Testa a linha de comando e o código de saída."""
+        assert main(['--inteiros', '0', '100', '-p', '1']) == 0
+        assert main(['--grandes', '2', '-p', '1']) == 1
+        assert 'OverflowError' in capsys.readouterr().out
+        assert main(['--grandes', '2', '--no-passo-a-passo', '-p', '1']) == 0